@@ -0,0 +1,76 @@
+"""
+Time parsing of residue range, chain offset and frame / loop / tag selectors with the cached pyparsing grammars and
+with the grammars rebuilt for each selector [as they were before they were cached].
+
+usage: python scripts/benchmark_selectors.py [REPEATS]
+"""
+
+import sys
+from contextlib import contextmanager
+from time import perf_counter
+
+from nef_pipelines.lib import cli_lib
+from nef_pipelines.lib.cli_lib import (
+    parse_chain_offset_syntax,
+    parse_frame_loop_and_tags,
+    parse_residue_ranges,
+)
+
+RESIDUE_RANGES = ["A:10..20", "A+B:5+7+9..12", ":-3..", "C", "15..30"]
+CHAIN_OFFSETS = ["A:+5", "A:10..20+3", "A+B+C:50..60+5:90..102-3"]
+FRAME_LOOP_TAGS = [
+    "shift.chemical_shift:atom_name,value",
+    "nef_chemical_shift_list",
+    ":sf_category",
+    "*.*:*",
+]
+
+GRAMMAR_BUILDERS = (
+    "_build_unified_grammar",
+    "_build_chain_offset_grammar",
+    "_build_frame_loop_tag_grammar",
+)
+
+
+@contextmanager
+def uncached_grammars():
+    cached = {name: getattr(cli_lib, name) for name in GRAMMAR_BUILDERS}
+    try:
+        for name, builder in cached.items():
+            setattr(cli_lib, name, builder.__wrapped__)
+        yield
+    finally:
+        for name, builder in cached.items():
+            setattr(cli_lib, name, builder)
+
+
+def selectors_per_second(parse, selectors, repeats):
+    start = perf_counter()
+    for _ in range(repeats):
+        for selector in selectors:
+            parse(selector)
+    return repeats * len(selectors) / (perf_counter() - start)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    benchmarks = {
+        "residue ranges": (lambda spec: parse_residue_ranges([spec]), RESIDUE_RANGES),
+        "chain offsets": (
+            lambda spec: parse_chain_offset_syntax([spec]),
+            CHAIN_OFFSETS,
+        ),
+        "frame/loop/tags": (parse_frame_loop_and_tags, FRAME_LOOP_TAGS),
+    }
+
+    print(f"{'selectors':<16} {'cached [/s]':>12} {'uncached [/s]':>14} {'speedup':>8}")
+    for name, (parse, selectors) in benchmarks.items():
+        cached = selectors_per_second(parse, selectors, repeats)
+        with uncached_grammars():
+            uncached = selectors_per_second(parse, selectors, repeats)
+        print(f"{name:<16} {cached:>12.0f} {uncached:>14.0f} {cached / uncached:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
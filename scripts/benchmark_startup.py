@@ -0,0 +1,63 @@
+"""
+Time the startup of each top level nef command [nef <command> --help] with lazy loading from the command manifest
+and with all modules loaded eagerly.
+
+usage: python scripts/benchmark_startup.py [REPEATS] [COMMAND ...]
+"""
+
+import os
+import subprocess
+import sys
+from statistics import median
+from time import perf_counter
+
+from nef_pipelines.lib.command_manifest_lib import (
+    LOAD_ALL_MODULES_ENV_VAR,
+    build_command_manifest,
+    write_command_manifest,
+)
+from nef_pipelines.module_registry import get_registerd_modules
+from nef_pipelines.nef_app_runner import (
+    create_nef_app,
+    load_nef_modules_and_build_failure,
+)
+
+NEF = [sys.executable, "-m", "nef_pipelines.main"]
+
+
+def time_command(args, env, repeats):
+    times = []
+    for _ in range(repeats):
+        start = perf_counter()
+        subprocess.run([*NEF, *args], env=env, capture_output=True)
+        times.append(perf_counter() - start)
+    return median(times)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    selected = sys.argv[2:]
+
+    modules = get_registerd_modules()
+    app = create_nef_app().app
+    load_nef_modules_and_build_failure()
+    manifest = build_command_manifest(app, modules)
+    write_command_manifest(manifest, modules)
+
+    lazy_env = {k: v for k, v in os.environ.items() if k != LOAD_ALL_MODULES_ENV_VAR}
+    eager_env = {**lazy_env, LOAD_ALL_MODULES_ENV_VAR: "1"}
+
+    names = selected if selected else sorted(entry.name for entry in manifest)
+    commands = [[]] + [[name] for name in names]
+
+    print(f"{'command':<20} {'lazy [s]':>10} {'eager [s]':>10} {'speedup':>8}")
+    for command in commands:
+        args = [*command, "--help"]
+        lazy = time_command(args, lazy_env, repeats)
+        eager = time_command(args, eager_env, repeats)
+        name = command[0] if command else "[top level]"
+        print(f"{name:<20} {lazy:>10.3f} {eager:>10.3f} {eager / lazy:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
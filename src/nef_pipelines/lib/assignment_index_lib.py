@@ -0,0 +1,219 @@
+"""
+    An index of the assignments in the loops of an entry's frames. An assignment is a group of chain_code,
+    sequence_code, residue_name and atom_name columns sharing a suffix [e.g. chain_code_1, sequence_code_1 ...
+    or chain_code, sequence_code ...] and the index maps each distinct set of values in such a group to the
+    frames, loops, rows and column groups where it occurs.
+
+    The index is built in one pass over the rows with the column groups of each loop found once, so commands
+    which renumber, relabel, filter or check assignments work on each distinct assignment once rather than
+    re-walking every row of every loop for every change.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from pynmrstar import Entry, Loop, Saveframe
+
+ASSIGNMENT_FIELDS = ("chain_code", "sequence_code", "residue_name", "atom_name")
+
+_ASSIGNMENT_TAG = re.compile(
+    r"^(chain_code|sequence_code|residue_name|atom_name)((?:_\d+)?)$"
+)
+
+
+class Assignment(NamedTuple):
+    """
+    the values of an assignment column group as they appear in a loop, fields are None if the loop doesn't have
+    the column
+    """
+
+    chain_code: Optional[str] = None
+    sequence_code: Optional[str] = None
+    residue_name: Optional[str] = None
+    atom_name: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class AssignmentColumns:
+    """
+    the indices of the columns of an assignment column group in a loop, indices are None if the loop doesn't have
+    the column
+    """
+
+    suffix: str
+    chain_code: Optional[int] = None
+    sequence_code: Optional[int] = None
+    residue_name: Optional[int] = None
+    atom_name: Optional[int] = None
+
+    @property
+    def indices(self) -> Tuple[Optional[int], ...]:
+        return (
+            self.chain_code,
+            self.sequence_code,
+            self.residue_name,
+            self.atom_name,
+        )
+
+    def has(self, *fields: str) -> bool:
+        """true if the group has a column for each of the fields [see ASSIGNMENT_FIELDS]"""
+        return all(getattr(self, field) is not None for field in fields)
+
+
+class AssignmentLocation(NamedTuple):
+    """where an assignment occurs: a row of a loop in a frame and the column group in the row"""
+
+    frame: Saveframe
+    loop: Loop
+    row: int
+    columns: AssignmentColumns
+
+
+def _suffix_sort_key(suffix: str) -> Tuple[int, int]:
+    return (0, 0) if not suffix else (1, int(suffix[1:]))
+
+
+def assignment_columns(tags: Iterable[str]) -> List[AssignmentColumns]:
+    """
+    find the assignment column groups in the tags of a loop
+
+    :param tags: the tags of the loop [without the category]
+    :return: a column group for each suffix with at least one assignment column, unsuffixed first and then in
+             order of the suffix's number
+    """
+
+    indices_by_suffix = {}
+    for index, tag in enumerate(tags):
+        match = _ASSIGNMENT_TAG.match(tag)
+        if match:
+            field, suffix = match.groups()
+            indices_by_suffix.setdefault(suffix, {})[field] = index
+
+    return [
+        AssignmentColumns(suffix, **indices_by_suffix[suffix])
+        for suffix in sorted(indices_by_suffix, key=_suffix_sort_key)
+    ]
+
+
+class AssignmentIndex:
+    """
+    maps each distinct assignment in the loops of a set of frames to where it occurs, assignments are kept in the
+    order they are first seen [frames, then loops, then rows and then column groups in order]
+
+    the index reflects the loops when it was built and any changes made through relabel, it is not updated if rows
+    are added, removed or edited by other means
+    """
+
+    def __init__(self, frames: Iterable[Saveframe]):
+
+        self._locations: Dict[Assignment, List[AssignmentLocation]] = {}
+        self._columns_by_loop: Dict[int, List[AssignmentColumns]] = {}
+        self._assignments_by_loop: Dict[int, Dict[Assignment, None]] = {}
+        self._loops: List[Tuple[Saveframe, Loop]] = []
+
+        for frame in frames:
+            for loop in frame.loops:
+                self._add_loop(frame, loop)
+
+    @classmethod
+    def from_entry(cls, entry: Entry) -> "AssignmentIndex":
+        """an index of the assignments in all the frames of an entry"""
+        return cls(entry.frame_list)
+
+    def _add_loop(self, frame: Saveframe, loop: Loop):
+        all_columns = assignment_columns(loop.tags)
+        if not all_columns:
+            return
+
+        self._loops.append((frame, loop))
+        self._columns_by_loop[id(loop)] = all_columns
+        loop_assignments = self._assignments_by_loop.setdefault(id(loop), {})
+
+        locations = self._locations
+        indices_by_columns = [(columns, columns.indices) for columns in all_columns]
+        for row_index, row in enumerate(loop.data):
+            for columns, indices in indices_by_columns:
+                assignment = Assignment(
+                    *[None if index is None else row[index] for index in indices]
+                )
+
+                location = AssignmentLocation(frame, loop, row_index, columns)
+                if assignment in locations:
+                    locations[assignment].append(location)
+                else:
+                    locations[assignment] = [location]
+                loop_assignments[assignment] = None
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __iter__(self) -> Iterator[Assignment]:
+        return iter(self._locations)
+
+    def __contains__(self, assignment: Assignment) -> bool:
+        return assignment in self._locations
+
+    def __getitem__(self, assignment: Assignment) -> List[AssignmentLocation]:
+        return self._locations[assignment]
+
+    def items(self) -> Iterable[Tuple[Assignment, List[AssignmentLocation]]]:
+        """the assignments and their locations"""
+        return self._locations.items()
+
+    def loops(self) -> List[Tuple[Saveframe, Loop]]:
+        """the frames and loops that have assignment columns"""
+        return list(self._loops)
+
+    def columns(self, loop: Loop) -> List[AssignmentColumns]:
+        """the assignment column groups of a loop, empty if the loop wasn't indexed or has none"""
+        return self._columns_by_loop.get(id(loop), [])
+
+    def assignments(self, loop: Optional[Loop] = None) -> List[Assignment]:
+        """
+        the distinct assignments in the index or in a single loop, in the order they were first seen
+
+        :param loop: the loop to get the assignments of or None for all assignments
+        :return: the assignments
+        """
+        if loop is None:
+            return list(self._locations)
+
+        return list(self._assignments_by_loop.get(id(loop), {}))
+
+    def relabel(self, new_assignments: Dict[Assignment, Assignment]):
+        """
+        change assignments wherever they occur, the values are written into the loops and the index is updated.
+        All the changes are made together so an assignment can be mapped to one that is itself being changed
+        [e.g. when renumbering] without being changed twice. Fields of a new assignment which are None are left
+        unchanged as are fields the column group doesn't have
+
+        :param new_assignments: the new assignment for each assignment to change
+        """
+
+        moves = [
+            (old, new, self._locations.pop(old))
+            for old, new in new_assignments.items()
+            if old in self._locations
+        ]
+
+        for old, _, locations in moves:
+            for location in locations:
+                self._assignments_by_loop[id(location.loop)].pop(old, None)
+
+        for _, new, locations in moves:
+            for location in locations:
+                row = location.loop.data[location.row]
+
+                values = []
+                for index, value in zip(location.columns.indices, new):
+                    if index is None:
+                        values.append(None)
+                        continue
+                    if value is not None:
+                        row[index] = value
+                    values.append(row[index])
+
+                assignment = Assignment(*values)
+                self._locations.setdefault(assignment, []).append(location)
+                self._assignments_by_loop[id(location.loop)][assignment] = None
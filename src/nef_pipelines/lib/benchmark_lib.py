@@ -0,0 +1,588 @@
+"""
+    Synthetic NEF entries of a chosen size and a suite of timings of NEF-Pipelines commands run on them [see nef
+    benchmark].
+
+    An entry has a molecular system, a chemical shift list, a pair of peak lists [the second a slightly perturbed copy
+    of the first], a distance restraint list and a relaxation series: a set of HN spectrum planes with a peak for
+    each residue and a series list frame describing them. All values come from a seeded random number generator so
+    the same sizes and seed always give the same entry.
+
+    Commands are run in process through the nef app with the entry as their input, so a command's time includes
+    reading its input, the command itself and writing its output, as when it is used in a pipeline. Results are
+    written as json and can be compared with a stored baseline to find commands which have become slower.
+"""
+
+import io
+import math
+import os
+import platform
+import random
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from enum import auto
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from pynmrstar import Entry, Loop, Saveframe
+from strenum import LowercaseStrEnum
+
+from nef_pipelines.lib.isotope_lib import Isotope
+from nef_pipelines.lib.lazy_entry_lib import lazy_entry_from_string
+from nef_pipelines.lib.nef_frames_lib import SPECTRUM_FRAME_CATEGORY
+from nef_pipelines.lib.nef_lib import (
+    UNUSED,
+    LoopBuilder,
+    add_frames_to_entry,
+    create_nef_save_frame,
+)
+from nef_pipelines.lib.peak_lib import peaks_to_frame
+from nef_pipelines.lib.pipeline_lib import run_pipeline
+from nef_pipelines.lib.sequence_lib import sequence_to_nef_frame
+from nef_pipelines.lib.shift_lib import shifts_to_nef_frame
+from nef_pipelines.lib.star_writer_lib import write_entry
+from nef_pipelines.lib.structures import (
+    AtomLabel,
+    NewPeak,
+    Residue,
+    SequenceResidue,
+    ShiftData,
+    ShiftList,
+)
+from nef_pipelines.lib.util import get_version
+
+BENCHMARK_FORMAT = 1
+
+DEFAULT_SEED = 42
+
+BENCHMARK_ENTRY_ID = "benchmark"
+CHAIN_CODE = "A"
+SERIES_NAME = "T2"
+PEAK_LIST_NAMES = ("peaks_1", "peaks_2")
+
+# residues without a missing H or CB so every residue has a peak in each dimension
+_RESIDUE_NAMES = ("ALA", "ARG", "ASN", "ASP", "GLU", "ILE", "LEU", "LYS", "SER", "VAL")
+
+# the atoms of the peak dimensions in order with their isotope, random coil shift and spread of shifts
+_DIMENSION_ATOMS = (
+    ("H", Isotope.H1, 8.2, 0.6),
+    ("N", Isotope.N15, 120.0, 5.0),
+    ("CA", Isotope.C13, 56.0, 4.0),
+    ("CB", Isotope.C13, 35.0, 8.0),
+)
+MAX_DIMENSIONS = len(_DIMENSION_ATOMS)
+
+_SPECTROMETER_FREQUENCY = 600.0
+_PEAK_LIST_2_NOISE = 0.01
+_PLANE_TIME_STEP_MS = 100
+_INITIAL_HEIGHT = 1_000_000.0
+
+
+@dataclass(frozen=True)
+class EntrySize:
+    """
+    the size of a synthetic entry: the number of residues, the number of peaks in each peak list, the number of
+    dimensions of the peak lists, the number of distance restraints and the number of planes in the relaxation series
+    """
+
+    residues: int = 200
+    peaks: int = 2000
+    dimensions: int = 2
+    restraints: int = 5000
+    planes: int = 10
+
+
+class BenchmarkException(Exception):
+    """a benchmark failed to run"""
+
+    pass
+
+
+def _sequence(size: EntrySize) -> List[SequenceResidue]:
+    return [
+        SequenceResidue(
+            CHAIN_CODE, index + 1, _RESIDUE_NAMES[index % len(_RESIDUE_NAMES)]
+        )
+        for index in range(size.residues)
+    ]
+
+
+def _shifts(
+    sequence: List[SequenceResidue], rng: random.Random
+) -> Dict[Tuple[int, str], ShiftData]:
+    shifts = {}
+    for sequence_residue in sequence:
+        residue = Residue.from_sequence_residue(sequence_residue)
+        for atom_name, _, shift, spread in _DIMENSION_ATOMS:
+            value = round(rng.gauss(shift, spread), 3)
+            atom = AtomLabel(residue, atom_name)
+            shifts[sequence_residue.sequence_code, atom_name] = ShiftData(atom, value)
+    return shifts
+
+
+def _peak_list_frame(
+    name: str,
+    peak_shifts: List[List[ShiftData]],
+    heights: List[float],
+    dimensions: int,
+):
+    peaks = [
+        NewPeak(shifts, id=index + 1, height=round(height, 3))
+        for index, (shifts, height) in enumerate(zip(peak_shifts, heights))
+    ]
+    axis_codes = [
+        {"axis_code": isotope} for _, isotope, _, _ in _DIMENSION_ATOMS[:dimensions]
+    ]
+    return peaks_to_frame(peaks, axis_codes, _SPECTROMETER_FREQUENCY, name)
+
+
+def _perturbed(shift: ShiftData, rng: random.Random) -> ShiftData:
+    return ShiftData(
+        shift.atom, round(shift.value + rng.gauss(0.0, _PEAK_LIST_2_NOISE), 3)
+    )
+
+
+def _restraint_frame(size: EntrySize, rng: random.Random):
+    frame = create_nef_save_frame("nef_distance_restraint_list", "restraints")
+    frame.add_tag("potential_type", "log-normal")
+    frame.add_tag("restraint_origin", "noe")
+
+    loop = Loop.from_scratch("nef_distance_restraint")
+    frame.add_loop(loop)
+    loop.add_tag(
+        [
+            "index",
+            "restraint_id",
+            "restraint_combination_id",
+            *[
+                f"{name}_{atom}"
+                for atom in (1, 2)
+                for name in ("chain_code", "sequence_code", "residue_name", "atom_name")
+            ],
+            "weight",
+            "target_value",
+            "upper_limit",
+            "lower_limit",
+        ]
+    )
+
+    builder = LoopBuilder(loop)
+    for index in range(size.restraints):
+        residue_1, residue_2 = (rng.randrange(size.residues) for _ in range(2))
+        target = round(rng.uniform(2.0, 5.0), 2)
+        builder.add_value_rows(
+            [
+                (
+                    index + 1,
+                    index + 1,
+                    UNUSED,
+                    CHAIN_CODE,
+                    residue_1 + 1,
+                    _RESIDUE_NAMES[residue_1 % len(_RESIDUE_NAMES)],
+                    "H",
+                    CHAIN_CODE,
+                    residue_2 + 1,
+                    _RESIDUE_NAMES[residue_2 % len(_RESIDUE_NAMES)],
+                    "HA",
+                    1.0,
+                    target,
+                    round(target + 1.0, 2),
+                    1.8,
+                )
+            ]
+        )
+    builder.build()
+
+    return frame
+
+
+def _series_frames(
+    sequence: List[SequenceResidue],
+    shifts: Dict[Tuple[int, str], ShiftData],
+    size: EntrySize,
+    rng: random.Random,
+) -> Tuple[List[Saveframe], Dict[Tuple[str, int], Tuple[float, str]]]:
+
+    rates = [rng.uniform(5.0, 15.0) for _ in sequence]
+    peak_shifts = [
+        [shifts[residue.sequence_code, atom_name] for atom_name in ("H", "N")]
+        for residue in sequence
+    ]
+
+    frames = []
+    timings = {}
+    for plane in range(size.planes):
+        plane_time = plane * _PLANE_TIME_STEP_MS / 1000.0
+        heights = [_INITIAL_HEIGHT * math.exp(-rate * plane_time) for rate in rates]
+        frame = _peak_list_frame(f"{SERIES_NAME}_{plane + 1}", peak_shifts, heights, 2)
+        frames.append(frame)
+        timings[frame.name, plane] = (plane * _PLANE_TIME_STEP_MS, "ms")
+
+    return frames, timings
+
+
+def synthetic_entry(size: EntrySize, seed: int = DEFAULT_SEED) -> Entry:
+    """
+    build a synthetic NEF entry [see the module documentation]
+
+    :param size: the size of the entry
+    :param seed: the seed for the random values in the entry
+    :return: the entry
+    """
+
+    if not 1 <= size.dimensions <= MAX_DIMENSIONS:
+        raise BenchmarkException(
+            f"the number of peak dimensions must be between 1 and {MAX_DIMENSIONS}, it was {size.dimensions}"
+        )
+
+    if size.residues < 1:
+        raise BenchmarkException(
+            f"there must be at least 1 residue, there were {size.residues}"
+        )
+
+    rng = random.Random(seed)
+
+    sequence = _sequence(size)
+    shifts = _shifts(sequence, rng)
+
+    entry = Entry.from_scratch(BENCHMARK_ENTRY_ID)
+
+    frames = [
+        sequence_to_nef_frame(sequence),
+        shifts_to_nef_frame(ShiftList(list(shifts.values())), "default"),
+    ]
+
+    dimension_atoms = [
+        atom_name for atom_name, _, _, _ in _DIMENSION_ATOMS[: size.dimensions]
+    ]
+    peak_shifts_1 = [
+        [
+            shifts[sequence[index % size.residues].sequence_code, atom_name]
+            for atom_name in dimension_atoms
+        ]
+        for index in range(size.peaks)
+    ]
+    peak_shifts_2 = [
+        [_perturbed(shift, rng) for shift in shifts_] for shifts_ in peak_shifts_1
+    ]
+    heights = [rng.uniform(0.5, 1.5) * _INITIAL_HEIGHT for _ in range(size.peaks)]
+
+    if size.peaks:
+        for name, peak_shifts in zip(PEAK_LIST_NAMES, (peak_shifts_1, peak_shifts_2)):
+            frames.append(_peak_list_frame(name, peak_shifts, heights, size.dimensions))
+
+    if size.restraints:
+        frames.append(_restraint_frame(size, rng))
+
+    timings = {}
+    if size.planes:
+        series_frames, timings = _series_frames(sequence, shifts, size, rng)
+        frames.extend(series_frames)
+
+    add_frames_to_entry(entry, frames)
+
+    if timings:
+        # imported here as the series tools register commands with the nef app
+        from nef_pipelines.tools.series.build import pipe as series_build_pipe  # lazy
+
+        series_build_pipe(entry, timings, "ms", SERIES_NAME, SERIES_NAME)
+
+    return entry
+
+
+class BenchmarkInput(LowercaseStrEnum):
+    """what a benchmark reads: the synthetic entry, nothing or the output of the benchmark it requires"""
+
+    ENTRY = auto()
+    NONE = auto()
+    REQUIRED = auto()
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """
+    a benchmark: a command line [without the leading nef] or a library function called with the synthetic entry
+    and its text, what it reads and the benchmark which has to be run before it [e.g. to write the files an
+    importer reads]
+    """
+
+    name: str
+    args: Tuple[str, ...] = ()
+    input: BenchmarkInput = BenchmarkInput.ENTRY
+    requires: Optional[str] = None
+    function: Optional[Callable[[Entry, str], Any]] = None
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """the times of the repeated runs of a benchmark in seconds"""
+
+    name: str
+    times: Tuple[float, ...]
+
+    @property
+    def best(self) -> float:
+        return min(self.times)
+
+    @property
+    def mean(self) -> float:
+        return sum(self.times) / len(self.times)
+
+
+@dataclass(frozen=True)
+class Regression:
+    """a benchmark which is slower than its baseline by more than the allowed tolerance"""
+
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+def _read_entry(_: Entry, text: str):
+    entry = lazy_entry_from_string(text)
+    for frame in entry:
+        # parse the frame
+        frame.loops
+
+
+def _write_entry(entry: Entry, _: str):
+    write_entry(entry, io.StringIO())
+
+
+_PEAKS_1, _PEAKS_2 = PEAK_LIST_NAMES
+
+BENCHMARKS = (
+    Benchmark("read", function=_read_entry),
+    Benchmark("write", function=_write_entry),
+    Benchmark("frames tabulate", ("frames", "tabulate", "nef_chemical_shift_list")),
+    Benchmark("shifts average", ("shifts", "average", _PEAKS_1, _PEAKS_2)),
+    Benchmark("peaks match", ("peaks", "match", _PEAKS_1, _PEAKS_2)),
+    Benchmark("chains renumber", ("chains", "renumber", CHAIN_CODE, "10")),
+    Benchmark("series table", ("series", "table", SERIES_NAME)),
+    Benchmark(
+        "fit exponential",
+        ("fit", "exponential", SERIES_NAME, "--cycles", "0"),
+        BenchmarkInput.REQUIRED,
+        "series table",
+    ),
+    Benchmark(
+        "fit mean",
+        ("fit", "mean", SERIES_NAME),
+        BenchmarkInput.REQUIRED,
+        "series table",
+    ),
+    Benchmark(
+        "fasta export sequence",
+        ("fasta", "export", "sequence", "--force", "sequence.fasta"),
+    ),
+    Benchmark(
+        "fasta import sequence",
+        ("fasta", "import", "sequence", "sequence.fasta"),
+        BenchmarkInput.NONE,
+        "fasta export sequence",
+    ),
+    Benchmark(
+        "sparky export peaks",
+        (
+            "sparky",
+            "export",
+            "peaks",
+            "--no-chains",
+            "--file-name-template",
+            "%s.txt",
+            _PEAKS_1,
+        ),
+    ),
+    Benchmark(
+        "sparky import peaks",
+        ("sparky", "import", "peaks", f"{SPECTRUM_FRAME_CATEGORY}_{_PEAKS_1}.txt"),
+        requires="sparky export peaks",
+    ),
+    Benchmark(
+        "sparky export shifts",
+        ("sparky", "export", "shifts", "--force", "--out", "shifts.txt"),
+    ),
+)
+
+BENCHMARK_NAMES = tuple(benchmark.name for benchmark in BENCHMARKS)
+
+_BENCHMARKS_BY_NAME = {benchmark.name: benchmark for benchmark in BENCHMARKS}
+
+
+@contextmanager
+def _working_directory(directory: Path):
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+
+
+def _run_benchmark(
+    benchmark: Benchmark, entry: Entry, text: str, outputs: Dict[str, str]
+) -> str:
+    if benchmark.function:
+        benchmark.function(entry, text)
+        return ""
+
+    if benchmark.input == BenchmarkInput.ENTRY:
+        nef_input = text
+    elif benchmark.input == BenchmarkInput.REQUIRED:
+        nef_input = outputs[benchmark.requires]
+    else:
+        nef_input = ""
+
+    outcome = run_pipeline([list(benchmark.args)], nef_input)
+
+    if outcome.exit_code != 0:
+        stderr = "".join(outcome.stderr)
+        raise BenchmarkException(
+            f"the benchmark {benchmark.name} [nef {' '.join(benchmark.args)}] failed with exit code "
+            f"{outcome.exit_code}, its error output was:\n{stderr}"
+        )
+
+    return outcome.stdout
+
+
+def _with_requirements(names: Sequence[str]) -> List[str]:
+    result = []
+    for name in names:
+        if name not in _BENCHMARKS_BY_NAME:
+            raise BenchmarkException(
+                f"there is no benchmark called {name}, the benchmarks are: {', '.join(BENCHMARK_NAMES)}"
+            )
+
+        required = _BENCHMARKS_BY_NAME[name].requires
+        if required:
+            result.extend(_with_requirements([required]))
+        result.append(name)
+
+    return list(dict.fromkeys(result))
+
+
+def run_benchmarks(
+    entry: Entry,
+    names: Optional[Sequence[str]] = None,
+    repeats: int = 3,
+    report: Optional[Callable[[BenchmarkResult], None]] = None,
+) -> List[BenchmarkResult]:
+    """
+    time benchmarks on an entry. Each benchmark is run once untimed first [so imports and caches are warmed up and
+    its output is available to benchmarks which require it] and then timed repeats times, the benchmarks are run in
+    a temporary directory [for the files exporters write and importers read]. Benchmarks required by the chosen
+    benchmarks are run untimed and are not reported
+
+    :param entry: the entry to benchmark with
+    :param names: the names of the benchmarks to run, None for all of them [see BENCHMARK_NAMES]
+    :param repeats: the number of times to time each benchmark
+    :param report: called with the result of each benchmark as it completes
+    :return: the results of the chosen benchmarks
+    """
+
+    names = list(BENCHMARK_NAMES) if names is None else list(names)
+
+    if repeats < 1:
+        raise BenchmarkException(
+            f"benchmarks must be repeated at least once, repeats was {repeats}"
+        )
+
+    text = str(entry)
+
+    results = []
+    outputs = {}
+    with tempfile.TemporaryDirectory() as directory, _working_directory(
+        Path(directory)
+    ):
+        for name in _with_requirements(names):
+            benchmark = _BENCHMARKS_BY_NAME[name]
+
+            outputs[name] = _run_benchmark(benchmark, entry, text, outputs)
+
+            if name not in names:
+                continue
+
+            times = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                _run_benchmark(benchmark, entry, text, outputs)
+                times.append(time.perf_counter() - start)
+
+            result = BenchmarkResult(name, tuple(times))
+            results.append(result)
+            if report:
+                report(result)
+
+    return results
+
+
+def results_to_json(
+    size: EntrySize, seed: int, results: Sequence[BenchmarkResult]
+) -> Dict[str, Any]:
+    """
+    the results of a set of benchmarks as json data, this includes the sizes of the entry and the versions of
+    NEF-Pipelines and python they were run with
+
+    :param size: the size of the entry benchmarked
+    :param seed: the seed the entry was built with
+    :param results: the results of the benchmarks
+    :return: the json data
+    """
+    return {
+        "format": BENCHMARK_FORMAT,
+        "nef_pipelines_version": get_version(),
+        "python_version": platform.python_version(),
+        "size": asdict(size),
+        "seed": seed,
+        "benchmarks": {
+            result.name: {
+                "best": result.best,
+                "mean": result.mean,
+                "times": list(result.times),
+            }
+            for result in results
+        },
+    }
+
+
+def compare_with_baseline(
+    current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[Regression]:
+    """
+    compare the best times of benchmarks with those of a baseline, benchmarks which aren't in both are ignored
+
+    :param current: the json data of the current results [see results_to_json]
+    :param baseline: the json data of the baseline results
+    :param tolerance: the fraction a benchmark can be slower than its baseline before it counts as a regression
+    :return: the regressions found
+    """
+
+    if baseline.get("format") != BENCHMARK_FORMAT:
+        raise BenchmarkException(
+            f"the baseline has format {baseline.get('format')} but format {BENCHMARK_FORMAT} was expected"
+        )
+
+    if (
+        baseline.get("size") != current["size"]
+        or baseline.get("seed") != current["seed"]
+    ):
+        raise BenchmarkException(
+            f"the baseline was made with an entry of size {baseline.get('size')} and seed {baseline.get('seed')} "
+            f"but the current entry has size {current['size']} and seed {current['seed']}"
+        )
+
+    regressions = []
+    for name, result in current["benchmarks"].items():
+        if name not in baseline["benchmarks"]:
+            continue
+
+        baseline_best = baseline["benchmarks"][name]["best"]
+        if result["best"] > baseline_best * (1.0 + tolerance):
+            regressions.append(Regression(name, baseline_best, result["best"]))
+
+    return regressions
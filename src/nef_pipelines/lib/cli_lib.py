@@ -59,6 +59,7 @@ import sys
 from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum, Flag, auto
+from functools import lru_cache
 from pathlib import Path
 from textwrap import dedent
 from typing import Any, Dict, List, Optional, Tuple, Union
@@ -69,6 +70,7 @@ from pyparsing import ParserElement, ParseResults, StringEnd
 
 from nef_pipelines.lib.nef_lib import (
     SelectionType,
+    print_entry,
     select_frames,
     select_loops_by_category,
 )
@@ -105,6 +107,10 @@ SELECT_ALL_FRAMES_LOOPS_AND_LOOP_TAGS = "*.*:*"
 SELECT_ALL_FRAMES_AND_LOOPS = "*.*"
 SELECT_ALL_FRAMES_AND_FRAME_TAGS = "*:*"
 
+# pyparsing grammars are built once for each set of separators or escape mode and reused, packrat parsing isn't
+# enabled as the selectors are short and it makes parsing them slower
+_GRAMMAR_CACHE_SIZE = 32
+
 
 class SelectorAction(Enum):
     """Actions for selector operations."""
@@ -289,11 +295,14 @@ def _parse_residue_ranges_with_pyparsing(
         raise ResidueRangeParsingException(f"Failed to parse '{spec}': {str(e)}")
 
 
+@lru_cache(maxsize=_GRAMMAR_CACHE_SIZE)
 def _build_unified_grammar(chain_separator: str, range_separator: str):
     """
     Build unified pyparsing grammar for .. separator.
 
     With .. separator, there's no ambiguity so we don't need separate strict/relaxed modes.
+
+    Grammars are cached by separators as they are expensive to build and are immutable once built.
     """
 
     # Basic elements - try integer first, then fall back to string
@@ -363,7 +372,7 @@ def _build_unified_grammar(chain_separator: str, range_separator: str):
     chains_only = chain_list  # A or A+B (includes non-numeric strings)
 
     # Put numeric patterns before chain patterns to ensure numeric strings are parsed as residues
-    return (
+    grammar = (
         all_chains_with_residues
         | specific_chains_with_residues
         | chains_with_empty_residues
@@ -371,6 +380,8 @@ def _build_unified_grammar(chain_separator: str, range_separator: str):
         | chains_only
     )
 
+    return grammar.streamline()
+
 
 def _convert_structured_parse_results(
     tokens: List, chain_separator: str, original_spec: str
@@ -1098,9 +1109,10 @@ def parse_chain_offset_syntax(
         )
 
 
+@lru_cache(maxsize=_GRAMMAR_CACHE_SIZE)
 def _build_chain_offset_grammar(chain_separator: str, range_separator: str):
     """
-    Build pyparsing grammar for chain offset syntax.
+    Build pyparsing grammar for chain offset syntax, grammars are cached by separators.
 
     Args:
         chain_separator: Character separating chain groups from range/offset specs
@@ -1167,7 +1179,7 @@ def _build_chain_offset_grammar(chain_separator: str, range_separator: str):
         + pp.ZeroOrMore(pp.Suppress(chain_separator) + range_offset_spec)
     )
 
-    return full_spec
+    return full_spec.streamline()
 
 
 def _convert_chain_offset_tokens(tokens) -> List[RangeOffset]:
@@ -1749,8 +1761,9 @@ def _parse_spec_with_grammar(
     return result
 
 
+@lru_cache(maxsize=_GRAMMAR_CACHE_SIZE)
 def _build_frame_loop_tag_grammar(use_escapes: bool) -> Union[ParserElement, StringEnd]:
-    # Build pyparsing grammar
+    # Build pyparsing grammar, grammars are cached by escape mode
     frame_tag_sep = pp.Literal(FRAME_TAG_SEPARATOR).suppress()
     frame_loop_sep = pp.Literal(FRAME_LOOP_SEPARATOR)
     tag_sep = pp.Literal(TAG_LIST_SEPARATOR).suppress()
@@ -1792,7 +1805,7 @@ def _build_frame_loop_tag_grammar(use_escapes: bool) -> Union[ParserElement, Str
         + pp.Optional(frame_tag_sep + pp.Optional(tag_list, default="*"))
         + pp.StringEnd()
     )
-    return grammar
+    return grammar.streamline()
 
 
 def parse_frame_loop_selector(pattern: str, separator: str = ".") -> Tuple[str, str]:
@@ -2436,7 +2449,7 @@ def print_output_or_exit_error(
         force: if True, overwrite existing files without error
         entry: if provided, print to stdout when output is routed elsewhere
     """
-    print_entry = False
+    output_entry = False
     if out is None or out == "@auto":
         if is_stdout_tty():
             if "-" in output_dict:
@@ -2444,14 +2457,14 @@ def print_output_or_exit_error(
         else:
             if "-" in output_dict:
                 print(output_dict["-"], end="", file=sys.stderr)
-                print_entry = True
+                output_entry = True
     elif out in ("-", "@out"):
         if "-" in output_dict:
             print(output_dict["-"], end="")
     elif out == "@err":
         if "-" in output_dict:
             print(output_dict["-"], end="", file=sys.stderr)
-        print_entry = True
+        output_entry = True
     else:
         if Path(out).exists() and not force:
             exit_error(f"file {out} already exists, run with --force to overwrite")
@@ -2460,10 +2473,10 @@ def print_output_or_exit_error(
                 f.write(output_dict[out])
             elif "-" in output_dict:
                 f.write(output_dict["-"])
-        print_entry = True
+        output_entry = True
 
-    if print_entry and entry is not None:
-        print(entry)
+    if output_entry and entry is not None:
+        print_entry(entry)
 
 
 def extract_initial_file_from_arguments(
@@ -0,0 +1,305 @@
+"""
+A manifest of the top level nef commands [name, module, help and help panel] so that at startup only the module
+that registers the command being run has to be imported. The manifest is built from the fully loaded app on the
+first run and cached in the user's cache directory, it is rebuilt whenever the version of NEF-Pipelines, the list
+of registered modules or the files that register the top level commands change.
+"""
+
+import inspect
+import json
+import os
+from dataclasses import asdict, dataclass
+from hashlib import sha1
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import platformdirs
+except ImportError:
+    platformdirs = None
+
+import typer
+from typer.main import get_command_name
+from typer.models import DefaultPlaceholder
+
+MANIFEST_FILE_NAME = "command_manifest.json"
+MANIFEST_FORMAT = 1
+
+# set this to any value to always load all the modules at startup
+LOAD_ALL_MODULES_ENV_VAR = "NEF_PIPELINES_LOAD_ALL_MODULES"
+
+# commands that introspect or run other commands and so need the complete app
+ALL_MODULES_COMMANDS = frozenset({"ai", "benchmark", "daemon", "help", "run"})
+
+_NEF_PIPELINES_ROOT = Path(__file__).parent.parent
+
+
+@dataclass(frozen=True)
+class CommandManifestEntry:
+    name: str
+    module: str
+    help: str = ""
+    rich_help_panel: Optional[str] = None
+    hidden: bool = False
+
+
+def _module_source_paths(module_name: str) -> List[Path]:
+    # the files that register top level commands, the module itself or the package's __init__
+    relative_path = Path(*module_name.split(".")[1:])
+    return [
+        _NEF_PIPELINES_ROOT / relative_path.with_suffix(".py"),
+        _NEF_PIPELINES_ROOT / relative_path / "__init__.py",
+    ]
+
+
+def command_manifest_key(modules: List[str]) -> str:
+    """
+    a key which changes when the commands registered by a set of modules may have changed
+
+    :param modules: the names of the modules that register commands
+    :return: the key as a hex digest
+    """
+
+    paths = [
+        _NEF_PIPELINES_ROOT / "VERSION",
+        _NEF_PIPELINES_ROOT / "module_registry.py",
+    ]
+    for module in modules:
+        paths.extend(_module_source_paths(module))
+
+    hasher = sha1(f"{MANIFEST_FORMAT}".encode())
+    for path in paths:
+        try:
+            stamp = path.stat().st_mtime_ns
+        except OSError:
+            stamp = None
+        hasher.update(f"\n{path}:{stamp}".encode())
+
+    return hasher.hexdigest()
+
+
+def _value(value):
+    # typer records options that weren't given as placeholders for their defaults
+    return value.value if isinstance(value, DefaultPlaceholder) else value
+
+
+def _module_for(module_name: str, modules: List[str]) -> Optional[str]:
+    candidates = [
+        module
+        for module in modules
+        if module_name == module or module_name.startswith(f"{module}.")
+    ]
+    return max(candidates, key=len) if candidates else None
+
+
+def _typer_app_module(app: typer.Typer, modules: List[str]) -> Optional[str]:
+    # a group is attributed to the module that registered any of its commands
+    for command_info in app.registered_commands:
+        if command_info.callback is not None:
+            module = _module_for(command_info.callback.__module__, modules)
+            if module:
+                return module
+
+    for group_info in app.registered_groups:
+        if group_info.typer_instance is not None:
+            module = _typer_app_module(group_info.typer_instance, modules)
+            if module:
+                return module
+
+    return None
+
+
+def build_command_manifest(
+    app: typer.Typer, modules: List[str]
+) -> List[CommandManifestEntry]:
+    """
+    build a manifest of the top level commands of a fully loaded nef app
+
+    :param app: the app with all its modules loaded
+    :param modules: the modules that registered the commands
+    :return: the manifest entries, commands that can't be attributed to a module are omitted
+    """
+
+    result = []
+    for command_info in app.registered_commands:
+        callback = command_info.callback
+        if callback is None:
+            continue
+
+        module = _module_for(callback.__module__, modules)
+        if module:
+            result.append(
+                CommandManifestEntry(
+                    name=command_info.name or get_command_name(callback.__name__),
+                    module=module,
+                    help=_value(command_info.help) or inspect.getdoc(callback) or "",
+                    rich_help_panel=_value(command_info.rich_help_panel),
+                    hidden=bool(_value(command_info.hidden)),
+                )
+            )
+
+    for group_info in app.registered_groups:
+        sub_app = group_info.typer_instance
+        name = _value(group_info.name)
+        if sub_app is None or not name:
+            continue
+
+        module = _typer_app_module(sub_app, modules)
+        if module:
+            result.append(
+                CommandManifestEntry(
+                    name=name,
+                    module=module,
+                    help=_value(group_info.help) or _value(sub_app.info.help) or "",
+                    rich_help_panel=_value(group_info.rich_help_panel),
+                    hidden=bool(_value(group_info.hidden)),
+                )
+            )
+
+    return result
+
+
+def command_manifest_path() -> Optional[Path]:
+    """
+    the path of the cached manifest
+
+    :return: the path or None if there is no cache directory
+    """
+    if platformdirs is None:
+        return None
+
+    return Path(platformdirs.user_cache_dir("nef-pipelines")) / MANIFEST_FILE_NAME
+
+
+def read_command_manifest(
+    modules: List[str], path: Optional[Path] = None
+) -> Optional[Dict[str, CommandManifestEntry]]:
+    """
+    read the cached manifest of top level commands
+
+    :param modules: the modules that register commands
+    :param path: the path to read the manifest from, the default is the user's cache directory
+    :return: the entries by command name or None if there is no up to date manifest
+    """
+
+    if os.environ.get(LOAD_ALL_MODULES_ENV_VAR):
+        return None
+
+    path = path if path else command_manifest_path()
+    if path is None:
+        return None
+
+    try:
+        with open(path) as file_h:
+            data = json.load(file_h)
+        if data.get("key") != command_manifest_key(modules):
+            return None
+        entries = [CommandManifestEntry(**entry) for entry in data["commands"]]
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return None
+
+    return {entry.name: entry for entry in entries}
+
+
+def write_command_manifest(
+    entries: List[CommandManifestEntry],
+    modules: List[str],
+    path: Optional[Path] = None,
+) -> bool:
+    """
+    cache a manifest of top level commands, failures to write are ignored as the manifest is only an optimisation
+
+    :param entries: the manifest entries
+    :param modules: the modules that registered the commands
+    :param path: the path to write the manifest to, the default is the user's cache directory
+    :return: True if the manifest was written
+    """
+
+    path = path if path else command_manifest_path()
+    if path is None:
+        return False
+
+    data = {
+        "key": command_manifest_key(modules),
+        "commands": [asdict(entry) for entry in entries],
+    }
+
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, "w") as file_h:
+            json.dump(data, file_h, indent=1)
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+        return False
+
+    return True
+
+
+def find_command_name(args: List[str]) -> Optional[str]:
+    """
+    find the name of the top level command in a nef command line, the top level options are all flags so this is
+    the first argument that isn't an option
+
+    :param args: the command line arguments without the program name
+    :return: the command name or None if no command is given
+    """
+
+    for arg in args:
+        if arg == "--":
+            return None
+        if not arg.startswith("-"):
+            return arg
+
+    return None
+
+
+def is_shell_completion_active() -> bool:
+    """True if the program is being run to complete a command line, this needs the complete app"""
+    return any(
+        name.startswith("_") and name.endswith("_COMPLETE") for name in os.environ
+    )
+
+
+def register_command_placeholders(
+    app: typer.Typer, entries: List[CommandManifestEntry]
+):
+    """
+    register placeholders for top level commands so the app's help can be displayed without loading their modules
+
+    :param app: the app to add placeholders to
+    :param entries: the manifest entries for the commands
+    """
+
+    registered = {_value(info.name) for info in app.registered_groups}
+    registered.update(
+        info.name or get_command_name(info.callback.__name__)
+        for info in app.registered_commands
+        if info.callback is not None
+    )
+
+    for entry in entries:
+        if entry.name in registered:
+            continue
+
+        app.command(
+            name=entry.name,
+            help=entry.help,
+            rich_help_panel=entry.rich_help_panel,
+            hidden=entry.hidden,
+        )(_make_placeholder(entry))
+
+
+def _make_placeholder(entry: CommandManifestEntry):
+    def placeholder():
+        from nef_pipelines.lib.util import exit_error  # lazy
+
+        exit_error(
+            f"the module {entry.module} for the command {entry.name} wasn't loaded"
+        )
+
+    return placeholder
@@ -0,0 +1,426 @@
+"""
+A warm worker for the nef command: the daemon keeps the nef app and its libraries loaded and runs command lines
+sent to it over a local Unix socket, a thin client in main forwards argv, stdin, stdout, stderr and the exit code
+so scripts keep using the nef command unchanged.
+
+Each request runs in a process forked from the daemon, in the client's working directory, with the client's
+environment and with the nef globals reset to the daemon's initial state, so requests run concurrently. The daemon
+runs as the user so commands can read and write the same files they could if run directly. The client's stdin is
+only sent to the daemon if the command reads it.
+
+Note: this module is imported by the client before anything else so it must only import the standard library at
+      module level
+"""
+
+import getpass
+import io
+import json
+import os
+import socket
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO
+
+# set to 1 [use the default socket] or the path of a socket to send nef commands to a running daemon
+DAEMON_ENV_VAR = "NEF_PIPELINES_DAEMON"
+
+SOCKET_FILE_NAME = "daemon.sock"
+
+DAEMON_COMMAND = "daemon"
+DAEMON_UNAVAILABLE_COMMANDS = ("ai", DAEMON_COMMAND)
+
+_HEADER = struct.Struct("!I")
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+
+REQUEST_RUN = "run"
+REQUEST_PING = "ping"
+REQUEST_STOP = "stop"
+REQUEST_STDIN = "stdin"
+
+# how long the daemon waits for a client to send its request after connecting in seconds
+_REQUEST_TIMEOUT = 10.0
+
+
+class DaemonUnavailableException(Exception):
+    """The daemon couldn't be reached or the request can't be sent to it."""
+
+
+def default_socket_path() -> Path:
+    """
+    the default path of the daemon's socket, in a directory only the current user can access
+
+    :return: the path
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_dir:
+        runtime_dir = tempfile.gettempdir()
+
+    user = os.getuid() if hasattr(os, "getuid") else getpass.getuser()
+    return Path(runtime_dir) / f"nef-pipelines-{user}" / SOCKET_FILE_NAME
+
+
+def daemon_socket_path_from_env() -> Optional[Path]:
+    """
+    get the socket the client should use from the NEF_PIPELINES_DAEMON environment variable
+
+    :return: the socket path or None if the daemon shouldn't be used
+    """
+    value = os.environ.get(DAEMON_ENV_VAR, "").strip()
+
+    if not value or value.lower() in {"0", "false", "no", "off"}:
+        return None
+
+    return default_socket_path() if value.lower() in _TRUE_VALUES else Path(value)
+
+
+def send_message(connection: socket.socket, message: Dict[str, Any]):
+    data = json.dumps(message).encode("utf-8")
+    connection.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _receive_exactly(connection: socket.socket, length: int) -> bytes:
+    chunks = []
+    while length:
+        chunk = connection.recv(min(length, 1 << 20))
+        if not chunk:
+            raise ConnectionError(
+                "the connection closed before the message was complete"
+            )
+        chunks.append(chunk)
+        length -= len(chunk)
+    return b"".join(chunks)
+
+
+def receive_message(connection: socket.socket) -> Dict[str, Any]:
+    (length,) = _HEADER.unpack(_receive_exactly(connection, _HEADER.size))
+    return json.loads(_receive_exactly(connection, length).decode("utf-8"))
+
+
+def _connect(socket_path: Path, timeout: Optional[float]) -> socket.socket:
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.settimeout(timeout)
+        connection.connect(str(socket_path))
+        connection.settimeout(None)
+    except OSError:
+        connection.close()
+        raise
+
+    return connection
+
+
+def request_daemon(
+    socket_path: Path, message: Dict[str, Any], timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    send a request to the daemon and wait for its reply
+
+    :param socket_path: the daemon's socket
+    :param message: the request
+    :param timeout: how long to wait to connect in seconds, None waits indefinitely
+    :return: the daemon's reply
+    """
+    try:
+        with _connect(socket_path, timeout) as connection:
+            send_message(connection, message)
+            return receive_message(connection)
+    except (OSError, ValueError, struct.error) as e:
+        raise DaemonUnavailableException(
+            f"couldn't communicate with the daemon at {socket_path} because: {e}"
+        ) from e
+
+
+def _read_stdin(stdin: TextIO) -> Optional[str]:
+    if stdin.isatty():
+        return None
+
+    # bytes that aren't utf-8 are carried through json as lone surrogates and restored by the daemon
+    return stdin.buffer.read().decode("utf-8", "surrogateescape")
+
+
+def run_in_daemon(socket_path: Path, args: List[str]) -> int:
+    """
+    run a nef command line in the daemon, stdin is copied to the daemon if the command asks for it and its stdout
+    and stderr are copied back
+
+    :param socket_path: the daemon's socket
+    :param args: the command line without the program name
+    :return: the command's exit code
+    """
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise DaemonUnavailableException("unix sockets are not available")
+
+    # the stream is kept as commands run in this process [e.g. in tests] replace sys.stdin
+    stdin = sys.stdin
+
+    request = {
+        "request": REQUEST_RUN,
+        "args": list(args),
+        "stdin_isatty": stdin.isatty(),
+        "cwd": os.getcwd(),
+        "env": dict(os.environ),
+    }
+
+    try:
+        with _connect(socket_path, None) as connection:
+            send_message(connection, request)
+
+            reply = receive_message(connection)
+            while reply.get("request") == REQUEST_STDIN:
+                send_message(connection, {"stdin": _read_stdin(stdin)})
+                reply = receive_message(connection)
+    except (OSError, ValueError, struct.error) as e:
+        raise DaemonUnavailableException(
+            f"couldn't communicate with the daemon at {socket_path} because: {e}"
+        ) from e
+
+    sys.stdout.write(reply.get("stdout", ""))
+    sys.stdout.flush()
+    sys.stderr.write(reply.get("stderr", ""))
+    sys.stderr.flush()
+
+    return int(reply.get("exit_code", 1))
+
+
+def run_command_line_in_daemon_if_configured(args: List[str]) -> Optional[int]:
+    """
+    if NEF_PIPELINES_DAEMON is set and a daemon is listening run the command line in it
+
+    :param args: the command line without the program name
+    :return: the exit code or None if the command line should be run in this process
+    """
+
+    socket_path = daemon_socket_path_from_env()
+
+    if socket_path is None or not socket_path.exists():
+        return None
+
+    if any(arg in DAEMON_UNAVAILABLE_COMMANDS for arg in args[:1]):
+        return None
+
+    try:
+        return run_in_daemon(socket_path, args)
+    except DaemonUnavailableException:
+        return None
+
+
+def _prepare_socket_path(socket_path: Path):
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.parent.name.startswith("nef-pipelines-"):
+        os.chmod(socket_path.parent, 0o700)
+
+    if socket_path.exists():
+        try:
+            request_daemon(socket_path, {"request": REQUEST_PING}, timeout=1.0)
+        except DaemonUnavailableException:
+            socket_path.unlink()
+        else:
+            raise FileExistsError(f"a daemon is already listening on {socket_path}")
+
+
+class _IsolatedRequest:
+    # the per request state the daemon changes: the working directory, environment, argv and nef globals
+    def __init__(
+        self, cwd: str, env: Dict[str, str], argv: List[str], globals_: Dict[str, Any]
+    ):
+        self._cwd = cwd
+        self._env = env
+        self._argv = argv
+        self._globals = globals_
+
+    def __enter__(self):
+        from nef_pipelines.lib import globals_lib  # lazy
+
+        self._saved = (os.getcwd(), dict(os.environ), sys.argv)
+
+        os.chdir(self._cwd)
+        os.environ.clear()
+        os.environ.update(self._env)
+        sys.argv = self._argv
+
+        globals_lib.replace_globals(self._globals)
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        from nef_pipelines.lib import globals_lib  # lazy
+
+        cwd, env, argv = self._saved
+
+        globals_lib.replace_globals(self._globals)
+
+        sys.argv = argv
+        os.environ.clear()
+        os.environ.update(env)
+        os.chdir(cwd)
+
+        return False
+
+
+class _ClientStdin(io.RawIOBase):
+    # the client's stdin, it is only requested from the client if the command reads it
+    def __init__(self, connection: socket.socket, isatty: bool):
+        super().__init__()
+        self._connection = connection
+        self._isatty = isatty
+        self._data: Optional[bytes] = None
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return self._isatty
+
+    def readinto(self, buffer) -> int:
+        if len(buffer) == 0:
+            return 0
+
+        if self._data is None:
+            send_message(self._connection, {"request": REQUEST_STDIN})
+            text = receive_message(self._connection).get("stdin") or ""
+            self._data = text.encode("utf-8", "surrogateescape")
+
+        chunk = self._data[self._position : self._position + len(buffer)]
+        buffer[: len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+
+def handle_run_request(
+    message: Dict[str, Any],
+    initial_globals: Dict[str, Any],
+    connection: Optional[socket.socket] = None,
+) -> Dict[str, Any]:
+    """
+    run a command line sent by a client in the current process, commands are run as they would be by the client
+    without a sandbox as the daemon runs as the same user
+
+    :param message: the request from the client, stdin is either included as text or requested from the client
+                    over the connection when the command reads it
+    :param initial_globals: the nef globals each request starts with
+    :param connection: the connection to the client
+    :return: the reply with stdout, stderr and the exit code
+    """
+
+    from nef_pipelines.lib.pipeline_lib import invoke_step  # lazy
+
+    args = [str(arg) for arg in message.get("args", [])]
+    cwd = message.get("cwd") or os.getcwd()
+    env = message.get("env") or dict(os.environ)
+
+    if args[:1] and args[0] in DAEMON_UNAVAILABLE_COMMANDS:
+        return {
+            "stdout": "",
+            "stderr": f"the command {args[0]} can't be run by the daemon\n",
+            "exit_code": 1,
+        }
+
+    if not Path(cwd).is_dir():
+        return {
+            "stdout": "",
+            "stderr": f"the working directory {cwd} doesn't exist\n",
+            "exit_code": 1,
+        }
+
+    if message.get("stdin") is not None or connection is None:
+        nef_input = message.get("stdin") or ""
+    else:
+        nef_input = io.BufferedReader(
+            _ClientStdin(connection, bool(message.get("stdin_isatty", False)))
+        )
+
+    with _IsolatedRequest(cwd, env, ["nef", *args], initial_globals):
+        stdout, stderr, exit_code = invoke_step(args, nef_input)
+
+    return {"stdout": stdout, "stderr": stderr, "exit_code": exit_code}
+
+
+def _receive_request(connection: socket.socket) -> Optional[Dict[str, Any]]:
+    # the first message from a client is sent as soon as it connects so a client that doesn't send one is dropped
+    try:
+        connection.settimeout(_REQUEST_TIMEOUT)
+        message = receive_message(connection)
+        connection.settimeout(None)
+    except (OSError, ValueError, struct.error):
+        return None
+
+    return message
+
+
+def serve_daemon(socket_path: Path):
+    """
+    run the daemon on a unix socket until it is asked to stop, each command line is run in its own forked process so
+    commands run concurrently [e.g. the steps of a shell pipeline] and each has its own working directory,
+    environment and nef globals
+
+    :param socket_path: the socket to listen on
+    """
+
+    import socketserver  # lazy
+
+    from nef_pipelines.lib.globals_lib import debug_get_globals  # lazy
+
+    _prepare_socket_path(socket_path)
+
+    initial_globals = debug_get_globals()
+
+    class _Handler(socketserver.BaseRequestHandler):
+        # runs in the forked process for a run request
+        def handle(self):
+            reply = handle_run_request(
+                self.server.run_message, initial_globals, self.request
+            )
+
+            try:
+                send_message(self.request, reply)
+            except OSError:
+                pass
+
+    class _Server(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+        stop_requested = False
+        timeout = 0.5
+        run_message: Dict[str, Any] = {}
+
+        def process_request(self, request, client_address):
+            # pings and stops are answered by the daemon itself, run requests are forked
+            message = _receive_request(request)
+
+            if message is not None and message.get("request") == REQUEST_RUN:
+                self.run_message = message
+                super().process_request(request, client_address)
+                return
+
+            if message is not None:
+                if message.get("request") == REQUEST_STOP:
+                    reply = {"stopped": True}
+                    self.stop_requested = True
+                else:
+                    reply = {"pid": os.getpid()}
+
+                try:
+                    send_message(request, reply)
+                except OSError:
+                    pass
+
+            self.shutdown_request(request)
+
+    old_umask = os.umask(0o177)
+    try:
+        server = _Server(str(socket_path), _Handler)
+    finally:
+        os.umask(old_umask)
+
+    try:
+        while not server.stop_requested:
+            server.handle_request()
+            server.collect_children()
+    finally:
+        server.server_close()
+        try:
+            socket_path.unlink()
+        except OSError:
+            pass
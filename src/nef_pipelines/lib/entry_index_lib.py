@@ -0,0 +1,407 @@
+"""
+    A table of contents for NEF entries: the name, category and tag names of each saveframe and the category, tag
+    names and row count of each of its loops, along with the byte offset and length of each saveframe in its file.
+
+    Indices are built by a scan of the STAR tokens in the text which is much cheaper than parsing it, and can be
+    stored next to a NEF file as a .nefidx sidecar [see nef save --index]. Structural questions [what frames, loops
+    and tags are there and how big are they] can then be answered without parsing anything. A sidecar records the
+    size and modification time of the file it indexes and is ignored if the file has changed since it was written.
+"""
+
+import json
+import os
+import re
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from pynmrstar import Entry, Saveframe
+
+from nef_pipelines.lib.lazy_entry_lib import LazySaveframe, _index_frames
+from nef_pipelines.lib.star_reader_lib import (
+    _SPECIAL_CHARACTERS,
+    LOOP,
+    SAVE,
+    STOP,
+    find_stop,
+    next_token,
+)
+
+NEF_INDEX_SUFFIX = ".nefidx"
+NEF_INDEX_FORMAT = 1
+
+_ENCODING = "utf-8"
+_ENCODING_ERRORS = "surrogateescape"
+
+# anything in a loop's values that means they can't be counted by splitting on white space, the special
+# characters [see star_reader_lib] are a quick check for whether the values need to be searched at all
+_NOT_SIMPLE_VALUE = re.compile(r"""(?<!\S)['"#;_]|(?i:loop_|save_|stop_)""")
+
+
+@dataclass(frozen=True)
+class LoopIndex:
+    """the category [with its leading underscore, as pynmrstar reports it], tag names and row count of a loop"""
+
+    category: str
+    tags: Tuple[str, ...]
+    row_count: int
+
+
+@dataclass(frozen=True)
+class FrameIndex:
+    """
+    the name, category, frame tag names and loops of a saveframe, the offset and length are the position of the
+    frame's text in bytes in the file it was read from and are None if the frame wasn't indexed from a file
+    """
+
+    name: str
+    category: str
+    tags: Tuple[str, ...]
+    loops: Tuple[LoopIndex, ...]
+    offset: Optional[int] = None
+    length: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class EntryIndex:
+    """
+    the entry id and saveframes of an entry, source_size and source_mtime_ns are the size and modification time
+    of the file the index was built from
+    """
+
+    entry_id: str
+    frames: Tuple[FrameIndex, ...]
+    source_size: Optional[int] = None
+    source_mtime_ns: Optional[int] = None
+
+    def frame(self, name: str) -> Optional[FrameIndex]:
+        """the index of the frame with the given name or None if there isn't one"""
+        for frame in self.frames:
+            if frame.name == name:
+                return frame
+        return None
+
+
+def _is_structural(token: str) -> bool:
+    # tags and keywords can't be values
+    return token[0] == "_" or token.lower() in (LOOP, STOP, SAVE)
+
+
+def _split_tag(token: str) -> Optional[Tuple[str, str]]:
+    category, dot, tag = token.partition(".")
+    return (category, tag) if dot and tag else None
+
+
+def _count_simple_values(text: str, start: int) -> Tuple[Optional[int], int]:
+    # loop values that are all bare words can be counted by splitting on white space rather than scanning tokens,
+    # without an underscore there can't be a tag or keyword amongst the values
+    stop = find_stop(text, start)
+    if stop == -1:
+        return None, start
+
+    values = text[start:stop]
+    if any(character in values for character in _SPECIAL_CHARACTERS):
+        if _NOT_SIMPLE_VALUE.search(values):
+            return None, start
+
+    return len(values.split()), stop + len(STOP)
+
+
+def _scan_loop(text: str, pos: int) -> Tuple[Optional[LoopIndex], int]:
+    category = None
+    tags = []
+
+    token, start, pos = next_token(text, pos)
+    while token is not None and token[0] == "_":
+        category_and_tag = _split_tag(token)
+        if category_and_tag is None:
+            return None, pos
+        loop_category, tag = category_and_tag
+        if category is not None and loop_category != category:
+            return None, pos
+        category = loop_category
+        tags.append(tag)
+
+        token, start, pos = next_token(text, pos)
+
+    if not tags:
+        return None, pos
+
+    value_count, simple_end = _count_simple_values(text, start)
+    if value_count is not None:
+        token, pos = STOP, simple_end
+    else:
+        value_count = 0
+        while token is not None and not _is_structural(token):
+            value_count += 1
+            token, _, pos = next_token(text, pos)
+
+    if token is None or token.lower() != STOP or value_count % len(tags) != 0:
+        return None, pos
+
+    return LoopIndex(category, tuple(tags), value_count // len(tags)), pos
+
+
+def _scan_frame(
+    text: str,
+    name: str,
+    category: str,
+    offset: Optional[int] = None,
+    length: Optional[int] = None,
+) -> Optional[FrameIndex]:
+    """
+    index the text of a saveframe by scanning its tokens
+
+    :param text: the text of the saveframe from save_<name> to save_
+    :param name: the name of the frame
+    :param category: the category of the frame
+    :param offset: the offset of the frame in bytes in its file
+    :param length: the length of the frame in bytes in its file
+    :return: the index of the frame or None if the text isn't a saveframe the scan understands
+    """
+
+    first, _, pos = next_token(text, 0)
+    if first is None or not first.lower().startswith(SAVE) or first == SAVE:
+        return None
+
+    frame_tags = []
+    loops = []
+    while True:
+        token, _, pos = next_token(text, pos)
+        if token is None:
+            return None
+
+        lower = token.lower()
+
+        if token[0] == "_":
+            category_and_tag = _split_tag(token)
+            value, _, pos = next_token(text, pos)
+            if category_and_tag is None or value is None or _is_structural(value):
+                return None
+            frame_tags.append(category_and_tag[1])
+
+        elif lower == LOOP:
+            loop, pos = _scan_loop(text, pos)
+            if loop is None:
+                return None
+            loops.append(loop)
+
+        elif lower == SAVE:
+            if next_token(text, pos)[0] is not None:
+                return None
+            return FrameIndex(
+                name, category, tuple(frame_tags), tuple(loops), offset, length
+            )
+
+        else:
+            return None
+
+
+def _index_parsed_frame(
+    frame: Saveframe, offset: Optional[int] = None, length: Optional[int] = None
+) -> FrameIndex:
+    loops = tuple(
+        LoopIndex(loop.category, tuple(loop.tags), len(loop.data))
+        for loop in frame.loops
+    )
+    tags = tuple(tag for tag, _ in frame.tag_iterator())
+
+    return FrameIndex(frame.name, frame.category, tags, loops, offset, length)
+
+
+def index_frame(frame: Saveframe) -> FrameIndex:
+    """
+    index a saveframe, a lazily read frame which hasn't been modified is indexed from its text [or a sidecar, see
+    attach_entry_index] without parsing it, other frames are indexed from their tags and loops
+
+    :param frame: the frame to index
+    :return: the index of the frame
+    """
+
+    if isinstance(frame, LazySaveframe) and not frame.dirty:
+        # False records a frame the scan doesn't understand
+        index = frame.__dict__.get("_lazy_index")
+        if index is None:
+            index = _scan_frame(
+                frame.__dict__["_lazy_text"], frame.name, frame.category
+            )
+            frame.__dict__["_lazy_index"] = False if index is None else index
+        if index:
+            return index
+
+    return _index_parsed_frame(frame)
+
+
+def _byte_offsets(text: str, offsets: List[int]) -> List[int]:
+    # convert increasing character offsets into byte offsets, encoding only the text between them
+    if text.isascii():
+        return offsets
+
+    result = []
+    char_offset = 0
+    byte_offset = 0
+    for offset in offsets:
+        byte_offset += len(text[char_offset:offset].encode(_ENCODING, _ENCODING_ERRORS))
+        char_offset = offset
+        result.append(byte_offset)
+
+    return result
+
+
+def index_entry_text(
+    text: str,
+    source_size: Optional[int] = None,
+    source_mtime_ns: Optional[int] = None,
+) -> Optional[EntryIndex]:
+    """
+    index the text of an entry, frames the token scan doesn't understand are parsed to index them
+
+    can throw a ParsingError from PyNMRStar
+
+    :param text: the text of the entry, decoded from utf-8 with surrogateescape so offsets map back to bytes
+    :param source_size: the size of the file the text was read from
+    :param source_mtime_ns: the modification time of the file the text was read from
+    :return: the index of the entry or None if the text can't be indexed by a scan [e.g. it contains text outside
+             of saveframes or more than one data block]
+    """
+
+    frames = _index_frames(text)
+    if frames is None:
+        return None
+    entry_id, frames = frames
+
+    # the frame texts returned by _index_frames have a trailing new line added
+    char_offsets = []
+    for _, _, frame_text, start in frames:
+        char_offsets.extend([start, start + len(frame_text) - 1])
+    byte_offsets = _byte_offsets(text, char_offsets)
+
+    frame_indices = []
+    for i, (name, category, frame_text, _) in enumerate(frames):
+        start, end = byte_offsets[2 * i], byte_offsets[2 * i + 1]
+
+        frame_index = _scan_frame(frame_text, name, category, start, end - start)
+        if frame_index is None:
+            frame = Saveframe.from_string(frame_text)
+            frame_index = _index_parsed_frame(frame, start, end - start)
+
+        frame_indices.append(frame_index)
+
+    return EntryIndex(entry_id, tuple(frame_indices), source_size, source_mtime_ns)
+
+
+def index_path(nef_path: Path) -> Path:
+    """the path of the .nefidx sidecar for a NEF file [e.g. test.nef -> test.nef.nefidx]"""
+    nef_path = Path(nef_path)
+    return nef_path.with_name(f"{nef_path.name}{NEF_INDEX_SUFFIX}")
+
+
+def index_file(nef_path: Path) -> Optional[EntryIndex]:
+    """
+    index a NEF file by scanning its text
+
+    can throw an IOError or a ParsingError from PyNMRStar
+
+    :param nef_path: the NEF file
+    :return: the index of the entry or None if the file can't be indexed by a scan
+    """
+
+    nef_path = Path(nef_path)
+    stat = nef_path.stat()
+    text = nef_path.read_bytes().decode(_ENCODING, _ENCODING_ERRORS)
+
+    return index_entry_text(text, stat.st_size, stat.st_mtime_ns)
+
+
+def write_entry_index(nef_path: Path) -> Optional[EntryIndex]:
+    """
+    index a NEF file and write the index as a .nefidx sidecar next to it
+
+    can throw an IOError or a ParsingError from PyNMRStar
+
+    :param nef_path: the NEF file
+    :return: the index that was written or None if the file can't be indexed by a scan, in which case any
+             existing sidecar is removed
+    """
+
+    sidecar = index_path(nef_path)
+
+    index = index_file(nef_path)
+    if index is None:
+        sidecar.unlink(missing_ok=True)
+        return None
+
+    content = {"format": NEF_INDEX_FORMAT, **asdict(index)}
+
+    temp_path = sidecar.with_name(f".{sidecar.name}.{os.getpid()}.tmp")
+    temp_path.write_text(json.dumps(content))
+    os.replace(temp_path, sidecar)
+
+    return index
+
+
+def _entry_index_from_json(content: dict) -> EntryIndex:
+    frames = tuple(
+        FrameIndex(
+            frame["name"],
+            frame["category"],
+            tuple(frame["tags"]),
+            tuple(
+                LoopIndex(loop["category"], tuple(loop["tags"]), loop["row_count"])
+                for loop in frame["loops"]
+            ),
+            frame["offset"],
+            frame["length"],
+        )
+        for frame in content["frames"]
+    )
+
+    return EntryIndex(
+        content["entry_id"],
+        frames,
+        content["source_size"],
+        content["source_mtime_ns"],
+    )
+
+
+def read_entry_index(nef_path: Path) -> Optional[EntryIndex]:
+    """
+    read the .nefidx sidecar of a NEF file
+
+    :param nef_path: the NEF file
+    :return: the index or None if there is no sidecar, it can't be read or the NEF file has changed since it was
+             written
+    """
+
+    nef_path = Path(nef_path)
+    try:
+        stat = nef_path.stat()
+        with open(index_path(nef_path)) as file_h:
+            content = json.load(file_h)
+
+        if content.get("format") != NEF_INDEX_FORMAT:
+            return None
+
+        index = _entry_index_from_json(content)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    if (index.source_size, index.source_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+        return None
+
+    return index
+
+
+def attach_entry_index(entry: Entry, index: EntryIndex):
+    """
+    use an index for the lazily read, unmodified frames of an entry [see index_frame], frames are matched by name
+
+    :param entry: the entry
+    :param index: an index of the text the entry was read from
+    """
+
+    for frame in entry.frame_list:
+        if isinstance(frame, LazySaveframe) and not frame.dirty:
+            frame_index = index.frame(frame.name)
+            if frame_index is not None and frame_index.category == frame.category:
+                frame.__dict__["_lazy_index"] = frame_index
@@ -23,3 +23,9 @@ def debug_clear_globals():
 
 def debug_get_globals():
     return copy.deepcopy(_globals)
+
+
+def replace_globals(values):
+    """replace all the globals with copies of values, used to isolate runs of commands in the same process"""
+    _globals.clear()
+    _globals.update(copy.deepcopy(values))
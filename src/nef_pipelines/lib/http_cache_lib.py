@@ -0,0 +1,522 @@
+"""
+An on-disk cache for http responses fetched from web services [e.g. the bmrb, shiftx2, uniprot and alphafold] so
+repeated runs don't re-fetch the same data and can be run without a network.
+
+Requests are keyed by a hash of their method, url, form data and uploaded file contents and response bodies are
+stored once by a hash of their content. Entries expire after a time to live and the least recently used entries are
+evicted when the bodies in the cache exceed a maximum size, the cache is checked when a process first writes to it
+and then after each tenth of the maximum size is written.
+
+The cache can be used in several modes [see HttpCacheMode] which are set from the environment variable
+NEF_PIPELINES_HTTP_CACHE or by commands [e.g. with an --offline option], record and replay are intended for testing
+against a stand-in server, a run in record mode against the stand-in creates a directory of responses which a run in
+replay mode serves without any network access.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import auto
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from strenum import LowercaseStrEnum
+
+try:
+    import platformdirs
+except ImportError:
+    platformdirs = None
+
+from nef_pipelines.lib.globals_lib import get_global, set_global
+
+HTTP_CACHE_ENV_VAR = "NEF_PIPELINES_HTTP_CACHE"
+HTTP_CACHE_DIR_ENV_VAR = "NEF_PIPELINES_HTTP_CACHE_DIR"
+HTTP_CACHE_TTL_ENV_VAR = "NEF_PIPELINES_HTTP_CACHE_TTL"
+HTTP_CACHE_MAX_SIZE_ENV_VAR = "NEF_PIPELINES_HTTP_CACHE_MAX_SIZE"
+
+HTTP_CACHE_DIR_NAME = "http"
+HTTP_CACHE_FORMAT = 1
+
+DEFAULT_TTL = 30 * 24 * 60 * 60
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+_HTTP_CACHE_MODE_GLOBAL = "http_cache_mode"
+
+_ENTRIES_DIR = "entries"
+_BODIES_DIR = "bodies"
+
+# writes and prunes are serialised within a process as requests may be made from several threads [e.g. pipe_many]
+_cache_lock = threading.RLock()
+
+# pruning reads every entry in the cache so a cache directory is pruned once by each process when it first writes a
+# response and then again only when the bodies it has written since exceed this fraction of the maximum size
+_PRUNE_FRACTION = 0.1
+
+# the bytes written to each cache directory by this process since it was last pruned
+_written_since_prune: Dict[Path, int] = {}
+
+OFFLINE_HELP = """
+    don't access the network, web requests are only answered from the cache of previous responses
+    """
+
+
+class HttpCacheMode(LowercaseStrEnum):
+    # use fresh cached responses, fetch and cache successful responses otherwise
+    ON = auto()
+    # don't use the cache
+    OFF = auto()
+    # only use cached responses of any age
+    OFFLINE = auto()
+    # always fetch and cache every response whatever its status
+    RECORD = auto()
+    # only use cached responses of any age and never change the cache
+    REPLAY = auto()
+
+
+class HttpCacheMissException(Exception):
+    """A request couldn't be answered from the cache and the network can't be used."""
+
+
+@dataclass
+class CachedResponse:
+    """A response served from the cache with the parts of the interface of a requests Response that are used."""
+
+    url: str
+    status_code: int
+    content: bytes
+    encoding: Optional[str] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    from_cache: bool = True
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if not self.ok:
+            from requests.exceptions import HTTPError  # deferred
+
+            raise HTTPError(f"{self.status_code} error for url: {self.url}")
+
+
+def default_http_cache_dir() -> Optional[Path]:
+    """
+    the default directory for the http cache
+
+    :return: the path or None if there is no cache directory
+    """
+    if platformdirs is None:
+        return None
+
+    return Path(platformdirs.user_cache_dir("nef-pipelines")) / HTTP_CACHE_DIR_NAME
+
+
+def set_http_cache_mode(mode: Optional[HttpCacheMode]):
+    """
+    set the cache mode for this run overriding the NEF_PIPELINES_HTTP_CACHE environment variable
+
+    :param mode: the mode or None to use the environment variable
+    """
+    set_global(_HTTP_CACHE_MODE_GLOBAL, mode)
+
+
+def http_cache_mode() -> HttpCacheMode:
+    """
+    the cache mode for this run
+
+    :return: the mode set by set_http_cache_mode or the NEF_PIPELINES_HTTP_CACHE environment variable, ON by default
+    """
+    mode = get_global(_HTTP_CACHE_MODE_GLOBAL, None)
+    if mode is None:
+        value = os.environ.get(HTTP_CACHE_ENV_VAR, "").strip().lower()
+        mode = HttpCacheMode(value) if value in list(HttpCacheMode) else None
+
+    return HttpCacheMode(mode) if mode else HttpCacheMode.ON
+
+
+def _float_from_env(name: str, default: float) -> float:
+    try:
+        return float(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+class HttpCache:
+    def __init__(
+        self,
+        directory: Optional[Path],
+        mode: HttpCacheMode = HttpCacheMode.ON,
+        ttl: float = DEFAULT_TTL,
+        max_size: int = DEFAULT_MAX_SIZE,
+    ):
+        """
+        :param directory: the directory to store responses in, if it is None responses are never cached
+        :param mode: how the cache is used
+        :param ttl: the age in seconds after which a cached response is re-fetched in ON mode
+        :param max_size: the largest total size of the response bodies in bytes before entries are evicted
+        """
+        self.directory = Path(directory) if directory is not None else None
+        self.mode = HttpCacheMode(mode)
+        self.ttl = ttl
+        self.max_size = max_size
+
+    def get(self, url: str, **kwargs):
+        """
+        a cached equivalent of requests.get
+
+        :param url: the url to get
+        :param kwargs: other arguments to requests.get [only params affects the key used to cache the response]
+        :return: a requests Response or a CachedResponse
+        """
+        return self.request("GET", url, **kwargs)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        data: Optional[Dict[str, Any]] = None,
+        files: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        cache_if: Optional[Callable[[Any], bool]] = None,
+        **kwargs,
+    ):
+        """
+        a cached equivalent of requests.request
+
+        :param method: the http method
+        :param url: the url
+        :param data: form data
+        :param files: files to upload as a dictionary of field names to open files, bytes or tuples of a file name
+                      and an open file or bytes
+        :param params: query parameters
+        :param cache_if: in ON mode only responses that this accepts are cached, the default is successful responses
+        :param kwargs: other arguments to requests.request [e.g. timeout and verify]
+        :return: a requests Response or a CachedResponse
+        :raises HttpCacheMissException: if the response isn't cached in OFFLINE and REPLAY modes
+        """
+
+        files = _read_files(files) if files else None
+
+        if self.mode == HttpCacheMode.OFF or self.directory is None:
+            if self.mode in (HttpCacheMode.OFFLINE, HttpCacheMode.REPLAY):
+                raise HttpCacheMissException(
+                    f"there is no http cache directory to answer {method} {url} from without the network"
+                )
+            return self._fetch(method, url, data, files, params, kwargs)
+
+        key = request_key(method, url, data, files, params)
+
+        if self.mode in (HttpCacheMode.OFFLINE, HttpCacheMode.REPLAY):
+            response = self._read(key, touch=self.mode == HttpCacheMode.OFFLINE)
+            if response is None:
+                msg = f"""\
+                    there is no cached response for {method} {url} and the network can't be used
+                    [http cache mode {self.mode}, cache {self.directory}]
+                """
+                raise HttpCacheMissException(msg)
+            return response
+
+        stale_response = None
+        if self.mode == HttpCacheMode.ON:
+            response, age = self._read_with_age(key)
+            if response is not None and age <= self.ttl:
+                return response
+            stale_response = response
+
+        try:
+            response = self._fetch(method, url, data, files, params, kwargs)
+        except Exception as e:
+            from requests.exceptions import ConnectionError, Timeout  # deferred
+
+            # a stale response is better than none when the server can't be reached
+            if stale_response is not None and isinstance(e, (ConnectionError, Timeout)):
+                return stale_response
+            raise
+
+        is_cacheable = cache_if(response) if cache_if else response.ok
+        if self.mode == HttpCacheMode.RECORD or is_cacheable:
+            self._write(key, method, response)
+            if self.mode == HttpCacheMode.ON:
+                self._prune_if_due(len(response.content))
+
+        return response
+
+    @staticmethod
+    def _fetch(method, url, data, files, params, kwargs):
+        response = _session().request(
+            method, url, data=data, files=files, params=params, **kwargs
+        )
+        response.from_cache = False
+
+        return response
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / _ENTRIES_DIR / key[:2] / f"{key}.json"
+
+    def _body_path(self, digest: str) -> Path:
+        return self.directory / _BODIES_DIR / digest[:2] / digest
+
+    def _read_with_age(self, key: str, touch: bool = True):
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path) as file_h:
+                entry = json.load(file_h)
+            if entry.get("format") != HTTP_CACHE_FORMAT:
+                return None, None
+            content = self._body_path(entry["body"]).read_bytes()
+            if touch:
+                # the modification time of an entry records when it was last used for evicting entries
+                os.utime(entry_path)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None, None
+
+        response = CachedResponse(
+            url=entry["url"],
+            status_code=entry["status_code"],
+            content=content,
+            encoding=entry.get("encoding"),
+            headers=entry.get("headers", {}),
+        )
+
+        return response, time.time() - entry["stored"]
+
+    def _read(self, key: str, touch: bool = True) -> Optional[CachedResponse]:
+        return self._read_with_age(key, touch)[0]
+
+    def _write(self, key: str, method: str, response):
+        content = response.content
+        digest = sha256(content).hexdigest()
+
+        entry = {
+            "format": HTTP_CACHE_FORMAT,
+            "method": method,
+            "url": response.url,
+            "status_code": response.status_code,
+            "encoding": response.encoding or response.apparent_encoding,
+            "headers": {
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() == "content-type"
+            },
+            "stored": time.time(),
+            "body": digest,
+        }
+
+        try:
+            with _cache_lock:
+                body_path = self._body_path(digest)
+                if not body_path.exists():
+                    _write_atomically(body_path, content)
+                _write_atomically(self._entry_path(key), json.dumps(entry).encode())
+        except OSError:
+            # the cache is an optimisation, failing to write to it isn't an error
+            pass
+
+    def _prune_if_due(self, size: int):
+        with _cache_lock:
+            written = _written_since_prune.get(self.directory)
+            if (
+                written is not None
+                and written + size <= self.max_size * _PRUNE_FRACTION
+            ):
+                _written_since_prune[self.directory] = written + size
+                return
+
+            self.prune()
+
+    def prune(self):
+        """
+        remove entries that haven't been used for longer than the time to live, then the least recently used
+        entries while the bodies they use are larger than max_size, and then any bodies no longer used by an entry
+        """
+
+        if self.directory is None:
+            return
+
+        with _cache_lock:
+            self._prune()
+            _written_since_prune[self.directory] = 0
+
+    def _prune(self):
+        now = time.time()
+        entries = []
+        for entry_path in (self.directory / _ENTRIES_DIR).glob("*/*.json"):
+            try:
+                with open(entry_path) as file_h:
+                    body = json.load(file_h)["body"]
+                stat = entry_path.stat()
+            except (OSError, ValueError, KeyError, TypeError):
+                _unlink_quietly(entry_path)
+                continue
+
+            if now - stat.st_mtime > self.ttl:
+                _unlink_quietly(entry_path)
+            else:
+                entries.append((stat.st_mtime, entry_path, body))
+
+        body_sizes = {}
+        for body_path in (self.directory / _BODIES_DIR).glob("*/*"):
+            # temporary files are still being written
+            if body_path.name.startswith("."):
+                continue
+            try:
+                body_sizes[body_path.name] = (body_path, body_path.stat().st_size)
+            except OSError:
+                pass
+
+        entries.sort(key=lambda entry: entry[0])
+
+        users = {}
+        for _, _, body in entries:
+            users[body] = users.get(body, 0) + 1
+
+        size = sum(body_sizes[body][1] for body in users if body in body_sizes)
+
+        for _, entry_path, body in entries:
+            if size <= self.max_size:
+                break
+            _unlink_quietly(entry_path)
+            users[body] -= 1
+            if users[body] == 0 and body in body_sizes:
+                size -= body_sizes[body][1]
+
+        for body, (body_path, _) in body_sizes.items():
+            if users.get(body, 0) == 0:
+                _unlink_quietly(body_path)
+
+
+def http_cache() -> HttpCache:
+    """
+    the http cache configured for this run from the cache mode and the environment variables
+    NEF_PIPELINES_HTTP_CACHE_DIR, NEF_PIPELINES_HTTP_CACHE_TTL [seconds] and NEF_PIPELINES_HTTP_CACHE_MAX_SIZE [bytes]
+
+    :return: the cache
+    """
+    directory = os.environ.get(HTTP_CACHE_DIR_ENV_VAR)
+    directory = Path(directory) if directory else default_http_cache_dir()
+
+    return HttpCache(
+        directory,
+        http_cache_mode(),
+        ttl=_float_from_env(HTTP_CACHE_TTL_ENV_VAR, DEFAULT_TTL),
+        max_size=int(_float_from_env(HTTP_CACHE_MAX_SIZE_ENV_VAR, DEFAULT_MAX_SIZE)),
+    )
+
+
+def cached_get(url: str, **kwargs):
+    """
+    get a url using the http cache configured for this run [see HttpCache.get]
+    """
+    return http_cache().get(url, **kwargs)
+
+
+def cached_request(method: str, url: str, **kwargs):
+    """
+    make a request using the http cache configured for this run [see HttpCache.request]
+    """
+    return http_cache().request(method, url, **kwargs)
+
+
+def request_key(
+    method: str,
+    url: str,
+    data: Optional[Dict[str, Any]] = None,
+    files: Optional[Dict[str, Any]] = None,
+    params: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    the key used to cache a request
+
+    :param method: the http method
+    :param url: the url
+    :param data: form data
+    :param files: files to upload as a dictionary of field names to tuples of a file name and bytes
+    :param params: query parameters
+    :return: the key as a hex digest
+    """
+
+    def _items(values):
+        return sorted([str(name), str(value)] for name, value in (values or {}).items())
+
+    uploads = sorted(
+        [str(name), str(file_name), sha256(content).hexdigest()]
+        for name, (file_name, content) in (files or {}).items()
+    )
+
+    key = [
+        HTTP_CACHE_FORMAT,
+        method.upper(),
+        url,
+        _items(params),
+        _items(data),
+        uploads,
+    ]
+
+    return sha256(json.dumps(key).encode()).hexdigest()
+
+
+def _read_files(files: Dict[str, Any]) -> Dict[str, Any]:
+    # uploads are read into memory so they can be hashed for the key and still be sent
+    result = {}
+    for name, value in files.items():
+        if isinstance(value, tuple):
+            file_name, content = value[0], value[1]
+        else:
+            file_name = os.path.basename(getattr(value, "name", name))
+            content = value
+        if hasattr(content, "read"):
+            content = content.read()
+        if isinstance(content, str):
+            content = content.encode()
+        result[name] = (file_name, content)
+
+    return result
+
+
+_sessions = threading.local()
+
+
+def _session():
+    # sessions pool connections so repeated requests to a server reuse them, they aren't thread safe so each thread
+    # has its own
+    session = getattr(_sessions, "session", None)
+    if session is None:
+        import requests  # deferred
+
+        session = requests.Session()
+        _sessions.session = session
+
+    return session
+
+
+def _write_atomically(path: Path, content: bytes):
+    # the temporary file has a unique name so concurrent writes of the same path by threads or processes don't collide
+    path.parent.mkdir(parents=True, exist_ok=True)
+    file_h = tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+    )
+    try:
+        with file_h:
+            file_h.write(content)
+        os.replace(file_h.name, path)
+    except OSError:
+        _unlink_quietly(Path(file_h.name))
+        raise
+
+
+def _unlink_quietly(path: Path):
+    try:
+        path.unlink()
+    except OSError:
+        pass
@@ -0,0 +1,390 @@
+"""
+    Lazy reading of NEF entries: saveframe boundaries are indexed in one scan of the text and each saveframe is
+    held as a slice of raw text until something other than its name or category is asked for. Saveframes which
+    are clean [never parsed, or parsed but not modified] are written back out verbatim so the cost of output is
+    proportional to the frames that were edited rather than the size of the entry.
+
+    Anything the scan doesn't understand [text outside saveframes, multiple data blocks, saveframes without a
+    simple sf_category tag] falls back to parsing with pynmrstar so the result is always a valid Entry. The shape
+    of each saveframe [tags with values, loops with a whole number of rows] is checked as the entry is read so
+    malformed NEF is still rejected when it is read rather than when a frame is first used.
+"""
+
+import re
+from typing import Any, List, Optional, Tuple
+
+from pynmrstar import Entry, Saveframe
+from pynmrstar._internal import _get_comments
+from pynmrstar.exceptions import ParsingError
+
+from nef_pipelines.lib.star_reader_lib import (
+    is_well_formed_saveframe,
+    saveframe_from_string,
+)
+from nef_pipelines.lib.star_writer_lib import format_entry, format_saveframe
+
+# lines that change the state of the scan: the start of a data block, the start or end of a saveframe and the
+# delimiter of a semicolon delimited string [which must start in the first column]
+_STRUCTURE_LINE = re.compile(r"^(?:;|[ \t]*(data_|save_)(\S*))", re.MULTILINE)
+_SF_CATEGORY_TAG = re.compile(r"^[ \t]*_[^\s.]+\.sf_category[ \t]+(\S+)", re.MULTILINE)
+
+_QUOTES = "'\""
+
+_PARSED_ATTRIBUTES = {"_tags", "_loops", "_name", "_category", "tag_prefix"}
+
+
+def _frame_state(frame: Saveframe) -> Tuple[Any, ...]:
+    # a copy of everything that is written out when a frame is formatted, strings are immutable so only the
+    # containers need copying
+    return (
+        frame._name,
+        frame._category,
+        frame.tag_prefix,
+        [list(tag) for tag in frame._tags],
+        [
+            (loop.category, list(loop.tags), [list(row) for row in loop.data])
+            for loop in frame._loops
+        ],
+    )
+
+
+def _frame_matches_state(frame: Saveframe, state: Tuple[Any, ...]) -> bool:
+    name, category, tag_prefix, tags, loops = state
+
+    if (frame._name, frame._category, frame.tag_prefix) != (name, category, tag_prefix):
+        return False
+
+    if frame._tags != tags or len(frame._loops) != len(loops):
+        return False
+
+    for loop, (loop_category, loop_tags, loop_data) in zip(frame._loops, loops):
+        if loop.category != loop_category or loop.tags != loop_tags:
+            return False
+        if loop.data != loop_data:
+            return False
+
+    return True
+
+
+class LazySaveframe(Saveframe):
+    """
+    A saveframe which is held as raw text and only parsed into tags and loops on first use, its name and
+    category are available without parsing. While the frame is clean [see dirty] formatting the frame returns
+    the original text.
+    """
+
+    def __init__(
+        self,
+        text: str,
+        name: str,
+        category: str,
+        source: str = "unknown",
+        line_offset: int = 0,
+    ):
+        # Saveframe.__init__ is deliberately not called, the frame's attributes are filled in by _parse
+        self.__dict__["_lazy_text"] = text
+        self.__dict__["_lazy_name"] = name
+        self.__dict__["_lazy_category"] = category
+        self.__dict__["_lazy_line_offset"] = line_offset
+        self.__dict__["source"] = source
+
+    @property
+    def parsed(self) -> bool:
+        """True if the frame has been parsed into tags and loops."""
+        return "_tags" in self.__dict__
+
+    def _parse(self):
+        try:
+            frame = saveframe_from_string(self.__dict__["_lazy_text"])
+        except ParsingError as e:
+            # report the line in the file the frame was read from rather than the line in the frame
+            line_offset = self.__dict__["_lazy_line_offset"]
+            if e.line_number is not None and line_offset:
+                raise ParsingError(e.message, e.line_number + line_offset) from e
+            raise
+
+        source = self.__dict__["source"]
+        self.__dict__.update(frame.__dict__)
+        self.__dict__["source"] = source
+
+        self.__dict__["_lazy_state"] = _frame_state(self)
+
+    @property
+    def dirty(self) -> bool:
+        """
+        True if the frame may differ from its original text: it has been marked dirty or it has been parsed and
+        its name, category, tags or loops have since been changed
+        """
+        if self.__dict__.get("_lazy_dirty", False):
+            return True
+
+        if not self.parsed:
+            return False
+
+        return not _frame_matches_state(self, self.__dict__["_lazy_state"])
+
+    def mark_dirty(self):
+        """Mark the frame as modified so it is always re-formatted on output."""
+        self.__dict__["_lazy_dirty"] = True
+
+    def __getattr__(self, key: str) -> Any:
+        # only called for attributes that don't exist yet, dunder lookups [e.g. from copy and pickle] and frames
+        # that aren't set up yet must not trigger a parse
+        if key in _PARSED_ATTRIBUTES and "_lazy_text" in self.__dict__:
+            self._parse()
+            return self.__dict__[key]
+
+        raise AttributeError(
+            f"'{self.__class__.__name__}' object has no attribute '{key}'"
+        )
+
+    @property
+    def name(self) -> Any:
+        return self._name if self.parsed else self.__dict__["_lazy_name"]
+
+    @name.setter
+    def name(self, name):
+        Saveframe.name.fset(self, name)
+
+    @property
+    def category(self) -> str:
+        return self._category if self.parsed else self.__dict__["_lazy_category"]
+
+    @category.setter
+    def category(self, category):
+        Saveframe.category.fset(self, category)
+
+    def __str__(
+        self,
+        first_in_category: bool = True,
+        skip_empty_loops: bool = False,
+        skip_empty_tags: bool = False,
+        show_comments: bool = True,
+    ) -> str:
+
+        return format_saveframe(
+            self,
+            first_in_category=first_in_category,
+            skip_empty_loops=skip_empty_loops,
+            skip_empty_tags=skip_empty_tags,
+            show_comments=show_comments,
+        )
+
+    def original_text(
+        self, skip_empty_loops: bool, skip_empty_tags: bool, show_comments: bool
+    ) -> Optional[str]:
+        """
+        the text the frame was read from if it can be output in place of formatting the frame
+
+        :param skip_empty_loops: empty loops are to be dropped from the output
+        :param skip_empty_tags: empty tags are to be dropped from the output
+        :param show_comments: the category's standard comments are to be added to the output
+        :return: the original text or None if the frame has to be formatted
+        """
+
+        if self.dirty:
+            return None
+
+        # the original text can't honour requests to drop empty loops or tags or to add comments
+        if skip_empty_loops or skip_empty_tags:
+            return None
+        if show_comments and self.category in _get_comments():
+            return None
+
+        return self.__dict__["_lazy_text"]
+
+
+class LazyEntry(Entry):
+    """
+    An entry whose saveframes may be LazySaveframes, lookups by category and name use the frames' names and
+    categories so they don't parse any frames and the entry is formatted by the native writer [see star_writer_lib]
+    """
+
+    def __str__(
+        self,
+        skip_empty_loops: bool = False,
+        skip_empty_tags: bool = False,
+        show_comments: bool = True,
+    ) -> str:
+
+        return format_entry(
+            self,
+            skip_empty_loops=skip_empty_loops,
+            skip_empty_tags=skip_empty_tags,
+            show_comments=show_comments,
+        )
+
+    def get_saveframes_by_tag_and_value(
+        self, tag_name: str, value: Any
+    ) -> List[Saveframe]:
+
+        tag_name_lower = tag_name.lower()
+        if tag_name_lower == "sf_category":
+            return [frame for frame in self._frame_list if frame.category == value]
+        elif tag_name_lower == "sf_framecode":
+            return [frame for frame in self._frame_list if frame.name == value]
+
+        return super().get_saveframes_by_tag_and_value(tag_name, value)
+
+    @property
+    def dirty_frames(self) -> List[Saveframe]:
+        """The frames in the entry which will be re-formatted on output, modified frames and new frames."""
+        return [
+            frame
+            for frame in self._frame_list
+            if not isinstance(frame, LazySaveframe) or frame.dirty
+        ]
+
+    @property
+    def parsed_frames(self) -> List[Saveframe]:
+        """The frames in the entry which have been parsed or weren't read lazily."""
+        return [
+            frame
+            for frame in self._frame_list
+            if not isinstance(frame, LazySaveframe) or frame.parsed
+        ]
+
+
+def _is_ignorable(text: str) -> bool:
+    # text outside of saveframes must be blank or comments
+    return all(
+        not line.strip() or line.lstrip().startswith("#") for line in text.split("\n")
+    )
+
+
+def _frame_category(frame_text: str) -> Optional[str]:
+    match = _SF_CATEGORY_TAG.search(frame_text)
+    if not match:
+        return None
+
+    category = match.group(1)
+    if category[0] in _QUOTES:
+        if len(category) < 2 or category[-1] != category[0]:
+            return None
+        category = category[1:-1]
+
+    return category
+
+
+def _index_frames(
+    text: str,
+) -> Optional[Tuple[str, List[Tuple[str, str, str, int]]]]:
+    """
+    index the data block and saveframes in a star file in a single scan
+
+    :param text: the text of the star file
+    :return: the entry id and a list of (name, category, text, offset) for each saveframe or None if the text
+             can't be handled by the scan, the offset is the character offset of the start of the frame's text
+    """
+
+    entry_id = None
+    frames = []
+
+    in_semicolon_string = False
+    frame_start = None
+    frame_name = None
+    last_end = 0
+
+    for match in _STRUCTURE_LINE.finditer(text):
+        keyword = match.group(1)
+
+        if keyword is None:
+            in_semicolon_string = not in_semicolon_string
+            continue
+
+        if in_semicolon_string:
+            continue
+
+        if keyword == "data_":
+            if entry_id is not None or frame_start is not None:
+                return None
+            if not _is_ignorable(text[last_end : match.start()]):
+                return None
+            entry_id = match.group(2)
+            last_end = match.end()
+
+        elif match.group(2):
+            if entry_id is None or frame_start is not None:
+                return None
+            if not _is_ignorable(text[last_end : match.start()]):
+                return None
+            frame_start = match.start()
+            frame_name = match.group(2)
+
+        else:
+            if frame_start is None:
+                return None
+
+            line_end = text.find("\n", match.end())
+            line_end = len(text) if line_end == -1 else line_end
+            if not _is_ignorable(text[match.end() : line_end]):
+                return None
+
+            frame_text = text[frame_start : match.end()] + "\n"
+            category = _frame_category(frame_text)
+            if category is None:
+                return None
+
+            frames.append((frame_name, category, frame_text, frame_start))
+            frame_start = None
+            last_end = line_end
+
+    if entry_id is None or frame_start is not None or in_semicolon_string:
+        return None
+
+    if not _is_ignorable(text[last_end:]):
+        return None
+
+    return entry_id, frames
+
+
+def _parses(frame: LazySaveframe) -> bool:
+    try:
+        frame._parse()
+    except ParsingError:
+        return False
+
+    return True
+
+
+def lazy_entry_from_string(text: str, source: str = "from_string()") -> Entry:
+    """
+    read an entry from a string, saveframes are only parsed when they are used. If the text can't be indexed
+    by a simple scan it is parsed by pynmrstar in full
+
+    can throw a ParsingError from PyNMRStar
+
+    :param text: the text of the entry
+    :param source: the source of the entry
+    :return: the entry
+    """
+
+    index = _index_frames(text)
+
+    if index is None:
+        return Entry.from_string(text)
+
+    entry_id, frames = index
+
+    entry = LazyEntry.from_scratch(entry_id)
+    entry.source = source
+    line_offset = 0
+    last_offset = 0
+    for name, category, frame_text, offset in frames:
+        line_offset += text.count("\n", last_offset, offset)
+        last_offset = offset
+
+        frame = LazySaveframe(frame_text, name, category, source, line_offset)
+
+        # frames the shape check can't vouch for are parsed now so errors are reported when the entry is read,
+        # pynmrstar then reports the error against the whole text as it would without lazy reading
+        if not is_well_formed_saveframe(frame_text) and not _parses(frame):
+            return Entry.from_string(text)
+
+        entry.frame_list.append(frame)
+
+    # duplicate names are an error pynmrstar reports when parsing, keep the same behaviour
+    if len({frame.name for frame in entry.frame_list}) != len(entry.frame_list):
+        return Entry.from_string(text)
+
+    return entry
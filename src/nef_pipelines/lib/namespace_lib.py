@@ -12,6 +12,7 @@ from nef_pipelines.lib.cli_lib import (
     SelectorAction,
     parse_selector_lists,
 )
+from nef_pipelines.lib.entry_index_lib import index_frame
 from nef_pipelines.lib.structures import EntryPart, EntryPartValues, FrameLoopsAndTags
 
 # TODO: [for future] Move separator escaping functionality to cli_lib and consolidate
@@ -194,8 +195,11 @@ def collect_namespaces_from_frames(
     seen = set()
 
     for frame in frames:
+        # read the frame's structure from its index so lazily read frames aren't parsed
+        frame = index_frame(frame)
+
         # Get frame namespace
-        frame_namespace = get_namespace(frame, EntryPart.Saveframe)
+        frame_namespace = get_namespace(frame.category, EntryPart.Saveframe)
         key = (frame_namespace, frame.name, frame.category, None, EntryPart.Saveframe)
         if key not in seen:
             namespaces.setdefault(frame_namespace, []).append(
@@ -207,7 +211,7 @@ def collect_namespaces_from_frames(
             seen.add(key)
 
         # Collect frame tags (can have explicit namespace prefixes like ccpn_peaklist_name)
-        for tag_name, _tag_value in frame.tag_iterator():
+        for tag_name in frame.tags:
             tag_namespace = get_namespace(tag_name, EntryPart.FrameTag, frame_namespace)
             key = (
                 tag_namespace,
@@ -229,7 +233,9 @@ def collect_namespaces_from_frames(
 
         for loop in frame.loops:
             # Get loop namespace, inheriting from the parent frame if unregistered
-            loop_namespace = get_namespace(loop, EntryPart.Loop, frame_namespace)
+            loop_namespace = get_namespace(
+                loop.category, EntryPart.Loop, frame_namespace
+            )
             key = (
                 loop_namespace,
                 frame.name,
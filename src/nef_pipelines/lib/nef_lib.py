@@ -5,24 +5,29 @@
 # Note: there are circular imports lower down in this file in function calls
 
 import sys
-from collections.abc import MutableMapping
+from array import array
+from collections.abc import Mapping, MutableMapping
 from enum import auto
 from fnmatch import fnmatchcase
 from io import StringIO
 from itertools import zip_longest
 from pathlib import Path
 from textwrap import dedent
-from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 # from pandas import DataFrame
 from pynmrstar import Entry, Loop, Saveframe, Schema
 from pynmrstar.definitions import STR_CONVERSION_DICT
 from pynmrstar.exceptions import ParsingError
+from pynmrstar.utils import format_tag_lc
 from strenum import LowercaseStrEnum
 
 from nef_pipelines.lib import util
 from nef_pipelines.lib.constants import NEF_PIPELINES
+from nef_pipelines.lib.entry_index_lib import attach_entry_index, read_entry_index
 from nef_pipelines.lib.globals_lib import set_global
+from nef_pipelines.lib.lazy_entry_lib import LazyEntry, lazy_entry_from_string
+from nef_pipelines.lib.pipeline_lib import hand_off_entry, take_handoff_entry
 from nef_pipelines.lib.structures import (
     EntryPart,
     NEFPipelinesException,
@@ -323,6 +328,17 @@ def select_frames_by_name(
     return tuple(result.values())
 
 
+def print_entry(entry: Entry):
+    """
+    print an entry to stdout as the output of a command, if the command is a step of an in-process pipeline the
+    entry is handed to the next step without being formatted [see pipeline_lib]
+
+    :param entry: the entry to output
+    """
+    if not hand_off_entry(entry):
+        print(entry)
+
+
 # refactor to two functions one of which gets a TextIO
 def create_entry_from_stdin() -> Optional[Entry]:
     """
@@ -333,6 +349,10 @@ def create_entry_from_stdin() -> Optional[Entry]:
     :return: a star file entry or None
     """
 
+    entry = take_handoff_entry()
+    if entry is not None:
+        return entry
+
     try:
         entry = None
         if not sys.stdin.isatty() or running_in_pycharm():
@@ -343,7 +363,7 @@ def create_entry_from_stdin() -> Optional[Entry]:
                 lines = "".join(stdin_lines)
 
             if len(lines.strip()) != 0:
-                entry = Entry.from_string(lines)
+                entry = lazy_entry_from_string(lines)
     except ParsingError as e:
         raise BadNefFileException(str(e)) from e
 
@@ -379,6 +399,10 @@ def read_entry_from_stdin_or_raise() -> Entry:
     :return: a star file entry
     """
 
+    entry = take_handoff_entry()
+    if entry is not None:
+        return entry
+
     if sys.stdin.isatty():
         raise NEFPLSLIOEmptyStdinException(
             "you appear to be reading from an empty stdin"
@@ -400,7 +424,7 @@ def read_entry_from_stdin_or_raise() -> Entry:
         )
 
     try:
-        entry = Entry.from_string(lines)
+        entry = lazy_entry_from_string(lines)
 
     except ParsingError as e:
         msg = f"failed to read a NEF entry from stdin because the NEF parser found the following error: {e}"
@@ -418,6 +442,10 @@ def read_entry_from_stdin_or_exit() -> Entry:
     :return: a star file entry
     """
 
+    entry = take_handoff_entry()
+    if entry is not None:
+        return entry
+
     if sys.stdin.isatty():
         exit_error("you appear to be reading from an empty stdin")
 
@@ -438,7 +466,7 @@ def read_entry_from_stdin_or_exit() -> Entry:
         exit_error("stdin is empty")
 
     try:
-        entry = Entry.from_string(lines)
+        entry = lazy_entry_from_string(lines)
 
     except ParsingError as e:
         exit_error(
@@ -451,15 +479,54 @@ def read_entry_from_stdin_or_exit() -> Entry:
     return entry
 
 
+def _no_conversion(value: Any) -> Any:
+    return value
+
+
+class LoopRowAccessor:
+    """
+    Per-loop state shared by all the rows of a loop during iteration: the tag to column index map and a
+    converter for each column. This is computed once per loop rather than once per row so row iteration
+    is linear in the length of the loop.
+    """
+
+    __slots__ = ("loop", "convert", "tag_to_index", "converters")
+
+    def __init__(self, loop: Loop, convert: bool = True):
+        self.loop = loop
+        self.convert = convert
+        self.tag_to_index = {tag: i for i, tag in enumerate(loop.tags)}
+
+        converter = do_reasonable_type_conversions if convert else _no_conversion
+        self.converters = tuple(converter for _ in loop.tags)
+
+    def row_index(self, row: List[Any]) -> int:
+        """
+        find the index of a row in the loop by identity, this is a linear search and is only used when a
+        row is created outside of an iterator
+        :param row: the row to find
+        :return: the index of the row or -1 if it isn't in the loop
+        """
+        for i, loop_row in enumerate(self.loop.data):
+            if loop_row is row:
+                return i
+        return -1
+
+
 class RowDict(MutableMapping):
-    def __init__(self, loop: Loop, row: int, convert: bool):
+    def __init__(
+        self,
+        loop: Loop,
+        row: List[Any],
+        convert: bool,
+        accessor: Optional[LoopRowAccessor] = None,
+    ):
         super().__init__()
         self._data = row
-        self._convert = convert
-        self._tag_to_index = {tag: i for i, tag in enumerate(loop.tags)}
-        self._tag_types = {
-            tag: type(value) for tag, value in zip(loop.tags, self._data)
-        }
+        self._accessor = (
+            accessor if accessor is not None else LoopRowAccessor(loop, convert)
+        )
+        self._tag_to_index = self._accessor.tag_to_index
 
     def __len__(self):
         return len(self._data)
@@ -472,14 +539,12 @@ class RowDict(MutableMapping):
 
     def __getitem__(self, key):
         index = self._tag_to_index[key]
-        value = self._data[index]
-        if self._convert:
-            value = do_reasonable_type_conversions(value)
-        return value
+        return self._accessor.converters[index](self._data[index])
 
     def __setitem__(self, key, value):
         index = self._tag_to_index[key]
-        if self._tag_types[key] == str and not isinstance(value, str):
+        # values only ever become strings here so the type of the current value is the type of the original
+        if isinstance(self._data[index], str) and not isinstance(value, str):
             value = str(value)
         self._data[index] = value
 
@@ -510,33 +575,39 @@ class RowDict(MutableMapping):
 class RowNamespace:
     """Provides attribute-based access to loop row data with mutability support."""
 
-    def __init__(self, loop: Loop, row: int, convert: bool):
+    __slots__ = ("_data", "_accessor", "_row_index")
+
+    def __init__(
+        self,
+        loop: Loop,
+        row: List[Any],
+        convert: bool,
+        row_index: Optional[int] = None,
+        accessor: Optional[LoopRowAccessor] = None,
+    ):
+        if accessor is None:
+            accessor = LoopRowAccessor(loop, convert)
+        if row_index is None:
+            row_index = accessor.row_index(row)
+
         object.__setattr__(self, "_data", row)
-        object.__setattr__(self, "_convert", convert)
-        object.__setattr__(self, "_loop", loop)
-        object.__setattr__(
-            self, "_row_index", loop.data.index(row) if row in loop.data else -1
-        )
-        object.__setattr__(
-            self, "_tag_to_index", {tag: i for i, tag in enumerate(loop.tags)}
-        )
+        object.__setattr__(self, "_accessor", accessor)
+        object.__setattr__(self, "_row_index", row_index)
 
     def __getattr__(self, key):
 
         if key.startswith("_"):
             value = object.__getattribute__(self, key)
         else:
-            tag_to_index = object.__getattribute__(self, "_tag_to_index")
+            accessor = object.__getattribute__(self, "_accessor")
+            tag_to_index = accessor.tag_to_index
             if key not in tag_to_index:
                 raise AttributeError(f"RowNamespace has no attribute '{key}'")
 
-            data = object.__getattribute__(self, "_data")
-            convert = object.__getattribute__(self, "_convert")
             index = tag_to_index[key]
-            value = data[index]
-
-            if convert:
-                value = do_reasonable_type_conversions(value)
+            value = accessor.converters[index](
+                object.__getattribute__(self, "_data")[index]
+            )
         return value
 
     def __setattr__(self, key, value):
@@ -544,13 +615,13 @@ class RowNamespace:
             object.__setattr__(self, key, value)
             return
 
-        tag_to_index = object.__getattribute__(self, "_tag_to_index")
+        accessor = object.__getattribute__(self, "_accessor")
+        tag_to_index = accessor.tag_to_index
         if key not in tag_to_index:
-            loop = object.__getattribute__(self, "_loop")
             row_index = object.__getattribute__(self, "_row_index")
             available = ", ".join(sorted(tag_to_index.keys()))
             raise AttributeError(
-                f"Cannot set '{key}' on row {row_index} in loop '{loop.category}'. "
+                f"Cannot set '{key}' on row {row_index} in loop '{accessor.loop.category}'. "
                 f"Available tags: {available}"
             )
 
@@ -558,7 +629,7 @@ class RowNamespace:
         index = tag_to_index[key]
 
         # pynmrstar stores everything as strings internally
-        # Type conversions happen on READ (via do_reasonable_type_conversions in __getattr__)
+        # Type conversions happen on READ (via the accessor's converters in __getattr__)
         # On WRITE, just convert to string (pynmrstar will do this on serialize/re-parse anyway)
         if not isinstance(value, str):
             value = str(value)
@@ -566,22 +637,19 @@ class RowNamespace:
 
     def __contains__(self, key):
         """Check if a tag exists in this row."""
-        tag_to_index = object.__getattribute__(self, "_tag_to_index")
-        return key in tag_to_index
+        accessor = object.__getattribute__(self, "_accessor")
+        return key in accessor.tag_to_index
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert RowNamespace to a dictionary containing only tag data (no internal attributes)."""
-        tag_to_index = object.__getattribute__(self, "_tag_to_index")
+        accessor = object.__getattribute__(self, "_accessor")
         data = object.__getattribute__(self, "_data")
-        convert = object.__getattribute__(self, "_convert")
+        converters = accessor.converters
 
-        result = {}
-        for tag, index in tag_to_index.items():
-            value = data[index]
-            if convert:
-                value = do_reasonable_type_conversions(value)
-            result[tag] = value
-        return result
+        return {
+            tag: converters[index](data[index])
+            for tag, index in accessor.tag_to_index.items()
+        }
 
     @property
     def __dict__(self):
@@ -589,7 +657,7 @@ class RowNamespace:
         return self.to_dict()
 
     def __repr__(self):
-        tag_to_index = object.__getattribute__(self, "_tag_to_index")
+        tag_to_index = object.__getattribute__(self, "_accessor").tag_to_index
         data = object.__getattribute__(self, "_data")
         items = {tag: data[idx] for tag, idx in tag_to_index.items()}
         return f"RowNamespace({items})"
@@ -618,9 +686,9 @@ def loop_row_dict_iter(
         """
         raise Exception(msg)
 
-    for i, row in enumerate(loop):
-        result = RowDict(loop, row, convert)
-        yield result
+    accessor = LoopRowAccessor(loop, convert)
+    for row in loop.data:
+        yield RowDict(loop, row, convert, accessor)
 
 
 def do_reasonable_type_conversions(value: str) -> Union[str, float, int]:
@@ -660,9 +728,195 @@ def loop_row_namespace_iter(loop: Loop, convert: bool = True) -> Iterator[RowNam
         """
         raise NEFPipelinesException(msg)
 
-    for i, row in enumerate(loop):
-        result = RowNamespace(loop, row, convert)
-        yield result
+    accessor = LoopRowAccessor(loop, convert)
+    for row_index, row in enumerate(loop.data):
+        yield RowNamespace(loop, row, convert, row_index, accessor)
+
+
+class ColumnType(LowercaseStrEnum):
+    INT = auto()
+    FLOAT = auto()
+    MIXED = auto()
+
+
+def _infer_column(values: List[Any]) -> Tuple[ColumnType, Sequence[Any]]:
+    """
+    infer the type of a loop column once and convert the whole column in one pass. Columns where every
+    value is a string of an int are stored as array('q'), columns where every value is a string of a float as
+    array('d'), anything else [including columns containing UNUSED and columns holding values which aren't
+    strings, e.g. python floats and bools added by code building a loop] is converted cell by cell as
+    do_reasonable_type_conversions would and stored as a list
+
+    :param values: the raw values of the column
+    :return: the type of the column and the converted values
+    """
+
+    # only strings are converted, int() and float() would truncate floats and turn bools into numbers
+    if not all(isinstance(value, str) for value in values):
+        return ColumnType.MIXED, [
+            do_reasonable_type_conversions(value) for value in values
+        ]
+
+    try:
+        return ColumnType.INT, array("q", [int(value) for value in values])
+    except (ValueError, TypeError, OverflowError):
+        pass
+
+    try:
+        return ColumnType.FLOAT, array("d", [float(value) for value in values])
+    except (ValueError, TypeError):
+        pass
+
+    return ColumnType.MIXED, [do_reasonable_type_conversions(value) for value in values]
+
+
+class LoopViewRow(Mapping):
+    """
+    A read only row of a LoopView supporting both dictionary [row['tag']] and attribute [row.tag] access,
+    values are read from the typed columns of the view and are not re-parsed
+    """
+
+    __slots__ = ("_view", "_index")
+
+    def __init__(self, view: "LoopView", index: int):
+        object.__setattr__(self, "_view", view)
+        object.__setattr__(self, "_index", index)
+
+    def __getitem__(self, key):
+        view = object.__getattribute__(self, "_view")
+        return view.columns[view.tag_to_index[key]][
+            object.__getattribute__(self, "_index")
+        ]
+
+    def __getattr__(self, key):
+        if key.startswith("_"):
+            return object.__getattribute__(self, key)
+
+        view = object.__getattribute__(self, "_view")
+        if key not in view.tag_to_index:
+            raise AttributeError(f"LoopViewRow has no attribute '{key}'")
+        return self[key]
+
+    def __setattr__(self, key, value):
+        raise AttributeError(
+            "LoopViewRow is read only, use loop_row_namespace_iter to modify loop rows"
+        )
+
+    def __iter__(self):
+        return iter(object.__getattribute__(self, "_view").tags)
+
+    def __len__(self):
+        return len(object.__getattribute__(self, "_view").tags)
+
+    def __contains__(self, key):
+        return key in object.__getattribute__(self, "_view").tag_to_index
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the row to a dictionary of tags and typed values."""
+        view = object.__getattribute__(self, "_view")
+        index = object.__getattribute__(self, "_index")
+        return {tag: column[index] for tag, column in zip(view.tags, view.columns)}
+
+    @property
+    def __dict__(self):
+        """Return dictionary view of tag data for vars() compatibility."""
+        return self.to_dict()
+
+    def __repr__(self):
+        return f"LoopViewRow({self.to_dict()})"
+
+    def __str__(self):
+        return self.__repr__()
+
+
+class LoopView:
+    """
+    A column typed, read only view of a loop. The type of each column is inferred once and the whole column
+    converted in one pass [see _infer_column], rows then read typed values from the columns rather than
+    converting each cell with do_reasonable_type_conversions every time it is read.
+
+    Note: the view is a snapshot, changes to the loop after the view is created are not seen by the view
+    """
+
+    def __init__(self, loop: Loop, convert: bool = True):
+
+        if not isinstance(loop, Loop):
+            msg = f"""\
+                loop must be of type Loop you provided a {loop.__class__.__name__}"
+                value: {loop}
+            """
+            raise NEFPipelinesException(msg)
+
+        self.loop = loop
+        self.tags = tuple(loop.tags)
+        self.tag_to_index = {tag: i for i, tag in enumerate(self.tags)}
+
+        raw_columns = [list(column) for column in zip(*loop.data)] if loop.data else []
+        if not raw_columns:
+            raw_columns = [[] for _ in self.tags]
+
+        if convert:
+            column_types, columns = (
+                zip(*[_infer_column(column) for column in raw_columns])
+                if self.tags
+                else ((), ())
+            )
+        else:
+            column_types = tuple(ColumnType.MIXED for _ in self.tags)
+            columns = raw_columns
+
+        self.column_types = tuple(column_types)
+        self.columns = tuple(columns)
+
+    def __len__(self):
+        return len(self.loop.data)
+
+    def __iter__(self) -> Iterator[LoopViewRow]:
+        for index in range(len(self)):
+            yield LoopViewRow(self, index)
+
+    def column(self, tag: str) -> Sequence[Any]:
+        """
+        get the typed values of a column
+        :param tag: the tag of the column
+        :return: an array('q'), array('d') or a list depending on the type of the column
+        """
+        return self.columns[self._tag_index_or_raise(tag)]
+
+    def column_type(self, tag: str) -> ColumnType:
+        """
+        get the inferred type of a column
+        :param tag: the tag of the column
+        :return: the type of the column
+        """
+        return self.column_types[self._tag_index_or_raise(tag)]
+
+    def numpy_column(self, tag: str):
+        """
+        get a column as a numpy array, int and float columns share memory with the view [no copy]
+
+        :param tag: the tag of the column
+        :return: a numpy array of the column's values
+        :raises ImportError: if numpy isn't available
+        """
+        import numpy as np  # optional dependency
+
+        column = self.column(tag)
+        if isinstance(column, array):
+            return np.frombuffer(
+                column, dtype=np.int64 if column.typecode == "q" else np.float64
+            )
+        return np.array(column, dtype=object)
+
+    def _tag_index_or_raise(self, tag: str) -> int:
+        if tag not in self.tag_to_index:
+            msg = f"""
+                the column {tag} wasn't found in the loop {self.loop.category}
+
+                the available columns are {', '.join(self.tags)}
+            """
+            raise NoSuchColumnException(msg)
+        return self.tag_to_index[tag]
 
 
 # TODO this partially overlaps with select_frames_by_name in this file, combine and simplify!
@@ -809,11 +1063,20 @@ def read_entry_from_file_or_raise(file):
     file = Path(file)
 
     with open(file) as fh:
-        entry = Entry.from_file(fh)
+        entry = lazy_entry_from_string(fh.read())
+
+    _attach_entry_index_sidecar(entry, file)
 
     return entry
 
 
+def _attach_entry_index_sidecar(entry: Entry, file: Path):
+    # files saved with an index [nef save --index] answer structural queries without scanning their frames
+    index = read_entry_index(file)
+    if index is not None:
+        attach_entry_index(entry, index)
+
+
 def read_entry_from_file_or_exit_error(file):
     """
     read a star entry from a file or exit with an error message
@@ -847,7 +1110,8 @@ def read_or_create_entry_exit_error_on_bad_file(
         else:
             try:
                 with open(file) as fh:
-                    entry = Entry.from_file(fh)
+                    entry = lazy_entry_from_string(fh.read())
+                    _attach_entry_index_sidecar(entry, file)
                     _parse_globals(entry)
 
             except IOError as e:
@@ -864,7 +1128,7 @@ def read_or_create_entry_exit_error_on_bad_file(
         exit_error(msg)
 
     if entry is None:
-        entry = Entry.from_scratch(entry_name)
+        entry = LazyEntry.from_scratch(entry_name)
 
     return entry
 
@@ -1080,6 +1344,153 @@ def extract_column(loop: Loop, column: Union[str, int]) -> Loop:
     return values
 
 
+class LoopBuilder:
+    """
+    Collect rows for a loop and add them to the loop in one operation. Loop.add_data looks up and checks the tags
+    of each row it is given every time it is called, which dominates the time taken to build large loops a row at
+    a time. Here the tag order of dict rows is looked up once for each distinct set of keys and rows are only added
+    to the loop by build, so if any row is bad nothing is added.
+
+    Rows can be added as dicts of tag to value [tags not given are None as with Loop.add_data], as rows of values
+    in the loop's tag order or as columns of values, which can be lists or arrays.
+    """
+
+    def __init__(self, loop: Loop):
+        self.loop = loop
+        self.tags = tuple(loop.tags)
+        self._tag_to_index = {tag.lower(): index for index, tag in enumerate(self.tags)}
+        self._key_indices = {}
+        self._rows = []
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add_row(self, row: Dict[str, Any]) -> "LoopBuilder":
+        """
+        add a row as a dict of tag to value
+        :param row: the row, tags not in the row are set to None
+        :return: the builder
+        """
+
+        keys = tuple(row)
+        indices = self._key_indices.get(keys)
+        if indices is None:
+            indices = self._key_indices[keys] = self._indices_for_tags_or_raise(keys)
+
+        if indices is True:
+            self._rows.append(list(row.values()))
+        else:
+            values = [None] * len(self.tags)
+            for index, value in zip(indices, row.values()):
+                values[index] = value
+            self._rows.append(values)
+
+        return self
+
+    def add_rows(self, rows: Iterable[Dict[str, Any]]) -> "LoopBuilder":
+        """
+        add rows as dicts of tag to value
+        :param rows: the rows, tags not in a row are set to None
+        :return: the builder
+        """
+        for row in rows:
+            self.add_row(row)
+
+        return self
+
+    def add_value_rows(self, rows: Iterable[Sequence[Any]]) -> "LoopBuilder":
+        """
+        add rows of values [e.g. tuples] in the loop's tag order
+        :param rows: the rows, each must have one value per tag
+        :return: the builder
+        """
+        width = len(self.tags)
+        new_rows = [list(row) for row in rows]
+        for row_index, row in enumerate(new_rows):
+            if len(row) != width:
+                msg = f"""
+                    row {row_index} of the rows for the loop {self.loop.category} has {len(row)} values but the
+                    loop has {width} tags
+
+                    the values were: {', '.join(str(value) for value in row)}
+                    the tags are: {', '.join(self.tags)}
+                """
+                raise NEFPipelinesException(msg)
+
+        self._rows.extend(new_rows)
+
+        return self
+
+    def add_columns(self, columns: Dict[str, Sequence[Any]]) -> "LoopBuilder":
+        """
+        add rows from columns of values
+        :param columns: a dict of tag to the values of the column [a list or array], all the columns must have
+                        the same length and tags not given are set to None
+        :return: the builder
+        """
+        if not columns:
+            return self
+
+        indices = self._indices_for_tags_or_raise(tuple(columns))
+
+        values_by_column = [
+            column.tolist() if hasattr(column, "tolist") else column
+            for column in columns.values()
+        ]
+
+        lengths = {len(column) for column in values_by_column}
+        if len(lengths) > 1:
+            column_lengths = [
+                f"{tag}: {len(column)}"
+                for tag, column in zip(columns, values_by_column)
+            ]
+            msg = f"""
+                the columns for the loop {self.loop.category} have different lengths
+
+                the lengths were: {', '.join(column_lengths)}
+            """
+            raise NEFPipelinesException(msg)
+
+        if indices is True:
+            self._rows.extend(list(row) for row in zip(*values_by_column))
+        else:
+            empty_columns = [None] * len(values_by_column[0])
+            all_columns = [empty_columns] * len(self.tags)
+            for index, column in zip(indices, values_by_column):
+                all_columns[index] = column
+            self._rows.extend(list(row) for row in zip(*all_columns))
+
+        return self
+
+    def build(self) -> Loop:
+        """
+        add the collected rows to the loop, after which the builder is empty
+        :return: the loop
+        """
+        self.loop.data.extend(self._rows)
+        self._rows = []
+
+        return self.loop
+
+    def _indices_for_tags_or_raise(
+        self, tags: Tuple[str, ...]
+    ) -> Union[List[int], bool]:
+        # True means the tags are exactly the loop's tags in order, so the values of a row can be used directly
+        indices = []
+        for tag in tags:
+            index = self._tag_to_index.get(format_tag_lc(tag))
+            if index is None:
+                msg = f"""
+                    the tag {tag} isn't one of the tags of the loop {self.loop.category}
+
+                    the available tags are {', '.join(self.tags)}
+                """
+                raise NoSuchColumnException(msg)
+            indices.append(index)
+
+        return True if indices == list(range(len(self.tags))) else indices
+
+
 def create_nef_save_frame(
     frame_category: str,
     frame_id: str = None,
@@ -0,0 +1,134 @@
+"""
+Run a per file stage of an importer [e.g. reading and parsing peak files] in a pool of processes.
+
+Results are returned in input order and any warnings or errors written by each file's stage are replayed on
+stderr in input order, so the output and error reporting are the same as when the files are processed one at a
+time: processing stops at the first file that fails and nothing is reported for later files.
+"""
+
+import sys
+from dataclasses import dataclass
+from io import StringIO
+from typing import Any, Callable, List, Optional, Sequence
+
+from nef_pipelines.lib.util import exit_error
+
+JOBS_HELP = """
+    the number of processes to read and parse input files with, files are parsed in parallel and the results are
+    combined in the order the files were given
+    """
+
+
+@dataclass
+class _FileResult:
+    result: Any
+    stderr: str
+    exception: Optional[BaseException] = None
+
+
+@dataclass
+class _WorkerState:
+    # the state of the parent process that affects how errors and warnings are reported
+    command_path: Optional[str]
+    debug_mode: bool
+    globals_: dict
+
+
+def _current_worker_state() -> _WorkerState:
+    import click  # deferred
+
+    from nef_pipelines import nef_app_runner  # circular
+    from nef_pipelines.lib.globals_lib import debug_get_globals  # deferred
+
+    context = click.get_current_context(silent=True)
+    command_path = context.command_path if context is not None else None
+
+    return _WorkerState(command_path, nef_app_runner.debug_mode, debug_get_globals())
+
+
+_worker_state: Optional[_WorkerState] = None
+
+
+def _init_worker(state: _WorkerState):
+    from nef_pipelines import nef_app_runner  # circular
+    from nef_pipelines.lib.globals_lib import replace_globals  # deferred
+
+    nef_app_runner.debug_mode = state.debug_mode
+    replace_globals(state.globals_)
+
+    global _worker_state
+    _worker_state = state
+
+
+def _run_captured(function: Callable, arguments: Sequence) -> _FileResult:
+    import click  # deferred
+
+    stderr = StringIO()
+    saved_stderr = sys.stderr
+    sys.stderr = stderr
+
+    # the command path is used to name the command in error messages
+    command_path = _worker_state.command_path if _worker_state else None
+    context = click.Context(click.Command(None), info_name=command_path)
+
+    try:
+        with context:
+            result = _FileResult(function(*arguments), stderr.getvalue())
+    except (Exception, SystemExit) as e:
+        result = _FileResult(None, stderr.getvalue(), e)
+    finally:
+        sys.stderr = saved_stderr
+
+    return result
+
+
+def run_per_file(
+    function: Callable, arguments_per_file: Sequence[Sequence], jobs: int = 1
+) -> List[Any]:
+    """
+    call a function once for each file, in parallel if jobs is more than 1
+
+    :param function: a module level function to call [it and its arguments and results must be picklable]
+    :param arguments_per_file: the positional arguments for each call
+    :param jobs: the number of processes to use, with 1 all the calls are made in this process
+    :return: the result of each call in input order
+    """
+
+    if jobs <= 1 or len(arguments_per_file) <= 1:
+        return [function(*arguments) for arguments in arguments_per_file]
+
+    import multiprocessing  # deferred
+    from concurrent.futures import ProcessPoolExecutor  # deferred
+
+    # the process may have loaded multithreaded libraries [e.g. jax] which aren't safe to fork
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(arguments_per_file)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(_current_worker_state(),),
+    ) as executor:
+        futures = [
+            executor.submit(_run_captured, function, arguments)
+            for arguments in arguments_per_file
+        ]
+
+        results = []
+        for future in futures:
+            file_result = future.result()
+
+            sys.stderr.write(file_result.stderr)
+            sys.stderr.flush()
+
+            if file_result.exception is not None:
+                for remaining in futures:
+                    remaining.cancel()
+                raise file_result.exception
+
+            results.append(file_result.result)
+
+    return results
+
+
+def exit_if_jobs_less_than_1(jobs: int):
+    if jobs < 1:
+        exit_error(f"the number of jobs must be 1 or more, i got {jobs}")
@@ -65,7 +65,8 @@ from nef_pipelines.lib.nef_lib import (
     NEF_NONE,
     NEF_TRUE,
     UNUSED,
-    loop_row_dict_iter,
+    LoopBuilder,
+    LoopView,
 )
 from nef_pipelines.lib.structures import (
     AtomLabel,
@@ -338,6 +339,7 @@ def peaks_to_frame(
 
     peak_loop.add_tag(peak_loop_tags)
 
+    peak_loop_builder = LoopBuilder(peak_loop)
     for index, peak in enumerate(peaks, start=1):
         peak_data = {
             INDEX: index,
@@ -383,11 +385,8 @@ def peaks_to_frame(
                 peak_data[CCPN_MERIT] = (
                     peak.figure_of_merit if peak.figure_of_merit is not None else UNUSED
                 )
-        peak_loop.add_data(
-            [
-                peak_data,
-            ]
-        )
+        peak_loop_builder.add_row(peak_data)
+    peak_loop_builder.build()
 
     return frame
 
@@ -407,21 +406,27 @@ def frame_to_peaks(frame: Saveframe, source="unknown") -> List[NewPeak]:
 
     peaks = []
 
-    for line_number, row in enumerate(loop_row_dict_iter(loop), start=1):
+    fields = [CHAIN_CODE, SEQUENCE_CODE, RESIDUE_NAME, ATOM_NAME]
+    raw_tags = [
+        CHAIN_CODE__DIMENSION_INDEX,
+        SEQUENCE_CODE__DIMENSION_INDEX,
+        RESIDUE_NAME__DIMENSION_INDEX,
+        ATOM_NAME__DIMENSION_INDEX,
+    ]
+    dimensions_tags = [
+        (
+            [raw_tag.format(dimension_index=dim_index) for raw_tag in raw_tags],
+            POSITION__DIMENSION_INDEX.format(dimension_index=dim_index),
+            POSITION_UNCERTAINTY__DIMENSION_INDEX.format(dimension_index=dim_index),
+        )
+        for dim_index in range(1, num_dimensions + 1)
+    ]
+
+    for line_number, row in enumerate(LoopView(loop), start=1):
         shift_data = []
-        for dim_index in range(1, num_dimensions + 1):
+        for dimension_tags, position_tag, position_uncertainty_tag in dimensions_tags:
 
             values = {}
-            fields = [CHAIN_CODE, SEQUENCE_CODE, RESIDUE_NAME, ATOM_NAME]
-            raw_tags = [
-                CHAIN_CODE__DIMENSION_INDEX,
-                SEQUENCE_CODE__DIMENSION_INDEX,
-                RESIDUE_NAME__DIMENSION_INDEX,
-                ATOM_NAME__DIMENSION_INDEX,
-            ]
-            dimension_tags = [
-                raw_tag.format(dimension_index=dim_index) for raw_tag in raw_tags
-            ]
             for name, tag in zip(fields, dimension_tags):
                 value = unused_to_empty_string(row[tag])
                 values[name] = value
@@ -440,20 +445,16 @@ def frame_to_peaks(frame: Saveframe, source="unknown") -> List[NewPeak]:
 
             atom_label = AtomLabel(residue, values[ATOM_NAME])
 
-            position = row[POSITION__DIMENSION_INDEX.format(dimension_index=dim_index)]
+            position = row[position_tag]
 
-            line_info = LineInfo(
-                f"{source}[{frame.name} ]", line_number, _row_to_table(row)
-            )
-            _raise_if_position_isnt_float(position, line_info)
-
-            position_uncertainty = unused_to_none(
-                row[
-                    POSITION_UNCERTAINTY__DIMENSION_INDEX.format(
-                        dimension_index=dim_index
-                    )
-                ]
-            )
+            # the line info is only needed for error reporting and is expensive to build
+            if not is_float(position):
+                line_info = LineInfo(
+                    f"{source}[{frame.name} ]", line_number, _row_to_table(row)
+                )
+                _raise_if_position_isnt_float(position, line_info)
+
+            position_uncertainty = unused_to_none(row[position_uncertainty_tag])
 
             shift_datum = ShiftData(atom_label, position, position_uncertainty)
 
@@ -0,0 +1,272 @@
+"""
+    In-process pipelines of nef commands. While a pipeline runs, a step that outputs an entry with
+    nef_lib.print_entry hands the live Entry to the next step through an explicit channel [see hand_off_entry and
+    take_handoff_entry] rather than formatting it as STAR text for the next step to parse. Text is only produced at
+    the ends of the pipeline or for steps which read stdin directly.
+
+    At each step boundary the values in the entry's parsed frames are normalised to the strings a shell pipeline
+    would have produced by formatting and re-reading the entry [e.g. the float 1.5 becomes the string '1.5' and None
+    becomes '.'] so each step sees the same values it would see if the pipeline were run by the shell.
+"""
+
+import io
+import shlex
+import threading
+from dataclasses import dataclass, field
+from typing import IO, Any, Callable, List, Optional, Tuple, Union
+
+from pynmrstar import Entry, definitions
+
+PIPE = "|"
+NEF = "nef"
+
+StepInput = Union[str, IO[bytes]]
+StepExecutor = Callable[[List[str], StepInput], Tuple[str, str, int]]
+
+
+class _Channel(threading.local):
+    # the entries handed between the steps of a pipeline running in this thread
+    def __init__(self):
+        self.active = False
+        self.input_entry: Optional[Entry] = None
+        self.output_entry: Optional[Entry] = None
+
+
+_channel = _Channel()
+
+
+@dataclass
+class PipelineOutcome:
+    """The result of running a pipeline, stderr has one entry per step run."""
+
+    stdout: str = ""
+    stderr: List[str] = field(default_factory=list)
+    exit_code: int = 0
+    steps_completed: int = 0
+
+
+def hand_off_entry(entry: Entry) -> bool:
+    """
+    hand an entry output by the current pipeline step to the next step, an entry is taken to be the last output
+    of a step, any entry handed off earlier in the same step is formatted into the step's stdout first
+
+    :param entry: the entry
+    :return: True if the entry was handed off, False if no pipeline is running and the entry should be printed
+    """
+    if not _channel.active:
+        return False
+
+    if _channel.output_entry is not None:
+        print(_channel.output_entry)
+
+    _channel.output_entry = entry
+
+    return True
+
+
+def take_handoff_entry() -> Optional[Entry]:
+    """
+    get the entry handed to the current pipeline step by the step before, this can only be taken once
+
+    :return: the entry or None if no entry was handed over
+    """
+    entry = _channel.input_entry
+    _channel.input_entry = None
+
+    return entry
+
+
+class _EntryStdin(io.RawIOBase):
+    # stdin for a step that was handed an entry, the entry is only formatted if the step reads stdin itself
+    def __init__(self, entry: Entry):
+        super().__init__()
+        self._entry = entry
+        self._data: Optional[bytes] = None
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if len(buffer) == 0:
+            return 0
+
+        if self._data is None:
+            self._data = f"{self._entry}\n".encode("utf-8")
+
+        chunk = self._data[self._position : self._position + len(buffer)]
+        buffer[: len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+
+def _as_text(value: Any) -> Any:
+    # the value as it would be read back after being formatted [see pynmrstar.utils.quote_value]
+    if isinstance(value, str):
+        return value
+
+    try:
+        if value in definitions.STR_CONVERSION_DICT:
+            value = definitions.STR_CONVERSION_DICT[value]
+    except TypeError:
+        pass
+
+    return value if isinstance(value, str) else str(value)
+
+
+def normalise_entry_values(entry: Entry):
+    """
+    replace values in the parsed frames of an entry which aren't strings by the strings they would be read back
+    as if the entry were formatted and read again, frames which haven't been parsed only contain strings
+
+    :param entry: the entry to normalise in place
+    """
+    from nef_pipelines.lib.lazy_entry_lib import LazySaveframe  # lazy
+
+    for frame in entry.frame_list:
+        if isinstance(frame, LazySaveframe) and not frame.parsed:
+            continue
+
+        for tag in frame.tags:
+            if not isinstance(tag[1], str):
+                tag[1] = _as_text(tag[1])
+
+        for loop in frame.loops:
+            for row in loop.data:
+                for index, value in enumerate(row):
+                    if not isinstance(value, str):
+                        row[index] = _as_text(value)
+
+
+def parse_pipeline(pipeline: Union[str, List[str]]) -> List[List[str]]:
+    """
+    split a pipeline of nef commands into steps, steps are separated by | and may optionally start with nef e.g.
+    "frames rename a b | nef save -" -> [["frames", "rename", "a", "b"], ["save", "-"]]
+
+    :param pipeline: the pipeline as a string or a list of strings which are joined with spaces
+    :return: a list of the arguments for each step
+    """
+    if not isinstance(pipeline, str):
+        pipeline = " ".join(pipeline)
+
+    lexer = shlex.shlex(pipeline, posix=True, punctuation_chars=PIPE)
+    lexer.whitespace_split = True
+
+    steps = [[]]
+    for token in lexer:
+        if token == PIPE:
+            steps.append([])
+        else:
+            steps[-1].append(token)
+
+    return [step[1:] if step and step[0] == NEF else step for step in steps]
+
+
+def invoke_step(args: List[str], nef_input: StepInput) -> Tuple[str, str, int]:
+    """
+    run a nef command in process
+
+    :param args: the command's arguments [without the leading nef]
+    :param nef_input: the command's stdin as text or a binary stream
+    :return: the command's stdout, stderr and exit code
+    """
+    from typer.testing import CliRunner  # lazy
+
+    from nef_pipelines import nef_app  # lazy
+    from nef_pipelines.lib.cli_runner_lib import (  # lazy
+        _MarkerCliRunner,
+        _split_marked_output,
+    )
+
+    # click < 8.3 needs stderr marking to separate the streams, click >= 8.3 separates them natively
+    try:
+        runner = _MarkerCliRunner(mix_stderr=True)
+    except TypeError:
+        runner = CliRunner()
+
+    result = runner.invoke(nef_app.app, args, input=nef_input, prog_name=NEF)  # allowed
+
+    if isinstance(runner, _MarkerCliRunner):
+        stdout, stderr = _split_marked_output(result.output)
+    else:
+        stdout, stderr = result.stdout or "", result.stderr or ""
+
+    if result.exception and not isinstance(result.exception, SystemExit):
+        stderr += f"Exception: {type(result.exception).__name__}: {result.exception}"
+
+    return stdout, stderr, result.exit_code
+
+
+def run_pipeline(
+    steps: List[List[str]],
+    nef_input: str = "",
+    execute_step: Optional[StepExecutor] = None,
+) -> PipelineOutcome:
+    """
+    run a pipeline of nef commands in process, the entry or text output by each step is the input of the next.
+    Empty steps are skipped and the pipeline stops at the first step that fails
+
+    Note: an entry is handed from step to step without copying so if a step fails after modifying its input,
+          the output reported for the previous step includes the modifications
+
+    :param steps: the arguments for each step [without the leading nef]
+    :param nef_input: the text input to the first step
+    :param execute_step: the function used to run a step, the default runs the step in a CliRunner
+    :return: the stdout of the last successful step, stderr for each step, the exit code and how many steps
+             completed
+    """
+    from nef_pipelines.lib.globals_lib import debug_get_globals, replace_globals  # lazy
+
+    execute_step = execute_step if execute_step else invoke_step
+
+    outcome = PipelineOutcome(stdout=nef_input)
+    entry = None
+
+    initial_globals = debug_get_globals()
+    saved_channel = (_channel.active, _channel.input_entry, _channel.output_entry)
+    try:
+        for args in steps:
+            if not args:
+                outcome.stderr.append("")
+                continue
+
+            # each step sees the globals as they were at the start, as if it ran in its own process
+            replace_globals(initial_globals)
+
+            step_input = outcome.stdout
+            if entry is not None:
+                normalise_entry_values(entry)
+                step_input = io.BufferedReader(_EntryStdin(entry))
+
+            _channel.active = True
+            _channel.input_entry = entry
+            _channel.output_entry = None
+
+            stdout, stderr, exit_code = execute_step(args, step_input)
+
+            output_entry = _channel.output_entry
+            _channel.active = False
+            _channel.input_entry = None
+            _channel.output_entry = None
+
+            outcome.stderr.append(stderr)
+            outcome.exit_code = exit_code
+            if exit_code != 0:
+                break
+
+            # an entry handed off after other output is formatted after it as print would have done
+            if output_entry is not None and stdout.strip():
+                stdout = f"{stdout}{output_entry}\n"
+                output_entry = None
+
+            entry = output_entry
+            outcome.stdout = stdout
+            outcome.steps_completed += 1
+
+        if entry is not None:
+            outcome.stdout = f"{entry}\n"
+    finally:
+        _channel.active, _channel.input_entry, _channel.output_entry = saved_channel
+        replace_globals(initial_globals)
+
+    return outcome
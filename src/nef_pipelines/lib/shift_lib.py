@@ -7,7 +7,7 @@ from typing import Dict, Iterable, List, Tuple
 
 from pynmrstar import Loop, Saveframe
 
-from nef_pipelines.lib.nef_lib import UNUSED, loop_row_namespace_iter
+from nef_pipelines.lib.nef_lib import UNUSED, LoopBuilder, LoopView
 from nef_pipelines.lib.structures import (
     AtomLabel,
     Residue,
@@ -43,30 +43,32 @@ def nef_frames_to_shifts(frames: List[Saveframe]) -> List[ShiftData]:
         except KeyError:
             continue
 
-        for i, row in enumerate(loop_row_namespace_iter(loop), start=1):
+        for i, row in enumerate(LoopView(loop), start=1):
+
+            row_values = row.to_dict()
 
             residue_fields = {
                 name: value
-                for name, value in vars(row).items()
+                for name, value in row_values.items()
                 if name in residue_field_names
             }
             atom_fields = {
                 name: value
-                for name, value in vars(row).items()
+                for name, value in row_values.items()
                 if name in atom_field_names
             }
             residue = Residue(**residue_fields)
             label = AtomLabel(residue, **atom_fields)
 
-            value_str = ", ".join([f"{value}" for value in vars(row).values()])
-            name_str = ", ".join([f"{name}" for name in vars(row).keys()])
+            value_str = ", ".join([f"{value}" for value in row_values.values()])
+            name_str = ", ".join([f"{name}" for name in row_values.keys()])
 
             line = f"{name_str}\n{value_str}"
 
             shift_data = ShiftData(
                 label,
-                row.value,
-                row.value_uncertainty,
+                row_values["value"],
+                row_values["value_uncertainty"],
                 frame_name=frame.name,
                 frame_row=i,
                 frame_line=line,
@@ -110,6 +112,7 @@ def shifts_to_nef_frame(shift_list: ShiftList, frame_name: str) -> Saveframe:
     loop.set_category(SHIFT_LOOP_CATEGORY)
     loop.add_tag(tags)
 
+    loop_builder = LoopBuilder(loop)
     for shift in shift_list.shifts:
         value_uncertainty = (
             shift.value_uncertainty if shift.value_uncertainty else UNUSED
@@ -131,11 +134,8 @@ def shifts_to_nef_frame(shift_list: ShiftList, frame_name: str) -> Saveframe:
             "element": element,
             "isotope_number": isotope_number,
         }
-        loop.add_data(
-            [
-                row_data,
-            ]
-        )
+        loop_builder.add_row(row_data)
+    loop_builder.build()
 
     return frame
 
@@ -0,0 +1,398 @@
+"""
+A k-d tree over points in a few dimensions [e.g. isotope weighted peak positions] which supports nearest neighbour,
+k nearest neighbour and radius queries, with an optional numpy path for batches of nearest neighbour queries, and an
+optimal one to one assignment between two sets of points.
+
+Distances are euclidean and are calculated in the same way on all paths so ties between equidistant points are
+reported consistently.
+"""
+
+from heapq import heappop, heappush, heappushpop
+from math import inf, sqrt
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_LEAF_SIZE = 8
+
+# slack when pruning branches of the tree so points at exactly the best distance [ties] are never missed
+_PRUNE_TOLERANCE = 1e-9
+
+# the number of point pairs compared at once by the numpy path for batches of nearest neighbour queries
+_NUMPY_CHUNK_PAIRS = 1 << 22
+
+# the number of nearest points in the other set considered for each point by optimal_assignment
+DEFAULT_CANDIDATES = 8
+
+Point = Sequence[float]
+
+
+def distance(point_1: Point, point_2: Point) -> float:
+    """
+    the euclidean distance between two points
+
+    :param point_1: the first point
+    :param point_2: the second point
+    :return: the distance
+    """
+    return sqrt(
+        sum([(value_1 - value_2) ** 2 for value_1, value_2 in zip(point_1, point_2)])
+    )
+
+
+class KDTree:
+    """
+    A k-d tree of points each with an id, results are reported by id with points at the same distance reported in
+    the order they were added to the tree.
+    """
+
+    def __init__(self, points: Sequence[Point], ids: Optional[Sequence[Any]] = None):
+        """
+        :param points: the points all with the same number of dimensions
+        :param ids: an id for each point, the default is the index of the point
+        """
+
+        self._points = [tuple(float(value) for value in point) for point in points]
+        self._ids = list(ids) if ids is not None else list(range(len(self._points)))
+
+        if len(self._ids) != len(self._points):
+            msg = f"there must be one id for each point, i got {len(self._ids)} ids and {len(self._points)} points"
+            raise ValueError(msg)
+
+        dimensions = {len(point) for point in self._points}
+        if len(dimensions) > 1:
+            raise ValueError(
+                f"all points must have the same number of dimensions, i got {sorted(dimensions)}"
+            )
+
+        self._root = (
+            self._build(list(range(len(self._points)))) if self._points else None
+        )
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _build(self, indices: List[int]):
+        # leaves are lists of point indices, branches are tuples of (axis, split, left, right) where points in left
+        # have values <= split and points in right have values >= split on the axis
+        if len(indices) <= _LEAF_SIZE:
+            return indices
+
+        points = self._points
+        dimensions = len(points[indices[0]])
+        spreads = [
+            max(points[index][axis] for index in indices)
+            - min(points[index][axis] for index in indices)
+            for axis in range(dimensions)
+        ]
+        axis = spreads.index(max(spreads))
+
+        indices = sorted(indices, key=lambda index: points[index][axis])
+        middle = len(indices) // 2
+
+        return (
+            axis,
+            points[indices[middle]][axis],
+            self._build(indices[:middle]),
+            self._build(indices[middle:]),
+        )
+
+    def nearest(self, point: Point) -> Tuple[List[Any], float]:
+        """
+        find the nearest points to a point
+
+        :param point: the point to search from
+        :return: the ids of the points at the smallest distance [more than one if there are ties] and the distance,
+                 an empty list and inf if the tree is empty
+        """
+
+        best = [inf, []]
+        if self._root is not None:
+            self._search_nearest(self._root, tuple(point), best)
+
+        return [self._ids[index] for index in sorted(best[1])], best[0]
+
+    def _search_nearest(self, node, point, best):
+        if isinstance(node, list):
+            for index in node:
+                point_distance = distance(point, self._points[index])
+                if point_distance < best[0]:
+                    best[0] = point_distance
+                    best[1] = [index]
+                elif point_distance == best[0]:
+                    best[1].append(index)
+            return
+
+        axis, split, left, right = node
+        offset = point[axis] - split
+        near, far = (left, right) if offset < 0 else (right, left)
+
+        self._search_nearest(near, point, best)
+        if abs(offset) <= best[0] + _PRUNE_TOLERANCE:
+            self._search_nearest(far, point, best)
+
+    def nearest_k(self, point: Point, k: int) -> List[Tuple[Any, float]]:
+        """
+        find the k nearest points to a point
+
+        :param point: the point to search from
+        :param k: the number of points to find
+        :return: up to k ids and distances sorted by distance
+        """
+
+        heap = []
+        if self._root is not None and k > 0:
+            self._search_nearest_k(self._root, tuple(point), k, heap)
+
+        results = sorted(
+            (-negative_distance, -negative_index)
+            for negative_distance, negative_index in heap
+        )
+        return [(self._ids[index], point_distance) for point_distance, index in results]
+
+    def _search_nearest_k(self, node, point, k, heap):
+        # heap is a max heap of the best k as (-distance, -index) so the worst candidate is at the top
+        if isinstance(node, list):
+            for index in node:
+                item = (-distance(point, self._points[index]), -index)
+                if len(heap) < k:
+                    heappush(heap, item)
+                elif item > heap[0]:
+                    heappushpop(heap, item)
+            return
+
+        axis, split, left, right = node
+        offset = point[axis] - split
+        near, far = (left, right) if offset < 0 else (right, left)
+
+        self._search_nearest_k(near, point, k, heap)
+        if len(heap) < k or abs(offset) <= -heap[0][0] + _PRUNE_TOLERANCE:
+            self._search_nearest_k(far, point, k, heap)
+
+    def within(self, point: Point, radius: float) -> List[Tuple[Any, float]]:
+        """
+        find the points within a distance of a point
+
+        :param point: the point to search from
+        :param radius: the largest distance to include
+        :return: the ids and distances of the points sorted by distance
+        """
+
+        found = []
+        if self._root is not None:
+            self._search_within(self._root, tuple(point), radius, found)
+
+        return [
+            (self._ids[index], point_distance)
+            for point_distance, index in sorted(found)
+        ]
+
+    def _search_within(self, node, point, radius, found):
+        if isinstance(node, list):
+            for index in node:
+                point_distance = distance(point, self._points[index])
+                if point_distance <= radius:
+                    found.append((point_distance, index))
+            return
+
+        axis, split, left, right = node
+        offset = point[axis] - split
+        near, far = (left, right) if offset < 0 else (right, left)
+
+        self._search_within(near, point, radius, found)
+        if abs(offset) <= radius + _PRUNE_TOLERANCE:
+            self._search_within(far, point, radius, found)
+
+    def nearest_batch(
+        self, points: Sequence[Point], use_numpy: bool = False
+    ) -> List[Tuple[List[Any], float]]:
+        """
+        find the nearest points to each of a list of points
+
+        :param points: the points to search from
+        :param use_numpy: compare each point with every point in the tree using numpy rather than searching the tree,
+                          this is only faster when the tree prunes poorly [e.g. the points are far from the tree's]
+        :return: the result of nearest for each point
+        """
+
+        if use_numpy and self._points and points:
+            return self._nearest_batch_numpy(points)
+
+        return [self.nearest(point) for point in points]
+
+    def _nearest_batch_numpy(self, points):
+        import numpy as np  # optional dependency
+
+        tree_points = np.array(self._points, dtype=np.float64)
+        query_points = np.array([tuple(point) for point in points], dtype=np.float64)
+
+        chunk_size = max(1, _NUMPY_CHUNK_PAIRS // len(tree_points))
+
+        results = []
+        for start in range(0, len(query_points), chunk_size):
+            chunk = query_points[start : start + chunk_size]
+
+            squared_distances = np.zeros((len(chunk), len(tree_points)))
+            for axis in range(tree_points.shape[1]):
+                squared_distances += (
+                    chunk[:, axis, None] - tree_points[None, :, axis]
+                ) ** 2
+
+            # numpy's rounding can differ from python's in the last place so the candidates for the nearest points
+            # are checked with the same distance calculation as the tree
+            limits = squared_distances.min(axis=1) * (1.0 + 1e-9) + 1e-300
+            for point, row, limit in zip(chunk, squared_distances, limits):
+                point = tuple(point)
+                best = [inf, []]
+                for index in np.flatnonzero(row <= limit):
+                    point_distance = distance(point, self._points[index])
+                    if point_distance < best[0]:
+                        best = [point_distance, [index]]
+                    elif point_distance == best[0]:
+                        best[1].append(index)
+                results.append(([self._ids[index] for index in best[1]], best[0]))
+
+        return results
+
+
+def optimal_assignment(
+    points_1: Sequence[Point],
+    points_2: Sequence[Point],
+    max_distance: Optional[float] = None,
+    candidates: int = DEFAULT_CANDIDATES,
+) -> List[Tuple[int, int, float]]:
+    """
+    match two sets of points one to one, as many points as possible are matched and of those matchings the one with
+    the smallest total distance is chosen [the Hungarian algorithm as successive shortest augmenting paths]
+
+    Only candidate pairs of points found with k-d trees are matched, rather than every pair. If max_distance is
+    given the candidates are the pairs within it and the result is the optimal matching of those pairs. Otherwise
+    the candidates are each point's candidates nearest points in the other set, if this leaves points in the smaller
+    set unmatched the number of candidates is doubled until they are all matched. Without a max_distance the result
+    is an approximation, a point's partner in the optimal matching of every pair may not be one of its nearest
+    points, this is rare for sets of points that are close to each other [e.g. two peak lists] and candidates as
+    large as the number of points compares every pair
+
+    :param points_1: the first set of points
+    :param points_2: the second set of points
+    :param max_distance: the largest distance between matched points
+    :param candidates: the number of nearest points to consider for each point if there is no max_distance
+    :return: matches as (index in points_1, index in points_2, distance) sorted by index in points_1
+    """
+
+    if not points_1 or not points_2:
+        return []
+
+    if max_distance is not None:
+        tree_2 = KDTree(points_2)
+        edges_by_row = [dict(tree_2.within(point, max_distance)) for point in points_1]
+        row_to_column = _min_cost_matching(edges_by_row, len(points_2))
+    else:
+        tree_1 = KDTree(points_1)
+        tree_2 = KDTree(points_2)
+
+        # every point in the smaller set can be matched when every pair is considered
+        num_matchable = min(len(points_1), len(points_2))
+        max_candidates = max(len(points_1), len(points_2))
+        num_candidates = max(1, candidates)
+        while True:
+            edges_by_row = [
+                dict(tree_2.nearest_k(point, num_candidates)) for point in points_1
+            ]
+            for column, point in enumerate(points_2):
+                for row, point_distance in tree_1.nearest_k(point, num_candidates):
+                    edges_by_row[row][column] = point_distance
+
+            row_to_column = _min_cost_matching(edges_by_row, len(points_2))
+
+            if len(row_to_column) == num_matchable or num_candidates >= max_candidates:
+                break
+
+            num_candidates *= 2
+
+    return [
+        (row, column, edges_by_row[row][column])
+        for row, column in sorted(row_to_column.items())
+    ]
+
+
+def _min_cost_matching(
+    edges_by_row: List[Dict[int, float]], num_columns: int
+) -> Dict[int, int]:
+    # successive shortest augmenting paths [Dijkstra on reduced costs with row and column potentials] on a sparse
+    # bipartite graph, each row also has a private dummy column with a cost larger than any matching of real edges
+    # so every row can be matched and leaving a row unmatched is only chosen when it has to be
+    num_rows = len(edges_by_row)
+    unmatched_cost = 1.0 + 2.0 * sum(sum(edges.values()) for edges in edges_by_row)
+
+    row_edges = [
+        [*edges.items(), (num_columns + row, unmatched_cost)]
+        for row, edges in enumerate(edges_by_row)
+    ]
+
+    row_potentials = [0.0] * num_rows
+    column_potentials = [0.0] * (num_columns + num_rows)
+    row_for_column = [-1] * (num_columns + num_rows)
+    column_for_row = [-1] * num_rows
+
+    for start_row in range(num_rows):
+        column_distances = {}
+        previous_row = {}
+        finished_columns = []
+        finished = set()
+        row_distances = {start_row: 0.0}
+        heap = []
+
+        def relax(row, row_distance):
+            for column, cost in row_edges[row]:
+                if column in finished:
+                    continue
+                new_distance = (
+                    row_distance
+                    + cost
+                    - row_potentials[row]
+                    - column_potentials[column]
+                )
+                if new_distance < column_distances.get(column, inf):
+                    column_distances[column] = new_distance
+                    previous_row[column] = row
+                    heappush(heap, (new_distance, column))
+
+        relax(start_row, 0.0)
+
+        free_column = None
+        path_distance = 0.0
+        while heap:
+            column_distance, column = heappop(heap)
+            if column in finished or column_distance > column_distances[column]:
+                continue
+
+            finished.add(column)
+            finished_columns.append(column)
+
+            matched_row = row_for_column[column]
+            if matched_row == -1:
+                free_column = column
+                path_distance = column_distance
+                break
+
+            row_distances[matched_row] = column_distance
+            relax(matched_row, column_distance)
+
+        # the start row's dummy column is always free so a path is always found
+        for row, row_distance in row_distances.items():
+            row_potentials[row] += path_distance - row_distance
+        for column in finished_columns:
+            column_potentials[column] -= path_distance - column_distances[column]
+
+        column = free_column
+        while True:
+            row = previous_row[column]
+            next_column = column_for_row[row]
+            row_for_column[column] = row
+            column_for_row[row] = column
+            if row == start_row:
+                break
+            column = next_column
+
+    return {
+        row: column for row, column in enumerate(column_for_row) if column < num_columns
+    }
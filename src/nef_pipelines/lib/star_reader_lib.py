@@ -0,0 +1,334 @@
+"""
+    A fast path for reading NEF saveframes. Frame and loop tags are found with a regular expression token scan
+    and loop values are read in bulk: loops whose values are all bare words are split on white space in one go
+    and loops with quoted values or comments are read with a single regular expression, the values are then cut
+    into rows in one pass rather than being added a token at a time.
+
+    Anything unusual [semicolon delimited strings, unexpected quoting, keywords or tags where values are expected,
+    characters which may not count as white space to pynmrstar] is left to pynmrstar's parser, which also reports
+    any errors, so the fast path only ever produces the same saveframe pynmrstar would.
+
+    The same scan can also check the shape of a saveframe without building it [see is_well_formed_saveframe].
+"""
+
+import logging
+import re
+from typing import List, Optional, Tuple
+
+from pynmrstar import Loop, Saveframe, definitions
+
+# a star token: a semicolon delimited string [which must start in the first column], a comment, a quoted string
+# [which only ends at a quote followed by white space] or a bare word
+STAR_TOKEN = re.compile(
+    r"""^;(?s:.*?)^;|#[^\n]*|'[^\n]*?'(?=\s|$)|"[^\n]*?"(?=\s|$)|\S+""",
+    re.MULTILINE,
+)
+
+# the values of a loop with quoted values or comments: a quoted string, a comment or a bare word
+_LOOP_VALUE = re.compile(r"""'([^\n]*?)'(?=\s|$)|"([^\n]*?)"(?=\s|$)|(#[^\n]*)|(\S+)""")
+
+# characters which mean loop values can't just be split on white space
+_SPECIAL_CHARACTERS = "_'\"#;"
+
+# white space other than spaces, tabs and new lines [python and pynmrstar may not agree on where it splits]
+_UNUSUAL_WHITE_SPACE = re.compile(r"[^\S \t\n]")
+_UNUSUAL_ASCII_WHITE_SPACE = "\v\f\r\x1c\x1d\x1e\x1f"
+
+_QUOTES = "'\""
+
+LOOP = "loop_"
+STOP = "stop_"
+SAVE = "save_"
+
+_SOURCE = "from_string()"
+
+_logger = logging.getLogger("pynmrstar")
+
+
+def next_token(text: str, pos: int) -> Tuple[Optional[str], int, int]:
+    """
+    the next token in STAR text that isn't a comment
+
+    :param text: the text to scan
+    :param pos: the position to start scanning from
+    :return: the token with its start and end or None if there are no more tokens
+    """
+    while True:
+        match = STAR_TOKEN.search(text, pos)
+        if match is None:
+            return None, len(text), len(text)
+
+        token = match.group()
+        if token[0] != "#":
+            return token, match.start(), match.end()
+
+        pos = match.end()
+
+
+def find_stop(text: str, start: int) -> int:
+    """
+    the position of the next lower case stop_ keyword surrounded by white space, other cases are left to a token
+    scan
+
+    :param text: the text to search
+    :param start: the position to start searching from
+    :return: the position of the keyword or -1 if there isn't one
+    """
+    stop = text.find(STOP, start)
+    while stop != -1:
+        before = text[stop - 1 : stop]
+        after = text[stop + len(STOP) : stop + len(STOP) + 1]
+        if before.isspace() and (not after or after.isspace()):
+            return stop
+        stop = text.find(STOP, stop + len(STOP))
+
+    return -1
+
+
+def _has_unusual_white_space(text: str) -> bool:
+    # searching for a handful of characters is much faster than a regular expression over the whole text
+    if text.isascii():
+        return any(character in text for character in _UNUSUAL_ASCII_WHITE_SPACE)
+    return _UNUSUAL_WHITE_SPACE.search(text) is not None
+
+
+def _is_bare_value(token: str) -> bool:
+    # a bare word pynmrstar reads as a value without complaint
+    lower = token.lower()
+    return (
+        token[0] not in _SPECIAL_CHARACTERS
+        and lower not in definitions.RESERVED_KEYWORDS
+        and not lower.startswith((LOOP, STOP, SAVE, "data_", "global_"))
+    )
+
+
+def _unquote(token: str) -> Optional[str]:
+    # the value of a frame tag token or None if it isn't one the fast path reads
+    if token[0] in _QUOTES:
+        if len(token) > 2 and token[-1] == token[0]:
+            return token[1:-1]
+        return None
+
+    return token if _is_bare_value(token) else None
+
+
+def _read_loop_values(body: str) -> Optional[List[str]]:
+    if not any(character in body for character in _SPECIAL_CHARACTERS):
+        return body.split()
+
+    values = []
+    for single_quoted, double_quoted, comment, bare in _LOOP_VALUE.findall(body):
+        if bare:
+            if not _is_bare_value(bare):
+                return None
+            values.append(bare)
+        elif comment:
+            continue
+        else:
+            value = single_quoted or double_quoted
+            # empty quoted strings are left to pynmrstar which also rejects a quoted stop_
+            if not value or value.lower() == STOP:
+                return None
+            values.append(value)
+
+    return values
+
+
+def _read_loop(text: str, pos: int, frame: Saveframe) -> Tuple[Optional[Loop], int]:
+
+    loop = Loop.from_scratch(source=_SOURCE)
+
+    token, start, pos = next_token(text, pos)
+    while token is not None and token[0] == "_":
+        try:
+            loop.add_tag(token)
+        except ValueError:
+            return None, pos
+        token, start, pos = next_token(text, pos)
+
+    if not loop.tags:
+        return None, pos
+
+    stop = find_stop(text, start)
+    if stop == -1:
+        return None, pos
+
+    values = _read_loop_values(text[start:stop])
+    if values is None or len(values) % len(loop.tags) != 0:
+        return None, pos
+
+    try:
+        frame.add_loop(loop)
+    except ValueError:
+        return None, pos
+
+    if values:
+        tag_count = len(loop.tags)
+        loop.data = [
+            values[row_start : row_start + tag_count]
+            for row_start in range(0, len(values), tag_count)
+        ]
+    else:
+        # the same warning pynmrstar gives, the line number is that of the stop_ keyword
+        _logger.warning("Loop with no data on line: %s", text.count("\n", 0, stop) + 1)
+
+    return loop, stop + len(STOP)
+
+
+def read_saveframe_fast(text: str) -> Optional[Saveframe]:
+    """
+    read a saveframe using the fast path, this only reads well-formed NEF and returns None for anything else
+
+    :param text: the text of the saveframe from save_<name> to save_
+    :return: the saveframe [the same as pynmrstar's Saveframe.from_string would return] or None if the text
+             should be read by pynmrstar
+    """
+
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    if "\n;" in text or text.startswith(";") or _has_unusual_white_space(text):
+        return None
+
+    token, _, pos = next_token(text, 0)
+    if token is None or not token.lower().startswith(SAVE) or len(token) == len(SAVE):
+        return None
+
+    frame = Saveframe.from_scratch(token[len(SAVE) :], source=_SOURCE)
+
+    while True:
+        token, _, pos = next_token(text, pos)
+        if token is None:
+            return None
+
+        lower = token.lower()
+
+        if token[0] == "_":
+            value, _, pos = next_token(text, pos)
+            value = _unquote(value) if value is not None else None
+            if value is None:
+                return None
+            try:
+                frame.add_tag(token, value)
+            except ValueError:
+                return None
+
+        elif lower == LOOP:
+            loop, pos = _read_loop(text, pos, frame)
+            if loop is None:
+                return None
+
+        elif lower == SAVE:
+            if frame.tag_prefix is None or next_token(text, pos)[0] is not None:
+                return None
+            return frame
+
+        else:
+            return None
+
+
+def _counted_loop_values(text: str, start: int) -> Tuple[Optional[int], int]:
+    # count loop values a token at a time [e.g. when there are semicolon delimited strings], returns the count or
+    # None if the values aren't simple and the position after the loop's stop_
+    count = 0
+    token, start, pos = next_token(text, start)
+    while token is not None and token.lower() != STOP:
+        value = token if token[0] == ";" else _unquote(token)
+        if value is None or value.lower() == STOP:
+            return None, pos
+        count += 1
+        token, start, pos = next_token(text, pos)
+
+    return (None if token is None else count), pos
+
+
+def _loop_value_count(text: str, start: int, stop: int) -> Optional[int]:
+    # the number of values in a loop body or None if the body has anything the fast path doesn't read
+    body = text[start:stop]
+    if not any(character in body for character in _SPECIAL_CHARACTERS):
+        return len(body.split())
+
+    values = _read_loop_values(body)
+    return None if values is None else len(values)
+
+
+def is_well_formed_saveframe(text: str) -> bool:
+    """
+    check the shape of a saveframe without building it: every tag has a value, every loop has tags and a
+    whole number of rows and the frame ends with save_. This is cheaper than reading the frame and is used to
+    reject malformed frames when an entry is read without parsing its frames [see lazy_entry_lib]
+
+    :param text: the text of the saveframe from save_<name> to save_
+    :return: True if the frame is well formed, False if it isn't or if it needs pynmrstar to decide [e.g. it has
+             unusual quoting or white space]
+    """
+
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    if text.startswith(";") or _has_unusual_white_space(text):
+        return False
+
+    # semicolon delimited strings can hide keywords so loops are then counted a token at a time
+    has_semicolon_strings = "\n;" in text
+
+    token, _, pos = next_token(text, 0)
+    if token is None or not token.lower().startswith(SAVE) or len(token) == len(SAVE):
+        return False
+
+    while True:
+        token, _, pos = next_token(text, pos)
+        if token is None:
+            return False
+
+        lower = token.lower()
+
+        if token[0] == "_":
+            value, _, pos = next_token(text, pos)
+            if value is None or (value[0] != ";" and _unquote(value) is None):
+                return False
+
+        elif lower == LOOP:
+            tag_count = 0
+            token, start, pos = next_token(text, pos)
+            while token is not None and token[0] == "_":
+                tag_count += 1
+                token, start, pos = next_token(text, pos)
+
+            if tag_count == 0 or token is None:
+                return False
+
+            if has_semicolon_strings:
+                value_count, pos = _counted_loop_values(text, start)
+            else:
+                stop = find_stop(text, start)
+                if stop == -1:
+                    return False
+                value_count = _loop_value_count(text, start, stop)
+                pos = stop + len(STOP)
+
+            if value_count is None or value_count % tag_count != 0:
+                return False
+
+        elif lower == SAVE:
+            return next_token(text, pos)[0] is None
+
+        else:
+            return False
+
+
+def saveframe_from_string(text: str) -> Saveframe:
+    """
+    read a saveframe from its text, well-formed NEF is read by the fast path and anything else by pynmrstar
+
+    can throw a ParsingError from PyNMRStar
+
+    :param text: the text of the saveframe from save_<name> to save_
+    :return: the saveframe
+    """
+
+    frame = read_saveframe_fast(text)
+    if frame is None:
+        frame = Saveframe.from_string(text)
+
+    return frame
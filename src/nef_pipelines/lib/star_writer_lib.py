@@ -0,0 +1,374 @@
+"""
+    A writer for NEF/STAR entries, saveframes and loops that produces the same text as pynmrstar's str() but
+    formats loops a column at a time: each distinct value in a column is quoted once, the column widths are found
+    in the same pass and the rows are streamed to the output in chunks rather than built up as one string.
+
+    Loops can also be written for a selection of their tags and a window of their rows without copying the data
+    into a new loop first [see frames display].
+
+    Quoting is done by pynmrstar's own quote_value so values are quoted exactly as pynmrstar would quote them.
+"""
+
+import io
+from typing import Any, Iterable, List, Optional, Sequence, TextIO, Tuple
+
+from pynmrstar import Entry, Loop, Saveframe, cnmrstar, definitions
+from pynmrstar._internal import _get_comments
+from pynmrstar.exceptions import InvalidStateError
+from pynmrstar.utils import quote_value
+
+# the number of loop rows formatted before they are written to the output
+ROWS_PER_CHUNK = 1000
+
+_LOOP_ROW_INDENT = "     "
+_LOOP_ROW_END = " \n"
+_MINIMUM_COLUMN_WIDTH = 4
+_COLUMN_SEPARATION = 3
+
+
+def _pad_column(column: Sequence[Any]) -> List[str]:
+
+    # a column of strings is quoted and padded once per distinct value, other types [int, float, bool ...] can
+    # compare equal to each other while formatting differently so they are quoted one by one
+    if set(map(type, column)) == {str}:
+        values = list(dict.fromkeys(column))
+        texts = _quote_strings(values)
+        width = _column_width(texts)
+        padded_by_value = dict(zip(values, [text.ljust(width) for text in texts]))
+        return list(map(padded_by_value.__getitem__, column))
+
+    texts = _multi_line_values_on_own_lines([quote_value(value) for value in column])
+    width = _column_width(texts)
+    return [text.ljust(width) for text in texts]
+
+
+def _quote_strings(values: List[str]) -> List[str]:
+    # strings go straight to cnmrstar unless pynmrstar has been asked to convert some of them [e.g. "" to "."]
+    quote = (
+        quote_value
+        if definitions.STR_CONVERSION_DICT.keys() & values
+        else cnmrstar.quote_value
+    )
+    return _multi_line_values_on_own_lines(list(map(quote, values)))
+
+
+def _multi_line_values_on_own_lines(texts: List[str]) -> List[str]:
+    if any("\n" in text for text in texts):
+        texts = [f"\n;\n{text};\n" if "\n" in text else text for text in texts]
+    return texts
+
+
+def _column_width(texts: List[str]) -> int:
+    # multi line values are written on their own lines and don't widen their column
+    single_line_texts = [text for text in texts if "\n" not in text]
+    width = max(map(len, single_line_texts), default=0) + _COLUMN_SEPARATION
+    return max(width, _MINIMUM_COLUMN_WIDTH)
+
+
+def _raise_empty_loop_value(loop: Loop, rows: Sequence[Sequence[Any]], tag_indices):
+    for row_position, row in enumerate(rows):
+        for column_position, tag_index in enumerate(tag_indices):
+            if row[tag_index] == "":
+                raise InvalidStateError(
+                    "Cannot generate NMR-STAR for entry, as empty strings are not valid tag values in NMR-STAR. "
+                    "Please either replace the empty strings with None objects, or set "
+                    "pynmrstar.definitions.STR_CONVERSION_DICT[''] = None.\n"
+                    f"Loop: {loop.category} Row: {row_position} Column: {column_position}"
+                )
+
+
+def write_loop(
+    loop: Loop,
+    file: TextIO,
+    tags: Optional[Sequence[str]] = None,
+    rows: Optional[Iterable[int]] = None,
+    skip_empty_loops: bool = False,
+    skip_empty_tags: bool = False,
+):
+    """
+    write a loop in STAR format, the output is the same as str(loop) for a loop with the selected tags and rows
+
+    :param loop: the loop to write
+    :param file: the file to write to
+    :param tags: the tags [columns] to write in the order to write them, None for all tags
+    :param rows: the indices of the rows to write in the order to write them, None for all rows
+    :param skip_empty_loops: don't write anything if there are no rows to write
+    :param skip_empty_tags: don't write columns which only contain null values
+    """
+
+    data = loop.data if rows is None else [loop.data[index] for index in rows]
+    tag_names = list(loop.tags) if tags is None else list(tags)
+
+    if len(data) == 0:
+        if skip_empty_loops:
+            return
+        if len(tag_names) == 0:
+            file.write("\n   loop_\n\n   stop_\n")
+            return
+
+    if len(tag_names) == 0:
+        raise InvalidStateError(
+            "Impossible to print data if there are no associated tags. Error in loop "
+            f"'{loop.category}' which contains data but hasn't had any tags added."
+        )
+
+    if len(data) != 0:
+        loop._check_tags_match_data()
+
+    loop_tags = loop.tags
+    tag_indices = [loop_tags.index(tag) for tag in tag_names]
+
+    if skip_empty_tags:
+        null_values = definitions.NULL_VALUES
+        tag_indices = [
+            tag_index
+            for tag_index in tag_indices
+            if not all(row[tag_index] in null_values for row in data)
+        ]
+        if not tag_indices:
+            return
+        tag_names = [loop_tags[tag_index] for tag_index in tag_indices]
+
+    if loop.category is None:
+        raise InvalidStateError(
+            "The category was never set for this loop. Either add a tag with the category intact, specify it "
+            "when generating the loop, or set it using Loop.set_category()."
+        )
+
+    header = [f"      {loop.category}.{tag}\n" for tag in tag_names]
+    file.write("".join(["\n   loop_\n", *header, "\n"]))
+
+    if len(data) != 0:
+        try:
+            padded_columns = [
+                _pad_column([row[tag_index] for row in data])
+                for tag_index in tag_indices
+            ]
+        except ValueError:
+            _raise_empty_loop_value(loop, data, tag_indices)
+            raise
+
+        row_format = f"{_LOOP_ROW_INDENT}{'{}' * len(padded_columns)}{_LOOP_ROW_END}"
+        for start in range(0, len(data), ROWS_PER_CHUNK):
+            end = start + ROWS_PER_CHUNK
+            chunk = [column[start:end] for column in padded_columns]
+            file.write("".join(map(row_format.format, *chunk)))
+
+    file.write("\n   stop_\n")
+
+
+def format_loop(
+    loop: Loop,
+    tags: Optional[Sequence[str]] = None,
+    rows: Optional[Iterable[int]] = None,
+    skip_empty_loops: bool = False,
+    skip_empty_tags: bool = False,
+) -> str:
+    """
+    format a loop in STAR format [see write_loop]
+
+    :param loop: the loop to format
+    :param tags: the tags [columns] to format in the order to format them, None for all tags
+    :param rows: the indices of the rows to format in the order to format them, None for all rows
+    :param skip_empty_loops: return an empty string if there are no rows to format
+    :param skip_empty_tags: don't format columns which only contain null values
+    :return: the formatted loop
+    """
+    file = io.StringIO()
+    write_loop(loop, file, tags, rows, skip_empty_loops, skip_empty_tags)
+    return file.getvalue()
+
+
+def format_frame_tags(
+    frame_name: str,
+    tag_prefix: str,
+    tags: Sequence[Tuple[str, Any]],
+    skip_empty_tags: bool = False,
+) -> str:
+    """
+    format the tags of a saveframe as they appear between its save_ header and its loops
+
+    :param frame_name: the name of the frame [used in error messages]
+    :param tag_prefix: the frame's tag prefix e.g. _nef_chemical_shift_list
+    :param tags: the names and values of the tags
+    :param skip_empty_tags: don't format tags with null values
+    :return: the formatted tags
+    """
+    if len(tags) == 0:
+        return ""
+
+    width = max(len(f"{tag_prefix}.{name}") for name, _ in tags)
+
+    result = []
+    for name, value in tags:
+        if skip_empty_tags and value in definitions.NULL_VALUES:
+            continue
+
+        try:
+            text = quote_value(value)
+        except ValueError:
+            raise InvalidStateError(
+                "Cannot generate NMR-STAR for entry, as empty strings are not valid tag values in NMR-STAR. "
+                "Please either replace the empty strings with None objects, or set "
+                "pynmrstar.definitions.STR_CONVERSION_DICT[''] = None. "
+                f"Saveframe: {frame_name} Tag: {name}"
+            )
+
+        tag = f"{tag_prefix}.{name}".ljust(width)
+        if "\n" in text:
+            result.append(f"   {tag}\n;\n{text};\n")
+        else:
+            result.append(f"   {tag}  {text}\n")
+
+    return "".join(result)
+
+
+def write_saveframe(
+    frame: Saveframe,
+    file: TextIO,
+    first_in_category: bool = True,
+    skip_empty_loops: bool = False,
+    skip_empty_tags: bool = False,
+    show_comments: bool = True,
+    use_original_text: bool = True,
+):
+    """
+    write a saveframe in STAR format, the output is the same as str(frame). Frames which can supply the text
+    they were read from [see LazySaveframe.original_text] write that text instead unless use_original_text is False
+
+    :param frame: the saveframe to write
+    :param file: the file to write to
+    :param first_in_category: is this the first frame of its category [category comments are only written once]
+    :param skip_empty_loops: don't write loops with no rows
+    :param skip_empty_tags: don't write tags and loop columns which only contain null values
+    :param show_comments: write pynmrstar's standard comments for the frame's category
+    :param use_original_text: write the text the frame was read from if it is unchanged
+    """
+
+    original_text = getattr(frame, "original_text", None) if use_original_text else None
+    if original_text is not None:
+        text = original_text(skip_empty_loops, skip_empty_tags, show_comments)
+        if text is not None:
+            file.write(text)
+            return
+
+    if frame.tag_prefix is None:
+        raise InvalidStateError(
+            f"The tag prefix was never set! Error in saveframe named '{frame.name}'."
+        )
+
+    if show_comments:
+        comments = _get_comments()
+        if frame.category in comments:
+            comment = comments[frame.category]
+            if first_in_category or comment["every_flag"]:
+                file.write(comment["comment"])
+
+    file.write(f"save_{frame.name}\n")
+    file.write(
+        format_frame_tags(frame.name, frame.tag_prefix, frame.tags, skip_empty_tags)
+    )
+
+    for loop in frame.loops:
+        write_loop(
+            loop,
+            file,
+            skip_empty_loops=skip_empty_loops,
+            skip_empty_tags=skip_empty_tags,
+        )
+
+    file.write("\nsave_\n")
+
+
+def format_saveframe(
+    frame: Saveframe,
+    first_in_category: bool = True,
+    skip_empty_loops: bool = False,
+    skip_empty_tags: bool = False,
+    show_comments: bool = True,
+    use_original_text: bool = True,
+) -> str:
+    """
+    format a saveframe in STAR format [see write_saveframe]
+
+    :param frame: the saveframe to format
+    :param first_in_category: is this the first frame of its category [category comments are only written once]
+    :param skip_empty_loops: don't format loops with no rows
+    :param skip_empty_tags: don't format tags and loop columns which only contain null values
+    :param show_comments: include pynmrstar's standard comments for the frame's category
+    :param use_original_text: use the text the frame was read from if it is unchanged
+    :return: the formatted saveframe
+    """
+    file = io.StringIO()
+    write_saveframe(
+        frame,
+        file,
+        first_in_category,
+        skip_empty_loops,
+        skip_empty_tags,
+        show_comments,
+        use_original_text,
+    )
+    return file.getvalue()
+
+
+def write_entry(
+    entry: Entry,
+    file: TextIO,
+    skip_empty_loops: bool = False,
+    skip_empty_tags: bool = False,
+    show_comments: bool = True,
+    use_original_text: bool = True,
+):
+    """
+    write an entry in STAR format, the output is the same as str(entry)
+
+    :param entry: the entry to write
+    :param file: the file to write to
+    :param skip_empty_loops: don't write loops with no rows
+    :param skip_empty_tags: don't write tags and loop columns which only contain null values
+    :param show_comments: write pynmrstar's standard comments for the first frame of each category
+    :param use_original_text: write the text unchanged frames were read from, False gives the same text as an
+                              entry parsed by pynmrstar would
+    """
+
+    file.write(f"data_{entry.entry_id}\n\n")
+
+    seen_categories = set()
+    for index, frame in enumerate(entry):
+        if index != 0:
+            file.write("\n")
+
+        write_saveframe(
+            frame,
+            file,
+            skip_empty_loops=skip_empty_loops,
+            skip_empty_tags=skip_empty_tags,
+            show_comments=show_comments and frame.category not in seen_categories,
+            use_original_text=use_original_text,
+        )
+        seen_categories.add(frame.category)
+
+
+def format_entry(
+    entry: Entry,
+    skip_empty_loops: bool = False,
+    skip_empty_tags: bool = False,
+    show_comments: bool = True,
+    use_original_text: bool = True,
+) -> str:
+    """
+    format an entry in STAR format [see write_entry]
+
+    :param entry: the entry to format
+    :param skip_empty_loops: don't format loops with no rows
+    :param skip_empty_tags: don't format tags and loop columns which only contain null values
+    :param show_comments: include pynmrstar's standard comments for the first frame of each category
+    :param use_original_text: use the text unchanged frames were read from
+    :return: the formatted entry
+    """
+    file = io.StringIO()
+    write_entry(
+        entry, file, skip_empty_loops, skip_empty_tags, show_comments, use_original_text
+    )
+    return file.getvalue()
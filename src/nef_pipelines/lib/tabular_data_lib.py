@@ -10,6 +10,8 @@ Public API:
         - read_csv(): Main CSV reading function with normalization
         - parse_csv_text(): Parse CSV text without file I/O
         - parse_csv_as_dicts(): Parse CSV text and return dicts
+        - read_csv_in_chunks(): read_csv streaming the data rows in chunks of CHUNK_SIZE rows
+        - iter_csv_file_rows(): Stream the raw rows of a CSV file
 
     Exceptions:
         - CsvParseError: Raised on CSV validation errors
@@ -19,22 +21,38 @@ Public API:
     Utilities:
         - get_column_or_default(): Extract column with fallback
         - build_column_offsets(): Map column names to indices
+        - fit_rows_to_tags(): Pad or truncate rows to the number of tags to add them to a loop
         - extract_column_from_text(): Extract single column from text
         - detect_tabular_format(): Detect format of tabular text
+        - parse_dialect(): Parse an explicit dialect [see DIALECT_HELP] used in place of format detection
+        - parse_dialect_or_exit(): parse_dialect for command line options
 """
 
 import csv
+import hashlib
 import io
+import random
 from enum import auto
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import (
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import clevercsv
 from clevercsv.dialect import SimpleDialect
 from strenum import LowercaseStrEnum, StrEnum
 
 from nef_pipelines.lib.nef_lib import UNUSED
-from nef_pipelines.lib.util import escape_spaces_with_underscore
+from nef_pipelines.lib.util import escape_spaces_with_underscore, exit_error
 
 # Constants
 ENCODING = "utf-8-sig"
@@ -48,6 +66,38 @@ COLUMN_SEPARATORS_MAY_HAVE_CHANGED = (
     "note: column separators shown here may different to those in the original file..."
 )
 
+DIALECT_HELP = """\
+    the dialect of the file as DELIMITER[:QUOTECHAR[:ESCAPECHAR]] where each is a single character or one of
+    comma, tab, space, semicolon, colon, pipe, quote, apostrophe, backslash or none [a colon must be given by name].
+    If given the format isn't detected and --format is ignored [e.g. semicolon or 'tab:"']
+"""
+
+# format detection only sniffs the first SNIFF_HEAD_LINES lines and SNIFF_RANDOM_LINES lines chosen from the rest of
+# the file, clevercsv's detection is super-linear in the length of the text
+SNIFF_HEAD_LINES = 200
+SNIFF_RANDOM_LINES = 20
+
+_DIALECT_CACHE_SIZE = 64
+
+# the number of rows read at a time when streaming csv files
+CHUNK_SIZE = 10_000
+
+_DIALECT_CHARACTER_NAMES = {
+    "comma": ",",
+    "tab": "\t",
+    "space": " ",
+    "semicolon": ";",
+    "colon": ":",
+    "pipe": "|",
+    "quote": '"',
+    "apostrophe": "'",
+    "backslash": "\\",
+    "none": "",
+}
+
+# detected formats keyed by a hash of the text they were detected from
+_detected_formats: Dict[str, Union["TabularFormatResult", SimpleDialect]] = {}
+
 
 class CsvLikeFormats(StrEnum):
     """CSV-like formats supported for reading."""
@@ -131,6 +181,7 @@ def read_csv(
     skip: int = 0,
     comment: str = "",
     header_skip: int = 0,
+    dialect: Optional[SimpleDialect] = None,
 ) -> Tuple[List[str], List[List[str]], List[str]]:
     """Read CSV file and return (tags, data_rows, warnings).
 
@@ -140,6 +191,7 @@ def read_csv(
         skip: Number of header rows to skip after column headers
         comment: Prefix for comment lines to ignore
         header_skip: Number of rows to skip before reading column headers
+        dialect: Explicit dialect to read with, if given csv_format is ignored
 
     Returns:
         (column_tags, data_rows, warnings)
@@ -156,7 +208,13 @@ def read_csv(
         raise CsvParseError(f"failed to read {csv_file}: {e}") from e
 
     return parse_csv_text(
-        text, csv_format, skip, comment, header_skip, source_path=csv_file
+        text,
+        csv_format,
+        skip,
+        comment,
+        header_skip,
+        source_path=csv_file,
+        dialect=dialect,
     )
 
 
@@ -167,6 +225,7 @@ def parse_csv_text(
     comment: str = "",
     header_skip: int = 0,
     source_path: Optional[Path] = None,
+    dialect: Optional[SimpleDialect] = None,
 ) -> Tuple[List[str], List[List[str]], List[str]]:
     """Parse CSV text and return (tags, data_rows, warnings).
 
@@ -177,6 +236,7 @@ def parse_csv_text(
         comment: Prefix for comment lines to ignore
         header_skip: Number of rows to skip before reading column headers
         source_path: Optional path for error messages
+        dialect: Explicit dialect to read with, if given csv_format is ignored
 
     Returns:
         (column_tags, data_rows, warnings)
@@ -191,14 +251,117 @@ def parse_csv_text(
     filtered_text = _apply_skip_and_comment(text, skip=header_skip, comment=comment)
 
     # Parse CSV rows from filtered text
-    rows = _parse_csv_rows_from_text(filtered_text, csv_format)
+    rows = _parse_csv_rows_from_text(filtered_text, csv_format, dialect)
 
     if not rows:
         source = f" in {source_path}" if source_path else ""
         raise CsvParseError(f"CSV is empty after filtering{source}")
 
     # Extract header row
-    header_row = rows[0]
+    normalized_tags, warnings = _normalize_header_row(rows[0])
+
+    # Extract data rows (skip header + additional skip rows)
+    data_start = 1 + skip
+    data_rows = rows[data_start:]
+
+    return normalized_tags, data_rows, warnings
+
+
+def read_csv_in_chunks(
+    csv_file: Path,
+    csv_format: CsvLikeFormats = CsvLikeFormats.AUTO,
+    skip: int = 0,
+    comment: str = "",
+    header_skip: int = 0,
+    dialect: Optional[SimpleDialect] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Tuple[List[str], Iterator[List[List[str]]], List[str]]:
+    """Read CSV file as (tags, data_row_chunks, warnings) streaming the data rows in chunks.
+
+    The same as read_csv but the file is never held in memory, only chunk_size rows at a time [if the format has to
+    be detected the file is read more than once].
+
+    Args:
+        csv_file: Path to CSV file
+        csv_format: Format type (CSV, TSV, SSV, or AUTO for detection)
+        skip: Number of header rows to skip after column headers
+        comment: Prefix for comment lines to ignore
+        header_skip: Number of rows to skip before reading column headers
+        dialect: Explicit dialect to read with, if given csv_format is ignored
+        chunk_size: The largest number of rows in a chunk
+
+    Returns:
+        (column_tags, data_row_chunks, warnings)
+        - column_tags: Normalized column names (spaces → underscores)
+        - data_row_chunks: Iterator of lists of data rows (each row is list of strings)
+        - warnings: List of warning messages (header normalization, etc.)
+
+    Raises:
+        CsvParseError: If CSV file is empty or cannot be read [read errors may be raised by the iterator]
+    """
+
+    def filtered_lines():
+        lines = _split_lines(_read_lines(csv_file))
+        for line in _skip_and_comment_lines(lines, header_skip, comment):
+            yield f"{line}\n"
+
+    rows = _iter_csv_rows(filtered_lines, csv_format, dialect)
+
+    header_row = next(rows, None)
+    if header_row is None:
+        raise CsvParseError(f"CSV is empty after filtering in {csv_file}")
+
+    normalized_tags, warnings = _normalize_header_row(header_row)
+
+    data_rows = islice(rows, skip, None)
+    chunks = iter(lambda: list(islice(data_rows, chunk_size)), [])
+
+    return normalized_tags, chunks, warnings
+
+
+def iter_csv_file_rows(
+    csv_file: Path,
+    csv_format: CsvLikeFormats = CsvLikeFormats.AUTO,
+    dialect: Optional[SimpleDialect] = None,
+) -> Iterator[List[str]]:
+    """Read the rows of a CSV file one at a time without filtering or header normalization.
+
+    Args:
+        csv_file: Path to CSV file
+        csv_format: Format type (CSV, TSV, SSV, or AUTO for detection)
+        dialect: Explicit dialect to read with, if given csv_format is ignored
+
+    Returns:
+        Iterator of rows (each row is a list of strings)
+
+    Raises:
+        CsvParseError: If the file cannot be read
+    """
+    return _iter_csv_rows(lambda: _read_lines(csv_file), csv_format, dialect)
+
+
+def fit_rows_to_tags(
+    rows: List[List[str]], tags: List[str]
+) -> List[List[Optional[str]]]:
+    """Make rows the same length as tags ready to add to a loop's data.
+
+    Short rows are padded with None and long rows truncated, as when rows are added to a loop as dicts of tag to value.
+
+    Args:
+        rows: Data rows
+        tags: Column names
+
+    Returns:
+        The rows all with one value per tag
+    """
+    width = len(tags)
+    return [
+        row[:width] if len(row) >= width else row + [None] * (width - len(row))
+        for row in rows
+    ]
+
+
+def _normalize_header_row(header_row: List[str]) -> Tuple[List[str], List[str]]:
     original_tags = [tag.strip() for tag in header_row]
 
     # Normalize tags (spaces → underscores) and collect warnings
@@ -208,11 +371,7 @@ def parse_csv_text(
         if orig != norm:
             warnings.append(f"normalized column header '{orig}' → '{norm}'")
 
-    # Extract data rows (skip header + additional skip rows)
-    data_start = 1 + skip
-    data_rows = rows[data_start:]
-
-    return normalized_tags, data_rows, warnings
+    return normalized_tags, warnings
 
 
 def parse_csv_as_dicts(
@@ -222,6 +381,7 @@ def parse_csv_as_dicts(
     comment: str = "",
     header_skip: int = 0,
     source_path: Optional[Path] = None,
+    dialect: Optional[SimpleDialect] = None,
 ) -> Tuple[List[Dict[str, str]], List[str], List[str]]:
     """Parse CSV text and return list of dicts (one per row).
 
@@ -232,6 +392,7 @@ def parse_csv_as_dicts(
         comment: Prefix for comment lines to ignore
         header_skip: Number of rows to skip before reading column headers
         source_path: Optional path for error messages
+        dialect: Explicit dialect to read with, if given csv_format is ignored
 
     Returns:
         (dict_rows, tags, warnings)
@@ -243,7 +404,7 @@ def parse_csv_as_dicts(
         CsvParseError: If CSV text is empty after filtering
     """
     tags, list_rows, warnings = parse_csv_text(
-        text, csv_format, skip, comment, header_skip, source_path
+        text, csv_format, skip, comment, header_skip, source_path, dialect
     )
 
     # Convert list rows to dicts
@@ -263,26 +424,85 @@ def detect_tabular_format(
     - UNKNOWN_OR_MESSY: Fallback to standard csv.reader
     - SimpleDialect: Detected delimiter/quoting
 
+    The delimiter is sniffed from a sample of the lines [see _sample_line_indices] and results are cached by the
+    content of the lines so the same file is only analysed once.
+
     Args:
         lines: Lines of text to analyze
 
     Returns:
         TabularFormatResult enum or SimpleDialect for proper delimited data
     """
-    if not lines:
+    return _detect_tabular_format_of_lines(lambda: lines)
+
+
+def _detect_tabular_format_of_lines(
+    line_source: Callable[[], Iterable[str]],
+) -> Union[TabularFormatResult, SimpleDialect]:
+    # line_source is called once for each pass over the lines so files don't have to be held in memory
+    digest = hashlib.sha1()
+    line_count = 0
+    for line in line_source():
+        if line_count:
+            digest.update(b"\n")
+        digest.update(line.encode("utf-8", "surrogatepass"))
+        line_count += 1
+
+    if not line_count:
         return TabularFormatResult.UNKNOWN_OR_MESSY
 
-    # Join lines into text for clevercsv detection
-    text = "\n".join(lines)
+    key = digest.hexdigest()
+
+    if key not in _detected_formats:
+        if len(_detected_formats) >= _DIALECT_CACHE_SIZE:
+            del _detected_formats[next(iter(_detected_formats))]
+
+        _detected_formats[key] = _detect_tabular_format(line_source(), line_count)
+
+    return _detected_formats[key]
+
+
+def _sample_line_indices(line_count: int) -> Collection[int]:
+    """The indices of the first SNIFF_HEAD_LINES lines and SNIFF_RANDOM_LINES lines from the rest.
+
+    The random lines are chosen reproducibly so the same number of lines always gives the same sample.
+    """
+    if line_count <= SNIFF_HEAD_LINES + SNIFF_RANDOM_LINES:
+        return range(line_count)
+
+    rest = range(SNIFF_HEAD_LINES, line_count)
+    chosen = random.Random(line_count).sample(rest, SNIFF_RANDOM_LINES)
+
+    return {*range(SNIFF_HEAD_LINES), *chosen}
+
+
+def _detect_tabular_format(
+    lines: Iterable[str], line_count: int
+) -> Union[TabularFormatResult, SimpleDialect]:
+
+    sample_indices = _sample_line_indices(line_count)
+
+    sample = []
+    field_counts = set()
+    has_commas = has_tabs = has_multiple_spaces = False
+    for index, line in enumerate(lines):
+        if index in sample_indices:
+            sample.append(line)
+
+        has_commas = has_commas or "," in line
+        has_tabs = has_tabs or "\t" in line
+
+        if line.strip():
+            # Check field counts first (before clevercsv)
+            field_counts.add(len(line.split()))
 
-    # Check field counts first (before clevercsv)
-    field_counts = [len(line.split()) for line in lines if line.strip()]
-    all_same_count = field_counts and len(set(field_counts)) == 1
+            # Check if it looks like whitespace-delimited data
+            has_multiple_spaces = has_multiple_spaces or "  " in line
 
-    # Check if it looks like whitespace-delimited data
-    has_commas = any("," in line for line in lines)
-    has_tabs = any("\t" in line for line in lines)
-    has_multiple_spaces = any("  " in line for line in lines if line.strip())
+    all_same_count = len(field_counts) == 1
+
+    # Join a sample of the lines into text for clevercsv detection
+    text = "\n".join(sample)
 
     # Try clevercsv detector
     try:
@@ -315,7 +535,67 @@ def detect_tabular_format(
     return TabularFormatResult.CLEVERCSV_AUTO
 
 
-def _parse_csv_rows_from_text(text: str, csv_format: CsvLikeFormats) -> List[List[str]]:
+def parse_dialect(dialect: str) -> SimpleDialect:
+    """Parse a dialect given as DELIMITER[:QUOTECHAR[:ESCAPECHAR]] [see DIALECT_HELP].
+
+    Args:
+        dialect: The dialect string
+
+    Returns:
+        The dialect
+
+    Raises:
+        CsvParseError: If the dialect isn't understood
+    """
+    # note: a colon has to be given by name as it separates the fields
+    fields = dialect.split(":")
+
+    if not 1 <= len(fields) <= 3:
+        raise CsvParseError(
+            f"the dialect {dialect} should be DELIMITER[:QUOTECHAR[:ESCAPECHAR]]"
+        )
+
+    characters = []
+    for field in fields:
+        character = _DIALECT_CHARACTER_NAMES.get(field.lower(), field)
+        if len(character) > 1:
+            names = ", ".join(_DIALECT_CHARACTER_NAMES)
+            msg = f"""\
+                in the dialect {dialect} the value {field} should be a single character or one of {names}
+            """
+            raise CsvParseError(msg)
+        characters.append(character)
+
+    characters.extend([""] * (3 - len(characters)))
+    delimiter, quote_character, escape_character = characters
+
+    if not delimiter:
+        raise CsvParseError(f"the dialect {dialect} doesn't define a delimiter")
+
+    return SimpleDialect(delimiter, quote_character, escape_character)
+
+
+def parse_dialect_or_exit(dialect: Optional[str]) -> Optional[SimpleDialect]:
+    """Parse a dialect from the command line, exiting with an error if it isn't understood.
+
+    Args:
+        dialect: The dialect string or None if no dialect was given
+
+    Returns:
+        The dialect or None
+    """
+    if dialect is None:
+        return None
+
+    try:
+        return parse_dialect(dialect)
+    except CsvParseError as e:
+        exit_error(str(e))
+
+
+def _parse_csv_rows_from_text(
+    text: str, csv_format: CsvLikeFormats, dialect: Optional[SimpleDialect] = None
+) -> List[List[str]]:
     """Parse CSV text into rows using specified format.
 
     Internal helper - returns raw rows without header normalization.
@@ -323,49 +603,97 @@ def _parse_csv_rows_from_text(text: str, csv_format: CsvLikeFormats) -> List[Lis
     Args:
         text: CSV text to parse
         csv_format: Format type (CSV, TSV, SSV, or AUTO)
+        dialect: Explicit dialect to read with, if given csv_format is ignored
 
     Returns:
         List of rows (each row is a list of strings)
     """
-    if csv_format == CsvLikeFormats.AUTO:
-        lines = text.splitlines()
-        format_result = detect_tabular_format(lines)
+    return list(_iter_csv_rows(lambda: io.StringIO(text), csv_format, dialect))
+
+
+def _iter_csv_rows(
+    line_source: Callable[[], Iterable[str]],
+    csv_format: CsvLikeFormats,
+    dialect: Optional[SimpleDialect] = None,
+) -> Iterator[List[str]]:
+    """Parse lines into rows using specified format one row at a time.
+
+    Args:
+        line_source: Called to get the lines to parse [with their line endings], it is called more than once if the
+                     format has to be detected
+        csv_format: Format type (CSV, TSV, SSV, or AUTO)
+        dialect: Explicit dialect to read with, if given csv_format is ignored
+
+    Returns:
+        Iterator of rows (each row is a list of strings)
+    """
+    if dialect is not None:
+        reader = clevercsv.reader(line_source(), dialect=dialect)
+    elif csv_format == CsvLikeFormats.AUTO:
+        format_result = _detect_tabular_format_of_lines(
+            lambda: _split_lines(line_source())
+        )
 
         if format_result == TabularFormatResult.RAGGED_WHITESPACE:
             # Split each line on whitespace, join with tabs
-            normalized_lines = [
-                "\t".join(line.split()) for line in lines if line.strip()
-            ]
-            text = "\n".join(normalized_lines)
-            reader = csv.reader(io.StringIO(text), delimiter="\t")
+            normalized_lines = (
+                "\t".join(line.split()) + "\n"
+                for line in _split_lines(line_source())
+                if line.strip()
+            )
+            reader = csv.reader(normalized_lines, delimiter="\t")
         elif format_result == TabularFormatResult.CLEVERCSV_AUTO:
-            reader = clevercsv.reader(io.StringIO(text))
+            reader = clevercsv.reader(line_source())
         elif format_result == TabularFormatResult.UNKNOWN_OR_MESSY:
-            reader = csv.reader(io.StringIO(text))
+            reader = csv.reader(line_source())
         else:
-            reader = clevercsv.reader(io.StringIO(text), dialect=format_result)
+            reader = clevercsv.reader(line_source(), dialect=format_result)
     elif csv_format == CsvLikeFormats.TSV:
-        reader = csv.reader(io.StringIO(text), delimiter="\t")
+        reader = csv.reader(line_source(), delimiter="\t")
     elif csv_format == CsvLikeFormats.CSV:
-        reader = csv.reader(io.StringIO(text))
+        reader = csv.reader(line_source())
     elif csv_format == CsvLikeFormats.SSV:
-        reader = csv.reader(io.StringIO(text), delimiter=" ", skipinitialspace=True)
+        reader = csv.reader(line_source(), delimiter=" ", skipinitialspace=True)
     else:
-        reader = csv.reader(io.StringIO(text), delimiter=" ", skipinitialspace=True)
+        reader = csv.reader(line_source(), delimiter=" ", skipinitialspace=True)
+
+    return iter(reader)
 
-    return list(reader)
+
+def _split_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Split lines as str.splitlines would split the text they came from."""
+    for line in lines:
+        yield from line.splitlines()
+
+
+def _read_lines(csv_file: Path, encoding: str = ENCODING) -> Iterator[str]:
+    """Read the lines of a file lazily, read errors are reported as CsvParseErrors."""
+    try:
+        with open(csv_file, encoding=encoding) as file_handle:
+            yield from file_handle
+    except (OSError, UnicodeDecodeError) as e:
+        raise CsvParseError(f"failed to read {csv_file}: {e}") from e
 
 
 def _apply_skip_and_comment(raw_text: str, skip: int, comment: str) -> str:
     """Strip comment lines and skip leading non-empty rows; return remaining text."""
-    if comment:
-        raw_text = "\n".join(
-            line
-            for line in raw_text.splitlines()
-            if not line.strip().startswith(comment)
-        )
-    non_empty = [line.rstrip() for line in raw_text.splitlines() if line.strip()]
-    return "\n".join(non_empty[skip:])
+    return "\n".join(_skip_and_comment_lines(raw_text.splitlines(), skip, comment))
+
+
+def _skip_and_comment_lines(
+    lines: Iterable[str], skip: int, comment: str
+) -> Iterator[str]:
+    """Strip comment and empty lines and skip leading non-empty rows, lines are right stripped."""
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or (comment and stripped.startswith(comment)):
+            continue
+
+        if skip > 0:
+            skip -= 1
+            continue
+
+        yield line.rstrip()
 
 
 def _resolve_file_col_name(
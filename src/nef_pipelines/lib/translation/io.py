@@ -3,13 +3,25 @@
 """
 
 import json
+import os
+import pickle
+import struct
+import threading
 import traceback
+from collections.abc import Mapping
+from hashlib import sha1
 from json import JSONDecodeError
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Set, Tuple
 
+import pydantic
 import xmltodict
 
+try:
+    import platformdirs
+except ImportError:
+    platformdirs = None
+
 from nef_pipelines.lib.nef_lib import UNUSED
 from nef_pipelines.lib.translation.chem_comp import ChemComp
 from nef_pipelines.lib.translation.object_iter import ObjectIter
@@ -602,30 +614,65 @@ def find_chem_comps(rel_path=JSON_CHEM_COMP_SUB_PATH, extension="json") -> List[
     return result
 
 
-MOL_TYPES = set()
-CHEM_COMPS = {}
+CHEM_COMP_CACHE_FILE_NAME = "chem_comps.pickle"
+CHEM_COMP_CACHE_FORMAT = 1
 
+_CACHE_HEADER_LENGTH = struct.Struct("!Q")
 
-# rough costs
-# read + parse std chem comps 0.218489s with v2 expected to be 0.054-0.004s typically 0.012s
-# just read chem comps 0.010838s
-# without linking 0.160787s (linking oh 0.058s ie 26%)
-def load_chem_comps():
-    chem_comp_paths = find_chem_comps()
 
+def chem_comp_cache_path() -> Optional[Path]:
+    """
+    the path of the compiled chem comp cache
+
+    :return: the path or None if there is no cache directory
+    """
+    if platformdirs is None:
+        return None
+
+    return (
+        Path(platformdirs.user_cache_dir("nef-pipelines")) / CHEM_COMP_CACHE_FILE_NAME
+    )
+
+
+def chem_comp_cache_key(chem_comp_paths: List[Path]) -> str:
+    """
+    a key which changes when the chem comp files or the ChemComp model they are compiled with change
+
+    :param chem_comp_paths: the json chem comp files
+    :return: the key as a hex digest
+    """
+
+    paths = [Path(__file__).parent / "chem_comp.py", *sorted(chem_comp_paths)]
+
+    hasher = sha1(f"{CHEM_COMP_CACHE_FORMAT}:{pydantic.VERSION}".encode())
+    for path in paths:
+        try:
+            stat = path.stat()
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamp = None
+        hasher.update(f"\n{path.name}:{stamp}".encode())
+
+    return hasher.hexdigest()
+
+
+def _chem_comp_key(chem_comp: ChemComp) -> str:
+    return (
+        chem_comp.code3Letter if chem_comp.code3Letter != UNUSED else chem_comp.ccpCode
+    )
+
+
+def _compile_chem_comps(
+    chem_comp_paths: List[Path],
+) -> Tuple[Dict[str, Tuple[int, int]], List[str], bytes]:
+    # parse and validate every chem comp and pickle each one separately so they can be unpickled one at a time,
+    # as before if two chem comps have the same key the last one read is used
+    chem_comps = {}
+    mol_types = set()
     for chem_comp_path in chem_comp_paths:
         try:
             with open(chem_comp_path, "r") as f:
                 chemcomp_data = json.load(f)
-                chem_comp = ChemComp(**chemcomp_data)
-                mol_type = chem_comp.molType
-                MOL_TYPES.add(mol_type.upper())
-                key = (
-                    chem_comp.code3Letter
-                    if chem_comp.code3Letter != UNUSED
-                    else chem_comp.ccpCode
-                )
-                CHEM_COMPS[key] = chem_comp
         except JSONDecodeError as e:
             msg = f"""\
                 while reading the chemical component {chem_comp_path} the following erro occured
@@ -633,6 +680,171 @@ def load_chem_comps():
             """
             raise ChemCompFormatException(msg)
 
+        chem_comp = ChemComp(**chemcomp_data)
+        chem_comps[_chem_comp_key(chem_comp)] = chem_comp
+        mol_types.add(chem_comp.molType.upper())
+
+    index = {}
+    blobs = []
+    offset = 0
+    for key, chem_comp in chem_comps.items():
+        blob = pickle.dumps(chem_comp, protocol=pickle.HIGHEST_PROTOCOL)
+        index[key] = (offset, len(blob))
+        blobs.append(blob)
+        offset += len(blob)
+
+    return index, sorted(mol_types), b"".join(blobs)
+
+
+def _read_chem_comp_cache(path: Path, key: str):
+    # the cache is the length of a pickled header [format, key and index] the header and then the pickled chem comps
+    try:
+        with open(path, "rb") as file_h:
+            (header_length,) = _CACHE_HEADER_LENGTH.unpack(
+                file_h.read(_CACHE_HEADER_LENGTH.size)
+            )
+            header = pickle.loads(file_h.read(header_length))
+            if (
+                header.get("format") != CHEM_COMP_CACHE_FORMAT
+                or header.get("key") != key
+            ):
+                return None
+            data = file_h.read()
+    except Exception:
+        return None
+
+    index = header.get("index")
+    if not isinstance(index, dict) or sum(
+        length for _, length in index.values()
+    ) != len(data):
+        return None
+
+    return index, header.get("mol_types", []), data
+
+
+def _write_chem_comp_cache(
+    path: Path, key: str, index, mol_types: List[str], data: bytes
+) -> bool:
+    header = pickle.dumps(
+        {
+            "format": CHEM_COMP_CACHE_FORMAT,
+            "key": key,
+            "index": index,
+            "mol_types": mol_types,
+        },
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, "wb") as file_h:
+            file_h.write(_CACHE_HEADER_LENGTH.pack(len(header)))
+            file_h.write(header)
+            file_h.write(data)
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+        return False
+
+    return True
+
+
+class ChemCompStore(Mapping):
+    """
+    The standard chem comps keyed by their 3 letter code [or ccpCode if they don't have one].
+
+    Validating all the json chem comps with pydantic takes seconds, so they are compiled once into a cache of
+    individually pickled ChemComps in the user's cache directory [rebuilt when the chem comp files change]. Only the
+    index of the cache is read on first use, each ChemComp is unpickled the first time it is accessed.
+    """
+
+    def __init__(
+        self,
+        cache_path: Optional[Path] = None,
+        chem_comp_paths: Optional[List[Path]] = None,
+    ):
+        self._cache_path = cache_path
+        self._chem_comp_paths = chem_comp_paths
+        self._lock = threading.RLock()
+        self._index = None
+        self._mol_types = None
+        self._data = None
+        self._chem_comps = {}
+
+    def load(self):
+        """read the index of the chem comps, compiling and caching them if needed, this is only done once"""
+        if self._index is not None:
+            return
+
+        with self._lock:
+            if self._index is not None:
+                return
+
+            chem_comp_paths = (
+                self._chem_comp_paths
+                if self._chem_comp_paths is not None
+                else find_chem_comps()
+            )
+            cache_path = (
+                self._cache_path if self._cache_path else chem_comp_cache_path()
+            )
+            key = chem_comp_cache_key(chem_comp_paths)
+
+            cached = _read_chem_comp_cache(cache_path, key) if cache_path else None
+            if cached is None:
+                cached = _compile_chem_comps(chem_comp_paths)
+                if cache_path:
+                    _write_chem_comp_cache(cache_path, key, *cached)
+
+            self._index, self._mol_types, self._data = cached
+
+    @property
+    def mol_types(self) -> Set[str]:
+        self.load()
+        return set(self._mol_types)
+
+    def __getitem__(self, key) -> ChemComp:
+        chem_comp = self._chem_comps.get(key)
+        if chem_comp is not None:
+            return chem_comp
+
+        self.load()
+        with self._lock:
+            if key not in self._chem_comps:
+                offset, length = self._index[key]
+                self._chem_comps[key] = pickle.loads(
+                    self._data[offset : offset + length]
+                )
+
+        return self._chem_comps[key]
+
+    def __contains__(self, key) -> bool:
+        self.load()
+        return key in self._index
+
+    def __iter__(self):
+        self.load()
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        self.load()
+        return len(self._index)
+
+
+MOL_TYPES = set()
+CHEM_COMPS = ChemCompStore()
+
+
+def load_chem_comps():
+    """make sure the chem comps index is loaded [the chem comps themselves are loaded on first access]"""
+
+    CHEM_COMPS.load()
+    MOL_TYPES.update(CHEM_COMPS.mol_types)
+
 
 if __name__ == "__main__":
 
@@ -321,10 +321,12 @@ def script_name(file: str) -> Path:
 
         current_context = Namespace(command_path="unknown unknown")
 
-    if in_pytest():
-        command = current_context.command_path.split()
-    else:
-        command = current_context.command_path.split()[1:]
+    command = current_context.command_path.split()
+
+    # commands run by nef [including in process by nef run] start with the program name, commands run directly by a
+    # test harness don't
+    if command[:1] == ["nef"] or not in_pytest():
+        command = command[1:]
 
     command = f"{'/'.join(command)}.py"
 
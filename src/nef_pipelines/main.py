@@ -16,6 +16,16 @@ if sys.version_info < MINIMUM_VERSION:
 
 
 def main():
+
+    # forward the command line to a running daemon if one has been requested [see nef daemon]
+    from nef_pipelines.lib.daemon_lib import (  # lazy
+        run_command_line_in_daemon_if_configured,
+    )
+
+    exit_code = run_command_line_in_daemon_if_configured(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
     try:
         import click  # noqa: F401  # lazy
         import typer  # noqa: F401  # lazy
@@ -21,6 +21,7 @@ def get_registerd_modules():
 _MODULES = [
     # Tools
     "nef_pipelines.tools.ai",
+    "nef_pipelines.tools.benchmark",
     "nef_pipelines.tools.chains",
     "nef_pipelines.tools.entry",
     "nef_pipelines.tools.fit",
@@ -29,10 +30,12 @@ _MODULES = [
     "nef_pipelines.tools.header",
     "nef_pipelines.tools.help",
     "nef_pipelines.tools.columns",
+    "nef_pipelines.tools.daemon",
     "nef_pipelines.tools.loops",
     "nef_pipelines.tools.namespace",
     "nef_pipelines.tools.peaks",
     # "nef_pipelines.tools.plot",
+    "nef_pipelines.tools.run",
     "nef_pipelines.tools.save",
     "nef_pipelines.tools.series",
     "nef_pipelines.tools.shifts",
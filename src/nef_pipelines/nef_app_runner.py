@@ -13,6 +13,15 @@ import typer
 from click import ClickException, Group
 
 from nef_pipelines import nef_app
+from nef_pipelines.lib.command_manifest_lib import (
+    ALL_MODULES_COMMANDS,
+    build_command_manifest,
+    find_command_name,
+    is_shell_completion_active,
+    read_command_manifest,
+    register_command_placeholders,
+    write_command_manifest,
+)
 from nef_pipelines.lib.typer_lib import FilteredHelpGroup, patch_rich_code_theme
 from nef_pipelines.lib.util import exit_error
 from nef_pipelines.module_registry import get_registerd_modules
@@ -114,15 +123,20 @@ def create_nef_app():
     return nef_app
 
 
-def load_nef_modules_and_build_failure() -> Optional[str]:
-    """Load all registered plugin modules.
+def load_nef_modules_and_build_failure(
+    modules: Optional[List[str]] = None,
+) -> Optional[str]:
+    """Load registered plugin modules [all of them by default].
 
     Caller must ensure create_nef_app() was called first.
     Returns a formatted error message or None when all modules loaded successfully.
     Does not call exit_error — callers decide how to handle failures.
     """
+    if modules is None:
+        modules = get_registerd_modules()
+
     load_failure_messages = []
-    for module_name in get_registerd_modules():
+    for module_name in modules:
         try:
             import_module(module_name)
         except Exception as e:
@@ -167,6 +181,44 @@ def load_nef_modules_and_build_failure() -> Optional[str]:
     return result
 
 
+def load_nef_modules_for_command_and_build_failure(args: List[str]) -> Optional[str]:
+    """Load the plugin modules needed to run a command line.
+
+    With an up to date command manifest only the module that registers the command is loaded, if no command is
+    given placeholders built from the manifest stand in for the commands so the top level help can be shown.
+    Otherwise all the modules are loaded and the manifest is rebuilt.
+
+    Caller must ensure create_nef_app() was called first.
+    Returns a formatted error message or None when all modules loaded successfully.
+    """
+
+    modules = get_registerd_modules()
+
+    manifest = None
+    if not typer_debug_mode and not is_shell_completion_active():
+        manifest = read_command_manifest(modules)
+
+    command_name = find_command_name(args)
+
+    if manifest is not None and command_name is None:
+        register_command_placeholders(nef_app.app, list(manifest.values()))
+        result = None
+    elif (
+        manifest is not None
+        and command_name in manifest
+        and command_name not in ALL_MODULES_COMMANDS
+    ):
+        result = load_nef_modules_and_build_failure([manifest[command_name].module])
+    else:
+        result = load_nef_modules_and_build_failure(modules)
+        if result is None and manifest is None:
+            write_command_manifest(
+                build_command_manifest(nef_app.app, modules), modules
+            )
+
+    return result
+
+
 def _report_typer_load_problems(messages: List[Optional[str]]):
     for message in messages:
         if message:
@@ -208,7 +260,9 @@ def run():
     try:
         nef_app_module = _make_nef_app_or_exit_error()
 
-        load_failure_message = load_nef_modules_and_build_failure()
+        load_failure_message = load_nef_modules_for_command_and_build_failure(
+            sys.argv[1:]
+        )
         bad_command_message = _if_typer_debug_get_bad_command_messages(nef_app_module)
 
         _report_typer_load_problems([load_failure_message, bad_command_message])
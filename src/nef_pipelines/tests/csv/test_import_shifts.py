@@ -1,3 +1,5 @@
+from pathlib import Path
+
 import typer
 
 from nef_pipelines.lib.test_lib import (
@@ -194,3 +196,31 @@ def test_shifts_import_duplicate_frame_quiet():
         result.stdout, "nef_chemical_shift_list_myshifts", "nef_chemical_shift"
     )
     assert_lines_match(EXPECTED_SHIFT_LOOP_DEFAULT_CHAIN, loop_text)
+
+
+def test_shifts_import_with_dialect(tmp_path):
+    csv_path = path_in_test_data(__file__, "shifts_basic.csv")
+
+    semicolon_path = tmp_path / "shifts_basic_semicolon.csv"
+    semicolon_path.write_text(Path(csv_path).read_text().replace(",", ";"))
+
+    result = run_and_report(
+        app, ["--dialect", "semicolon", "myshifts", str(semicolon_path)]
+    )
+
+    loop_text = isolate_loop(
+        result.stdout, "nef_chemical_shift_list_myshifts", "nef_chemical_shift"
+    )
+    assert_lines_match(EXPECTED_SHIFT_LOOP_DEFAULT_CHAIN, loop_text)
+
+
+def test_shifts_import_bad_dialect_errors():
+    csv_path = path_in_test_data(__file__, "shifts_basic.csv")
+
+    result = run_and_report(
+        app,
+        ["--dialect", "semicolons", "myshifts", csv_path],
+        expected_exit_code=EXIT_ERROR,
+    )
+
+    assert "semicolons" in result.stdout
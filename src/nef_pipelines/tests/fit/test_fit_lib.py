@@ -1,9 +1,19 @@
+from math import exp
+
 import pytest
 
+from nef_pipelines.lib.interface import NoiseInfo, NoiseInfoSource
 from nef_pipelines.tools.fit.fit_lib import (
+    FitTask,
     NEFPLSFitLibInconsistentSeriesDataError,
     RelaxationSeriesValues,
+    _build_fit_shards,
     _combine_relaxation_series,
+    _fit_shard,
+    _merge_fit_results,
+    _shard_seeds,
+    _split_ids,
+    fit_tasks,
 )
 
 SPECTRA_1 = ["spectrum_A", "spectrum_B"]
@@ -184,3 +194,98 @@ class TestCombineRelaxationSeries:
             match=r"Inconsistent field lengths for spectra: series1 has 2, series2 has 1",
         ):
             _combine_relaxation_series(series1, series2)
+
+
+DECAY_TIMES = [0.0, 0.1, 0.2, 0.4, 0.8]
+DECAY_ID_XY_DATA = {
+    data_id: (DECAY_TIMES, [100.0 * exp(-rate * time) for time in DECAY_TIMES])
+    for data_id, rate in enumerate([1.0, 2.0, 3.0, 4.0, 5.0], start=1)
+}
+CLI_NOISE = NoiseInfo(NoiseInfoSource.CLI, 0.5, None, None, NoiseInfoSource.CLI)
+
+
+def _fit_rates_and_errors(results):
+    return {
+        data_id: (
+            fit.params["rate"].value,
+            results["monte_carlo_errors"][data_id]["rate_mc_error"],
+        )
+        for data_id, fit in results["fits"].items()
+    }
+
+
+class TestFitTasks:
+    """Test cases for fitting tasks in shards across worker processes."""
+
+    def test_split_ids(self):
+        assert _split_ids([1, 2, 3, 4, 5], 2) == [[1, 2, 3], [4, 5]]
+        assert _split_ids([1, 2], 1) == [[1, 2]]
+
+    def test_shard_seeds(self):
+        assert _shard_seeds(42, 1) == [42]
+
+        seeds = _shard_seeds(42, 3)
+        assert seeds == _shard_seeds(42, 3)
+        assert len(set(seeds)) == 3
+        assert seeds != _shard_seeds(43, 3)
+
+    def test_shards_merge_in_id_order(self):
+        pytest.importorskip("streamfitter")
+        from streamfitter import fitter
+
+        tasks = [FitTask(DECAY_ID_XY_DATA, CLI_NOISE), FitTask({}, CLI_NOISE)]
+        function_name = fitter.FUNCTION_EXPONENTIAL_DECAY_2_PARAMETER
+
+        shards = _build_fit_shards(function_name, tasks, 10, 42, 0, None, 2)
+
+        assert [shard.task_index for shard in shards] == [0, 0, 1]
+        assert [shard.seed for shard in shards] == [*_shard_seeds(42, 2), 42]
+
+        serial_results = next(fit_tasks(function_name, tasks[:1], 10, 42))
+        merged_results = _merge_fit_results(
+            [_fit_shard(shard) for shard in shards[:2]], 42
+        )
+
+        assert list(merged_results["fits"]) == list(DECAY_ID_XY_DATA)
+        assert merged_results["total_requested"] == 5
+        assert merged_results["random seed"] == 42
+
+        serial_rates = _fit_rates_and_errors(serial_results)
+        merged_rates = _fit_rates_and_errors(merged_results)
+        for data_id, (rate, _) in serial_rates.items():
+            assert merged_rates[data_id][0] == pytest.approx(rate)
+            assert rate == pytest.approx(data_id, rel=1e-3)
+
+    def test_fit_in_worker_process(self):
+        pytest.importorskip("streamfitter")
+        from streamfitter import fitter
+
+        tasks = [FitTask({1: DECAY_ID_XY_DATA[1]}, CLI_NOISE)]
+        function_name = fitter.FUNCTION_EXPONENTIAL_DECAY_2_PARAMETER
+
+        serial_results = list(fit_tasks(function_name, tasks, 10, 42))
+        worker_results = list(fit_tasks(function_name, tasks, 10, 42, workers=2))
+
+        assert _fit_rates_and_errors(worker_results[0]) == pytest.approx(
+            _fit_rates_and_errors(serial_results[0])
+        )
+
+    def test_serial_fit_is_streamed_per_task(self, monkeypatch):
+        from nef_pipelines.tools.fit import fit_lib
+
+        fitted = []
+
+        def fake_fit_shard(shard):
+            fitted.append(shard.task_index)
+            return {"task_index": shard.task_index}
+
+        monkeypatch.setattr(fit_lib, "_fit_shard", fake_fit_shard)
+
+        tasks = [FitTask({1: DECAY_ID_XY_DATA[1]}, CLI_NOISE)] * 3
+        results = fit_tasks("test", tasks, 10, 42)
+
+        assert next(results) == {"task_index": 0}
+        assert fitted == [0]
+
+        assert [result["task_index"] for result in results] == [1, 2]
+        assert fitted == [0, 1, 2]
@@ -1,7 +1,11 @@
 from pathlib import Path
 
+import pytest
 import typer
+from pynmrstar import Entry
+from pynmrstar.exceptions import ParsingError
 
+from nef_pipelines.lib.nef_lib import NEFPLSLIOStarParseException
 from nef_pipelines.lib.test_lib import (
     assert_lines_match,
     path_in_test_data,
@@ -69,12 +73,12 @@ def test_frame_basic_verbose():
             lines: 48 frames: 2 checksum: d6235a487cbdb33cb1ed5d2f5f3f2635 [md5]
         1. nef_nmr_meta_data
             category: nef_nmr_meta_data
-            loops: 1 [lengths: 19]
+            loops: 1 [lengths: 1]
             loop names: nef_program_script
             is nef frame: True
         2. nef_molecular_system
             category: nef_molecular_system
-            loops: 1 [lengths: 13]
+            loops: 1 [lengths: 1]
             loop names: nef_sequence
             is nef frame: True
 
@@ -133,14 +137,37 @@ def test_frame_verbose_with_utf8():
             lines: 45 frames: 2 checksum: 297f92ba5b6cb3cd0301c87821ded26d [md5]
         1. nef_nmr_meta_data
             category: nef_nmr_meta_data
-            loops: 1 [lengths: 19]
+            loops: 1 [lengths: 1]
             loop names: nef_program_script
             is nef frame: True
         2. nef_molecular_system
             category: nef_molecular_system
-            loops: 1 [lengths: 13]
+            loops: 1 [lengths: 3]
             loop names: nef_sequence
             is nef frame: True
     """
 
     assert_lines_match(EXPECTED_VERBOSE_UTF8, result.stdout)
+
+
+def test_frame_list_malformed_entry():
+
+    path = path_in_test_data(__file__, "frames.nef")
+    text = Path(path).read_text()
+
+    # remove the last value of the first row of the sequence
+    lines = text.split("\n")
+    row_index = next(i for i, line in enumerate(lines) if line.strip().startswith("1 "))
+    lines[row_index] = lines[row_index].rsplit(maxsplit=1)[0]
+    text = "\n".join(lines)
+
+    with pytest.raises(ParsingError) as expected:
+        Entry.from_string(text)
+
+    result = run_and_report(app, ["--verbose"], input=text, expected_exit_code=1)
+
+    # the error is reported when the entry is read with the line number in the file
+    assert isinstance(result.exception, NEFPLSLIOStarParseException)
+    assert "does not have the expected number of data elements" in str(result.exception)
+    assert f"line {expected.value.line_number}" in str(result.exception)
+    assert result.stdout == ""
@@ -0,0 +1,158 @@
+from pynmrstar import Entry
+
+from nef_pipelines.lib.assignment_index_lib import (
+    Assignment,
+    AssignmentColumns,
+    AssignmentIndex,
+    assignment_columns,
+)
+
+TEST_ENTRY = """\
+data_test
+
+   save_nef_chemical_shift_list_test
+      _nef_chemical_shift_list.sf_category   nef_chemical_shift_list
+      _nef_chemical_shift_list.sf_framecode  nef_chemical_shift_list_test
+
+      loop_
+         _nef_chemical_shift.chain_code
+         _nef_chemical_shift.sequence_code
+         _nef_chemical_shift.residue_name
+         _nef_chemical_shift.atom_name
+         _nef_chemical_shift.value
+
+         A   1   ALA   H    8.0
+         A   1   ALA   N    120.0
+         A   2   GLY   H    7.0
+      stop_
+   save_
+
+   save_nef_distance_restraint_list_test
+      _nef_distance_restraint_list.sf_category   nef_distance_restraint_list
+      _nef_distance_restraint_list.sf_framecode  nef_distance_restraint_list_test
+
+      loop_
+         _nef_distance_restraint.index
+         _nef_distance_restraint.chain_code_1
+         _nef_distance_restraint.sequence_code_1
+         _nef_distance_restraint.atom_name_1
+         _nef_distance_restraint.chain_code_2
+         _nef_distance_restraint.sequence_code_2
+         _nef_distance_restraint.atom_name_2
+
+         1   A   1   H    A   2   H
+         2   A   2   H    A   1   N
+      stop_
+   save_
+"""
+
+
+def test_assignment_columns():
+
+    tags = [
+        "index",
+        "chain_code_2",
+        "sequence_code_2",
+        "chain_code_1",
+        "sequence_code_1",
+        "atom_name_1",
+        "sequence_code_10",
+        "sequence_code_x",
+    ]
+
+    assert assignment_columns(tags) == [
+        AssignmentColumns("_1", chain_code=3, sequence_code=4, atom_name=5),
+        AssignmentColumns("_2", chain_code=1, sequence_code=2),
+        AssignmentColumns("_10", sequence_code=6),
+    ]
+
+    assert assignment_columns(["value"]) == []
+
+
+def test_lookup():
+
+    entry = Entry.from_string(TEST_ENTRY)
+    index = AssignmentIndex.from_entry(entry)
+
+    shifts = entry.get_saveframe_by_name("nef_chemical_shift_list_test")
+    restraints = entry.get_saveframe_by_name("nef_distance_restraint_list_test")
+    shift_loop = shifts.get_loop("_nef_chemical_shift")
+    restraint_loop = restraints.get_loop("_nef_distance_restraint")
+
+    assert len(index) == 6
+    assert [frame.name for frame, _ in index.loops()] == [shifts.name, restraints.name]
+
+    assert index.assignments(shift_loop) == [
+        Assignment("A", "1", "ALA", "H"),
+        Assignment("A", "1", "ALA", "N"),
+        Assignment("A", "2", "GLY", "H"),
+    ]
+    assert index.assignments(restraint_loop) == [
+        Assignment("A", "1", None, "H"),
+        Assignment("A", "2", None, "H"),
+        Assignment("A", "1", None, "N"),
+    ]
+
+    locations = index[Assignment("A", "2", None, "H")]
+    assert [(location.row, location.columns.suffix) for location in locations] == [
+        (0, "_2"),
+        (1, "_1"),
+    ]
+    assert all(location.frame is restraints for location in locations)
+    assert Assignment("A", "3", "ALA", "H") not in index
+
+
+def test_relabel_is_simultaneous():
+
+    entry = Entry.from_string(TEST_ENTRY)
+    index = AssignmentIndex.from_entry(entry)
+
+    # shift every residue up by one, 1 -> 2 mustn't then be moved again by 2 -> 3
+    index.relabel(
+        {
+            assignment: assignment._replace(
+                sequence_code=str(int(assignment.sequence_code) + 1)
+            )
+            for assignment in index
+        }
+    )
+
+    shift_loop = entry.get_loops_by_category("_nef_chemical_shift")[0]
+    restraint_loop = entry.get_loops_by_category("_nef_distance_restraint")[0]
+
+    assert [row[1] for row in shift_loop.data] == ["2", "2", "3"]
+    assert [(row[2], row[5]) for row in restraint_loop.data] == [
+        ("2", "3"),
+        ("3", "2"),
+    ]
+
+    assert index.assignments(shift_loop) == [
+        Assignment("A", "2", "ALA", "H"),
+        Assignment("A", "2", "ALA", "N"),
+        Assignment("A", "3", "GLY", "H"),
+    ]
+    assert Assignment("A", "1", None, "H") not in index
+    assert len(index[Assignment("A", "3", None, "H")]) == 2
+
+
+def test_relabel_leaves_unspecified_fields():
+
+    entry = Entry.from_string(TEST_ENTRY)
+    index = AssignmentIndex.from_entry(entry)
+
+    index.relabel(
+        {
+            Assignment("A", "1", "ALA", "H"): Assignment(chain_code="B"),
+            Assignment("A", "1", None, "H"): Assignment(
+                chain_code="B", residue_name="ALA"
+            ),
+        }
+    )
+
+    shift_loop = entry.get_loops_by_category("_nef_chemical_shift")[0]
+    restraint_loop = entry.get_loops_by_category("_nef_distance_restraint")[0]
+
+    assert shift_loop.data[0][:4] == ["B", "1", "ALA", "H"]
+    assert restraint_loop.data[0][1:4] == ["B", "1", "H"]
+    assert Assignment("B", "1", "ALA", "H") in index
+    assert Assignment("B", "1", None, "H") in index
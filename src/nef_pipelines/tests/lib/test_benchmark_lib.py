@@ -0,0 +1,122 @@
+import pytest
+
+from nef_pipelines.lib.benchmark_lib import (
+    BENCHMARK_FORMAT,
+    DEFAULT_SEED,
+    PEAK_LIST_NAMES,
+    BenchmarkException,
+    BenchmarkResult,
+    EntrySize,
+    _with_requirements,
+    compare_with_baseline,
+    results_to_json,
+    run_benchmarks,
+    synthetic_entry,
+)
+from nef_pipelines.nef_app_runner import load_nef_modules_and_build_failure
+
+# the benchmarks run commands through the nef app
+load_nef_modules_and_build_failure()
+
+SMALL_SIZE = EntrySize(residues=5, peaks=7, dimensions=3, restraints=11, planes=3)
+
+
+def test_synthetic_entry_sizes():
+
+    entry = synthetic_entry(SMALL_SIZE)
+
+    sequence = entry.get_loops_by_category("_nef_sequence")[0]
+    assert len(sequence.data) == 5
+
+    shifts = entry.get_loops_by_category("_nef_chemical_shift")[0]
+    assert len(shifts.data) == 5 * 4
+
+    for name in PEAK_LIST_NAMES:
+        frame = entry.get_saveframe_by_name(f"nef_nmr_spectrum_{name}")
+        assert len(frame.get_loop("_nef_spectrum_dimension").data) == 3
+        assert len(frame.get_loop("_nef_peak").data) == 7
+
+    restraints = entry.get_loops_by_category("_nef_distance_restraint")[0]
+    assert len(restraints.data) == 11
+
+    assert len(entry.get_saveframes_by_category("nef_nmr_spectrum")) == 2 + 3
+    assert len(entry.get_saveframes_by_category("nefpls_series_list")) == 1
+
+
+def _without_meta_data(size, seed=DEFAULT_SEED):
+    # the meta data frame has a time stamp and uuid
+    entry = synthetic_entry(size, seed)
+    return [str(frame) for frame in entry if frame.category != "nef_nmr_meta_data"]
+
+
+def test_synthetic_entry_is_deterministic():
+
+    assert _without_meta_data(SMALL_SIZE) == _without_meta_data(SMALL_SIZE)
+    assert _without_meta_data(SMALL_SIZE) != _without_meta_data(SMALL_SIZE, 1)
+
+
+@pytest.mark.parametrize(
+    "size", [EntrySize(dimensions=0), EntrySize(dimensions=5), EntrySize(residues=0)]
+)
+def test_synthetic_entry_bad_size(size):
+
+    with pytest.raises(BenchmarkException):
+        synthetic_entry(size)
+
+
+def test_requirements_run_first():
+
+    assert _with_requirements(["fit mean", "series table", "fit exponential"]) == [
+        "series table",
+        "fit mean",
+        "fit exponential",
+    ]
+
+    with pytest.raises(BenchmarkException, match="no benchmark called bogus"):
+        _with_requirements(["bogus"])
+
+
+def test_run_benchmarks():
+
+    entry = synthetic_entry(SMALL_SIZE)
+
+    reported = []
+    results = run_benchmarks(
+        entry, ["read", "sparky import peaks"], repeats=2, report=reported.append
+    )
+
+    assert [result.name for result in results] == ["read", "sparky import peaks"]
+    assert reported == results
+    for result in results:
+        assert len(result.times) == 2
+        assert result.best <= result.mean
+
+
+def test_compare_with_baseline():
+
+    baseline = results_to_json(
+        SMALL_SIZE,
+        42,
+        [BenchmarkResult("read", (1.0, 2.0)), BenchmarkResult("write", (1.0,))],
+    )
+    current = results_to_json(
+        SMALL_SIZE,
+        42,
+        [
+            BenchmarkResult("read", (1.2,)),
+            BenchmarkResult("write", (1.3,)),
+            BenchmarkResult("peaks match", (9.0,)),
+        ],
+    )
+
+    assert baseline["format"] == BENCHMARK_FORMAT
+    assert baseline["benchmarks"]["read"]["mean"] == 1.5
+
+    regressions = compare_with_baseline(current, baseline, 0.25)
+
+    assert [(regression.name, regression.ratio) for regression in regressions] == [
+        ("write", pytest.approx(1.3))
+    ]
+
+    with pytest.raises(BenchmarkException, match="seed"):
+        compare_with_baseline(results_to_json(SMALL_SIZE, 1, []), baseline, 0.25)
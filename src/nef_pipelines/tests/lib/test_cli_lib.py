@@ -14,6 +14,9 @@ from nef_pipelines.lib.cli_lib import (
     DetectedSeparatorConflicts,
     RangeOffset,
     SelectorAction,
+    _build_chain_offset_grammar,
+    _build_frame_loop_tag_grammar,
+    _build_unified_grammar,
     _combine_range_number_pairs,
     _get_available_separators,
     _validate_separators_are_unique_or_get_message,
@@ -257,6 +260,25 @@ def test_parse_residue_ranges_custom_separators_with_dashes():
     ]
 
 
+def test_grammars_cached_by_separators_and_escape_mode():
+    """Test grammars are built once for each set of separators or escape mode and reused."""
+
+    assert _build_unified_grammar(":", "..") is _build_unified_grammar(":", "..")
+    assert _build_unified_grammar(":", "..") is not _build_unified_grammar("@", "~")
+    assert _build_chain_offset_grammar(":", "..") is _build_chain_offset_grammar(
+        ":", ".."
+    )
+    assert _build_frame_loop_tag_grammar(True) is _build_frame_loop_tag_grammar(True)
+    assert _build_frame_loop_tag_grammar(True) is not _build_frame_loop_tag_grammar(
+        False
+    )
+
+    # parsing with one set of separators doesn't change parsing with another
+    for _ in range(2):
+        assert parse_residue_ranges(["B@5~15"], "@", "~") == [ResidueRange("B", 5, 15)]
+        assert parse_residue_ranges(["B:5..15"]) == [ResidueRange("B", 5, 15)]
+
+
 def test_parse_residue_ranges_separator_validation():
     """Test that identical separators are rejected."""
 
@@ -0,0 +1,123 @@
+import json
+
+import pytest
+import typer
+
+from nef_pipelines import nef_app
+from nef_pipelines.lib.command_manifest_lib import (
+    LOAD_ALL_MODULES_ENV_VAR,
+    build_command_manifest,
+    find_command_name,
+    read_command_manifest,
+    register_command_placeholders,
+    write_command_manifest,
+)
+from nef_pipelines.lib.typer_lib import FilteredHelpGroup
+from nef_pipelines.module_registry import get_registerd_modules
+from nef_pipelines.nef_app_runner import load_nef_modules_and_build_failure
+
+
+@pytest.fixture(scope="module")
+def manifest():
+    load_nef_modules_and_build_failure()
+    return build_command_manifest(nef_app.app, get_registerd_modules())
+
+
+def _short_helps(app: typer.Typer):
+    group = typer.main.get_command(app)
+    return {
+        name: (command.get_short_help_str(limit=200), command.hidden)
+        for name, command in group.commands.items()
+    }
+
+
+def test_manifest_commands(manifest):
+
+    commands = {entry.name: entry for entry in manifest}
+
+    assert commands["save"].module == "nef_pipelines.tools.save"
+    assert commands["frames"].module == "nef_pipelines.tools.frames"
+    assert commands["xplor"].module == "nef_pipelines.transcoders.xplor"
+    assert commands["frames"].rich_help_panel == "NEF manipulation"
+    assert "carry out operations on frames" in commands["frames"].help
+
+    assert len(commands) == len(manifest)
+    assert set(commands) == set(typer.main.get_command(nef_app.app).commands)
+
+
+def test_manifest_round_trip(manifest, tmp_path):
+
+    path = tmp_path / "manifest.json"
+    modules = get_registerd_modules()
+
+    assert write_command_manifest(manifest, modules, path)
+
+    result = read_command_manifest(modules, path)
+
+    assert list(result.values()) == manifest
+
+
+def test_manifest_stale(manifest, tmp_path):
+
+    path = tmp_path / "manifest.json"
+    modules = get_registerd_modules()
+    write_command_manifest(manifest, modules, path)
+
+    assert read_command_manifest(modules[:-1], path) is None
+
+    data = json.loads(path.read_text())
+    data["key"] = "stale"
+    path.write_text(json.dumps(data))
+
+    assert read_command_manifest(modules, path) is None
+
+
+def test_manifest_bad_file(tmp_path):
+
+    path = tmp_path / "manifest.json"
+    path.write_text("{not json")
+
+    assert read_command_manifest(get_registerd_modules(), path) is None
+    assert read_command_manifest(get_registerd_modules(), tmp_path / "missing") is None
+
+
+def test_manifest_disabled(manifest, tmp_path, monkeypatch):
+
+    path = tmp_path / "manifest.json"
+    modules = get_registerd_modules()
+    write_command_manifest(manifest, modules, path)
+
+    monkeypatch.setenv(LOAD_ALL_MODULES_ENV_VAR, "1")
+
+    assert read_command_manifest(modules, path) is None
+
+
+def test_find_command_name():
+
+    assert find_command_name(["frames", "list"]) == "frames"
+    assert find_command_name(["--debug", "--server", "save", "-"]) == "save"
+    assert find_command_name(["--help"]) is None
+    assert find_command_name([]) is None
+
+
+def test_placeholders_match_top_level_help(manifest):
+
+    app = typer.Typer(cls=FilteredHelpGroup)
+    register_command_placeholders(app, manifest)
+
+    assert _short_helps(app) == _short_helps(nef_app.app)
+
+
+def test_placeholders_dont_replace_loaded_commands(manifest):
+
+    app = typer.Typer()
+
+    @app.command()
+    def save():
+        """a loaded command"""
+
+    register_command_placeholders(app, manifest)
+
+    saves = [info for info in app.registered_commands if info.name in (None, "save")]
+    assert len(saves) == 1
+    assert saves[0].callback is save
@@ -0,0 +1,283 @@
+import io
+import os
+import socket
+import subprocess
+import sys
+import time
+import threading
+from pathlib import Path
+
+import pytest
+
+from nef_pipelines.lib import globals_lib
+from nef_pipelines.lib.daemon_lib import (
+    DAEMON_ENV_VAR,
+    REQUEST_PING,
+    REQUEST_RUN,
+    REQUEST_STOP,
+    DaemonUnavailableException,
+    _IsolatedRequest,
+    daemon_socket_path_from_env,
+    default_socket_path,
+    handle_run_request,
+    receive_message,
+    request_daemon,
+    run_in_daemon,
+    send_message,
+    serve_daemon,
+)
+from nef_pipelines.nef_app_runner import load_nef_modules_and_build_failure
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="the daemon requires unix sockets"
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _nef_commands():
+    load_nef_modules_and_build_failure()
+
+
+def test_socket_path_from_env(monkeypatch):
+
+    monkeypatch.delenv(DAEMON_ENV_VAR, raising=False)
+    assert daemon_socket_path_from_env() is None
+
+    monkeypatch.setenv(DAEMON_ENV_VAR, "0")
+    assert daemon_socket_path_from_env() is None
+
+    monkeypatch.setenv(DAEMON_ENV_VAR, "1")
+    assert daemon_socket_path_from_env() == default_socket_path()
+
+    monkeypatch.setenv(DAEMON_ENV_VAR, "/tmp/test.sock")
+    assert daemon_socket_path_from_env() == Path("/tmp/test.sock")
+
+
+def test_message_round_trip():
+
+    message = {"args": ["frames", "list"], "stdin": "data_test\n" * 100_000}
+
+    left, right = socket.socketpair()
+    with left, right:
+        sender = threading.Thread(target=send_message, args=(left, message))
+        sender.start()
+        result = receive_message(right)
+        sender.join()
+
+    assert result == message
+
+
+def test_isolated_request_restores_state(tmp_path):
+
+    globals_lib.replace_globals({"test_value": ["initial"]})
+    cwd = os.getcwd()
+    argv = sys.argv
+
+    try:
+        with _IsolatedRequest(
+            str(tmp_path), {"TEST_ENV": "1"}, ["nef", "test"], {"test_value": ["a"]}
+        ):
+            assert Path.cwd() == tmp_path.resolve()
+            assert os.environ == {"TEST_ENV": "1"}
+            assert sys.argv == ["nef", "test"]
+            assert globals_lib.get_global("test_value", None) == ["a"]
+
+            globals_lib.get_global("test_value", None).append("changed")
+            globals_lib.set_global("other_value", 1)
+
+        assert os.getcwd() == cwd
+        assert "TEST_ENV" not in os.environ
+        assert sys.argv is argv
+        assert globals_lib.debug_get_globals() == {"test_value": ["a"]}
+    finally:
+        globals_lib.debug_clear_globals()
+
+
+def test_run_request(tmp_path):
+
+    reply = handle_run_request(
+        {"args": ["header", "test"], "cwd": str(tmp_path), "env": dict(os.environ)},
+        {},
+    )
+
+    assert reply["exit_code"] == 0
+    assert reply["stdout"].startswith("data_test")
+
+
+def test_run_request_daemon_commands_refused(tmp_path):
+
+    reply = handle_run_request({"args": ["daemon"], "cwd": str(tmp_path)}, {})
+
+    assert reply["exit_code"] == 1
+    assert "can't be run by the daemon" in reply["stderr"]
+
+
+def test_run_request_writes_outside_cwd(tmp_path):
+
+    work = tmp_path / "work"
+    work.mkdir()
+    output = tmp_path / "other" / "out.nef"
+    output.parent.mkdir()
+
+    nef_input = handle_run_request(
+        {"args": ["header", "test"], "cwd": str(work), "env": dict(os.environ)}, {}
+    )["stdout"]
+
+    reply = handle_run_request(
+        {
+            "args": ["save", str(output)],
+            "stdin": nef_input,
+            "cwd": str(work),
+            "env": dict(os.environ),
+        },
+        {},
+    )
+
+    assert reply["exit_code"] == 0, reply["stderr"]
+    assert output.read_text().startswith("data_test")
+
+
+def _start_daemon(socket_path):
+    server = threading.Thread(target=serve_daemon, args=(socket_path,), daemon=True)
+    server.start()
+
+    for _ in range(100):
+        if socket_path.exists():
+            break
+        server.join(0.05)
+
+    return server
+
+
+class _CountingStdin(io.BytesIO):
+    reads = 0
+
+    def read(self, *args):
+        self.reads += 1
+        return super().read(*args)
+
+
+def test_run_in_daemon_only_reads_stdin_when_needed(tmp_path, monkeypatch, capsys):
+
+    socket_path = tmp_path / "d.sock"
+    server = _start_daemon(socket_path)
+    monkeypatch.chdir(tmp_path)
+
+    try:
+        nef_input = request_daemon(
+            socket_path,
+            {"request": REQUEST_RUN, "args": ["header", "test"], "cwd": str(tmp_path)},
+        )["stdout"]
+
+        stdin = _CountingStdin(nef_input.encode())
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(stdin))
+
+        assert run_in_daemon(socket_path, ["header", "other"]) == 0
+        assert capsys.readouterr().out.startswith("data_other")
+        assert stdin.reads == 0
+
+        assert run_in_daemon(socket_path, ["frames", "list"]) == 0
+        assert capsys.readouterr().out.strip() == "nef_nmr_meta_data"
+        assert stdin.reads > 0
+    finally:
+        request_daemon(socket_path, {"request": REQUEST_STOP}, 5.0)
+        server.join(5.0)
+
+
+def test_daemon_serves_requests(tmp_path):
+
+    socket_path = tmp_path / "d.sock"
+    server = _start_daemon(socket_path)
+
+    try:
+        assert "pid" in request_daemon(socket_path, {"request": REQUEST_PING}, 5.0)
+
+        nef_input = request_daemon(
+            socket_path,
+            {"request": REQUEST_RUN, "args": ["header", "test"], "cwd": str(tmp_path)},
+        )["stdout"]
+
+        reply = request_daemon(
+            socket_path,
+            {
+                "request": REQUEST_RUN,
+                "args": ["frames", "list"],
+                "stdin": nef_input,
+                "cwd": str(tmp_path),
+            },
+        )
+
+        assert reply["exit_code"] == 0
+        assert reply["stdout"].strip() == "nef_nmr_meta_data"
+    finally:
+        request_daemon(socket_path, {"request": REQUEST_STOP}, 5.0)
+        server.join(5.0)
+
+    assert not server.is_alive()
+    assert not socket_path.exists()
+
+    with pytest.raises(DaemonUnavailableException):
+        request_daemon(socket_path, {"request": REQUEST_PING}, 1.0)
+
+
+# the nef command as run from the shell
+_NEF = [sys.executable, "-c", "from nef_pipelines.main import main; main()"]
+
+
+def test_daemon_runs_the_steps_of_a_pipeline_concurrently(tmp_path):
+
+    # the equivalent of (sleep 1; nef header test < /dev/null) | nef save --force out.nef run through a live daemon,
+    # save asks for its stdin before header has run so the requests must be served at the same time
+    socket_path = tmp_path / "d.sock"
+    output = tmp_path / "out.nef"
+    env = {**os.environ, DAEMON_ENV_VAR: str(socket_path)}
+
+    daemon = subprocess.Popen(
+        [*_NEF, "daemon", "--socket", str(socket_path)],
+        stdin=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    clients = []
+    try:
+        for _ in range(600):
+            if socket_path.exists() or daemon.poll() is not None:
+                break
+            time.sleep(0.05)
+        assert socket_path.exists()
+
+        read_end, write_end = os.pipe()
+        clients.append(
+            subprocess.Popen(
+                [*_NEF, "save", "--force", str(output)],
+                stdin=read_end,
+                cwd=tmp_path,
+                env=env,
+            )
+        )
+        time.sleep(1.0)
+        clients.append(
+            subprocess.Popen(
+                [*_NEF, "header", "test"],
+                stdin=subprocess.DEVNULL,
+                stdout=write_end,
+                cwd=tmp_path,
+                env=env,
+            )
+        )
+        os.close(read_end)
+        os.close(write_end)
+
+        exit_codes = [client.wait(60) for client in clients]
+    finally:
+        for client in clients:
+            if client.poll() is None:
+                client.kill()
+        try:
+            request_daemon(socket_path, {"request": REQUEST_STOP}, 5.0)
+            daemon.wait(10)
+        except (DaemonUnavailableException, subprocess.TimeoutExpired):
+            daemon.kill()
+
+    assert exit_codes == [0, 0]
+    assert output.read_text().startswith("data_test")
@@ -0,0 +1,137 @@
+import os
+
+from pynmrstar import Entry
+
+from nef_pipelines.lib.entry_index_lib import (
+    FrameIndex,
+    LoopIndex,
+    index_entry_text,
+    index_frame,
+    index_path,
+    read_entry_index,
+    write_entry_index,
+)
+from nef_pipelines.lib.lazy_entry_lib import lazy_entry_from_string
+from nef_pipelines.lib.nef_lib import read_entry_from_file_or_raise
+
+TEST_ENTRY = """\
+data_test
+
+# a comment between frames is allowed
+   save_nef_nmr_meta_data
+      _nef_nmr_meta_data.sf_category      nef_nmr_meta_data
+      _nef_nmr_meta_data.sf_framecode     nef_nmr_meta_data
+      _nef_nmr_meta_data.program_name     'café save_ loop_'
+   save_
+
+   save_nef_chemical_shift_list_test
+      _nef_chemical_shift_list.sf_category   'nef_chemical_shift_list'
+      _nef_chemical_shift_list.sf_framecode  nef_chemical_shift_list_test
+      _nef_chemical_shift_list.comment
+;
+save_not_a_frame
+loop_ _not.a_tag stop_
+;
+
+      loop_
+         _nef_chemical_shift.chain_code
+         _nef_chemical_shift.sequence_code
+         _nef_chemical_shift.value
+
+         # a comment in a loop
+         A   1    8.0
+         A   "2 x's"    7.0
+      stop_
+
+      loop_
+         _nef_comment.text
+      stop_
+   save_
+"""
+
+EXPECTED_FRAMES = [
+    FrameIndex(
+        "nef_nmr_meta_data",
+        "nef_nmr_meta_data",
+        ("sf_category", "sf_framecode", "program_name"),
+        (),
+    ),
+    FrameIndex(
+        "nef_chemical_shift_list_test",
+        "nef_chemical_shift_list",
+        ("sf_category", "sf_framecode", "comment"),
+        (
+            LoopIndex(
+                "_nef_chemical_shift", ("chain_code", "sequence_code", "value"), 2
+            ),
+            LoopIndex("_nef_comment", ("text",), 0),
+        ),
+    ),
+]
+
+
+def _without_offsets(frame_index):
+    return FrameIndex(
+        frame_index.name, frame_index.category, frame_index.tags, frame_index.loops
+    )
+
+
+def test_index_matches_parsed_entry():
+
+    index = index_entry_text(TEST_ENTRY)
+
+    assert index.entry_id == "test"
+    assert [_without_offsets(frame) for frame in index.frames] == EXPECTED_FRAMES
+
+    entry = Entry.from_string(TEST_ENTRY)
+    assert [index_frame(frame) for frame in entry] == EXPECTED_FRAMES
+
+
+def test_index_frame_doesnt_parse_lazy_frames():
+
+    entry = lazy_entry_from_string(TEST_ENTRY)
+
+    assert [index_frame(frame) for frame in entry] == EXPECTED_FRAMES
+    assert entry.parsed_frames == []
+
+    # modified frames are indexed from their loops
+    frame = entry.get_saveframe_by_name("nef_chemical_shift_list_test")
+    frame.remove_loop("_nef_comment")
+
+    assert index_frame(frame).loops == EXPECTED_FRAMES[1].loops[:1]
+
+
+def test_sidecar(tmp_path):
+
+    nef_path = tmp_path / "test.nef"
+    nef_path.write_text(TEST_ENTRY)
+
+    assert read_entry_index(nef_path) is None
+
+    index = write_entry_index(nef_path)
+
+    assert index_path(nef_path) == tmp_path / "test.nef.nefidx"
+    assert read_entry_index(nef_path) == index
+
+    # frames read from a file with a sidecar use its index [indices scanned from a frame's text have no offsets]
+    entry = read_entry_from_file_or_raise(nef_path)
+    assert [index_frame(frame) for frame in entry] == list(index.frames)
+
+    # a sidecar is ignored once the file changes
+    stat = nef_path.stat()
+    os.utime(nef_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert read_entry_index(nef_path) is None
+
+    index_path(nef_path).write_text("not json")
+    assert read_entry_index(nef_path) is None
+
+
+def test_text_outside_frames_isnt_indexed(tmp_path):
+
+    nef_path = tmp_path / "test.nef"
+    nef_path.write_text(f"{TEST_ENTRY}\n_not.in_a_frame 1\n")
+    index_path(nef_path).write_text("stale")
+
+    assert index_entry_text(nef_path.read_text()) is None
+    assert write_entry_index(nef_path) is None
+    assert not index_path(nef_path).exists()
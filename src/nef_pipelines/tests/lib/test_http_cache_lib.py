@@ -0,0 +1,255 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from nef_pipelines.lib import globals_lib
+from nef_pipelines.lib.http_cache_lib import (
+    HTTP_CACHE_DIR_ENV_VAR,
+    HTTP_CACHE_ENV_VAR,
+    CachedResponse,
+    HttpCache,
+    HttpCacheMissException,
+    HttpCacheMode,
+    cached_get,
+    http_cache_mode,
+    request_key,
+    set_http_cache_mode,
+)
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    # paths are answered with their text and a count of the requests made for them, /missing with a 404
+
+    def _reply(self, body):
+        status = 404 if self.path == "/missing" else 200
+        self.server.counts[self.path] = self.server.counts.get(self.path, 0) + 1
+
+        content = f"{body}{self.path} {self.server.counts[self.path]}".encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        self._reply("")
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        self._reply(f"{len(self.rfile.read(length))} ")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    server.counts = {}
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def test_responses_are_cached(tmp_path, server):
+
+    cache = HttpCache(tmp_path)
+
+    response = cache.get(f"{server.url}/entry")
+    assert response.text == "/entry 1"
+    assert not response.from_cache
+
+    response = cache.get(f"{server.url}/entry")
+    assert response.text == "/entry 1"
+    assert response.from_cache
+    assert response.status_code == 200
+    assert server.counts["/entry"] == 1
+
+    # failed responses aren't cached
+    assert cache.get(f"{server.url}/missing").status_code == 404
+    assert cache.get(f"{server.url}/missing").status_code == 404
+    assert server.counts["/missing"] == 2
+
+
+def test_expired_responses_are_refetched(tmp_path, server):
+
+    cache = HttpCache(tmp_path, ttl=0.0)
+
+    cache.get(f"{server.url}/entry")
+    time.sleep(0.01)
+
+    assert cache.get(f"{server.url}/entry").text == "/entry 2"
+
+
+def test_stale_response_used_when_server_unavailable(tmp_path, server):
+
+    url = f"{server.url}/entry"
+    HttpCache(tmp_path).get(url)
+
+    server.shutdown()
+    server.server_close()
+
+    response = HttpCache(tmp_path, ttl=0.0).get(url, timeout=1)
+
+    assert response.from_cache
+    assert response.text == "/entry 1"
+
+
+def test_post_keyed_by_data_and_file_content(tmp_path, server):
+
+    cache = HttpCache(tmp_path)
+    url = f"{server.url}/predict"
+
+    cache.request("POST", url, data={"a": 1}, files={"file": ("x.pdb", b"ATOM")})
+    cache.request("POST", url, data={"a": 1}, files={"file": ("x.pdb", b"ATOM")})
+    assert server.counts["/predict"] == 1
+
+    cache.request("POST", url, data={"a": 1}, files={"file": ("x.pdb", b"HETATM")})
+    cache.request("POST", url, data={"a": 2}, files={"file": ("x.pdb", b"ATOM")})
+    assert server.counts["/predict"] == 3
+
+    assert request_key("GET", url, params={"a": 1, "b": 2}) == request_key(
+        "GET", url, params={"b": 2, "a": 1}
+    )
+
+
+def test_cache_if(tmp_path, server):
+
+    cache = HttpCache(tmp_path)
+    url = f"{server.url}/busy"
+
+    cache.get(url, cache_if=lambda response: False)
+    cache.get(url, cache_if=lambda response: False)
+
+    assert server.counts["/busy"] == 2
+
+
+def test_least_recently_used_evicted(tmp_path, server):
+
+    cache = HttpCache(tmp_path, max_size=30)
+
+    for name in ("first", "second", "third"):
+        cache.get(f"{server.url}/{name}")
+        time.sleep(0.01)
+
+    # each body is about 10 bytes so only the two most recently used entries fit
+    cache.get(f"{server.url}/first")
+    cache.get(f"{server.url}/fourth")
+
+    assert cache.get(f"{server.url}/first").from_cache
+    assert cache.get(f"{server.url}/fourth").from_cache
+    assert not cache.get(f"{server.url}/second").from_cache
+
+    bodies = list((tmp_path / "bodies").glob("*/*"))
+    assert sum(path.stat().st_size for path in bodies) <= 30
+
+
+def test_pruned_once_until_enough_is_written(tmp_path, server, monkeypatch):
+
+    prunes = []
+    monkeypatch.setattr(HttpCache, "_prune", lambda self: prunes.append(self))
+
+    # each body is 4 bytes [/<index> 1] and a prune is due after 10 bytes are written
+    cache = HttpCache(tmp_path, max_size=100)
+    for index in range(3):
+        cache.get(f"{server.url}/{index}")
+
+    assert len(prunes) == 1
+
+    cache.get(f"{server.url}/3")
+
+    assert len(prunes) == 2
+
+
+def test_concurrent_writes_and_prunes(tmp_path):
+
+    cache = HttpCache(tmp_path)
+
+    # every response has the same body so the threads write the same body file
+    def write(thread_index):
+        for index in range(20):
+            url = f"http://example.org/{thread_index}/{index}"
+            response = CachedResponse(url, 200, b"same body", "utf-8")
+            cache._write(request_key("GET", url), "GET", response)
+            cache.prune()
+
+    threads = [threading.Thread(target=write, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for thread_index in range(8):
+        for index in range(20):
+            url = f"http://example.org/{thread_index}/{index}"
+            assert cache._read(request_key("GET", url)).content == b"same body"
+
+    assert not list(tmp_path.glob("**/.*.tmp"))
+
+
+def test_offline(tmp_path, server):
+
+    HttpCache(tmp_path).get(f"{server.url}/entry")
+
+    offline = HttpCache(tmp_path, HttpCacheMode.OFFLINE, ttl=0.0)
+
+    assert offline.get(f"{server.url}/entry").text == "/entry 1"
+
+    with pytest.raises(HttpCacheMissException):
+        offline.get(f"{server.url}/other")
+
+    with pytest.raises(HttpCacheMissException):
+        HttpCache(None, HttpCacheMode.OFFLINE).get(f"{server.url}/entry")
+
+    assert server.counts == {"/entry": 1}
+
+
+def test_record_and_replay(tmp_path, server):
+
+    recording = HttpCache(tmp_path, HttpCacheMode.RECORD)
+
+    recording.get(f"{server.url}/entry")
+    recording.get(f"{server.url}/entry")
+    recording.get(f"{server.url}/missing")
+
+    server.shutdown()
+    server.server_close()
+
+    replay = HttpCache(tmp_path, HttpCacheMode.REPLAY, ttl=0.0, max_size=0)
+
+    assert replay.get(f"{server.url}/entry").text == "/entry 2"
+    assert replay.get(f"{server.url}/missing").status_code == 404
+
+    with pytest.raises(HttpCacheMissException):
+        replay.get(f"{server.url}/other")
+
+
+def test_mode_from_env_and_globals(tmp_path, server, monkeypatch):
+
+    monkeypatch.setenv(HTTP_CACHE_DIR_ENV_VAR, str(tmp_path))
+    monkeypatch.setenv(HTTP_CACHE_ENV_VAR, "replay")
+
+    try:
+        assert http_cache_mode() == HttpCacheMode.REPLAY
+
+        set_http_cache_mode(HttpCacheMode.OFF)
+        assert http_cache_mode() == HttpCacheMode.OFF
+
+        assert cached_get(f"{server.url}/entry").text == "/entry 1"
+        assert not os.listdir(tmp_path)
+
+        set_http_cache_mode(None)
+        with pytest.raises(HttpCacheMissException):
+            cached_get(f"{server.url}/entry")
+    finally:
+        globals_lib.debug_clear_globals()
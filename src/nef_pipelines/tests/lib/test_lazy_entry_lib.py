@@ -0,0 +1,236 @@
+import copy
+
+import pytest
+from pynmrstar import Entry
+from pynmrstar.exceptions import ParsingError
+
+from nef_pipelines.lib.lazy_entry_lib import (
+    LazyEntry,
+    LazySaveframe,
+    lazy_entry_from_string,
+)
+from nef_pipelines.lib.nef_lib import create_nef_save_frame, select_frames
+
+TEST_ENTRY = """\
+data_test
+
+# a comment between frames is allowed
+   save_nef_nmr_meta_data
+      _nef_nmr_meta_data.sf_category      nef_nmr_meta_data
+      _nef_nmr_meta_data.sf_framecode     nef_nmr_meta_data
+      _nef_nmr_meta_data.format_name      nmr_exchange_format
+   save_
+
+   save_nef_chemical_shift_list_test
+      _nef_chemical_shift_list.sf_category   'nef_chemical_shift_list'
+      _nef_chemical_shift_list.sf_framecode  nef_chemical_shift_list_test
+      _nef_chemical_shift_list.comment
+;
+save_not_a_frame
+;
+
+      loop_
+         _nef_chemical_shift.chain_code
+         _nef_chemical_shift.sequence_code
+         _nef_chemical_shift.value
+
+         A   1    8.0
+         A   2    7.0
+      stop_
+   save_
+"""
+
+
+def test_lazy_entry_indexes_frames_without_parsing():
+
+    entry = lazy_entry_from_string(TEST_ENTRY)
+
+    assert isinstance(entry, LazyEntry)
+    assert entry.entry_id == "test"
+    assert [frame.name for frame in entry] == [
+        "nef_nmr_meta_data",
+        "nef_chemical_shift_list_test",
+    ]
+    assert [frame.category for frame in entry] == [
+        "nef_nmr_meta_data",
+        "nef_chemical_shift_list",
+    ]
+    assert all(isinstance(frame, LazySaveframe) for frame in entry)
+    assert entry.parsed_frames == []
+
+
+def test_lazy_entry_selection_doesnt_parse():
+
+    entry = lazy_entry_from_string(TEST_ENTRY)
+
+    frames = select_frames(entry, "nef_chemical_shift_list")
+    by_category = entry.get_saveframes_by_category("nef_chemical_shift_list")
+    by_name = entry.get_saveframe_by_name("nef_nmr_meta_data")
+
+    assert [frame.name for frame in frames] == ["nef_chemical_shift_list_test"]
+    assert by_category == frames
+    assert by_name.name == "nef_nmr_meta_data"
+    assert entry.parsed_frames == []
+
+
+def test_lazy_entry_parses_on_use():
+
+    entry = lazy_entry_from_string(TEST_ENTRY)
+
+    frame = entry.get_saveframe_by_name("nef_chemical_shift_list_test")
+    loop = frame.get_loop("nef_chemical_shift")
+
+    assert loop.data == [["A", "1", "8.0"], ["A", "2", "7.0"]]
+    assert frame.get_tag("comment") == ["save_not_a_frame\n"]
+    assert entry.parsed_frames == [frame]
+
+
+def test_lazy_entry_matches_pynmrstar():
+
+    lazy_entry = lazy_entry_from_string(TEST_ENTRY)
+    entry = Entry.from_string(TEST_ENTRY)
+
+    assert lazy_entry == entry
+
+
+def test_lazy_entry_writes_untouched_frames_verbatim():
+
+    entry = lazy_entry_from_string(TEST_ENTRY)
+
+    frame = entry.get_saveframe_by_name("nef_nmr_meta_data")
+    frame.add_tag("program_name", "test")
+
+    result = str(entry)
+
+    # the untouched frame is copied from the input
+    assert (
+        TEST_ENTRY[TEST_ENTRY.index("   save_nef_chemical_shift_list_test") :] in result
+    )
+
+    # the modified frame is re-formatted
+    assert "_nef_nmr_meta_data.program_name" in result
+    assert Entry.from_string(result).get_saveframe_by_name("nef_nmr_meta_data").get_tag(
+        "program_name"
+    ) == ["test"]
+
+
+def test_lazy_entry_rename_parses_frame():
+
+    entry = lazy_entry_from_string(TEST_ENTRY)
+
+    frame = entry.get_saveframe_by_name("nef_nmr_meta_data")
+    frame.name = "nef_nmr_meta_data_renamed"
+
+    assert frame.parsed
+    assert frame.get_tag("sf_framecode") == ["nef_nmr_meta_data_renamed"]
+
+
+def test_lazy_entry_copy():
+
+    entry = lazy_entry_from_string(TEST_ENTRY)
+
+    frame = copy.deepcopy(entry.get_saveframe_by_name("nef_chemical_shift_list_test"))
+
+    assert not frame.parsed
+    assert frame.get_loop("nef_chemical_shift").data[0] == ["A", "1", "8.0"]
+
+
+def test_lazy_entry_falls_back_to_full_parse():
+
+    MISSING_CATEGORY = TEST_ENTRY.replace(
+        "      _nef_nmr_meta_data.sf_category      nef_nmr_meta_data\n", ""
+    )
+
+    entry = lazy_entry_from_string(MISSING_CATEGORY)
+
+    assert not isinstance(entry, LazyEntry)
+    assert entry == Entry.from_string(MISSING_CATEGORY)
+
+
+def test_lazy_entry_bad_text_outside_frames_raises():
+
+    TEXT_OUTSIDE_FRAMES = TEST_ENTRY.replace(
+        "# a comment between frames is allowed", "_bad.tag outside_frame"
+    )
+
+    with pytest.raises(ParsingError):
+        lazy_entry_from_string(TEXT_OUTSIDE_FRAMES)
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        ("A   2    7.0", "A   2"),
+        ("A   2    7.0", "A   2    7.0   extra"),
+        ("format_name      nmr_exchange_format", "format_name"),
+    ],
+)
+def test_lazy_entry_malformed_frames_raise_when_read(old, new):
+
+    MALFORMED = TEST_ENTRY.replace(old, new)
+
+    with pytest.raises(ParsingError) as expected:
+        Entry.from_string(MALFORMED)
+
+    with pytest.raises(ParsingError) as result:
+        lazy_entry_from_string(MALFORMED)
+
+    assert str(result.value) == str(expected.value)
+
+
+def test_lazy_frame_parse_errors_report_file_lines():
+
+    text = "save_test\n   _test.sf_category  test\n   loop_\n      _loop.a\n   stop_\n   bad\nsave_\n"
+
+    with pytest.raises(ParsingError) as expected:
+        LazySaveframe(text, "test", "test").loops
+
+    with pytest.raises(ParsingError) as result:
+        LazySaveframe(text, "test", "test", line_offset=10).loops
+
+    assert result.value.line_number == expected.value.line_number + 10
+
+
+def test_lazy_entry_parsed_but_unmodified_frames_are_clean():
+
+    entry = lazy_entry_from_string(TEST_ENTRY)
+
+    frame = entry.get_saveframe_by_name("nef_chemical_shift_list_test")
+    assert frame.get_loop("nef_chemical_shift").data[0][2] == "8.0"
+
+    assert frame.parsed
+    assert not frame.dirty
+    assert entry.dirty_frames == []
+    assert str(entry) == str(lazy_entry_from_string(TEST_ENTRY))
+
+
+def test_lazy_entry_modified_loop_is_dirty():
+
+    entry = lazy_entry_from_string(TEST_ENTRY)
+
+    frame = entry.get_saveframe_by_name("nef_chemical_shift_list_test")
+    frame.get_loop("nef_chemical_shift").data[0][2] = "9.0"
+
+    assert frame.dirty
+    assert entry.dirty_frames == [frame]
+
+    result = str(entry)
+    assert "A   1    8.0" not in result
+    assert Entry.from_string(result).get_saveframe_by_name(
+        "nef_chemical_shift_list_test"
+    ).get_loop("nef_chemical_shift").data[0] == ["A", "1", "9.0"]
+
+
+def test_lazy_entry_new_and_marked_frames_are_dirty():
+
+    entry = lazy_entry_from_string(TEST_ENTRY)
+
+    new_frame = create_nef_save_frame("nef_test", "new")
+    entry.add_saveframe(new_frame)
+
+    meta_data_frame = entry.get_saveframe_by_name("nef_nmr_meta_data")
+    meta_data_frame.mark_dirty()
+
+    assert not meta_data_frame.parsed
+    assert entry.dirty_frames == [meta_data_frame, new_frame]
+    assert "   save_nef_nmr_meta_data\n      _nef_nmr_meta_data" not in str(entry)
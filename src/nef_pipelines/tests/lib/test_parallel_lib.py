@@ -0,0 +1,56 @@
+import sys
+
+import pytest
+
+from nef_pipelines.lib.parallel_lib import run_per_file
+from nef_pipelines.lib.util import exit_error, warn
+
+
+def _square_and_warn(value):
+    warn(f"squaring {value}")
+    return value * value
+
+
+def _exit_on_negative(value):
+    if value < 0:
+        exit_error(f"the value {value} is negative")
+    warn(f"read {value}")
+    return value
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_results_and_warnings_in_input_order(jobs, capsys):
+
+    assert run_per_file(_square_and_warn, [(i,) for i in range(6)], jobs) == [
+        0,
+        1,
+        4,
+        9,
+        16,
+        25,
+    ]
+
+    assert capsys.readouterr().err.split("\n")[:-1] == [
+        f"WARNING: squaring {i}" for i in range(6)
+    ]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_stops_at_first_failure(jobs, capsys):
+
+    with pytest.raises(SystemExit):
+        run_per_file(_exit_on_negative, [(1,), (-2,), (3,), (-4,)], jobs)
+
+    stderr = capsys.readouterr().err
+
+    assert "WARNING: read 1" in stderr
+    assert "the value -2 is negative" in stderr
+    assert "3" not in stderr and "-4" not in stderr
+
+
+def test_worker_exceptions_are_raised():
+
+    with pytest.raises(ZeroDivisionError):
+        run_per_file(divmod, [(1, 1), (1, 0)], 2)
+
+    assert sys.stderr is not None
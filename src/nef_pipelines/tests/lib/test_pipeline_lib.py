@@ -0,0 +1,197 @@
+import pytest
+from pynmrstar import Entry, Loop, Saveframe
+
+from nef_pipelines.lib import globals_lib, nef_lib
+from nef_pipelines.lib.globals_lib import get_global, set_global
+from nef_pipelines.lib.pipeline_lib import (
+    hand_off_entry,
+    normalise_entry_values,
+    parse_pipeline,
+    run_pipeline,
+    take_handoff_entry,
+)
+from nef_pipelines.lib.test_lib import read_test_data
+from nef_pipelines.nef_app_runner import load_nef_modules_and_build_failure
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _nef_commands():
+    # pipelines run commands from the full nef app
+    load_nef_modules_and_build_failure()
+
+
+def test_parse_pipeline():
+
+    result = parse_pipeline("frames rename 'a b' c | nef shifts average|save -")
+
+    assert result == [
+        ["frames", "rename", "a b", "c"],
+        ["shifts", "average"],
+        ["save", "-"],
+    ]
+
+
+def test_parse_pipeline_from_arguments():
+
+    result = parse_pipeline(["nef", "frames", "list", "|", "save", "-"])
+
+    assert result == [["frames", "list"], ["save", "-"]]
+
+
+def test_run_pipeline_passes_output_between_steps():
+
+    nef_input = read_test_data("multi_shift_frames.nef", __file__)
+
+    steps = parse_pipeline(
+        "frames rename default renamed | frames rename renamed renamed_again | frames list"
+    )
+    result = run_pipeline(steps, nef_input)
+
+    assert result.exit_code == 0
+    assert result.steps_completed == 3
+    assert result.stderr == ["", "", ""]
+    assert "nef_chemical_shift_list_renamed_again" in result.stdout
+
+
+def test_run_pipeline_output_is_text():
+
+    nef_input = read_test_data("multi_shift_frames.nef", __file__)
+
+    steps = parse_pipeline("frames rename default renamed")
+    result = run_pipeline(steps, nef_input)
+
+    assert result.exit_code == 0
+    entry = Entry.from_string(result.stdout)
+    assert entry.get_saveframe_by_name("nef_chemical_shift_list_renamed")
+
+
+def test_run_pipeline_stops_on_failure():
+
+    nef_input = read_test_data("multi_shift_frames.nef", __file__)
+
+    steps = parse_pipeline("frames list | frames bogus | frames list")
+    result = run_pipeline(steps, nef_input)
+
+    assert result.exit_code != 0
+    assert result.steps_completed == 1
+    assert len(result.stderr) == 2
+    assert "bogus" in result.stderr[1]
+
+
+def test_run_pipeline_isolates_globals():
+
+    seen = []
+
+    def record_step(args, nef_input):
+        seen.append(get_global("test_value", None))
+        set_global("test_value", args[0])
+        return "", "", 0
+
+    set_global("test_value", "initial")
+    try:
+        run_pipeline([["a"], ["b"]], execute_step=record_step)
+
+        assert seen == ["initial", "initial"]
+        assert get_global("test_value", None) == "initial"
+    finally:
+        globals_lib._globals.pop("test_value", None)
+
+
+def _entry_with_values(tag_value, loop_values):
+    entry = Entry.from_scratch("test")
+    frame = Saveframe.from_scratch("test_frame", "test")
+    frame.add_tag("sf_category", "test")
+    frame.add_tag("sf_framecode", "test_frame")
+    frame.add_tag("value", tag_value)
+
+    loop = Loop.from_scratch("_test_loop")
+    loop.add_tag(["a", "b", "c"])
+    loop.add_data([loop_values])
+    frame.add_loop(loop)
+    entry.add_saveframe(frame)
+
+    return entry
+
+
+def test_normalise_entry_values():
+
+    entry = _entry_with_values(1.5, [None, True, 10])
+
+    normalise_entry_values(entry)
+
+    frame = entry.get_saveframe_by_name("test_frame")
+    assert frame.get_tag("value") == ["1.5"]
+    assert frame.loops[0].data == [[".", "True", "10"]]
+
+
+def test_run_pipeline_hands_normalised_entry_between_steps():
+
+    received = []
+
+    def hand_off_step(args, nef_input):
+        assert hand_off_entry(_entry_with_values(1.5, [None, True, 10]))
+        return "", "", 0
+
+    def take_step(args, nef_input):
+        entry = take_handoff_entry()
+        received.append(entry)
+        assert take_handoff_entry() is None
+        hand_off_entry(entry)
+        return "", "", 0
+
+    def execute_step(args, nef_input):
+        return (
+            hand_off_step(args, nef_input)
+            if args == ["first"]
+            else take_step(args, nef_input)
+        )
+
+    result = run_pipeline([["first"], ["second"]], execute_step=execute_step)
+
+    assert result.exit_code == 0
+    assert result.steps_completed == 2
+
+    frame = received[0].get_saveframe_by_name("test_frame")
+    assert frame.get_tag("value") == ["1.5"]
+    assert frame.loops[0].data == [[".", "True", "10"]]
+
+    assert Entry.from_string(result.stdout).get_saveframe_by_name("test_frame")
+
+
+def test_run_pipeline_only_parses_its_input(monkeypatch):
+
+    calls = []
+
+    def counting_lazy_entry_from_string(*args, **kwargs):
+        calls.append(args)
+        return lazy_entry_from_string(*args, **kwargs)
+
+    lazy_entry_from_string = nef_lib.lazy_entry_from_string
+    monkeypatch.setattr(
+        nef_lib, "lazy_entry_from_string", counting_lazy_entry_from_string
+    )
+
+    nef_input = read_test_data("multi_shift_frames.nef", __file__)
+
+    steps = parse_pipeline(
+        "frames rename default renamed | frames rename renamed renamed_again | frames rename renamed_again final"
+    )
+    result = run_pipeline(steps, nef_input)
+
+    assert result.exit_code == 0
+    assert len(calls) == 1
+    entry = Entry.from_string(result.stdout)
+    assert entry.get_saveframe_by_name("nef_chemical_shift_list_final")
+
+
+def test_hand_off_entry_outside_a_pipeline(capsys):
+
+    entry = _entry_with_values("a", ["b", "c", "d"])
+
+    assert not hand_off_entry(entry)
+
+    nef_lib.print_entry(entry)
+
+    assert Entry.from_string(capsys.readouterr().out).get_saveframe_by_name(
+        "test_frame"
+    )
@@ -0,0 +1,189 @@
+import random
+from itertools import permutations
+
+import pytest
+
+from nef_pipelines.lib import spatial_index_lib
+from nef_pipelines.lib.spatial_index_lib import (
+    DEFAULT_CANDIDATES,
+    KDTree,
+    distance,
+    optimal_assignment,
+)
+
+
+def _random_points(rng, count, dimensions=2):
+    # coarse grid values so there are ties between equidistant points
+    return [
+        tuple(rng.randint(0, 20) / 3 for _ in range(dimensions)) for _ in range(count)
+    ]
+
+
+def _brute_force_nearest(point, points):
+    distances = [distance(point, other) for other in points]
+    minimum = min(distances)
+    return [
+        index
+        for index, point_distance in enumerate(distances)
+        if point_distance == minimum
+    ], minimum
+
+
+def test_nearest_matches_brute_force():
+
+    rng = random.Random(42)
+    points = _random_points(rng, 200, 3)
+    tree = KDTree(points)
+
+    for point in _random_points(rng, 100, 3):
+        assert tree.nearest(point) == _brute_force_nearest(point, points)
+
+
+def test_nearest_ids_and_ties():
+
+    tree = KDTree([(0.0, 0.0), (2.0, 0.0), (1.0, 5.0)], ids=["a", "b", "c"])
+
+    assert tree.nearest((1.0, 0.0)) == (["a", "b"], 1.0)
+    assert tree.nearest((1.0, 4.0)) == (["c"], 1.0)
+    assert KDTree([]).nearest((1.0, 1.0))[0] == []
+
+
+def test_bad_ids_or_dimensions():
+
+    with pytest.raises(ValueError):
+        KDTree([(0.0, 0.0)], ids=["a", "b"])
+
+    with pytest.raises(ValueError):
+        KDTree([(0.0, 0.0), (1.0,)])
+
+
+def test_nearest_k_and_within():
+
+    rng = random.Random(7)
+    points = _random_points(rng, 150)
+    tree = KDTree(points)
+
+    for point in _random_points(rng, 50):
+        by_distance = sorted(
+            (distance(point, other), index) for index, other in enumerate(points)
+        )
+
+        assert tree.nearest_k(point, 5) == [
+            (index, point_distance) for point_distance, index in by_distance[:5]
+        ]
+        assert tree.within(point, 1.5) == [
+            (index, point_distance)
+            for point_distance, index in by_distance
+            if point_distance <= 1.5
+        ]
+
+
+def test_nearest_batch_numpy():
+
+    pytest.importorskip("numpy")
+
+    rng = random.Random(3)
+    tree = KDTree(_random_points(rng, 300))
+    points = _random_points(rng, 100)
+
+    assert tree.nearest_batch(points, use_numpy=True) == tree.nearest_batch(points)
+
+
+def _brute_force_assignment_cost(points_1, points_2):
+    # points_1 must be no larger than points_2
+    return min(
+        sum(distance(point, points_2[index]) for point, index in zip(points_1, indices))
+        for indices in permutations(range(len(points_2)), len(points_1))
+    )
+
+
+def test_optimal_assignment_matches_brute_force():
+
+    rng = random.Random(11)
+
+    for _ in range(20):
+        points_1 = [(rng.random() * 5, rng.random() * 5) for _ in range(5)]
+        points_2 = [(rng.random() * 5, rng.random() * 5) for _ in range(6)]
+
+        matches = optimal_assignment(points_1, points_2, candidates=6)
+
+        assert [index_1 for index_1, _, _ in matches] == list(range(5))
+        assert len({index_2 for _, index_2, _ in matches}) == 5
+        assert sum(match[2] for match in matches) == pytest.approx(
+            _brute_force_assignment_cost(points_1, points_2)
+        )
+
+
+def test_optimal_assignment_considers_every_pair_for_few_points():
+
+    rng = random.Random(5)
+
+    approximate = 0
+    for _ in range(20):
+        points_1 = [(rng.random() * 5, rng.random() * 5) for _ in range(7)]
+        points_2 = [(rng.random() * 5, rng.random() * 5) for _ in range(7)]
+
+        best = _brute_force_assignment_cost(points_1, points_2)
+
+        # there are no more points than the default number of candidates
+        matches = optimal_assignment(points_1, points_2)
+        assert sum(match[2] for match in matches) == pytest.approx(best)
+
+        # with only a few candidates per point the matching is an approximation
+        matches = optimal_assignment(points_1, points_2, candidates=2)
+        if sum(match[2] for match in matches) > best + 1e-9:
+            approximate += 1
+
+    assert approximate > 0
+
+
+def test_optimal_assignment_is_one_to_one():
+
+    # the closest match for both 0 and 1 is 0, matching 1 to 1 gives the smallest total distance
+    points_1 = [(0.0, 0.0), (1.0, 0.0)]
+    points_2 = [(0.4, 0.0), (2.5, 0.0)]
+
+    assert optimal_assignment(points_1, points_2) == [(0, 0, 0.4), (1, 1, 1.5)]
+    assert optimal_assignment(points_1, points_2, max_distance=1.0) == [(0, 0, 0.4)]
+    assert optimal_assignment(points_1, []) == []
+
+
+def test_optimal_assignment_falls_back_to_more_candidates():
+
+    # the points in points_2 are all nearest to point 0 so one candidate per point can't match both points
+    points_1 = [(0.0, 0.0), (10.0, 0.0)]
+    points_2 = [(0.1, 0.0), (0.2, 0.0)]
+
+    assert optimal_assignment(points_1, points_2, candidates=1) == [
+        (0, 0, pytest.approx(0.1)),
+        (1, 1, pytest.approx(9.8)),
+    ]
+
+
+def test_optimal_assignment_scales_with_candidates(monkeypatch):
+
+    # a large peak list and a perturbed copy, only the nearest points of each point are compared
+    rng = random.Random(17)
+    points_1 = [
+        (index % 40 * 0.25 + rng.random() * 0.1, index // 40 * 0.6 + rng.random() * 0.3)
+        for index in range(2000)
+    ]
+    points_2 = [(x + rng.gauss(0, 0.01), y + rng.gauss(0, 0.05)) for x, y in points_1]
+
+    num_edges = []
+    min_cost_matching = spatial_index_lib._min_cost_matching
+
+    def counting_min_cost_matching(edges_by_row, num_columns):
+        num_edges.append(sum(len(edges) for edges in edges_by_row))
+        return min_cost_matching(edges_by_row, num_columns)
+
+    monkeypatch.setattr(
+        spatial_index_lib, "_min_cost_matching", counting_min_cost_matching
+    )
+
+    matches = optimal_assignment(points_1, points_2)
+
+    assert [(index_1, index_2) for index_1, index_2, _ in matches] == [
+        (index, index) for index in range(2000)
+    ]
+    assert num_edges == [pytest.approx(2000 * DEFAULT_CANDIDATES, rel=0.5)]
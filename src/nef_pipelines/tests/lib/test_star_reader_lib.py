@@ -0,0 +1,172 @@
+import logging
+from pathlib import Path
+
+import pytest
+from pynmrstar import Saveframe
+from pynmrstar.exceptions import ParsingError
+
+from nef_pipelines.lib.lazy_entry_lib import _index_frames
+from nef_pipelines.lib.star_reader_lib import (
+    is_well_formed_saveframe,
+    read_saveframe_fast,
+    saveframe_from_string,
+)
+
+TESTS_ROOT = Path(__file__).parent.parent
+
+TEST_FRAME = """\
+save_nef_chemical_shift_list_test
+   _nef_chemical_shift_list.sf_category   nef_chemical_shift_list
+   _nef_chemical_shift_list.sf_framecode  'nef_chemical_shift_list_test'
+   _nef_chemical_shift_list.comment       "it's a list"
+
+   loop_
+      _nef_chemical_shift.chain_code
+      _nef_chemical_shift.sequence_code
+      _nef_chemical_shift.atom_name
+      _nef_chemical_shift.ccpn_comment
+
+      A   1   H     'a comment'
+      # a comment between rows
+      A   1   HB%   "it's"
+      A   2   N     isn't
+   stop_
+
+   loop_
+      _nef_peak.index
+   stop_
+save_
+"""
+
+
+def _frame_state(frame):
+    return (
+        frame.name,
+        frame.category,
+        frame.tag_prefix,
+        frame.source,
+        [list(tag) for tag in frame.tags],
+        [(loop.category, loop.tags, loop.data, loop.source) for loop in frame.loops],
+    )
+
+
+def _test_data_frames():
+    for file_path in sorted(TESTS_ROOT.glob("**/test_data/**/*.nef")):
+        index = _index_frames(file_path.read_text())
+        if index is not None:
+            for name, _, text, _ in index[1]:
+                yield file_path, name, text
+
+
+def test_test_data_matches_pynmrstar():
+
+    frame_count = 0
+    fast_count = 0
+    for file_path, name, text in _test_data_frames():
+        frame_count += 1
+
+        try:
+            expected = _frame_state(Saveframe.from_string(text))
+        except ParsingError:
+            expected = None
+
+        frame = read_saveframe_fast(text)
+        if frame is None:
+            continue
+
+        fast_count += 1
+        assert _frame_state(frame) == expected, f"{file_path} {name}"
+
+    assert frame_count > 100
+    assert fast_count > frame_count / 2
+
+
+def test_quoting_and_comments_read_by_fast_path():
+
+    frame = read_saveframe_fast(TEST_FRAME)
+
+    assert frame is not None
+    assert _frame_state(frame) == _frame_state(Saveframe.from_string(TEST_FRAME))
+    assert frame.get_loop("_nef_chemical_shift").data[1] == ["A", "1", "HB%", "it's"]
+
+
+def test_empty_loop_warns_like_pynmrstar(caplog):
+
+    with caplog.at_level(logging.WARNING, logger="pynmrstar"):
+        Saveframe.from_string(TEST_FRAME)
+    expected = caplog.messages
+    caplog.clear()
+
+    with caplog.at_level(logging.WARNING, logger="pynmrstar"):
+        read_saveframe_fast(TEST_FRAME)
+
+    assert len(expected) == 1
+    assert caplog.messages == expected
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        ("'a comment'", "\n;\na multi\nline comment\n;\n"),
+        ("'a comment'", "''"),
+        ("'a comment'", "'stop_'"),
+        ("'a comment'", "'a' comment'"),
+        ("isn't", "save_x"),
+        ("isn't", "_nef_chemical_shift.value"),
+        ("   A   2   N", "\v  A   2   N"),
+    ],
+)
+def test_unusual_frames_read_by_pynmrstar(old, new):
+
+    text = TEST_FRAME.replace(old, new)
+
+    assert read_saveframe_fast(text) is None
+
+    try:
+        expected = _frame_state(Saveframe.from_string(text))
+    except ParsingError:
+        with pytest.raises(ParsingError):
+            saveframe_from_string(text)
+    else:
+        assert _frame_state(saveframe_from_string(text)) == expected
+
+
+def test_well_formed_test_data_frames_parse():
+
+    well_formed_count = 0
+    for file_path, name, text in _test_data_frames():
+        if is_well_formed_saveframe(text):
+            well_formed_count += 1
+            Saveframe.from_string(text)
+
+    assert well_formed_count > 100
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        ("   A   2   N     isn't", "   A   2   N"),
+        ("   A   2   N     isn't", "   A   2   N     isn't  extra"),
+        ("'nef_chemical_shift_list_test'", ""),
+        ("   stop_\nsave_", "save_"),
+        ("'a comment'", "'stop_'"),
+    ],
+)
+def test_malformed_frames_are_not_well_formed(old, new):
+
+    assert is_well_formed_saveframe(TEST_FRAME)
+
+    text = TEST_FRAME.replace(old, new)
+    assert not is_well_formed_saveframe(text)
+
+    with pytest.raises(ParsingError):
+        Saveframe.from_string(text)
+
+
+def test_loops_with_semicolon_strings_are_counted():
+
+    text = TEST_FRAME.replace("'a comment'", "\n;\nstop_ in a\nmulti line comment\n;\n")
+    assert is_well_formed_saveframe(text)
+
+    short_row = text.replace("   A   2   N     isn't\n", "   A   2   N\n")
+    assert not is_well_formed_saveframe(short_row)
@@ -0,0 +1,135 @@
+import io
+
+from pynmrstar import Entry, Loop
+
+from nef_pipelines.lib import star_writer_lib
+from nef_pipelines.lib.lazy_entry_lib import lazy_entry_from_string
+from nef_pipelines.lib.star_writer_lib import (
+    format_entry,
+    format_loop,
+    format_saveframe,
+    write_entry,
+)
+
+TEST_ENTRY = """\
+data_test
+
+save_nef_chemical_shift_list_test
+   _nef_chemical_shift_list.sf_category   nef_chemical_shift_list
+   _nef_chemical_shift_list.sf_framecode  nef_chemical_shift_list_test
+   _nef_chemical_shift_list.comment
+;
+a multi line
+comment
+;
+
+   loop_
+      _nef_chemical_shift.chain_code
+      _nef_chemical_shift.sequence_code
+      _nef_chemical_shift.residue_name
+      _nef_chemical_shift.atom_name
+      _nef_chemical_shift.value
+      _nef_chemical_shift.ccpn_comment
+
+      A   1   ALA   H     8.0     'a comment'
+      A   1   ALA   HB%   1.2     "it's"
+      A   2   GLY   HA2   4.1     '"quoted" it\'s'
+      A   2   GLY   N     120.0   .
+      A   3   'data_x'   '_N'  110.0
+;
+multi
+line
+;
+   stop_
+save_
+
+save_nef_chemical_shift_list_empty
+   _nef_chemical_shift_list.sf_category   nef_chemical_shift_list
+   _nef_chemical_shift_list.sf_framecode  nef_chemical_shift_list_empty
+
+   loop_
+      _nef_chemical_shift.chain_code
+      _nef_chemical_shift.value
+   stop_
+save_
+"""
+
+
+def test_entry_matches_pynmrstar():
+
+    entry = Entry.from_string(TEST_ENTRY)
+
+    assert format_entry(entry) == str(entry)
+    for frame in entry:
+        assert format_saveframe(frame) == str(frame)
+
+    for options in (
+        {"skip_empty_loops": True},
+        {"skip_empty_tags": True, "skip_empty_loops": True},
+        {"show_comments": False},
+    ):
+        expected = entry.format(**{"skip_empty_loops": False, **options})
+        assert format_entry(entry, **options) == expected
+
+
+def test_loop_window_matches_copied_loop():
+
+    loop = Entry.from_string(TEST_ENTRY).get_loops_by_category("_nef_chemical_shift")[0]
+
+    tags = ["value", "atom_name", "ccpn_comment"]
+    rows = [1, 4]
+
+    expected = Loop.from_scratch(loop.category)
+    for tag in tags:
+        expected.add_tag(tag)
+    for row in rows:
+        expected.add_data([loop.data[row][loop.tags.index(tag)] for tag in tags])
+
+    assert format_loop(loop, tags=tags, rows=rows) == str(expected)
+
+    expected.data = []
+    assert format_loop(loop, tags=tags, rows=[]) == str(expected)
+
+
+def test_rows_are_written_in_chunks(monkeypatch):
+
+    monkeypatch.setattr(star_writer_lib, "ROWS_PER_CHUNK", 2)
+
+    entry = Entry.from_string(TEST_ENTRY)
+
+    class CountingWriter(io.StringIO):
+        writes = 0
+
+        def write(self, text):
+            CountingWriter.writes += 1
+            return super().write(text)
+
+    file = CountingWriter()
+    write_entry(entry, file)
+    chunked_writes = CountingWriter.writes
+
+    assert file.getvalue() == str(entry)
+
+    monkeypatch.setattr(star_writer_lib, "ROWS_PER_CHUNK", 1000)
+    CountingWriter.writes = 0
+    write_entry(entry, CountingWriter())
+
+    # the 5 rows of the first loop are written as 3 chunks rather than 1
+    assert chunked_writes == CountingWriter.writes + 2
+
+
+def test_lazy_entry_writes_clean_frames_verbatim():
+
+    entry = lazy_entry_from_string(TEST_ENTRY)
+
+    assert str(entry) == TEST_ENTRY
+    assert entry.parsed_frames == []
+
+    frame = entry.get_saveframe_by_name("nef_chemical_shift_list_test")
+    frame.get_loop("_nef_chemical_shift").data[0][4] = "8.5"
+
+    expected = Entry.from_string(TEST_ENTRY)
+    expected.get_loops_by_category("_nef_chemical_shift")[0].data[0][4] = "8.5"
+
+    assert str(frame) == str(expected.get_saveframe_by_name(frame.name))
+    assert "8.5" in str(entry)
@@ -0,0 +1,136 @@
+import clevercsv
+import pytest
+from clevercsv.dialect import SimpleDialect
+
+import nef_pipelines.lib.tabular_data_lib as tabular_data_lib
+from nef_pipelines.lib.tabular_data_lib import (
+    SNIFF_HEAD_LINES,
+    SNIFF_RANDOM_LINES,
+    CsvLikeFormats,
+    CsvParseError,
+    detect_tabular_format,
+    fit_rows_to_tags,
+    parse_csv_text,
+    parse_dialect,
+    read_csv,
+    read_csv_in_chunks,
+)
+
+HEADER = "index,sequence_code,residue_name,atom_name,value"
+
+
+def _shift_lines(count):
+    return [HEADER] + [f"{i},{i},ALA,H,{8.0 + i / 1000:.3f}" for i in range(count)]
+
+
+@pytest.fixture
+def sniffed_texts(monkeypatch):
+    texts = []
+    sniff = clevercsv.Sniffer.sniff
+
+    def recording_sniff(self, sample, *args, **kwargs):
+        texts.append(sample)
+        return sniff(self, sample, *args, **kwargs)
+
+    monkeypatch.setattr(clevercsv.Sniffer, "sniff", recording_sniff)
+    monkeypatch.setattr(tabular_data_lib, "_detected_formats", {})
+
+    return texts
+
+
+def test_detect_sniffs_a_bounded_sample(sniffed_texts):
+
+    lines = _shift_lines(5000)
+
+    assert detect_tabular_format(lines) == SimpleDialect(",", "", "")
+
+    (sample,) = sniffed_texts
+    sample_lines = sample.split("\n")
+
+    assert len(sample_lines) == SNIFF_HEAD_LINES + SNIFF_RANDOM_LINES
+    assert sample_lines[:SNIFF_HEAD_LINES] == lines[:SNIFF_HEAD_LINES]
+    assert set(sample_lines) <= set(lines)
+
+
+def test_detect_caches_by_content(sniffed_texts):
+
+    lines = _shift_lines(10)
+
+    first = detect_tabular_format(lines)
+
+    assert detect_tabular_format(list(lines)) is first
+    assert len(sniffed_texts) == 1
+
+    detect_tabular_format(_shift_lines(11))
+
+    assert len(sniffed_texts) == 2
+
+
+def test_parse_dialect():
+
+    assert parse_dialect(";") == SimpleDialect(";", "", "")
+    assert parse_dialect("tab:quote") == SimpleDialect("\t", '"', "")
+    assert parse_dialect("colon:':backslash") == SimpleDialect(":", "'", "\\")
+
+    for bad_dialect in ["", "semicolons", "a:b:c:d"]:
+        with pytest.raises(CsvParseError):
+            parse_dialect(bad_dialect)
+
+
+def test_dialect_skips_detection(sniffed_texts):
+
+    text = "sequence_code|value\n1|'8,1'\n2|'8,2'"
+
+    tags, rows, _ = parse_csv_text(
+        text, CsvLikeFormats.CSV, dialect=parse_dialect("pipe:apostrophe")
+    )
+
+    assert tags == ["sequence_code", "value"]
+    assert rows == [["1", "8,1"], ["2", "8,2"]]
+    assert sniffed_texts == []
+
+
+@pytest.mark.parametrize(
+    "text, csv_format",
+    [
+        ("a,b\n#note\n1,2\n\n3,4\n5,6", CsvLikeFormats.AUTO),
+        ("a\tb\n1\t2\n3\t4\n5\t6\n", CsvLikeFormats.TSV),
+        ("a   b\n1   2  \n3 4\n5   6 7\n", CsvLikeFormats.AUTO),
+    ],
+)
+def test_read_csv_in_chunks_matches_read_csv(tmp_path, text, csv_format):
+
+    csv_path = tmp_path / "test.csv"
+    csv_path.write_text(text)
+
+    for skip, comment, header_skip in [(0, "", 0), (1, "#", 0), (0, "#", 1)]:
+        expected = read_csv(csv_path, csv_format, skip, comment, header_skip)
+
+        tags, chunks, warnings = read_csv_in_chunks(
+            csv_path, csv_format, skip, comment, header_skip, chunk_size=2
+        )
+        chunks = list(chunks)
+
+        assert all(0 < len(chunk) <= 2 for chunk in chunks)
+        assert (tags, [row for chunk in chunks for row in chunk], warnings) == expected
+
+
+def test_read_csv_in_chunks_errors(tmp_path):
+
+    csv_path = tmp_path / "test.csv"
+    csv_path.write_text("# only a comment\n")
+
+    with pytest.raises(CsvParseError, match="empty"):
+        read_csv_in_chunks(csv_path, comment="#")
+
+    with pytest.raises(CsvParseError, match="failed to read"):
+        read_csv_in_chunks(tmp_path / "missing.csv")
+
+
+def test_fit_rows_to_tags():
+
+    assert fit_rows_to_tags([["1"], ["1", "2"], ["1", "2", "3"]], ["a", "b"]) == [
+        ["1", None],
+        ["1", "2"],
+        ["1", "2"],
+    ]
@@ -0,0 +1,82 @@
+import pytest
+
+import nef_pipelines.lib.translation.io as converter_io
+from nef_pipelines.lib.translation.io import ChemCompStore, find_chem_comps
+from nef_pipelines.transcoders.nmrstar.importers.shifts import (
+    _get_atom_sets_by_residue,
+    _get_geminal_pairs,
+)
+
+CHEM_COMP_PATHS = [
+    path
+    for path in find_chem_comps()
+    if path.name.split("+")[1] in ("Ala", "Trp", "Xxx")
+]
+
+
+def _fail_to_compile(*args, **kwargs):
+    raise AssertionError("the chem comps were compiled when they should be cached")
+
+
+def test_store_compiles_and_caches(tmp_path, monkeypatch):
+
+    cache_path = tmp_path / "chem_comps.pickle"
+
+    store = ChemCompStore(cache_path, CHEM_COMP_PATHS)
+
+    assert set(store) == {"ALA", "TRP", "Xxx"}
+    assert store.mol_types == {"PROTEIN", "DNA", "RNA"}
+    assert cache_path.exists()
+
+    monkeypatch.setattr(converter_io, "_compile_chem_comps", _fail_to_compile)
+
+    cached_store = ChemCompStore(cache_path, CHEM_COMP_PATHS)
+
+    assert "TRP" in cached_store
+    assert "GLY" not in cached_store
+    assert cached_store["TRP"].name == store["TRP"].name == "TRYPTOPHAN"
+
+
+def test_store_materializes_chem_comps_once(tmp_path):
+
+    store = ChemCompStore(tmp_path / "chem_comps.pickle", CHEM_COMP_PATHS)
+    store.load()
+
+    assert store._chem_comps == {}
+
+    trp = store["TRP"]
+
+    assert list(store._chem_comps) == ["TRP"]
+    assert store["TRP"] is trp
+
+    with pytest.raises(KeyError):
+        store["GLY"]
+
+
+def test_store_stale_or_bad_cache(tmp_path):
+
+    cache_path = tmp_path / "chem_comps.pickle"
+
+    ChemCompStore(cache_path, CHEM_COMP_PATHS).load()
+
+    assert set(ChemCompStore(cache_path, CHEM_COMP_PATHS[:1])) < {"ALA", "TRP", "Xxx"}
+
+    cache_path.write_bytes(b"not a cache")
+
+    assert set(ChemCompStore(cache_path, CHEM_COMP_PATHS)) == {"ALA", "TRP", "Xxx"}
+
+
+def test_derived_tables_are_cached():
+
+    geminal_pairs = _get_geminal_pairs({"TRP"})
+    trp_pairs = geminal_pairs["TRP"]
+
+    assert "HB*" in trp_pairs["middle"]
+    assert _get_geminal_pairs({"TRP", "ALA"}) is geminal_pairs
+    assert geminal_pairs["TRP"] is trp_pairs
+
+    atom_sets = _get_atom_sets_by_residue({"TRP"})
+    trp_atom_sets = atom_sets["TRP"]
+
+    assert set(trp_atom_sets) == {"start", "middle", "end"}
+    assert _get_atom_sets_by_residue({"TRP"})["TRP"] is trp_atom_sets
@@ -28,3 +28,21 @@ def test_peaks():
     peaks_result = isolate_frame(result.stdout, "nef_nmr_spectrum_gb3_assigned_trunc")
 
     assert_lines_match(EXPECTED, peaks_result)
+
+
+def test_peaks_parallel_jobs():
+
+    paths = [
+        path_in_test_data(__file__, "gb3_assigned_trunc.tab"),
+        path_in_test_data(__file__, "gb3.tab"),
+    ]
+
+    serial_result = run_and_report(app, paths, input=HEADER)
+    parallel_result = run_and_report(app, ["--jobs", "2", *paths], input=HEADER)
+
+    for frame_name in ["gb3_assigned_trunc", "gb3"]:
+        frame_name = f"nef_nmr_spectrum_{frame_name}"
+        expected = isolate_frame(serial_result.stdout, frame_name)
+
+        assert expected is not None
+        assert isolate_frame(parallel_result.stdout, frame_name) == expected
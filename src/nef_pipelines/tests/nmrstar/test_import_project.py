@@ -3,12 +3,21 @@ Tests for nmrstar project import functionality, focusing on error handling for f
 """
 
 import tempfile
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from unittest.mock import mock_open, patch
 
 import typer
 
-from nef_pipelines.lib.test_lib import NOQA_E501, assert_lines_match, run_and_report
+from nef_pipelines.lib.http_cache_lib import HTTP_CACHE_DIR_ENV_VAR
+from nef_pipelines.lib.test_lib import (
+    NOQA_E501,
+    assert_lines_match,
+    isolate_frame,
+    run_and_report,
+)
 from nef_pipelines.transcoders.nmrstar.importers.project_cli import project
 
 
@@ -407,3 +416,53 @@ def test_valid_local_file_import():
         # NEF files start with data_ block
         expected_nef_output = "data_"
         assert expected_nef_output in result.stdout
+
+
+class _QuietHTTPRequestHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def test_offline_import_from_http_cache(tmp_path, monkeypatch):
+    """Test an entry fetched from the web is cached and can then be imported with --offline"""
+    app = typer.Typer()
+    app.command()(project)
+
+    monkeypatch.setenv(HTTP_CACHE_DIR_ENV_VAR, str(tmp_path / "cache"))
+
+    test_data = Path(__file__).parent / "test_data"
+    handler = partial(_QuietHTTPRequestHandler, directory=str(test_data))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    url_template = (
+        f"http://127.0.0.1:{server.server_address[1]}/bmr{{entry_number}}_3.str.txt"
+    )
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        online = run_and_report(
+            app, ["bmr5387", "--source", "web", "--url-template", url_template]
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+    offline = run_and_report(
+        app,
+        ["bmr5387", "--source", "web", "--url-template", url_template, "--offline"],
+    )
+
+    online_shifts = isolate_frame(online.stdout, "nef_chemical_shift_list_default")
+    offline_shifts = isolate_frame(offline.stdout, "nef_chemical_shift_list_default")
+
+    assert online_shifts is not None
+    assert offline_shifts == online_shifts
+
+    result = run_and_report(
+        app,
+        ["bmr15457", "--source", "web", "--url-template", url_template, "--offline"],
+        expected_exit_code=1,
+    )
+
+    assert "could not read entry from bmr15457" in result.stdout
@@ -0,0 +1,57 @@
+import typer
+from pynmrstar import Entry
+
+from nef_pipelines.lib.test_lib import read_test_data, run_and_report
+from nef_pipelines.tools.peaks.match import match
+
+app = typer.Typer()
+app.command()(match)
+
+MATCH_FRAME = "nefpls_chemical_shift_perturbations_from_nef_nmr_spectrum_list_1_to_nef_nmr_spectrum_list_2"
+
+
+def _matches(output):
+    # stderr is mixed into the output and the command warns it is lightly tested
+    lines = [line for line in output.split("\n") if not line.startswith("***")]
+    entry = Entry.from_string("\n".join(lines))
+    loop = entry.get_saveframe_by_name(MATCH_FRAME).get_loop("nefpls_perturbations")
+
+    return [
+        (peak_id_1, peak_id_2, round(float(distance), 3))
+        for peak_id_1, peak_id_2, distance in loop.get_tag(
+            ["peak_id_1", "peak_id_2", "distance"]
+        )
+    ]
+
+
+def test_match_closest():
+
+    nef_input = read_test_data("two_peak_lists.nef", __file__)
+
+    result = run_and_report(app, ["list_1", "list_2"], input=nef_input)
+
+    # both peaks in the first list are closest to the first peak in the second
+    assert _matches(result.stdout) == [("1", "1", 0.4), ("2", "1", 0.6)]
+
+
+def test_match_one_to_one():
+
+    nef_input = read_test_data("two_peak_lists.nef", __file__)
+
+    result = run_and_report(app, ["--one-to-one", "list_1", "list_2"], input=nef_input)
+
+    # 1 -> 1 and 2 -> 2 has a total distance of 1.9, 1 -> 2 and 2 -> 1 would be 3.1
+    assert _matches(result.stdout) == [("1", "1", 0.4), ("2", "2", 1.5)]
+
+
+def test_match_one_to_one_max_distance():
+
+    nef_input = read_test_data("two_peak_lists.nef", __file__)
+
+    result = run_and_report(
+        app,
+        ["--one-to-one", "--max-distance", "1.0", "list_1", "list_2"],
+        input=nef_input,
+    )
+
+    assert _matches(result.stdout) == [("1", "1", 0.4)]
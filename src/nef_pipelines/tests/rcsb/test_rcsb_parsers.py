@@ -255,3 +255,180 @@ def test_parse_clic1(file_name):
     groups = structure.get_chains_with_common_sequences()
     assert len(groups) == 1
     assert sorted(groups[0]) == ["A", "B"]
+
+
+def _structure_summary(structure):
+    return [
+        (
+            model.serial,
+            chain_key,
+            residue.sequence_code,
+            residue.residue_name,
+            [(atom.serial, atom.atom_name, atom.x, atom.y, atom.z) for atom in residue],
+        )
+        for model in structure.models
+        for chain_key, chain in model.chains.items()
+        for residue in chain.residues
+    ]
+
+
+@pytest.mark.parametrize("file_name", ["1k0o.pdb", "1k0o.cif"])
+def test_parse_in_threads(file_name):
+    from concurrent.futures import ThreadPoolExecutor
+
+    file_data = read_test_data(file_name, __file__).split("\n")
+    reader = FILE_TYPE_TO_READER[file_name.split(".")[-1]]
+
+    expected = _structure_summary(reader(file_data, file_name))
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        structures = list(
+            executor.map(lambda _: reader(file_data, file_name), range(8))
+        )
+
+    for structure in structures:
+        assert _structure_summary(structure) == expected
+
+
+def test_model_arrays():
+
+    file_data = read_test_data("1l2y_short.pdb", __file__).split("\n")
+    structure = parse_pdb(file_data, "1l2y_short.pdb")
+
+    model = structure.models[0]
+    arrays = model.arrays
+
+    assert len(arrays) == len(arrays.atom_serials) == len(arrays.coordinates) // 3
+    assert list(arrays.residue_names) == ["ASN", "LEU", "TYR", "ILE"]
+    assert list(arrays.residue_sequence_codes) == [1, 2, 3, 4]
+    assert list(arrays.chain_codes) == ["A"]
+    assert list(arrays.chain_residue_indices(0)) == [0, 1, 2, 3]
+    assert arrays.chain_indices_by_key() == {"A": 0}
+
+    assert model.structure is structure
+    assert model.chains["A"].model is model
+
+    atom_index = 0
+    for residue_index, residue in enumerate(model.chains["A"].residues):
+        assert list(arrays.residue_atom_indices(residue_index)) == list(
+            range(atom_index, atom_index + len(residue.atoms))
+        )
+        for atom in residue.atoms:
+            assert atom.serial == arrays.atom_serials[atom_index]
+            assert atom.atom_name == arrays.atom_names[atom_index]
+            assert (atom.x, atom.y, atom.z) == tuple(
+                arrays.coordinates[atom_index * 3 : atom_index * 3 + 3]
+            )
+            assert atom.temp_fact == arrays.temp_facts[atom_index]
+            assert atom.occupancy == arrays.occupancies[atom_index] == 1.0
+            assert atom.residue is residue
+            atom_index += 1
+
+    assert atom_index == len(arrays)
+
+
+def test_parsed_structure_pickles():
+    import pickle
+
+    file_data = read_test_data("1l2y_short.cif", __file__).split("\n")
+    structure = parse_cif(file_data, "1l2y_short.cif")
+
+    copy = pickle.loads(pickle.dumps(structure))
+
+    assert _structure_summary(copy) == _structure_summary(structure)
+
+
+def test_coordinate_array():
+    np = pytest.importorskip("numpy")
+
+    file_data = read_test_data("1l2y_short.pdb", __file__).split("\n")
+    arrays = parse_pdb(file_data, "1l2y_short.pdb").models[1].arrays
+
+    coordinates = arrays.coordinate_array()
+
+    assert coordinates.shape == (len(arrays), 3)
+    assert np.array_equal(coordinates.ravel(), np.array(arrays.coordinates))
+
+
+def _wrap_atom_site_rows(lines):
+    # split every atom_site row over two lines so the rows have to be read by the mmCIF reader
+    result = []
+    for line in lines:
+        if line.startswith(("ATOM", "HETATM")):
+            fields = line.split()
+            result.append(" ".join(fields[:10]))
+            result.append(" ".join(fields[10:]))
+        else:
+            result.append(line)
+    return result
+
+
+@pytest.mark.parametrize("file_name", ["1l2y_short.cif", "1k0o.cif"])
+def test_parse_cif_lazy_and_by_model(file_name):
+
+    file_data = read_test_data(file_name, __file__).split("\n")
+
+    expected = parse_cif(_wrap_atom_site_rows(file_data), file_name)
+    expected_summary = _structure_summary(expected)
+
+    structure = parse_cif(file_data, file_name)
+    assert _structure_summary(structure) == expected_summary
+    assert [sequence.residues for sequence in structure.sequences.values()] == [
+        sequence.residues for sequence in expected.sequences.values()
+    ]
+
+    lazy_structure = parse_cif(file_data, file_name, lazy=True)
+    assert [model.serial for model in lazy_structure.models] == [
+        model.serial for model in expected.models
+    ]
+    assert _structure_summary(lazy_structure) == expected_summary
+
+
+def test_parse_cif_in_processes():
+
+    file_data = read_test_data("1l2y_short.cif", __file__).split("\n")
+
+    structure = parse_cif(file_data, "1l2y_short.cif", jobs=2)
+
+    assert len(structure.models) == 2
+    assert _structure_summary(structure) == _structure_summary(
+        parse_cif(file_data, "1l2y_short.cif")
+    )
+
+
+def test_lazy_cif_model_pickles():
+    import pickle
+
+    file_data = read_test_data("1l2y_short.cif", __file__).split("\n")
+    structure = parse_cif(file_data, "1l2y_short.cif", lazy=True)
+
+    copy = pickle.loads(pickle.dumps(structure))
+
+    assert _structure_summary(copy) == _structure_summary(structure)
+
+
+def test_parse_cif_bad_coordinate_reports_line(capsys):
+
+    file_data = read_test_data("1l2y_short.cif", __file__).split("\n")
+
+    # the first atom of the second model
+    line_index = next(
+        index
+        for index, line in enumerate(file_data)
+        if line.startswith("ATOM") and line.split()[-1] == "2"
+    )
+    fields = file_data[line_index].split()
+    fields[10] = "1.2x3"
+    file_data[line_index] = " ".join(fields)
+
+    structure = parse_cif(file_data, "1l2y_short.cif", lazy=True)
+
+    # the error is in the second model and so is only found when it is used
+    assert len(structure.models[0].chains["A"].residues) == 4
+
+    with pytest.raises(SystemExit):
+        structure.models[1].chains
+
+    error = capsys.readouterr().err
+    assert f"at line {line_index + 1} in 1l2y_short.cif" in error
+    assert "the value of the field x was |1.2x3|" in error
@@ -8,6 +8,7 @@ from nef_pipelines.lib.test_lib import (
     read_test_data,
     run_and_report,
 )
+from nef_pipelines.transcoders.rcsb import rcsb_lib
 from nef_pipelines.transcoders.rcsb.importers.sequence import sequence
 
 app = typer.Typer()
@@ -152,3 +153,47 @@ def test_3a_test_no_chain_segid():
     assert "ERROR" in result.stdout
     assert "both the chain code and segment id" in result.stdout
     assert "not present on an ATOM record" in result.stdout
+
+
+EXPECTED_1L2Y_SHORT = """\
+    save_nef_molecular_system
+        _nef_molecular_system.sf_category   nef_molecular_system
+        _nef_molecular_system.sf_framecode  nef_molecular_system
+
+        loop_
+            _nef_sequence.index
+            _nef_sequence.chain_code
+            _nef_sequence.sequence_code
+            _nef_sequence.residue_name
+            _nef_sequence.linking
+            _nef_sequence.residue_variant
+            _nef_sequence.cis_peptide
+
+            1   A   1   ASN   start    .   .
+            2   A   2   LEU   middle   .   .
+            3   A   3   TYR   middle   .   .
+            4   A   4   ILE   end      .   .
+
+        stop_
+
+    save_
+"""
+
+
+# noinspection PyUnusedLocal
+def test_cif_sequence_without_reading_atoms(monkeypatch):
+
+    # the chains are matched to sequences by pdbx_poly_seq_scheme so the atom_site rows are never read
+    def fail_if_atoms_read(*args, **kwargs):
+        raise AssertionError("the atom_site rows were read")
+
+    monkeypatch.setattr(rcsb_lib, "_read_cif_model_arrays", fail_if_atoms_read)
+
+    path = path_in_test_data(__file__, "1l2y_short.cif")
+    result = run_and_report(app, [path], input=HEADER)
+
+    assert result.exit_code == 0
+
+    mol_sys_result = isolate_frame(result.stdout, "%s" % NEF_MOLECULAR_SYSTEM)
+
+    assert_lines_match(EXPECTED_1L2Y_SHORT, mol_sys_result)
@@ -0,0 +1,115 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+import typer
+
+from nef_pipelines.lib.http_cache_lib import HTTP_CACHE_DIR_ENV_VAR
+from nef_pipelines.lib.test_lib import isolate_frame, run_and_report
+from nef_pipelines.transcoders.shiftx2.importers import shifts as shiftx2_shifts
+
+app = typer.Typer()
+app.command()(shiftx2_shifts.shifts)
+
+PREDICTIONS = """\
+NUM,RES,ATOMNAME,SHIFT
+1,M,CA,55.1
+2,Q,N,120.2
+"""
+
+
+# a stand-in for the shiftx2 server, a pdb id containing BAD gives an error page
+class _StandInShiftx2Handler(BaseHTTPRequestHandler):
+    def _send(self, text):
+        content = text.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_POST(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+
+        length = int(self.headers["Content-Length"])
+        pdb_id = parse_qs(self.rfile.read(length).decode())["pdbid"][0]
+
+        # hold the request open so concurrent requests overlap
+        time.sleep(0.2)
+
+        if "BAD" in pdb_id:
+            page = "<html>Error the pdb id couldn't be found</html>"
+        else:
+            page = f'<html><a href="out_{pdb_id}.csv">download predictions</a></html>'
+
+        with server.lock:
+            server.active -= 1
+
+        self._send(page)
+
+    def do_GET(self):
+        self._send(PREDICTIONS)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in_server(tmp_path, monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInShiftx2Handler)
+    server.lock = threading.Lock()
+    server.active = 0
+    server.max_active = 0
+
+    root_url = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(shiftx2_shifts, "ROOT_URL", root_url)
+    monkeypatch.setattr(shiftx2_shifts, "CGI_URL", f"{root_url}/shiftx2.cgi")
+    monkeypatch.setattr(shiftx2_shifts, "SHIFTX2_RETRY_COUNT", 1)
+    monkeypatch.setattr(shiftx2_shifts, "DEFAULT_TIMEOUT", 0)
+    monkeypatch.setenv(HTTP_CACHE_DIR_ENV_VAR, str(tmp_path / "cache"))
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def test_many_codes_predicted_concurrently(stand_in_server):
+
+    result = run_and_report(
+        app, ["1abc", "2BAD", "3def", "--jobs", "3"], merge_stderr=False
+    )
+
+    for code in ("1abc", "3def"):
+        frame = isolate_frame(result.stdout, f"nef_chemical_shift_list_shiftx2_{code}")
+        assert frame is not None
+        assert "120.2" in frame
+
+    assert "nef_chemical_shift_list_shiftx2_2BAD" not in result.stdout
+    assert "couldn't get a shiftx2 prediction for 2BAD" in result.stderr
+    assert "1 of 3 shiftx2 predictions failed: 2BAD" in result.stderr
+
+    assert stand_in_server.max_active > 1
+
+
+def test_single_code_failure_exits(stand_in_server):
+
+    result = run_and_report(app, ["1BAD"], expected_exit_code=1)
+
+    assert "couldn't get a shiftx2 prediction for 1BAD after 1 retries" in result.stdout
+
+
+def test_all_codes_failing_exits(stand_in_server):
+
+    result = run_and_report(app, ["1BAD", "2BAD"], expected_exit_code=1)
+
+    assert "couldn't get shiftx2 predictions for any of 1BAD, 2BAD" in result.stdout
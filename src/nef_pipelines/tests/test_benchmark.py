@@ -0,0 +1,68 @@
+import json
+
+import typer
+
+from nef_pipelines.lib.benchmark_lib import BENCHMARK_FORMAT
+from nef_pipelines.lib.test_lib import run_and_report
+from nef_pipelines.nef_app_runner import load_nef_modules_and_build_failure
+from nef_pipelines.tools.benchmark import benchmark
+
+app = typer.Typer()
+app.command()(benchmark)
+
+load_nef_modules_and_build_failure()
+
+SMALL_SIZE_ARGS = [
+    "--residues",
+    "5",
+    "--peaks",
+    "5",
+    "--restraints",
+    "5",
+    "--planes",
+    "3",
+    "--repeats",
+    "1",
+]
+
+
+def test_benchmark(tmp_path):
+
+    out = tmp_path / "results.json"
+
+    result = run_and_report(
+        app, [*SMALL_SIZE_ARGS, "--out", str(out), "read", "peaks match"]
+    )
+
+    results = json.loads(out.read_text())
+
+    assert "peaks match" in result.stdout
+    assert results["format"] == BENCHMARK_FORMAT
+    assert results["size"]["residues"] == 5
+    assert list(results["benchmarks"]) == ["read", "peaks match"]
+
+
+def test_benchmark_slower_than_baseline(tmp_path):
+
+    baseline_path = tmp_path / "baseline.json"
+    run_and_report(app, [*SMALL_SIZE_ARGS, "--out", str(baseline_path), "write"])
+
+    baseline = json.loads(baseline_path.read_text())
+    baseline["benchmarks"]["write"]["best"] = 1e-9
+    baseline_path.write_text(json.dumps(baseline))
+
+    result = run_and_report(
+        app,
+        [*SMALL_SIZE_ARGS, "--baseline", str(baseline_path), "write"],
+        expected_exit_code=1,
+    )
+
+    assert "more than 25% slower than the baseline" in result.stdout
+    assert "write:" in result.stdout
+
+
+def test_benchmark_unknown_name():
+
+    result = run_and_report(app, [*SMALL_SIZE_ARGS, "bogus"], expected_exit_code=1)
+
+    assert "there is no benchmark called bogus" in result.stdout
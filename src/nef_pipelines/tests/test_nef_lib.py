@@ -9,9 +9,14 @@ import pytest
 # from pandas import DataFrame
 from pynmrstar import Entry, Loop
 
+from nef_pipelines.lib import nef_lib
 from nef_pipelines.lib.nef_lib import (  # dataframe_to_loop,; loop_to_dataframe,; NEF_CATEGORY_ATTR,
     UNUSED,
     BadNefFileException,
+    ColumnType,
+    LoopBuilder,
+    LoopView,
+    NoSuchColumnException,
     add_frames_to_entry,
     create_entry_from_stdin,
     create_nef_save_frame,
@@ -22,7 +27,7 @@ from nef_pipelines.lib.nef_lib import (  # dataframe_to_loop,; loop_to_dataframe
     select_frames_by_name,
     select_loops_by_category,
 )
-from nef_pipelines.lib.structures import SaveframeNameParts
+from nef_pipelines.lib.structures import NEFPipelinesException, SaveframeNameParts
 from nef_pipelines.lib.test_lib import assert_lines_match, path_in_test_data
 from nef_pipelines.lib.util import STDIN
 from nef_pipelines.nef_app_runner import EXIT_ERROR
@@ -622,6 +627,159 @@ def test_loop_row_namespace_iter_writethrough():
     assert rows_after[1].col_3 == 111.1
 
 
+def test_loop_row_namespace_iter_row_index_with_duplicate_rows():
+    """Test that rows with identical values still report their own row index."""
+
+    TEST_DATA = """\
+    loop_
+        _test.name
+        _test.value
+
+        A 10
+        A 10
+        A 10
+    stop_
+    """
+
+    loop = Loop.from_string(TEST_DATA)
+    rows = list(loop_row_namespace_iter(loop))
+
+    with pytest.raises(AttributeError, match=r"Cannot set 'invalid_column' on row 2"):
+        rows[2].invalid_column = 123
+
+
+def test_loop_row_iterators_share_one_accessor(monkeypatch):
+    """Row iteration must be linear in loop length: per-loop state is built once and rows never search the loop."""
+
+    loop = Loop.from_scratch("_test")
+    loop.add_tag(["index", "chain_code", "sequence_code", "value"])
+    loop.data = [[str(i), "A", str(i), "1.234"] for i in range(1, 101)]
+
+    accessors = []
+
+    class CountingAccessor(nef_lib.LoopRowAccessor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            accessors.append(self)
+
+        def row_index(self, row):
+            raise AssertionError("row_index searched the loop during iteration")
+
+    monkeypatch.setattr(nef_lib, "LoopRowAccessor", CountingAccessor)
+
+    namespace_rows = list(loop_row_namespace_iter(loop))
+    assert [row.value for row in namespace_rows] == [1.234] * 100
+    assert [row._row_index for row in namespace_rows] == list(range(100))
+    assert len(accessors) == 1
+    assert all(row._accessor is accessors[0] for row in namespace_rows)
+
+    dict_rows = list(loop_row_dict_iter(loop))
+    assert [row["index"] for row in dict_rows] == list(range(1, 101))
+    assert len(accessors) == 2
+    assert all(row._accessor is accessors[1] for row in dict_rows)
+
+
+def test_loop_view_rows():
+    """Test LoopView rows support dictionary and attribute access with typed values."""
+
+    loop = Loop.from_string(ITER_TEST_DATA)
+
+    EXPECTED = [
+        {"col_1": "a", "col_2": 2, "col_3": 4.5},
+        {"col_1": "b", "col_2": 3, "col_3": 5.6},
+    ]
+
+    view = LoopView(loop)
+
+    assert [dict(row) for row in view] == EXPECTED
+    assert [vars(row) for row in view] == EXPECTED
+    assert [(row.col_1, row["col_2"]) for row in view] == [("a", 2), ("b", 3)]
+    assert [type(value) for value in vars(list(view)[0]).values()] == [str, int, float]
+
+
+def test_loop_view_column_types():
+    """Test LoopView infers a type per column and stores numeric columns as typed arrays."""
+
+    TEST_DATA = """\
+    loop_
+        _test.ints
+        _test.floats
+        _test.mixed
+        _test.unused
+
+        1 1.5  @1 .
+        2 2    3  4.0
+    stop_
+    """
+
+    view = LoopView(Loop.from_string(TEST_DATA))
+
+    assert [view.column_type(tag) for tag in view.tags] == [
+        ColumnType.INT,
+        ColumnType.FLOAT,
+        ColumnType.MIXED,
+        ColumnType.MIXED,
+    ]
+
+    assert view.column("ints").typecode == "q"
+    assert list(view.column("ints")) == [1, 2]
+    assert view.column("floats").typecode == "d"
+    assert list(view.column("floats")) == [1.5, 2.0]
+    assert view.column("mixed") == ["@1", 3]
+    assert view.column("unused") == [UNUSED, 4.0]
+
+
+def test_loop_view_columns_of_python_values():
+    """Test LoopView leaves values which aren't strings as they are, as loop_row_dict_iter does."""
+
+    loop = Loop.from_scratch("_test")
+    loop.add_tag(["floats", "bools", "mixed"])
+    loop.add_data([[1.5, True, 1], [2.7, False, 2.5]])
+
+    view = LoopView(loop)
+
+    assert [view.column_type(tag) for tag in view.tags] == [ColumnType.MIXED] * 3
+
+    for tag in view.tags:
+        expected = [row[tag] for row in loop_row_dict_iter(loop)]
+        assert view.column(tag) == expected
+
+    assert view.column("floats") == [1.5, 2.7]
+    assert view.column("bools") == [True, False]
+    assert [type(value) for value in view.column("mixed")] == [int, float]
+
+
+def test_loop_view_no_convert():
+    """Test LoopView with convert=False returns the raw strings."""
+
+    view = LoopView(Loop.from_string(ITER_TEST_DATA), convert=False)
+
+    assert [dict(row) for row in view] == [
+        {"col_1": "a", "col_2": "2", "col_3": "4.5"},
+        {"col_1": "b", "col_2": "3", "col_3": "5.6"},
+    ]
+
+
+def test_loop_view_is_read_only():
+    """Test LoopView rows can't be modified."""
+
+    row = list(LoopView(Loop.from_string(ITER_TEST_DATA)))[0]
+
+    with pytest.raises(AttributeError, match="read only"):
+        row.col_1 = "c"
+
+
+def test_loop_view_numpy_column():
+    """Test numeric columns can be read as numpy arrays."""
+
+    np = pytest.importorskip("numpy")
+
+    view = LoopView(Loop.from_string(ITER_TEST_DATA))
+
+    assert view.numpy_column("col_2").dtype == np.int64
+    assert list(view.numpy_column("col_3")) == [4.5, 5.6]
+
+
 @pytest.mark.skip(reason="not currently working")
 def test_loop_row_dict_iter_attributes():
 
@@ -1007,3 +1165,71 @@ def test_add_frames_to_entry_with_existing(capsys):
     # Verify complete warning message
     captured = capsys.readouterr()
     assert captured.err == EXPECTED_WARNING
+
+
+def _loop_with_tags(tags):
+    loop = Loop.from_scratch("test")
+    loop.add_tag(tags)
+    return loop
+
+
+def test_loop_builder_matches_add_data():
+
+    tags = ["col_1", "col_2", "col_3"]
+    rows = [
+        {"col_1": "a", "col_2": 2, "col_3": 4.5},
+        {"col_3": 5.6, "col_1": "b"},
+        {"_test.col_2": 4},
+    ]
+
+    expected = _loop_with_tags(tags)
+    for row in rows:
+        expected.add_data([row])
+
+    loop = _loop_with_tags(tags)
+    builder = LoopBuilder(loop).add_rows(rows)
+
+    assert len(builder) == 3
+    assert loop.data == []
+
+    assert builder.build() is loop
+    assert loop.data == expected.data
+    assert len(builder) == 0
+
+
+def test_loop_builder_value_rows_and_columns():
+    from array import array
+
+    loop = _loop_with_tags(["col_1", "col_2", "col_3"])
+
+    LoopBuilder(loop).add_value_rows([("a", 1, 1.5), ("b", 2, 2.5)]).add_columns(
+        {"col_2": array("q", [3, 4]), "col_1": ["c", "d"]}
+    ).add_columns({"col_1": ["e"], "col_2": [5], "col_3": [5.5]}).build()
+
+    assert loop.data == [
+        ["a", 1, 1.5],
+        ["b", 2, 2.5],
+        ["c", 3, None],
+        ["d", 4, None],
+        ["e", 5, 5.5],
+    ]
+
+
+def test_loop_builder_bad_data_adds_nothing():
+
+    loop = _loop_with_tags(["col_1", "col_2"])
+    builder = LoopBuilder(loop).add_row({"col_1": "a", "col_2": "b"})
+
+    with pytest.raises(NoSuchColumnException):
+        builder.add_row({"col_4": "a"})
+
+    with pytest.raises(NEFPipelinesException):
+        builder.add_value_rows([("a", "b"), ("c",)])
+
+    with pytest.raises(NEFPipelinesException):
+        builder.add_columns({"col_1": ["a", "b"], "col_2": ["c"]})
+
+    assert loop.data == []
+
+    builder.build()
+    assert loop.data == [["a", "b"]]
@@ -0,0 +1,104 @@
+from pathlib import Path
+
+import typer
+from pynmrstar import Entry
+
+from nef_pipelines import nef_app
+from nef_pipelines.lib.test_lib import (
+    assert_lines_match,
+    read_test_data,
+    run_and_report,
+)
+from nef_pipelines.nef_app_runner import load_nef_modules_and_build_failure
+from nef_pipelines.tools.run import run
+
+app = typer.Typer()
+app.command()(run)
+
+load_nef_modules_and_build_failure()
+
+EXPECTED_FRAMES = """\
+nef_nmr_meta_data                  nef_molecular_system
+nef_chemical_shift_list_renamed    nef_chemical_shift_list_simulated
+nef_chemical_shift_list_predicted
+"""
+
+
+def test_run_pipeline():
+
+    input = read_test_data("multi_shift_frames.nef", __file__)
+
+    result = run_and_report(
+        app, ["frames rename default renamed | nef frames list"], input=input
+    )
+
+    assert_lines_match(EXPECTED_FRAMES, result.stdout)
+
+
+def test_run_pipeline_from_arguments():
+
+    input = read_test_data("multi_shift_frames.nef", __file__)
+
+    result = run_and_report(
+        app,
+        ["frames", "rename", "default", "renamed", "|", "frames", "list"],
+        input=input,
+    )
+
+    assert_lines_match(EXPECTED_FRAMES, result.stdout)
+
+
+def test_run_pipeline_failed_step():
+
+    input = read_test_data("multi_shift_frames.nef", __file__)
+
+    result = run_and_report(
+        app, ["frames list | frames bogus"], input=input, expected_exit_code=1
+    )
+
+    assert "step 2 [frames bogus]" in result.stdout
+
+
+def test_run_pipeline_empty_step():
+
+    result = run_and_report(app, ["frames list | | save -"], expected_exit_code=1)
+
+    assert "empty steps: 2" in result.stdout
+
+
+def _frames_without_meta_data(text):
+    # the meta data frame has a time stamp and uuid
+    entry = Entry.from_string(text)
+    return [str(frame) for frame in entry if frame.category != "nef_nmr_meta_data"]
+
+
+def test_run_pipeline_matches_shell_pipeline():
+
+    test_data = Path(__file__).parent / "nmrview" / "test_data"
+    sequence = str(test_data / "4peaks_seq.nef")
+    peaks = str(test_data / "4peaks.xpk")
+
+    steps = [
+        ["nmrview", "import", "peaks", "--in", sequence, peaks],
+        ["shifts", "average"],
+    ]
+
+    # as the shell would run it: each step in its own invocation reading the text output of the step before
+    shell_output = ""
+    for step in steps:
+        shell_output = run_and_report(nef_app.app, step, input=shell_output).stdout
+
+    result = run_and_report(
+        app, [f"nmrview import peaks --in {sequence} {peaks} | shifts average"]
+    )
+
+    assert _frames_without_meta_data(result.stdout) == _frames_without_meta_data(
+        shell_output
+    )
+
+    entry = Entry.from_string(result.stdout)
+    shifts = entry.get_loops_by_category("_nef_chemical_shift")[0]
+    assert shifts.get_tag("value") == ["10.405", "10.408", "5.542", "8.796"]
+
+    meta_data = entry.get_saveframes_by_category("nef_nmr_meta_data")[0]
+    assert meta_data.get_tag("script_name") == ["nmrview/import/peaks.py"]
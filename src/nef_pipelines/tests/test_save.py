@@ -4,6 +4,7 @@ from pathlib import Path
 import typer
 from pynmrstar import Entry
 
+from nef_pipelines.lib.entry_index_lib import read_entry_index
 from nef_pipelines.lib.test_lib import (
     assert_frame_category_exists,
     assert_lines_match,
@@ -196,6 +197,21 @@ def test_save_multi_stream_to_directory(tmp_path):
     assert_lines_match(EXPECTED_TEST, Path(tmp_path / "test.nef").read_text())
 
 
+def test_save_multi_stream_to_directory_with_index(tmp_path):
+    data = read_test_data(
+        "multi.nef",
+        __file__,
+    )
+
+    run_and_report(app, ["--index", str(tmp_path)], input=data)
+
+    for entry_id in ("xplor", "test"):
+        index = read_entry_index(tmp_path / f"{entry_id}.nef")
+
+        assert index.entry_id == entry_id
+        assert index.frames[0].name == "nef_molecular_system"
+
+
 def test_save_multi_stream_to_single_file(tmp_path):
     data = read_test_data(
         "multi.nef",
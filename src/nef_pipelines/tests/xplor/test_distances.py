@@ -170,3 +170,34 @@ def test_2_distances_overriding_segids():
     )
 
     assert_lines_match(EXPECTED, result)
+
+
+def test_3_distances_bad_second_reports_line():
+    sequence_path = path_in_test_data(__file__, "3a_ab.neff")
+    distances_path = path_in_test_data(__file__, "test_3_distances_bad_second.tbl")
+
+    with open(sequence_path, "r") as fh:
+        nef_sequence = fh.read()
+
+    args = [distances_path]
+    result = run_and_report(app, args, input=nef_sequence, expected_exit_code=1)
+
+    assert "failed to read distance restraints" in result.stdout
+    assert "(line:3, col:92)" in result.stdout
+
+
+def test_2_distances_ambiguous():
+    sequence_path = path_in_test_data(__file__, "3a_ab.neff")
+    distances_path = path_in_test_data(__file__, "test_2_distances_ambiguous.tbl")
+
+    with open(sequence_path, "r") as fh:
+        nef_sequence = fh.read()
+
+    args = [distances_path]
+    result = run_and_report(app, args, input=nef_sequence, expected_exit_code=1)
+
+    assert (
+        "got a multi atom selection for the 1st atom in restraint number 2"
+        in result.stdout
+    )
+    assert "or (segid AAAA and resid 3 and name HN)" in result.stdout
@@ -1,12 +1,13 @@
 import pytest
-from pyparsing import ParseException
+from pyparsing import OneOrMore, ParseException
 
-from nef_pipelines.lib.structures import AtomLabel, SequenceResidue
+from nef_pipelines.lib.structures import AtomLabel, DistanceRestraint, SequenceResidue
 from nef_pipelines.lib.test_lib import NOQA_E501, path_in_test_data
 from nef_pipelines.transcoders.xplor.xplor_lib import (
     XPLOR_COMMENT,
     XPLORParseException,
     _atom_factor,
+    _commented_distance_restraint,
     _dihedral_restraint,
     _dihedral_restraints,
     _distance_restraints,
@@ -15,8 +16,10 @@ from nef_pipelines.transcoders.xplor.xplor_lib import (
     _get_single_atom_selection,
     _NamedToken,
     _residue_factor,
+    _scan_distance_restraints,
     _segid_factor,
     _selection,
+    parse_distance_restraints,
 )
 
 
@@ -383,3 +386,100 @@ def test_get_single_atom_selection_dihderal_restraint():
     assert len(selection_expressions) == 1
 
     assert str(selection_expressions[0]) == "[[segid : AAAA, resid : 1, atom : C]]"
+
+
+DISTANCE_RESTRAINTS_MIXED_FORMS = """\
+! restraints in forms read by the scanner and forms only read by pyparsing
+assign (segid AAAA and resid 1 and name HA) (segid AAAA and resid 2 and name HB#) 3.0 1.2 0.5
+ASSI (RESI 2 AND NAME HN) (name "HD1*" and segidentifier BBBB and residue 3) 4 3.3 2.7 ! comment
+assign (resid 3 and name HN) ! a comment inside the restraint
+       (segid BBBB and resid -1 and name O') .5 +1. 1e0 peak 12
+assign (resid3 and name HN) (resid 1 and name HA) 2.6 2 3.0
+"""
+
+
+def _pyparsing_distance_restraints(text, residue_types, chain_code):
+    result = []
+    for restraint in OneOrMore(_commented_distance_restraint).parse_string(
+        text, parse_all=True
+    ):
+        atoms = [
+            _get_single_atom_selection(
+                restraint.get(atoms_name)[0], residue_types, chain_code
+            )
+            for atoms_name in ("atoms_1", "atoms_2")
+        ]
+        distance = restraint.get("d")
+        comment = restraint.get("extra_info").strip()
+
+        result.append(
+            DistanceRestraint(
+                [atoms[0]],
+                [atoms[1]],
+                target_distance=distance,
+                distance_minus=distance - restraint.get("d_minus"),
+                distance_plus=distance + restraint.get("d_plus"),
+                comment=comment if comment else None,
+            )
+        )
+
+    return result
+
+
+def test_scanned_distance_restraints_match_pyparsing():
+    residue_types = {
+        (chain_code, str(sequence_code)): "ALA"
+        for chain_code in ("A", "AAAA", "BBBB")
+        for sequence_code in range(-1, 4)
+    }
+
+    result = parse_distance_restraints(
+        DISTANCE_RESTRAINTS_MIXED_FORMS, residue_types, "test", "A"
+    )
+
+    assert len(result) == 4
+    assert result == _pyparsing_distance_restraints(
+        DISTANCE_RESTRAINTS_MIXED_FORMS, residue_types, "A"
+    )
+    assert result[2].comment == "peak 12"
+
+
+def test_scan_distance_restraints():
+
+    TEST_DATA = f"""\
+{DISTANCE_RESTRAINTS_MIXED_FORMS}\
+assign ((resid 1 and name HA) or (resid 1 and name HB)) (resid 2 and name HA) 3.0 1.2 0.5
+"""
+
+    result = list(_scan_distance_restraints(TEST_DATA))
+
+    restraint_starts = [
+        TEST_DATA.index(line)
+        for line in TEST_DATA.split("\n")
+        if line.lower().startswith("assi")
+    ]
+    assert [start for start, _, _ in result] == restraint_starts
+    assert [end for _, end, _ in result] == [*restraint_starts[1:], len(TEST_DATA)]
+
+    # a residue factor without a space isn't read by the scanner
+    assert [scanned is not None for _, _, scanned in result] == [
+        True,
+        True,
+        True,
+        False,
+        True,
+    ]
+
+    scanned = result[1][2]
+    assert [selection.terms for selection in scanned.selections] == [
+        [[("resid", 2), ("atom", "HN")]],
+        [[("atom", '"HD1*"'), ("segid", "BBBB"), ("resid", 3)]],
+    ]
+    assert scanned.extra_info == ""
+
+    ambiguous = result[-1][2].selections[0]
+    assert ambiguous.nested
+    assert ambiguous.terms == [
+        [("resid", 1), ("atom", "HA")],
+        [("resid", 1), ("atom", "HB")],
+    ]
@@ -14,6 +14,7 @@ try:
 except ImportError:
     Context = object  # type: ignore[assignment,misc]
 
+from nef_pipelines.lib.pipeline_lib import StepInput, run_pipeline
 from nef_pipelines.tools.ai.mcp_lib import (
     ChangeSandboxResult,
     CommandHelpResult,
@@ -370,7 +371,8 @@ def nef_execute_pipeline(
     nef_input: str = "",
 ) -> PipelineResult:
     """
-    Execute a sequence of NEF commands in-process, chaining stdout → stdin.
+    Execute a sequence of NEF commands in-process, chaining stdout → stdin [entries are handed
+    between steps without being formatted, see pipeline_lib].
 
     steps     - list of argument lists, e.g. [["nef", "frames", "list"], ["nef", "save", "-"]]
                 each step must start with 'nef'.
@@ -386,35 +388,31 @@ def nef_execute_pipeline(
             steps=steps, stdout=nef_input, exit_code=1, stderr=[error]
         )
 
-    result = PipelineResult(steps=steps, stdout=nef_input)
-
-    for args in steps:
-        if not args:
-            result.stderr.append("")
-            continue
-
+    def execute_step(args: List[str], step_input: StepInput):
         if args[0] != "nef":
             msg = f"""
                     each step must start with 'nef' — got {args!r}.
                     Example: ["nef", "frames", "list"]
                 """
-            result.stderr.append(dedent(msg))
-            result.exit_code = 1
-            break
+            return "", dedent(msg), 1
 
         #  inject global --server flag
         injected_args = [args[0], "--server"] + args[1:]
-        step_result = _safe_execute_step(injected_args, result.stdout)
-        result.stderr.append(step_result.stderr[0] if step_result.stderr else "")
-        result.exit_code = step_result.exit_code
+        step_result = _safe_execute_step(injected_args, step_input)
+        step_stderr = step_result.stderr[0] if step_result.stderr else ""
 
-        if step_result.exit_code == 0:
-            result.steps_completed += 1
-            result.stdout = step_result.stdout
-        else:
-            break
+        return step_result.stdout, step_stderr, step_result.exit_code
 
-    return result
+    # entries are handed between steps in process, only the final output is formatted
+    outcome = run_pipeline(steps, nef_input, execute_step)
+
+    return PipelineResult(
+        steps=steps,
+        stdout=outcome.stdout,
+        stderr=outcome.stderr,
+        exit_code=outcome.exit_code,
+        steps_completed=outcome.steps_completed,
+    )
 
 
 @mcp_tool
@@ -14,6 +14,7 @@ from typer.testing import CliRunner
 
 import nef_pipelines
 from nef_pipelines.lib.cli_runner_lib import _MarkerCliRunner, _split_marked_output
+from nef_pipelines.lib.pipeline_lib import StepInput
 from nef_pipelines.lib.util import warn
 from nef_pipelines.nef_app_runner import (
     create_nef_app,
@@ -504,7 +505,7 @@ class CommandHelpResult(CommandResult):
 
 def _execute_command_in_process(
     args: List[str],
-    nef_input: str = "",
+    nef_input: StepInput = "",
 ) -> PipelineResult:
     """\
     Execute a single NEF command in-process with sandbox write auditing.
@@ -584,7 +585,7 @@ def _execute_command_in_process(
     return result
 
 
-def _safe_execute_step(args: List[str], nef_input: str) -> PipelineResult:
+def _safe_execute_step(args: List[str], nef_input: StepInput) -> PipelineResult:
     """Execute one pipeline step, returning a PipelineResult even on exception."""
     try:
         result = _execute_command_in_process(args, nef_input)
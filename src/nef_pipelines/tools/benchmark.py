@@ -0,0 +1,142 @@
+import json
+import sys
+from pathlib import Path
+from typing import List
+
+import typer
+
+from nef_pipelines import nef_app
+from nef_pipelines.lib.benchmark_lib import (
+    BENCHMARK_NAMES,
+    DEFAULT_SEED,
+    MAX_DIMENSIONS,
+    BenchmarkException,
+    BenchmarkResult,
+    EntrySize,
+    compare_with_baseline,
+    results_to_json,
+    run_benchmarks,
+    synthetic_entry,
+)
+from nef_pipelines.lib.util import (
+    STDOUT,
+    ToolCategory,
+    exit_error,
+    parse_comma_separated_options,
+)
+
+_DEFAULT_SIZE = EntrySize()
+
+BENCHMARKS_HELP = f"""the benchmarks to run [quote names with spaces], by default all of them are run. The benchmarks
+                     are: {', '.join(BENCHMARK_NAMES)}"""
+
+if nef_app:
+    # noinspection PyUnusedLocal
+    @nef_app.app.command(rich_help_panel=ToolCategory.GENERAL)
+    def benchmark(
+        residues: int = typer.Option(
+            _DEFAULT_SIZE.residues, help="the number of residues in the entry"
+        ),
+        peaks: int = typer.Option(
+            _DEFAULT_SIZE.peaks, help="the number of peaks in each peak list"
+        ),
+        dimensions: int = typer.Option(
+            _DEFAULT_SIZE.dimensions,
+            help=f"the number of dimensions of the peak lists [1-{MAX_DIMENSIONS}]",
+        ),
+        restraints: int = typer.Option(
+            _DEFAULT_SIZE.restraints, help="the number of distance restraints"
+        ),
+        planes: int = typer.Option(
+            _DEFAULT_SIZE.planes,
+            help="the number of planes in the relaxation series, each has a peak for each residue",
+        ),
+        seed: int = typer.Option(
+            DEFAULT_SEED, help="the seed for the random values in the entry"
+        ),
+        repeats: int = typer.Option(
+            3, "-r", "--repeats", help="how many times to run each benchmark"
+        ),
+        output: Path = typer.Option(
+            STDOUT,
+            "-o",
+            "--out",
+            metavar="JSON-FILE",
+            help="where to write the results as json [- is stdout]",
+        ),
+        baseline: Path = typer.Option(
+            None,
+            "-b",
+            "--baseline",
+            metavar="JSON-FILE",
+            help="results from an earlier run to compare with, the command fails if a benchmark is slower",
+        ),
+        tolerance: float = typer.Option(
+            0.25,
+            help="the fraction a benchmark can be slower than the baseline before it counts as slower",
+        ),
+        names: List[str] = typer.Argument(
+            None, help=BENCHMARKS_HELP, metavar="<benchmark>..."
+        ),
+    ):
+        """- time commands on a synthetic NEF entry of a chosen size and compare the times with a baseline"""
+
+        names = parse_comma_separated_options(names) if names else None
+
+        baseline_results = _read_baseline_or_exit_error(baseline) if baseline else None
+
+        size = EntrySize(residues, peaks, dimensions, restraints, planes)
+
+        try:
+            entry = synthetic_entry(size, seed)
+            results = run_benchmarks(entry, names, repeats, _report_result)
+        except BenchmarkException as e:
+            exit_error(str(e))
+
+        current_results = results_to_json(size, seed, results)
+
+        text = json.dumps(current_results, indent=2)
+        if output == STDOUT:
+            print(text)
+        else:
+            with open(output, "w") as file_h:
+                file_h.write(text + "\n")
+
+        if baseline_results is not None:
+            try:
+                regressions = compare_with_baseline(
+                    current_results, baseline_results, tolerance
+                )
+            except BenchmarkException as e:
+                exit_error(str(e))
+
+            if regressions:
+                lines = [
+                    f"{regression.name}: {regression.current:.3f}s was {regression.baseline:.3f}s "
+                    f"[x{regression.ratio:.2f}]"
+                    for regression in regressions
+                ]
+                NEW_LINE = "\n                    "
+                msg = f"""
+                    the following benchmarks were more than {tolerance:.0%} slower than the baseline {baseline}
+
+                    {NEW_LINE.join(lines)}
+                """
+                exit_error(msg)
+
+
+def _report_result(result: BenchmarkResult):
+    print(
+        f"{result.name:25} best {result.best:8.3f}s  mean {result.mean:8.3f}s",
+        file=sys.stderr,
+    )
+
+
+def _read_baseline_or_exit_error(file_path: Path):
+    try:
+        with open(file_path) as file_h:
+            result = json.load(file_h)
+    except (IOError, json.JSONDecodeError) as e:
+        exit_error(f"couldn't read the baseline {file_path} because {e}")
+
+    return result
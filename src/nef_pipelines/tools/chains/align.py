@@ -11,10 +11,12 @@ import typer
 from tabulate import tabulate
 from typer import Argument, Option
 
+from nef_pipelines.lib.assignment_index_lib import AssignmentIndex
 from nef_pipelines.lib.nef_lib import (
     NEF_MOLECULAR_SYSTEM,
     SELECTORS_LOWER,
     SelectionType,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
     select_frames,
 )
@@ -45,10 +47,6 @@ separated lists of frame names [default: the molecular system frame if present o
 
 app = typer.Typer()
 
-CHAIN_CODE = "chain_code"
-
-SEQUENCE_CODE = "sequence_code"
-
 
 @dataclass
 class Sequence:
@@ -196,7 +194,7 @@ def align(
                 },
             )
 
-    print(entry)
+    print_entry(entry)
 
 
 def _get_offset_or_none(matcher):
@@ -470,9 +468,18 @@ def exit_if_molecular_system_isnt_a_singleton(molecular_system_frames):
 
 
 def offset_chains_in_frames(frames, chain_offsets):
-    for frame in frames:
-        for chain, offset in chain_offsets.items():
-            _offset_residue_numbers(frame, chain, offset)
+    assignment_index = AssignmentIndex(frames)
+
+    new_assignments = {}
+    for assignment in assignment_index:
+        offset = chain_offsets.get(assignment.chain_code)
+        if offset is not None and is_int(assignment.sequence_code):
+            sequence_code = str(int(assignment.sequence_code) + offset)
+            new_assignments[assignment] = assignment._replace(
+                sequence_code=sequence_code
+            )
+
+    assignment_index.relabel(new_assignments)
 
 
 def _exit_multiple_offsets_for_chain(chain, first_offset, second_offset):
@@ -548,34 +555,6 @@ def _exit_if_chains_and_offsets_dont_match(chains, offsets):
         exit_error(msg)
 
 
-def _offset_residue_numbers(frame, chain, offset):
-
-    for loop_data in frame.loop_dict.values():
-        for tag in loop_data.tags:
-            if _tag_is_based_on(tag, SEQUENCE_CODE):
-                sequence_index = loop_data.tag_index(tag)
-
-                chain_code_tag = _tag_based_on(tag, SEQUENCE_CODE, CHAIN_CODE)
-                chain_code_index = loop_data.tag_index(chain_code_tag)
-                for line in loop_data:
-                    if chain_code_index is not None and line[chain_code_index] == chain:
-                        sequence = line[sequence_index]
-                        if is_int(sequence):
-                            sequence = int(sequence)
-                            sequence = sequence + offset
-                            line[sequence_index] = str(sequence)
-
-
-def _tag_based_on(tag, base, substitute):
-    column_code = tag[len(base) :]
-    new_tag = f"{substitute}{column_code}"
-    return new_tag
-
-
-def _tag_is_based_on(tag, base):
-    return tag.startswith(base)
-
-
 # noinspection PyUnusedLocal
 def _parse_target_chains_and_reference_frames_or_exit_error(
     reference_chains_and_frames, entry, reference_selector_type
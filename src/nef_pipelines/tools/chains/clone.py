@@ -6,7 +6,10 @@ from typing import List
 import typer
 from typer import Argument, Option
 
-from nef_pipelines.lib.nef_lib import read_entry_from_file_or_stdin_or_exit_error
+from nef_pipelines.lib.nef_lib import (
+    print_entry,
+    read_entry_from_file_or_stdin_or_exit_error,
+)
 from nef_pipelines.lib.sequence_lib import (
     chains_from_frames,
     get_chain_code_iter,
@@ -87,4 +90,4 @@ def clone(
 
     entry.add_saveframe(molecular_system_frame)
 
-    print(entry)
+    print_entry(entry)
@@ -8,6 +8,7 @@ from typer import Argument, Option
 from nef_pipelines.lib.nef_lib import (
     SELECTORS_LOWER,
     SelectionType,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
     select_frames,
 )
@@ -84,7 +85,7 @@ def rename(
 
     entry = pipe(entry, frames_to_process, old_new_chain_id_pairs)
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
@@ -5,6 +5,7 @@ from typing import Dict, Set, Tuple
 import typer
 from typer import Option
 
+from nef_pipelines.lib.assignment_index_lib import AssignmentIndex
 from nef_pipelines.lib.nef_lib import (
     loop_row_namespace_iter,
     molecular_system_from_entry_or_exit,
@@ -325,11 +326,16 @@ def validate_frames_against_molecular_system(
         "nef_spectral_peak_list",
     ]
 
+    # index the assignments of all the frames to check in one pass
+    assignment_index = AssignmentIndex(
+        frame for frame in entry if frame.category in frame_categories_to_check
+    )
+
     # Iterate through all saveframes in the entry
     for frame in entry:
         if hasattr(frame, "category") and frame.category in frame_categories_to_check:
             frame_results = _validate_frame_residues(
-                entry, frame, molecular_system_residues, verbose
+                entry, frame, molecular_system_residues, assignment_index, verbose
             )
 
             results["frames"][frame.name] = frame_results
@@ -343,12 +349,17 @@ def validate_frames_against_molecular_system(
 
 
 def _validate_frame_residues(
-    entry, frame, molecular_system_residues: Dict, verbose: bool
+    entry,
+    frame,
+    molecular_system_residues: Dict,
+    assignment_index: AssignmentIndex,
+    verbose: bool,
 ) -> Dict:
     """
     Validate residues in a specific frame against molecular system
 
     :param frame: The saveframe to validate
+    :param assignment_index: An assignment index including the frame
     :param molecular_system_residues: Dictionary of molecular system residues
     :param verbose: Whether to print detailed output
     :return: Dictionary with frame validation results
@@ -362,7 +373,7 @@ def _validate_frame_residues(
     }
 
     # Extract residue information from frame based on category
-    frame_residues = _extract_residues_from_frame(frame)
+    frame_residues = _extract_residues_from_frame(frame, assignment_index)
     results["residue_count"] = len(frame_residues)
 
     for chain_code, sequence_code, residue_name in frame_residues:
@@ -419,19 +430,18 @@ def _validate_frame_residues(
     return results
 
 
-def _extract_residues_from_frame(frame) -> Set[Tuple[str, int, str]]:
+def _extract_residues_from_frame(
+    frame, assignment_index: AssignmentIndex
+) -> Set[Tuple[str, int, str]]:
     """
-    Extract residue information from a frame using dynamic column detection
+    Extract residue information from the main loop of a frame using the entry's assignment index
 
     :param frame: The saveframe to extract residues from
+    :param assignment_index: An assignment index including the frame
     :return: Set of (chain_code, sequence_code, residue_name) tuples
     """
     residues = set()
 
-    # Try to get the main loop for this frame type
-    loop = None
-    loop_name = None
-
     # Common NEF loop names by category
     loop_mappings = {
         "nef_chemical_shift_list": "_nef_chemical_shift",
@@ -442,105 +452,44 @@ def _extract_residues_from_frame(frame) -> Set[Tuple[str, int, str]]:
         "nef_nmr_meta_data": "_nef_nmr_meta_data",
     }
 
-    if frame.category in loop_mappings:
-        loop_name = loop_mappings[frame.category]
+    loop_name = loop_mappings.get(frame.category)
+    if not loop_name:
+        return residues
 
-    # Try to get the loop
     try:
-        if loop_name:
-            loop = frame.get_loop(loop_name)
-        else:
-            # Try to find any loop in the frame
-            if hasattr(frame, "loops") and frame.loops:
-                loop = list(frame.loops.values())[0]
-    except (KeyError, AttributeError):
+        loop = frame.get_loop(loop_name)
+    except KeyError:
         return residues
 
-    if not loop:
-        return residues
+    # each distinct assignment in the loop is only seen once however many rows and dimensions it occurs in
+    for assignment in assignment_index.assignments(loop):
+        chain_code = assignment.chain_code
+        sequence_code_str = assignment.sequence_code
+
+        if (
+            not chain_code
+            or not sequence_code_str
+            or chain_code == "."
+            or sequence_code_str == "."
+        ):
+            continue
 
-    # Get all column names from the loop
-    try:
-        column_names = [tag.replace(f"{loop_name}.", "") for tag in loop.tags]
-    except (AttributeError, TypeError):
         try:
-            column_names = loop.tags if hasattr(loop, "tags") else []
-        except Exception:
-            return residues
-
-    # Find all residue-related columns (with and without dimension numbers)
-    chain_cols = []
-    sequence_cols = []
-    residue_cols = []
-    atom_cols = []
-
-    for col in column_names:
-        if col.startswith("chain_code"):
-            chain_cols.append(col)
-        elif col.startswith("sequence_code"):
-            sequence_cols.append(col)
-        elif col.startswith("residue_name"):
-            residue_cols.append(col)
-        elif col.startswith("atom_name"):
-            atom_cols.append(col)
-
-    # Process each row in the loop
-    try:
-        for row in loop_row_namespace_iter(loop):
-            # Extract residues from all available dimension combinations
-            processed_combinations = set()
-
-            # Handle both numbered dimensions (_1, _2, etc.) and unnumbered columns
-            for chain_col in chain_cols:
-                # Determine dimension suffix
-                if "_" in chain_col and chain_col.split("_")[-1].isdigit():
-                    dim_suffix = "_" + chain_col.split("_")[-1]
-                else:
-                    dim_suffix = ""
-
-                seq_col = f"sequence_code{dim_suffix}"
-                res_col = f"residue_name{dim_suffix}"
-
-                # Check if we have the required columns for this dimension
-                if hasattr(row, chain_col) and hasattr(row, seq_col):
-                    try:
-                        chain_code = getattr(row, chain_col)
-                        sequence_code_str = getattr(row, seq_col)
-
-                        if (
-                            chain_code
-                            and sequence_code_str
-                            and chain_code != "."
-                            and sequence_code_str != "."
-                        ):
-                            sequence_code = int(sequence_code_str)
-
-                            # Get residue name if available
-                            residue_name = "."
-                            if hasattr(row, res_col):
-                                residue_name = getattr(row, res_col) or "."
-
-                            # Create a unique key to avoid duplicates
-                            residue_key = (chain_code, sequence_code, residue_name)
-
-                            if residue_key not in processed_combinations:
-                                processed_combinations.add(residue_key)
-
-                                # Warn if residue name is missing
-                                if residue_name == ".":
-                                    warn(
-                                        f"Frame {frame.name}: Missing residue name for {chain_code}.{sequence_code}"
-                                    )
-
-                                residues.add(residue_key)
-
-                    except (ValueError, AttributeError, TypeError):
-                        # Skip invalid entries
-                        continue
-
-    except (AttributeError, TypeError):
-        # Skip if loop processing fails
-        pass
+            sequence_code = int(sequence_code_str)
+        except ValueError:
+            continue
+
+        residue_name = assignment.residue_name or "."
+        residue_key = (chain_code, sequence_code, residue_name)
+
+        if residue_key not in residues:
+            # Warn if residue name is missing
+            if residue_name == ".":
+                warn(
+                    f"Frame {frame.name}: Missing residue name for {chain_code}.{sequence_code}"
+                )
+
+            residues.add(residue_key)
 
     return residues
 
@@ -4,7 +4,10 @@ from typing import List
 import typer
 from pynmrstar import Entry, Loop
 
-from nef_pipelines.lib.nef_lib import read_entry_from_file_or_stdin_or_exit_error
+from nef_pipelines.lib.nef_lib import (
+    print_entry,
+    read_entry_from_file_or_stdin_or_exit_error,
+)
 from nef_pipelines.lib.structures import FrameLoopsAndTags
 from nef_pipelines.lib.util import STDIN, warn
 from nef_pipelines.tools.columns import columns_app
@@ -33,7 +36,7 @@ def delete(
     # TODO these should most probably be merged by loop bu currently aren't
     selections = _parse_frame_loop_and_tag_selectors_or_exit_error(entry, selectors)
     entry = pipe(entry, selections)
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(entry: Entry, selections: List[FrameLoopsAndTags]) -> Entry:
@@ -7,7 +7,10 @@ from click import Context
 from pynmrstar import Entry
 
 from nef_pipelines.lib.cli_lib import BadFrameLoopTagSyntaxException
-from nef_pipelines.lib.nef_lib import read_entry_from_file_or_stdin_or_exit_error
+from nef_pipelines.lib.nef_lib import (
+    print_entry,
+    read_entry_from_file_or_stdin_or_exit_error,
+)
 from nef_pipelines.lib.structures import NEFPipelinesException
 from nef_pipelines.lib.util import STDIN, exit_error
 from nef_pipelines.tools.columns import columns_app
@@ -190,7 +193,7 @@ def insert(
     except NEFPipelinesException as e:
         _exit_error_on_pipe_exception(e, specs)
 
-    print(entry)
+    print_entry(entry)
 
 
 def _exit_error_if_no_column_specifications(specs: Optional[List[str]]):
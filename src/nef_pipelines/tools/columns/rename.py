@@ -7,6 +7,7 @@ from pynmrstar import Entry
 from nef_pipelines.lib.nef_lib import (
     SelectionType,
     loop_row_dict_iter,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
     select_frames,
     select_loops_by_category,
@@ -54,7 +55,7 @@ def rename(
     _validate_columns_exist(entry, rename_pairs)
 
     entry = pipe(entry, rename_pairs)
-    print(entry)
+    print_entry(entry)
 
 
 def _parse_rename_arguments_or_exit_error(
@@ -10,6 +10,7 @@ from strenum import LowercaseStrEnum
 from nef_pipelines.lib.nef_lib import (
     SelectionType,
     loop_row_dict_iter,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
     select_frames,
     select_loops_by_category,
@@ -175,7 +176,7 @@ def reorder(
     _validate_reorder_or_exit_error(entry, frame_loop_tags, input)
 
     entry = pipe(entry, frame_loop_tags, policy)
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
@@ -3,7 +3,10 @@ from typing import List, Optional
 
 import typer
 
-from nef_pipelines.lib.nef_lib import read_entry_from_file_or_stdin_or_exit_error
+from nef_pipelines.lib.nef_lib import (
+    print_entry,
+    read_entry_from_file_or_stdin_or_exit_error,
+)
 from nef_pipelines.lib.util import STDIN
 from nef_pipelines.tools.columns import columns_app
 from nef_pipelines.tools.columns.columns_structures import ExtractFormat
@@ -98,4 +101,4 @@ def replace(
         selector, args, entry, input, format
     )
     entry = pipe(entry, column_instructions)
-    print(entry)
+    print_entry(entry)
@@ -0,0 +1,94 @@
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+import nef_pipelines
+from nef_pipelines import nef_app
+from nef_pipelines.lib.daemon_lib import (
+    DAEMON_COMMAND,
+    DAEMON_ENV_VAR,
+    REQUEST_PING,
+    REQUEST_STOP,
+    DaemonUnavailableException,
+    default_socket_path,
+    request_daemon,
+    serve_daemon,
+)
+from nef_pipelines.lib.util import ToolCategory, exit_error, info, warn
+
+SOCKET_HELP = """the unix socket the daemon listens on, the default is in the user's runtime or temporary
+                 directory [clients select it by setting {env_var} to 1 or to the path of the socket]"""
+
+if nef_app.app:
+
+    @nef_app.app.command(rich_help_panel=ToolCategory.GENERAL)
+    def daemon(
+        socket_path: Optional[Path] = typer.Option(
+            None,
+            "--socket",
+            metavar="SOCKET",
+            help=SOCKET_HELP.format(env_var=DAEMON_ENV_VAR),
+        ),
+        stop: bool = typer.Option(False, "--stop", help="stop a running daemon"),
+        status: bool = typer.Option(
+            False, "--status", help="report whether a daemon is running"
+        ),
+    ):
+        """- run a warm worker that runs nef commands without starting a new python [set NEF_PIPELINES_DAEMON=1]"""
+
+        socket_path = socket_path if socket_path else default_socket_path()
+
+        if stop or status:
+            request = REQUEST_STOP if stop else REQUEST_PING
+            try:
+                reply = request_daemon(socket_path, {"request": request}, timeout=5.0)
+            except DaemonUnavailableException as e:
+                exit_error(f"no daemon is running at {socket_path}: {e}")
+
+            if stop:
+                info(f"stopped the daemon at {socket_path}")
+            else:
+                print(f"daemon running at {socket_path} [pid: {reply.get('pid')}]")
+            return
+
+        _load_daemon_app()
+
+        info(
+            f"""
+                nef daemon listening on {socket_path}
+                set {DAEMON_ENV_VAR}=1 [or to the socket path] to run nef commands in the daemon
+            """
+        )
+
+        try:
+            serve_daemon(socket_path)
+        except FileExistsError as e:
+            exit_error(str(e))
+        except KeyboardInterrupt:
+            pass
+
+
+def _load_daemon_app():
+    # load every command so any command line can be run, commands run without a sandbox as the daemon runs as the
+    # user [see daemon_lib] and the ai and daemon commands are removed
+    from nef_pipelines.nef_app_runner import (  # lazy
+        create_nef_app,
+        load_nef_modules_and_build_failure,
+    )
+
+    create_nef_app()
+    failure_message = load_nef_modules_and_build_failure()
+    if failure_message:
+        warn(failure_message)
+
+    app = nef_pipelines.nef_app.app
+    app.registered_groups = [
+        group for group in app.registered_groups if group.name != "ai"
+    ]
+    app.registered_commands = [
+        command
+        for command in app.registered_commands
+        if command.name != DAEMON_COMMAND
+        and getattr(command.callback, "__name__", None) != DAEMON_COMMAND
+    ]
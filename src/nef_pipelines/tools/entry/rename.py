@@ -2,7 +2,7 @@ from pathlib import Path
 
 import typer
 
-from nef_pipelines.lib.nef_lib import read_entry_from_stdin_or_exit
+from nef_pipelines.lib.nef_lib import print_entry, read_entry_from_stdin_or_exit
 from nef_pipelines.tools.entry import entry_app
 
 
@@ -28,4 +28,4 @@ def rename(
     if name is not None:
         entry.entry_id = name
 
-    print(entry)
+    print_entry(entry)
@@ -12,11 +12,12 @@ from typing import List, Optional, Set, Tuple
 
 import typer
 from click import Context
-from pynmrstar import Entry, Loop, Saveframe
+from pynmrstar import Entry
 from strenum import LowercaseStrEnum
 from treelib import Node, Tree
 
 from nef_pipelines.lib.cli_lib import parse_frame_loop_and_tags
+from nef_pipelines.lib.entry_index_lib import FrameIndex, LoopIndex, index_frame
 from nef_pipelines.lib.namespace_lib import (
     NO_NAMESPACE,
     filter_namespaces,
@@ -83,8 +84,8 @@ class NefNode(Node):
         entry_part: EntryPart,
         frame_name: Optional[str] = None,
         loop_category: Optional[str] = None,
-        saveframe: Optional[Saveframe] = None,
-        loop: Optional[Loop] = None,
+        loop_count: Optional[int] = None,
+        row_count: Optional[int] = None,
         *args,
         **kwargs,
     ):
@@ -93,8 +94,8 @@ class NefNode(Node):
         self.entry_part = entry_part
         self.frame_name = frame_name
         self.loop_category = loop_category
-        self.saveframe = saveframe
-        self.loop = loop
+        self.loop_count = loop_count
+        self.row_count = row_count
 
 
 @entry_app.command()
@@ -746,19 +747,19 @@ def _match_nodes_by_selector(tree: Tree, selector) -> Set[str]:
     return nodes_to_keep
 
 
-def _add_frame_to_tree(tree: Tree, frame: Saveframe) -> None:
+def _add_frame_to_tree(tree: Tree, frame: FrameIndex) -> None:
     """\
     Add a frame and its tags to the tree.
 
     Args:
         tree: Tree to add to
-        frame: Saveframe to add
+        frame: Index of the saveframe to add
     """
     frame_id = f"frame:{frame.name}"
     loop_count = len(frame.loops)
     loops_text = "loop" if loop_count == 1 else "loops"
 
-    frame_namespace = get_namespace(frame, EntryPart.Saveframe)
+    frame_namespace = get_namespace(frame.category, EntryPart.Saveframe)
 
     frame_node = NefNode(
         tag=f"{frame.name} \\[frame: {loop_count} {loops_text}]",
@@ -766,11 +767,11 @@ def _add_frame_to_tree(tree: Tree, frame: Saveframe) -> None:
         namespace=frame_namespace,
         entry_part=EntryPart.Saveframe,
         frame_name=frame.name,
-        saveframe=frame,
+        loop_count=loop_count,
     )
     tree.add_node(frame_node, parent="entry")
 
-    for tag_name, _tag_value in frame.tag_iterator():
+    for tag_name in frame.tags:
         tag_id = f"tag:{frame.name}:{tag_name}"
         tag_namespace = get_namespace(tag_name, EntryPart.FrameTag, frame_namespace)
 
@@ -784,23 +785,23 @@ def _add_frame_to_tree(tree: Tree, frame: Saveframe) -> None:
         tree.add_node(tag_node, parent=frame_id)
 
 
-def _add_loop_to_tree(tree: Tree, frame: Saveframe, loop: Loop) -> None:
+def _add_loop_to_tree(tree: Tree, frame: FrameIndex, loop: LoopIndex) -> None:
     """\
     Add a loop and its tags to the tree.
 
     Args:
         tree: Tree to add to
-        frame: Parent saveframe
-        loop: Loop to add
+        frame: Index of the parent saveframe
+        loop: Index of the loop to add
     """
     frame_id = f"frame:{frame.name}"
     loop_id = f"loop:{frame.name}:{loop.category}"
 
-    row_count = len(loop.data)
+    row_count = loop.row_count
     rows_text = "row" if row_count == 1 else "rows"
     display_category = loop.category.lstrip("_")
 
-    loop_namespace = get_namespace(loop, EntryPart.Loop)
+    loop_namespace = get_namespace(loop.category, EntryPart.Loop)
 
     loop_node = NefNode(
         tag=f"{display_category} \\[loop: {row_count} {rows_text}]",
@@ -809,7 +810,7 @@ def _add_loop_to_tree(tree: Tree, frame: Saveframe, loop: Loop) -> None:
         entry_part=EntryPart.Loop,
         frame_name=frame.name,
         loop_category=loop.category,
-        loop=loop,
+        row_count=row_count,
     )
     tree.add_node(loop_node, parent=frame_id)
 
@@ -842,6 +843,8 @@ def _build_nef_tree_structure(entry: Entry) -> Tree:
         │       ├── column_2
         │       └── (N rows)
 
+    Frames are read from their index [see entry_index_lib] so lazily read frames aren't parsed.
+
     Args:
         entry: pynmrstar Entry object
 
@@ -858,6 +861,7 @@ def _build_nef_tree_structure(entry: Entry) -> Tree:
     tree.add_node(entry_node)
 
     for frame in entry.frame_list:
+        frame = index_frame(frame)
         _add_frame_to_tree(tree, frame)
 
         for loop in frame.loops:
@@ -1105,12 +1109,12 @@ def _render_node_as_markdown(
             label = f"**entry**: {node.tag}"
         elif part == EntryPart.Saveframe:
             name = node.tag.split(" ")[0]
-            loop_count = len(node.saveframe.loops) if node.saveframe else 0
+            loop_count = node.loop_count or 0
             loops_text = "loop" if loop_count == 1 else "loops"
             label = f"**frame**: {name} ({loop_count} {loops_text})"
         elif part == EntryPart.Loop:
             name = node.tag.split(" ")[0]
-            row_count = len(node.loop.data) if node.loop else 0
+            row_count = node.row_count or 0
             rows_text = "row" if row_count == 1 else "rows"
             label = f"**loop**: {name} ({row_count} {rows_text})"
         elif part == EntryPart.FrameTag:
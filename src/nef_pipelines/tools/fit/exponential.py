@@ -9,19 +9,26 @@ import typer
 from pynmrstar import Entry, Saveframe
 
 from nef_pipelines.lib.nef_frames_lib import NEF_PIPELINES_NAMESPACE
-from nef_pipelines.lib.nef_lib import read_entry_from_file_or_stdin_or_exit_error
+from nef_pipelines.lib.nef_lib import (
+    print_entry,
+    read_entry_from_file_or_stdin_or_exit_error,
+)
 from nef_pipelines.lib.util import exit_error, parse_comma_separated_options
 from nef_pipelines.tools.ai.sandbox_lib import setup_jax, setup_sandbox
 from nef_pipelines.tools.fit import fit_app
 from nef_pipelines.tools.fit.fit_lib import (
+    WORKERS_HELP,
+    FitTask,
     _exit_if_no_frame_selectors,
     _exit_if_no_series_frames_selected,
+    _exit_if_workers_less_than_1,
     _fit_results_as_frame,
     _get_mc_failed_cycles_or_none,
     _select_relaxation_series_or_exit,
     _series_frame_to_id_series_data,
     _warn_if_montecarlo_cycles_is_1,
     calculate_noise_level_from_replicates,
+    fit_tasks,
     report_fit_status_and_exit_error_if_required,
 )
 
@@ -86,6 +93,7 @@ def exponential(
         "--failure-output",
         help="output format for failed fits: comment (UNUSED values), skip (omit row)",
     ),
+    workers: int = typer.Option(1, "-w", "--workers", help=WORKERS_HELP),
     frames_selectors: List[str] = typer.Argument(None, help="select frames to fit"),
 ):
     """- fit a data series to an exponential decay with error propagation [alpha]"""
@@ -109,6 +117,8 @@ def exponential(
 
     _warn_if_montecarlo_cycles_is_1(cycles)
 
+    _exit_if_workers_less_than_1(workers)
+
     entry = pipe(
         entry,
         series_frames,
@@ -118,9 +128,10 @@ def exponential(
         verbose,
         failure_handling,
         failure_output,
+        workers,
     )
 
-    print(entry)
+    print_entry(entry)
 
 
 # TODO: this function is way too long
@@ -133,15 +144,14 @@ def pipe(
     verbose: int = 0,
     failure_handling: FailureHandling = FailureHandling.WARN,
     failure_output: FailureOutput = FailureOutput.COMMENT,
+    workers: int = 1,
 ) -> Entry:
 
     try:
         from streamfitter import fitter  # deferred
 
         if fitter:
-            function = fitter.get_function(
-                fitter.FUNCTION_EXPONENTIAL_DECAY_2_PARAMETER
-            )
+            function_name = fitter.FUNCTION_EXPONENTIAL_DECAY_2_PARAMETER
         else:
             raise ImportError(stream_fitter_import_error)
     except ImportError as e:
@@ -153,6 +163,7 @@ def pipe(
 
         exit_error(msg)
 
+    tasks = []
     for series_frame in series_frames:
         id_series_data = _series_frame_to_id_series_data(
             series_frame, NEF_PIPELINES_NAMESPACE, entry
@@ -193,15 +204,22 @@ def pipe(
             for id, series_datum in id_series_data.items()
         }
 
-        results = fitter.fit(
-            function(),
-            id_xy_data,
-            cycles,
-            noise_info,
-            seed,
-            verbose=verbose,
-            failure_handling=failure_handling,
-        )
+        tasks.append(FitTask(id_xy_data, noise_info))
+
+    # the series frames are fitted together so their data can be shared across workers, with one worker each
+    # frame is only fitted when its results are reported below
+    all_results = fit_tasks(
+        function_name,
+        tasks,
+        cycles,
+        seed,
+        verbose=verbose,
+        failure_handling=failure_handling,
+        workers=workers,
+    )
+
+    for series_frame, task, results in zip(series_frames, tasks, all_results):
+        noise_info = task.noise_info
 
         # Check exit status and handle STOPPED case
         report_fit_status_and_exit_error_if_required(
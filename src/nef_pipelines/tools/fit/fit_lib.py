@@ -1,8 +1,9 @@
 from dataclasses import dataclass, field
+from datetime import timedelta
 from itertools import combinations
 from math import sqrt
 from statistics import stdev
-from typing import Dict, List, Optional, OrderedDict, Tuple, Union
+from typing import Dict, Iterator, List, Optional, OrderedDict, Tuple, Union
 
 from ordered_set import OrderedSet
 from pynmrstar import Entry, Loop, Saveframe
@@ -105,6 +106,240 @@ def _get_mc_failed_cycles_or_none(
     )
 
 
+WORKERS_HELP = """
+    the number of processes to fit with, data ids and series are split into shards which are fitted in parallel,
+    each shard's random number generator is seeded from the seed so results are reproducible for a given number
+    of workers [results with more than one worker will differ from those with one worker]
+    """
+
+# results from fitter.fit keyed by data id which are merged when a fit is split into shards
+_PER_ID_RESULTS = (
+    "fits",
+    "estimates",
+    "monte_carlo_errors",
+    "monte_carlo_value_stats",
+    "monte_carlo_param_values",
+    "mc_failed_cycles",
+)
+
+
+@dataclass
+class FitTask:
+    """The data for one call of fitter.fit, typically the data ids from one series frame."""
+
+    id_xy_data: Dict
+    noise_info: NoiseInfo
+
+
+@dataclass
+class _FitShard:
+    task_index: int
+    function_name: str
+    id_xy_data: Dict
+    cycles: int
+    noise_info: NoiseInfo
+    seed: int
+    verbose: int
+    failure_handling: object
+
+
+def _split_ids(ids: List, num_shards: int) -> List[List]:
+    # contiguous shards of near equal size so merging the shards keeps the order of the data ids
+    shard_size, remainder = divmod(len(ids), num_shards)
+
+    result = []
+    start = 0
+    for shard_index in range(num_shards):
+        end = start + shard_size + (1 if shard_index < remainder else 0)
+        result.append(ids[start:end])
+        start = end
+
+    return result
+
+
+def _shard_seeds(seed: int, num_shards: int) -> List[int]:
+    # a single shard uses the seed unchanged so it matches a serial fit
+    if num_shards == 1:
+        return [seed]
+
+    from numpy.random import SeedSequence  # deferred
+
+    return [
+        int(child.generate_state(1)[0])
+        for child in SeedSequence(seed).spawn(num_shards)
+    ]
+
+
+def _build_fit_shards(
+    function_name, tasks, cycles, seed, verbose, failure_handling, workers
+) -> List[_FitShard]:
+    shards = []
+    for task_index, task in enumerate(tasks):
+        ids = list(task.id_xy_data)
+        num_shards = max(1, min(workers, len(ids)))
+
+        shard_ids = _split_ids(ids, num_shards)
+        seeds = _shard_seeds(seed, num_shards)
+
+        for ids_in_shard, shard_seed in zip(shard_ids, seeds):
+            shard_data = {id: task.id_xy_data[id] for id in ids_in_shard}
+            shards.append(
+                _FitShard(
+                    task_index,
+                    function_name,
+                    shard_data,
+                    cycles,
+                    task.noise_info,
+                    shard_seed,
+                    verbose,
+                    failure_handling,
+                )
+            )
+
+    return shards
+
+
+def _fit_shard(shard: _FitShard) -> Dict:
+    from streamfitter import fitter  # deferred
+
+    function = fitter.get_function(shard.function_name)
+
+    results = fitter.fit(
+        function(),
+        shard.id_xy_data,
+        shard.cycles,
+        shard.noise_info,
+        shard.seed,
+        verbose=shard.verbose,
+        failure_handling=shard.failure_handling,
+    )
+
+    # the keyword arguments lmfit records hold the fit function, which can't be returned from a worker process
+    for fit in results["fits"].values():
+        if hasattr(fit, "call_kws"):
+            fit.call_kws = {}
+
+    return results
+
+
+def _merge_fit_results(shard_results: List[Dict], seed: int) -> Dict:
+    from streamfitter.fitter import FitExitStatus  # deferred
+
+    if len(shard_results) == 1:
+        return shard_results[0]
+
+    result = dict(shard_results[0])
+
+    for key in _PER_ID_RESULTS:
+        if key in result:
+            result[key] = {}
+            for shard_result in shard_results:
+                result[key].update(shard_result[key])
+
+    result["total_requested"] = sum(
+        shard_result["total_requested"] for shard_result in shard_results
+    )
+    result["failed_fits"] = sum(
+        shard_result["failed_fits"] for shard_result in shard_results
+    )
+
+    stopped = [
+        shard_result
+        for shard_result in shard_results
+        if shard_result["exit_status"] == FitExitStatus.STOPPED
+    ]
+    last_result = stopped[0] if stopped else shard_results[-1]
+    result["exit_status"] = last_result["exit_status"]
+    result["last_attempted_id"] = last_result["last_attempted_id"]
+
+    result["random seed"] = seed
+    result["time_start"] = min(
+        shard_result["time_start"] for shard_result in shard_results
+    )
+    result["time_end"] = max(shard_result["time_end"] for shard_result in shard_results)
+    calculation_time = timedelta(seconds=result["time_end"] - result["time_start"])
+    result["calculation_time"] = calculation_time
+    result["calculation time"] = calculation_time
+
+    return result
+
+
+def fit_tasks(
+    function_name: str,
+    tasks: List[FitTask],
+    cycles: int,
+    seed: int,
+    verbose: int = 0,
+    failure_handling=None,
+    workers: int = 1,
+) -> Iterator[Dict]:
+    """Fit a list of tasks with streamfitter, optionally splitting them into shards fitted by a pool of processes.
+
+    With one worker each task is fitted in this process exactly as fitter.fit would, and only when its result is
+    requested, so callers can report each result [or stop] before the next task is fitted. With more workers the
+    data ids of each task are split into up to workers shards, each shard is fitted with a seed derived from the
+    seed and the shards of each task are merged back into a single result in the original order of the data ids.
+
+    Args:
+        function_name: the name of the streamfitter function to fit [e.g. fitter.FUNCTION_EXPONENTIAL_DECAY_2_PARAMETER]
+        tasks: the data and noise info to fit
+        cycles: the number of Monte Carlo cycles for error propagation
+        seed: the seed for the random number generator
+        verbose: the verbosity passed to streamfitter
+        failure_handling: how streamfitter should handle failed fits, None for its default
+        workers: the number of processes to fit with
+
+    Returns:
+        an iterator over the results from fitter.fit for each task in the same order as the tasks
+    """
+
+    from nef_pipelines.lib.interface import FailureHandling  # deferred
+
+    if failure_handling is None:
+        failure_handling = FailureHandling.WARN
+
+    if workers <= 1:
+        for task_index, task in enumerate(tasks):
+            shard = _FitShard(
+                task_index,
+                function_name,
+                task.id_xy_data,
+                cycles,
+                task.noise_info,
+                seed,
+                verbose,
+                failure_handling,
+            )
+            yield _fit_shard(shard)
+        return
+
+    import multiprocessing  # deferred
+    from concurrent.futures import ProcessPoolExecutor  # deferred
+
+    shards = _build_fit_shards(
+        function_name, tasks, cycles, seed, verbose, failure_handling, workers
+    )
+
+    # jax is multithreaded and isn't safe to fork
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(shards)) if shards else 1,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        shard_results = list(executor.map(_fit_shard, shards))
+
+    results_by_task = [[] for _ in tasks]
+    for shard, shard_result in zip(shards, shard_results):
+        results_by_task[shard.task_index].append(shard_result)
+
+    for task_results in results_by_task:
+        yield _merge_fit_results(task_results, seed)
+
+
+def _exit_if_workers_less_than_1(workers: int):
+    if workers < 1:
+        exit_error(f"the number of workers must be 1 or more, i got {workers}")
+
+
 class NEFPLSFitLibException(NEFPipelinesException):
     """Base exception class for NEF fit library errors."""
 
@@ -9,6 +9,7 @@ from pynmrstar import Entry, Saveframe
 from nef_pipelines.lib.nef_frames_lib import NEF_PIPELINES_NAMESPACE
 from nef_pipelines.lib.nef_lib import (
     UNUSED,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
 )
 from nef_pipelines.lib.util import exit_error, parse_comma_separated_options
@@ -85,7 +86,7 @@ def mean(
         noise_level,
     )
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
@@ -12,6 +12,7 @@ from nef_pipelines.lib.nef_lib import (
     UNUSED,
     create_nef_save_frame,
     get_frame_id,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
 )
 from nef_pipelines.lib.util import parse_comma_separated_options
@@ -78,7 +79,7 @@ def ratio(
 
     entry = pipe(entry, series_frames, noise_level)
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
@@ -11,21 +11,28 @@ from pynmrstar import Entry, Saveframe
 
 from nef_pipelines.lib.interface import LoggingLevels, NoiseInfo, NoiseInfoSource
 from nef_pipelines.lib.nef_frames_lib import NEF_PIPELINES_NAMESPACE
-from nef_pipelines.lib.nef_lib import read_entry_from_file_or_stdin_or_exit_error
+from nef_pipelines.lib.nef_lib import (
+    print_entry,
+    read_entry_from_file_or_stdin_or_exit_error,
+)
 from nef_pipelines.lib.util import exit_error, parse_comma_separated_options
 from nef_pipelines.tools.ai.sandbox_lib import setup_jax, setup_sandbox
 from nef_pipelines.tools.fit import fit_app
 from nef_pipelines.tools.fit.fit_lib import (
+    WORKERS_HELP,
+    FitTask,
     NEFPLSFitLibException,
     _combine_relaxation_series,
     _exit_if_no_frame_selectors,
     _exit_if_no_series_frames_selected,
+    _exit_if_workers_less_than_1,
     _fit_results_as_frame,
     _get_mc_failed_cycles_or_none,
     _select_relaxation_series_or_exit,
     _series_frame_to_id_series_data,
     _warn_if_montecarlo_cycles_is_1,
     calculate_noise_level_from_replicates,
+    fit_tasks,
     report_fit_status_and_exit_error_if_required,
 )
 
@@ -64,6 +71,7 @@ def t1noe(
         42, "-s", "--seed", help="seed for random number generator"
     ),
     verbose: int = typer.Option(LoggingLevels.WARNING, count=True, help=VERBOSE_HELP),
+    workers: int = typer.Option(1, "-w", "--workers", help=WORKERS_HELP),
     frames_selectors: List[str] = typer.Argument(
         None, help="select frames to fit, these must come in pairs"
     ),
@@ -102,6 +110,8 @@ def t1noe(
 
     _warn_if_montecarlo_cycles_is_1(cycles)
 
+    _exit_if_workers_less_than_1(workers)
+
     if outputs:
         outputs = parse_comma_separated_options(outputs)
 
@@ -118,9 +128,11 @@ def t1noe(
 
         exit_error(msg)
 
-    entry = pipe(entry, series_frames, cycles, noise_level, seed, verbose, outputs)
+    entry = pipe(
+        entry, series_frames, cycles, noise_level, seed, verbose, outputs, workers
+    )
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
@@ -131,14 +143,13 @@ def pipe(
     seed: int,
     verbose: int = 0,
     outputs=None,
+    workers: int = 1,
 ) -> Entry:
 
     try:
         from streamfitter import fitter  # deferred
 
-        function = fitter.get_function(
-            fitter.FUNCTION_TWO_EXPONENTIAL_DECAYS_2_PARAMETER_SHARED_RATE
-        )
+        function_name = fitter.FUNCTION_TWO_EXPONENTIAL_DECAYS_2_PARAMETER_SHARED_RATE
 
     except ImportError as e:
 
@@ -149,7 +160,10 @@ def pipe(
 
         exit_error(msg)
 
-    for series_frame_1, series_frame_2 in _chunker(series_frames, 2):
+    tasks = []
+    series_frame_pairs = list(_chunker(series_frames, 2))
+    outputs_by_pair = []
+    for series_frame_1, series_frame_2 in series_frame_pairs:
 
         id_series_data_1 = _series_frame_to_id_series_data(
             series_frame_1, NEF_PIPELINES_NAMESPACE, entry
@@ -231,14 +245,19 @@ def pipe(
             for data_id, series_datum in id_series_data.items()
         }
 
-        results = fitter.fit(
-            function(),
-            id_xy_data,
-            cycles,
-            noise_info,
-            seed,
-            verbose=verbose,
-        )
+        tasks.append(FitTask(id_xy_data, noise_info))
+        outputs_by_pair.append(outputs)
+
+    # the pairs of series frames are fitted together so their data can be shared across workers, with one worker
+    # each pair is only fitted when its results are reported below
+    all_results = fit_tasks(
+        function_name, tasks, cycles, seed, verbose=verbose, workers=workers
+    )
+
+    for (series_frame_1, _), task, outputs, results in zip(
+        series_frame_pairs, tasks, outputs_by_pair, all_results
+    ):
+        noise_info = task.noise_info
 
         # Check exit status and handle STOPPED case
         report_fit_status_and_exit_error_if_required(
@@ -8,6 +8,7 @@ from nef_pipelines.lib.nef_lib import (
     add_frames_to_entry,
     create_nef_save_frame,
     is_save_frame_name_in_entry,
+    print_entry,
     read_or_create_entry_exit_error_on_bad_file,
 )
 from nef_pipelines.lib.util import (
@@ -69,7 +70,7 @@ def create(
 
     entry = pipe(entry, pairs)
 
-    print(entry)
+    print_entry(entry)
 
 
 def _warn_if_frame_existsing_and_not_quiet(
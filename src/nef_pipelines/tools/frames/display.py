@@ -22,6 +22,7 @@ from nef_pipelines.lib.namespace_lib import (
     filter_namespaces,
 )
 from nef_pipelines.lib.nef_lib import read_entry_from_file_or_stdin_or_exit_error
+from nef_pipelines.lib.star_writer_lib import format_frame_tags, format_loop
 from nef_pipelines.lib.structures import FrameLoopsAndTags
 from nef_pipelines.lib.util import STDIN, warn
 from nef_pipelines.tools.frames import frames_app
@@ -595,28 +596,16 @@ def _indent_frame_content(lines: List[str]) -> List[str]:
 
 
 def _format_frame_tags(frame: Saveframe, selected_tags: List[str]) -> List[str]:
-    """Format frame tags by building a filtered saveframe copy and using pynmrstar str()."""
+    """Format the selected frame tags using the STAR writer."""
     selected_pairs = [
-        (name, val)
+        (name, val if val != "" else None)
         for name, val in frame.tag_iterator()
         if name in selected_tags or not selected_tags
     ]
     if not selected_pairs:
         return []
 
-    temp = Saveframe.from_scratch(frame.name, frame.tag_prefix)
-    for name, value in selected_pairs:
-        temp.add_tag(name, value if value != "" else None)
-
-    frame_lines = str(temp).split("\n")
-
-    # Strip save_ header (first line) and save_ footer
-    result = []
-    for line in frame_lines[1:]:
-        if line.strip() == "save_":
-            break
-        result.append(line)
-    return result
+    return format_frame_tags(frame.name, frame.tag_prefix, selected_pairs).split("\n")
 
 
 def _calculate_display_indices(
@@ -655,7 +644,7 @@ def _calculate_display_indices(
 def _format_loop_data(
     loop: Loop, selected_tags: List[str], indices_to_include: List[int]
 ) -> List[str]:
-    """Format loop data using pynmrstar (no comments).
+    """Format the selected rows and columns of a loop using the STAR writer (no comments).
 
     Args:
         loop: The loop to format
@@ -667,41 +656,11 @@ def _format_loop_data(
     """
     # If no tags specified, use all tags
     tags_to_show = selected_tags if selected_tags else loop.tags
-    tag_indices = [loop.tags.index(tag) for tag in tags_to_show]
-
-    # Build new loop with selected tags using pynmrstar
-    new_loop = Loop.from_scratch(loop.category)
 
-    # Add selected tags
-    for tag in tags_to_show:
-        new_loop.add_tag(tag)
+    loop_text = format_loop(loop, tags=tags_to_show, rows=indices_to_include)
 
-    # Add data rows (only selected columns)
-    for idx in indices_to_include:
-        row = loop.data[idx]
-        values = [row[i] for i in tag_indices]
-        new_loop.add_data(values)
-
-    # Create temporary saveframe and format using pynmrstar
-    temp_frame = Saveframe.from_scratch("temp", loop.category)
-    temp_frame.add_loop(new_loop)
-
-    # Get formatted string and extract loop portion
-    frame_str = str(temp_frame)
-
-    # Extract just the loop (skip saveframe header/footer)
-    frame_lines = frame_str.split("\n")
-    in_loop = False
-    loop_lines = []
-    for line in frame_lines:
-        if line.strip().startswith("loop_"):
-            in_loop = True
-        if in_loop:
-            loop_lines.append(line)
-            if line.strip().startswith("stop_"):
-                break
-
-    return loop_lines
+    # drop the blank line before loop_ and the line break after stop_
+    return loop_text.split("\n")[1:-1]
 
 
 def _insert_more_columns_comment(loop_lines: List[str]) -> List[str]:
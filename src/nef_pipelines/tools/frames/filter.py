@@ -7,13 +7,15 @@ import typer
 from pynmrstar import Entry
 from strenum import LowercaseStrEnum
 
+from nef_pipelines.lib.assignment_index_lib import ASSIGNMENT_FIELDS, AssignmentIndex
 from nef_pipelines.lib.nef_lib import (
     UNUSED,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
     select_frames,
 )
 from nef_pipelines.lib.sequence_lib import sequence_from_entry_or_exit
-from nef_pipelines.lib.structures import AtomLabel, Residue
+from nef_pipelines.lib.structures import Residue
 from nef_pipelines.lib.util import STDIN, is_int, parse_comma_separated_options
 from nef_pipelines.tools.frames import frames_app
 
@@ -81,7 +83,7 @@ def filter(
 
     entry = pipe(entry, frame_selectors, filter_assigned, assignment_state)
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
@@ -98,121 +100,73 @@ def pipe(
     sequence_set = {replace(residue, residue_name="") for residue in sequence_set}
 
     selected_frames = select_frames(entry, frame_selectors)
-    for frame in selected_frames:
-
-        for loop in frame.loops:
-
-            rows_to_remove = set()
-            tags = loop.tags
-
-            loop_has_tags = {}
-            for tag_name in (
-                "chain_code",
-                "sequence_code",
-                "residue_name",
-                "atom_name",
-            ):
-                loop_has_tags[tag_name] = [tag.startswith(tag_name) for tag in tags]
-
-            are_assignables = [any(has_tag) for has_tag in loop_has_tags.values()]
-            is_assignable = all(are_assignables)
-
-            if is_assignable:
-
-                tag_sets_by_end = {}
-
-                for tag_name in (
-                    "chain_code",
-                    "sequence_code",
-                    "residue_name",
-                    "atom_name",
-                ):
-                    for tag, is_chain_code in zip(tags, loop_has_tags[tag_name]):
-                        if is_chain_code:
-                            end = tag[len(tag_name) :]
-                            tag_and_index = (tag, loop.tag_index(tag))
-                            tag_sets_by_end.setdefault(end, []).append(tag_and_index)
-
-                for row_index, row in enumerate(loop):
-
-                    assignment_state = _get_assignment_state(
-                        row, sequence_set, tag_sets_by_end
-                    )
-
-                    assigned = False
-                    if target_assignment_state is AssignmentState.FULL:
-                        assigned = assignment_state is AssignmentState.FULL
-                    elif target_assignment_state is AssignmentState.PARTIAL:
-                        assigned = assignment_state in {
-                            AssignmentState.FULL,
-                            AssignmentState.PARTIAL,
-                        }
-
-                    if filter_assigned and assigned:
-                        rows_to_remove.add(row_index)
-                    elif not filter_assigned and not assigned:
-                        rows_to_remove.add(row_index)
-
-            for row_index in reversed(sorted(rows_to_remove)):
-                del loop.data[row_index]
-    return entry
-
-
-def _get_assignment_state(row, sequence_set, tag_sets_by_end):
-    atom_labels_by_tag_set_end = _get_atom_labels_by_tag_set(row, tag_sets_by_end)
-
-    assigned_by_end = {}
-    for set_end, atom_label in atom_labels_by_tag_set_end.items():
-        residue_in_sequence = atom_label.residue in sequence_set
-        atom_name = atom_label.atom_name
-        atom_name_ok = (
-            atom_name is not None and len(atom_name) > 0 and atom_name != UNUSED
-        )
-
-        assigned_by_end[set_end] = residue_in_sequence and atom_name_ok
+    assignment_index = AssignmentIndex(selected_frames)
+
+    # each distinct assignment is checked once and counted against the rows it occurs in
+    assigned_counts_by_loop = {
+        id(loop): [0] * len(loop.data) for _, loop in assignment_index.loops()
+    }
+    for assignment, locations in assignment_index.items():
+        if _is_assigned(assignment, sequence_set):
+            for location in locations:
+                assigned_counts_by_loop[id(location.loop)][location.row] += 1
+
+    for _, loop in assignment_index.loops():
+
+        all_columns = assignment_index.columns(loop)
+        if not _is_assignable(all_columns):
+            continue
+
+        rows_to_remove = set()
+        for row_index, assigned_count in enumerate(assigned_counts_by_loop[id(loop)]):
+
+            assignment_state = None
+            if assigned_count == len(all_columns):
+                assignment_state = AssignmentState.FULL
+            elif assigned_count > 0:
+                assignment_state = AssignmentState.PARTIAL
+
+            assigned = False
+            if target_assignment_state is AssignmentState.FULL:
+                assigned = assignment_state is AssignmentState.FULL
+            elif target_assignment_state is AssignmentState.PARTIAL:
+                assigned = assignment_state in {
+                    AssignmentState.FULL,
+                    AssignmentState.PARTIAL,
+                }
+
+            if filter_assigned and assigned:
+                rows_to_remove.add(row_index)
+            elif not filter_assigned and not assigned:
+                rows_to_remove.add(row_index)
+
+        for row_index in reversed(sorted(rows_to_remove)):
+            del loop.data[row_index]
 
-    result = None
-    if all(assigned_by_end.values()):
-        result = AssignmentState.FULL
-    elif any(assigned_by_end.values()):
-        result = AssignmentState.PARTIAL
-
-    return result
-
-
-def _get_atom_labels_by_tag_set(row, tag_sets_by_end):
-
-    residues_by_tag_end = {}
-    for tag_end, tag_set in tag_sets_by_end.items():
+    return entry
 
-        chain_code = None
-        sequence_code = None
-        # residue_name = None
-        atom_name = None
 
-        for tag, tag_index in tag_set:
+def _is_assignable(all_columns):
+    # a loop is assignable if it has chain_code, sequence_code, residue_name and atom_name columns
+    return all(
+        any(columns.has(field) for columns in all_columns)
+        for field in ASSIGNMENT_FIELDS
+    )
 
-            value = row[tag_index]
 
-            if tag.startswith("chain_code"):
-                chain_code = value
-            elif tag.startswith("sequence_code"):
-                sequence_code = value
-            # ignore this for now
-            # elif tag.startswith("residue_name"):
-            #     residue_name = value
-            elif tag.startswith("atom_name"):
-                atom_name = value
+def _is_assigned(assignment, sequence_set):
+    # residue types are currently ignored
+    sequence_code = assignment.sequence_code
+    if is_int(sequence_code):
+        sequence_code = int(sequence_code)
 
-            if is_int(sequence_code):
-                sequence_code = int(sequence_code)
+    residue = Residue(
+        chain_code=assignment.chain_code,
+        sequence_code=sequence_code,
+        residue_name="",
+    )
 
-            residue = Residue(
-                chain_code=chain_code,
-                sequence_code=sequence_code,
-                residue_name="",
-            )
-            atom_label = AtomLabel(residue, atom_name)
-            residues_by_tag_end[tag_end] = atom_label
+    atom_name = assignment.atom_name
+    atom_name_ok = atom_name is not None and len(atom_name) > 0 and atom_name != UNUSED
 
-    return residues_by_tag_end
+    return residue in sequence_set and atom_name_ok
@@ -9,6 +9,7 @@ import typer
 from pynmrstar import Entry
 from strenum import LowercaseStrEnum
 
+from nef_pipelines.lib.nef_lib import print_entry
 from nef_pipelines.lib.util import (
     exit_error,
     parse_comma_separated_options,
@@ -93,7 +94,7 @@ def insert(
                 else:
                     stream_entry.add_saveframe(external_frame)
 
-    print(stream_entry)
+    print_entry(stream_entry)
 
 
 def current_function():
@@ -9,6 +9,7 @@ from click import Context
 from pynmrstar import Entry
 from tabulate import tabulate
 
+from nef_pipelines.lib.entry_index_lib import index_frame
 from nef_pipelines.lib.nef_lib import (
     NEFPLSLIOEmptyStdinException,
     SelectionType,
@@ -16,6 +17,7 @@ from nef_pipelines.lib.nef_lib import (
     select_frames,
 )
 from nef_pipelines.lib.sequence_lib import chains_from_frames, count_residues
+from nef_pipelines.lib.star_writer_lib import format_entry
 from nef_pipelines.lib.typer_utils import get_args
 from nef_pipelines.lib.util import (
     STDIN,
@@ -104,7 +106,6 @@ def list(
         else:
             exit_error("couldn't read a nef stream from stdin")
 
-    lines = str(entry)
     output_file = sys.stderr if write_error else sys.stdout
     with contextlib.redirect_stdout(output_file):
 
@@ -115,6 +116,9 @@ def list(
             print(f"entry {entry.entry_id}")
             print()
 
+            # the checksum is of the entry as pynmrstar would format it, not the text it was read from, so
+            # entries with the same content have the same checksum however they were laid out
+            lines = format_entry(entry, use_original_text=False)
             md5 = hashlib.md5(lines.encode("utf-8")).hexdigest()
             num_lines = len(lines.split("\n"))
             print(f"lines: {num_lines} frames: {len(entry)} checksum: {md5} [md5]")
@@ -161,9 +165,12 @@ def list(
                             f"    name: {frame.name[len(frame.category):].lstrip(UNDERSCORE)}"
                         )
 
+                    # the loops are read from the frame's index so the frame isn't parsed
+                    frame_index = index_frame(frame)
+
                     loop_lengths = []
-                    for loop in frame.loop_dict:
-                        loop_lengths.append(str(len(loop)))
+                    for loop in frame_index.loops:
+                        loop_lengths.append(str(loop.row_count))
 
                     loops = ""
                     if len(loops) == 1:
@@ -171,9 +178,11 @@ def list(
                     else:
                         loops = f' [lengths: {", ".join(loop_lengths)}]'
 
-                    print(f"    loops: {len(frame.loop_dict)}{loops}")
+                    print(f"    loops: {len(frame_index.loops)}{loops}")
 
-                    loop_names = [name.lstrip("_") for name in frame.loop_dict.keys()]
+                    loop_names = [
+                        loop.category.lower().lstrip("_") for loop in frame_index.loops
+                    ]
                     comma = ", "
                     print(f"    loop names: {comma.join(loop_names)}")
 
@@ -11,6 +11,7 @@ from tabulate import tabulate
 
 from nef_pipelines.lib.nef_lib import (
     parse_frame_name,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
     select_frames_by_name,
 )
@@ -269,7 +270,7 @@ def rename(
                 """
             ).strip()
         )
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
@@ -5,7 +5,6 @@ from copy import copy
 from dataclasses import dataclass, replace
 from datetime import time
 from enum import auto
-from itertools import product
 from pathlib import Path
 from random import seed as set_random_seed
 from random import shuffle
@@ -16,11 +15,13 @@ from ordered_set import OrderedSet
 from pynmrstar import Saveframe
 from strenum import KebabCaseStrEnum, LowercaseStrEnum
 
+from nef_pipelines.lib.assignment_index_lib import Assignment, AssignmentIndex
 from nef_pipelines.lib.nef_lib import (
     SELECTORS_LOWER,
     UNUSED,
     SelectionType,
     loop_row_dict_iter,
+    print_entry,
     read_or_create_entry_exit_error_on_bad_file,
     select_frames,
 )
@@ -268,7 +269,7 @@ def unassign(
         complete,
     )
 
-    print(entry)
+    print_entry(entry)
 
 
 # noinspection PyUnusedLocal
@@ -297,8 +298,10 @@ def pipe(
         if use_residue_offsets:
             _offset_sequence_codes_in_triple(frame, targets)
 
-    for frame in target_frames:
-        all_assignments.update(_build_current_assignments_for_frame(frame))
+    assignment_index = AssignmentIndex(target_frames)
+    labels_by_assignment = _labels_by_assignment(assignment_index)
+
+    all_assignments.update(labels_by_assignment.values())
 
     assignments_to_remove = _select_assignments_to_remove_by_residue_ranges(
         all_assignments, residue_ranges, use_residue_offsets
@@ -311,9 +314,7 @@ def pipe(
         assignments_to_remove, targets, sequence_mode, chain_mappings, complete
     )
 
-    for frame in target_frames:
-        for loop in frame:
-            _reassign_loop(loop, assignment_map)
+    _reassign(assignment_index, labels_by_assignment, assignment_map)
 
     for frame in target_frames:
         if use_residue_offsets:
@@ -398,87 +399,37 @@ def _select_assignments_to_remove_by_residue_ranges(
     return assignments_to_remove
 
 
-def _reassign_loop(loop, assignment_map):
-    tag_indices = {tag: index for index, tag in enumerate(loop.tags)}
-    for row_index, row in enumerate(loop_row_dict_iter(loop)):
-        assignments_by_index = {}
-        for index, prefix in product(range(1, 16), ATOM_LABEL_FIELDS):
-
-            if prefix in row:
-                key = prefix
-            else:
-                key = f"{prefix}_{index}"
-
-            if key not in row:
-                break
-
-            assignments_by_index.setdefault(index, {})[prefix] = row[key]
-
-        for column_index, assignment in enumerate(
-            assignments_by_index.values(), start=1
-        ):
-
-            old_label = _dict_to_label(assignment)
-
-            if old_label is not None and old_label in assignment_map:
-
-                new_label = assignment_map[old_label]
+def _reassign(assignment_index, labels_by_assignment, assignment_map):
+    new_assignments = {}
+    for assignment, label in labels_by_assignment.items():
+        if label in assignment_map:
+            new_assignments[assignment] = _label_to_assignment(assignment_map[label])
 
-                for atom_label_field in ATOM_LABEL_FIELDS:
-                    key = None
-                    if atom_label_field in tag_indices:
-                        key = atom_label_field
-                    if not key:
-                        possible_key = f"{atom_label_field}_{column_index}"
-                        if possible_key in tag_indices:
-                            key = possible_key
+    assignment_index.relabel(new_assignments)
 
-                    if key:
-                        tag_index = tag_indices[key]
 
-                        if atom_label_field == "chain_code":
-                            new_value = new_label.residue.chain_code
-                        elif atom_label_field == "sequence_code":
-                            if new_label.residue.offset == 0:
-                                new_value = new_label.residue.sequence_code
-                            else:
-                                if new_label.residue.sequence_code != UNUSED:
-                                    new_value = f"{new_label.residue.sequence_code}{new_label.residue.offset}"
-                                else:
-                                    new_value = new_label.residue.sequence_code
-
-                        elif atom_label_field == "residue_name":
-                            new_value = new_label.residue.residue_name
-                        elif atom_label_field == "atom_name":
-                            new_value = new_label.atom_name
-
-                        loop.data[row_index][tag_index] = new_value
-
-
-def _build_current_assignments_for_frame(frame):
-
-    result = OrderedSet()
-
-    for loop in frame:
-        for i, row in enumerate(loop_row_dict_iter(loop)):
-            assignments_by_index = {}
-            for index, prefix in product(range(1, 16), ATOM_LABEL_FIELDS):
-
-                if prefix in row:
-                    key = prefix
-                else:
-                    key = f"{prefix}_{index}"
-
-                    if key not in row:
-                        break
+def _label_to_assignment(label):
+    if label.residue.offset == 0:
+        sequence_code = label.residue.sequence_code
+    elif label.residue.sequence_code != UNUSED:
+        sequence_code = f"{label.residue.sequence_code}{label.residue.offset}"
+    else:
+        sequence_code = label.residue.sequence_code
 
-                assignments_by_index.setdefault(index, {})[prefix] = row[key]
+    return Assignment(
+        label.residue.chain_code,
+        sequence_code,
+        label.residue.residue_name,
+        label.atom_name,
+    )
 
-            for assignment in assignments_by_index.values():
-                label = _dict_to_label(assignment)
 
-                if label:
-                    result.add(label)
+def _labels_by_assignment(assignment_index):
+    # atom labels for the assignments which have all of chain_code, sequence_code, residue_name and atom_name
+    result = {}
+    for assignment, locations in assignment_index.items():
+        if locations[0].columns.has(*ATOM_LABEL_FIELDS):
+            result[assignment] = _dict_to_label(assignment._asdict())
 
     return result
 
@@ -10,6 +10,7 @@ from nef_pipelines.lib.nef_lib import (
     _parse_globals,
     create_entry_from_stdin,
     create_nef_save_frame,
+    print_entry,
 )
 from nef_pipelines.lib.util import ToolCategory
 
@@ -61,7 +62,7 @@ if nef_app:
         entry = _create_or_update_globals_frame(entry)
 
         if entry:
-            print(entry)
+            print_entry(entry)
         else:
             print()
 
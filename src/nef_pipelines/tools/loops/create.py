@@ -5,7 +5,10 @@ from typing import Any, List, Union
 import typer
 
 from nef_pipelines.lib.cli_lib import BadFrameLoopTagSyntaxException
-from nef_pipelines.lib.nef_lib import read_entry_from_file_or_stdin_or_exit_error
+from nef_pipelines.lib.nef_lib import (
+    print_entry,
+    read_entry_from_file_or_stdin_or_exit_error,
+)
 from nef_pipelines.lib.util import STDIN, exit_error
 from nef_pipelines.tools.columns.columns_cli_lib import (
     _build_column_instructions,
@@ -119,7 +122,7 @@ def create(
     except NEFColumnsException as e:
         exit_error(str(e))
 
-    print(entry)
+    print_entry(entry)
 
 
 def _resolve_loop_speification_pairs_or_exit_error(
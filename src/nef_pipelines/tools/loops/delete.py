@@ -10,7 +10,10 @@ from nef_pipelines.lib.cli_lib import (
     parse_frame_loop_selectors_and_get_errors,
     validate_loop_selection_only_or_raise,
 )
-from nef_pipelines.lib.nef_lib import read_entry_from_file_or_stdin_or_exit_error
+from nef_pipelines.lib.nef_lib import (
+    print_entry,
+    read_entry_from_file_or_stdin_or_exit_error,
+)
 from nef_pipelines.lib.structures import FrameLoopsAndTags
 from nef_pipelines.lib.util import STDIN, exit_error
 from nef_pipelines.tools.loops import loops_app
@@ -41,7 +44,7 @@ def delete(
         msg = f" There was a problem parsing the selectors because:\n{e}"
         exit_error(msg)
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(entry: Entry, frames_loops_and_tags: List[FrameLoopsAndTags]) -> Entry:
@@ -14,6 +14,7 @@ from nef_pipelines.lib.nef_lib import (
     SELECTORS_LOWER,
     SelectionType,
     loop_row_dict_iter,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
     select_frames,
 )
@@ -120,7 +121,7 @@ def trim(
 
     entry = pipe(entry, frame_selectors, selector_type, chain_bounds)
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
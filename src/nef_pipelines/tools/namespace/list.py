@@ -5,6 +5,7 @@ import typer
 from pynmrstar import Entry, Saveframe
 from tabulate import tabulate
 
+from nef_pipelines.lib.entry_index_lib import index_frame
 from nef_pipelines.lib.namespace_lib import (
     collect_namespaces_from_frames,
     filter_namespaces,
@@ -378,7 +379,7 @@ def _build_row(
 def _collect_rows(
     frames: List[Saveframe], namespaces_to_show: Set[str]
 ) -> Tuple[List[NamespaceRow], bool]:
-    """Scan frames in file order and return (rows, has_loops)."""
+    """Scan the frames' indices in file order and return (rows, has_loops)."""
     rows = []
     has_loops = False
 
@@ -390,7 +391,8 @@ def _collect_rows(
                 has_loops = True
 
     for frame in frames:
-        frame_namespace = get_namespace(frame, EntryPart.Saveframe)
+        frame = index_frame(frame)
+        frame_namespace = get_namespace(frame.category, EntryPart.Saveframe)
 
         add(
             _build_row(
@@ -402,7 +404,7 @@ def _collect_rows(
             )
         )
 
-        for tag_name, _ in frame.tag_iterator():
+        for tag_name in frame.tags:
             tag_namespace = get_namespace(tag_name, EntryPart.FrameTag, frame_namespace)
             add(
                 _build_row(
@@ -416,7 +418,9 @@ def _collect_rows(
             )
 
         for loop in frame.loops:
-            loop_namespace = get_namespace(loop, EntryPart.Loop, frame_namespace)
+            loop_namespace = get_namespace(
+                loop.category, EntryPart.Loop, frame_namespace
+            )
             add(
                 _build_row(
                     loop_namespace,
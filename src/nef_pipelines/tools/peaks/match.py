@@ -1,7 +1,6 @@
 import sys
-from math import sqrt
 from textwrap import dedent
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import typer
 from pynmrstar import Loop, Saveframe
@@ -11,10 +10,12 @@ from nef_pipelines.lib.nef_lib import (
     UNUSED,
     create_nef_save_frame,
     loop_row_dict_iter,
+    print_entry,
     read_entry_from_stdin_or_exit,
     select_frames_by_name,
 )
 from nef_pipelines.lib.peak_lib import frame_to_peaks
+from nef_pipelines.lib.spatial_index_lib import KDTree, optimal_assignment
 from nef_pipelines.lib.structures import AtomLabel, NewPeak, SequenceResidue, ShiftData
 from nef_pipelines.lib.util import exit_error, flatten
 from nef_pipelines.tools.peaks import peaks_app
@@ -36,6 +37,20 @@ def match(
         "--assign",
         help="assign the second peak list using closest matches from the first",
     ),
+    one_to_one: bool = typer.Option(
+        False,
+        "--one-to-one",
+        help="""match each peak at most once minimising the total distance between matched peaks [Hungarian
+                algorithm] rather than matching each peak in the first list to its closest peaks in the second,
+                with or without --assign. Only pairs within --max-distance are compared, without it each peak is
+                compared with its nearest peaks in the other list [more are used if this leaves peaks unmatched]
+                which finds the best matching unless peaks have to move past many of their neighbours""",
+    ),
+    max_distance: Optional[float] = typer.Option(
+        None,
+        "--max-distance",
+        help="the largest isotope weighted distance between matched peaks [in 1H ppm]",
+    ),
     names: List[str] = typer.Argument(
         ..., help="pairs of shift frame names for the chemical shifts to compare"
     ),
@@ -59,9 +74,9 @@ def match(
 
     # amide_search_region = {'H': amide_search_region[0], 'N': amide_search_region[1]}
 
-    entry = pipe(entry, frame_1, frames_2, assign)
+    entry = pipe(entry, frame_1, frames_2, assign, one_to_one, max_distance)
 
-    print(entry)
+    print_entry(entry)
 
 
 def _nef_frames_to_peak_shifts(frame: Saveframe) -> Dict[str, Dict[str, float]]:
@@ -85,34 +100,45 @@ def _nef_frames_to_peak_shifts(frame: Saveframe) -> Dict[str, Dict[str, float]]:
     return peak_atom_shifts
 
 
-def _find_best_match(
-    shifts: Dict[str, float],
-    match_shifts: Dict[str, Dict[str, float]],
-    weights=Dict[str, float],
+def _find_best_matches(
+    shifts_1: Dict[int, Dict[int, float]],
+    shifts_2: Dict[int, Dict[int, float]],
+    weights: Dict[int, float],
+    one_to_one: bool = False,
+    max_distance: Optional[float] = None,
 ):
+    # peaks are matched on isotope weighted positions indexed by a k-d tree rather than comparing every pair of peaks
+    dims = list(weights)
 
-    weighted_values_1 = _get_weighted_terms(shifts, weights)
-
-    result = {}
-
-    for peak_id, match_shifts in match_shifts.items():
-        weighted_values_2 = _get_weighted_terms(match_shifts, weights)
-
-        terms = []
-
-        for dim in weighted_values_1:
-            terms.append((weighted_values_1[dim] - weighted_values_2[dim]) ** 2)
-        distance = sqrt(sum(terms))
+    peak_ids_1 = list(shifts_1)
+    peak_ids_2 = list(shifts_2)
+    points_1 = [
+        _get_weighted_point(shifts_1[peak_id], weights, dims) for peak_id in peak_ids_1
+    ]
+    points_2 = [
+        _get_weighted_point(shifts_2[peak_id], weights, dims) for peak_id in peak_ids_2
+    ]
 
-        result.setdefault(distance, []).append(peak_id)
+    results = {}
+    if one_to_one:
+        for index_1, index_2, distance in optimal_assignment(
+            points_1, points_2, max_distance
+        ):
+            results[peak_ids_1[index_1]] = [peak_ids_2[index_2]], distance
+    else:
+        peak_index_2 = KDTree(points_2, peak_ids_2)
+        for peak_1_id, (best_matches, distance) in zip(
+            peak_ids_1, peak_index_2.nearest_batch(points_1)
+        ):
+            if best_matches and (max_distance is None or distance <= max_distance):
+                results[peak_1_id] = best_matches, distance
 
-    min_distance = min(result.keys())
-    return result[min_distance], min_distance
+    return results
 
 
-def _get_weighted_terms(shifts, weights):
+def _get_weighted_point(shifts, weights, dims):
 
-    return {dim: shift / weights[dim] for dim, shift in shifts.items()}
+    return tuple(shifts[dim] / weights[dim] for dim in dims)
 
 
 def _nef_frames_to_peak_by_id(frame):
@@ -285,7 +311,14 @@ def _assign_frame(result, peak_frame_2):
         print(key, value)
 
 
-def pipe(entry: Entry, peak_frame_1: Saveframe, peak_frame_2: Saveframe, assign=False):
+def pipe(
+    entry: Entry,
+    peak_frame_1: Saveframe,
+    peak_frame_2: Saveframe,
+    assign=False,
+    one_to_one=False,
+    max_distance=None,
+):
 
     num_dimensions_1 = int(peak_frame_1.get_tag("num_dimensions")[0])
 
@@ -311,14 +344,9 @@ def pipe(entry: Entry, peak_frame_1: Saveframe, peak_frame_2: Saveframe, assign=
 
     _exit_if_dim_weights_not_defined(dim_weights, peak_frame_1, peak_frame_2)
 
-    results = {}
-    for peak_1_id, target_shifts in shifts_1.items():
-
-        best_matches, distance = _find_best_match(target_shifts, shifts_2, dim_weights)
-
-        best_matches = [best_match for best_match in best_matches]
-
-        results[peak_1_id] = best_matches, distance
+    results = _find_best_matches(
+        shifts_1, shifts_2, dim_weights, one_to_one, max_distance
+    )
 
     if assign:
 
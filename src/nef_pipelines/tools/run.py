@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+from typing import List
+
+import typer
+
+from nef_pipelines import nef_app
+from nef_pipelines.lib.pipeline_lib import parse_pipeline, run_pipeline
+from nef_pipelines.lib.util import STDIN, exit_error, read_from_file_or_exit
+
+PIPELINE_HELP = """the commands to run separated by | [quote the pipeline so the shell doesn't see the |],
+                   each command may optionally start with nef e.g. "frames rename a b | save -" """
+
+if nef_app:
+    # noinspection PyUnusedLocal
+    @nef_app.app.command(rich_help_panel="NEF manipulation")
+    def run(
+        input: Path = typer.Option(
+            STDIN,
+            "-i",
+            "--in",
+            metavar="NEF-FILE-STREAM",
+            help="read NEF data stream from a file instead of stdin",
+        ),
+        pipeline: List[str] = typer.Argument(..., help=PIPELINE_HELP),
+    ):
+        """- run a pipeline of commands in a single process, each command reads the output of the one before"""
+
+        steps = parse_pipeline(pipeline)
+
+        empty_steps = [i for i, step in enumerate(steps, start=1) if not step]
+        if empty_steps:
+            empty_steps = ", ".join(str(step) for step in empty_steps)
+            exit_error(
+                f"the pipeline {' '.join(pipeline)} has empty steps: {empty_steps}"
+            )
+
+        nef_input = ""
+        if input != STDIN or not sys.stdin.isatty():
+            nef_input = read_from_file_or_exit(input)
+
+        result = run_pipeline(steps, nef_input)
+
+        for stderr in result.stderr:
+            if stderr:
+                print(stderr, end="", file=sys.stderr)
+
+        if result.exit_code != 0:
+            failed_step = " ".join(steps[result.steps_completed])
+            exit_error(
+                f"step {result.steps_completed + 1} [{failed_step}] of the pipeline failed with exit code"
+                f" {result.exit_code}"
+            )
+
+        print(result.stdout, end="")
@@ -6,14 +6,19 @@ from typing import List
 
 import typer
 from pynmrstar import Entry
+from pynmrstar.exceptions import ParsingError
 
 from nef_pipelines import nef_app
+from nef_pipelines.lib.entry_index_lib import write_entry_index
+from nef_pipelines.lib.nef_lib import print_entry
+from nef_pipelines.lib.star_writer_lib import write_entry
 from nef_pipelines.lib.util import (
     STDIN,
     STDOUT,
     exit_error,
     parse_comma_separated_options,
     read_from_file_or_exit,
+    warn,
 )
 
 FILE_PATHS_HELP = """write the entries to files named, these maybe comma separated
@@ -48,6 +53,12 @@ if nef_app:
             False, "--no-globals-cleanup", help="do not remove the globals frame"
         ),
         no_header: bool = typer.Option(False, help="do not write a header"),
+        index: bool = typer.Option(
+            False,
+            "--index",
+            help="""also write a .nefidx index next to each file saved, this records where each frame is and what
+                    loops and tags it has so later commands can list the contents of large files quickly""",
+        ),
         file_paths: List[str] = typer.Argument(None, help=FILE_PATHS_HELP),
     ):
         """- save the entries in the stream to a file / files or stdout with delimiters"""
@@ -80,11 +91,13 @@ if nef_app:
                 for save_frame in entry.get_saveframes_by_category("nefpls_globals"):
                     entry.remove_saveframe(save_frame)
 
-        entries = pipe(entries, file_paths, template, no_header, single_file, force)
+        entries = pipe(
+            entries, file_paths, template, no_header, single_file, force, index
+        )
 
         if entries:
             for entry in entries:
-                print(entry)
+                print_entry(entry)
 
 
 def pipe(
@@ -94,6 +107,7 @@ def pipe(
     no_header: bool,
     single_file: bool,
     force: bool,
+    index: bool = False,
 ):
 
     _exit_if_no_file_paths(file_paths)
@@ -172,7 +186,8 @@ def pipe(
         else:
             header_text = None
 
-        print(entry, file=file_h)
+        write_entry(entry, file_h)
+        file_h.write("\n")
 
         if not file_h == sys.stdout:
             file_h.close()
@@ -189,9 +204,25 @@ def pipe(
         if not write_stdout:
             file_h.close()
 
+    if index and not write_stdout:
+        _write_entry_indices_or_warn(file_paths)
+
     return None if write_stdout else entries
 
 
+def _write_entry_indices_or_warn(file_paths):
+    for file_path in dict.fromkeys(file_paths):
+        try:
+            if write_entry_index(file_path) is None:
+                msg = f"""
+                    couldn't write an index for the file {file_path}
+                    it doesn't contain a single entry made up of saveframes
+                """
+                warn(msg)
+        except (OSError, ParsingError) as e:
+            warn(f"couldn't write an index for the file {file_path} because {e}")
+
+
 def _exit_if_file_exists_and_no_append_or_force(file_path, append_mode, force):
 
     if file_path != STDOUT and file_path.exists() and not (force or append_mode):
@@ -20,6 +20,7 @@ from nef_pipelines.lib.nef_lib import (
     SelectionType,
     add_frames_to_entry,
     create_nef_save_frame,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
     select_frames,
 )
@@ -243,7 +244,7 @@ def build(
 
     entry = pipe(entry, frames_and_timings, unit, name, experiment_type)
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
@@ -9,7 +9,9 @@ from strenum import StrEnum
 from nef_pipelines.lib.nef_frames_lib import NEF_PIPELINES_NAMESPACE
 from nef_pipelines.lib.nef_lib import (
     UNUSED,
+    LoopBuilder,
     SelectionType,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
     select_frames,
     select_frames_by_name,
@@ -103,7 +105,7 @@ def table(
         outputs,
     )
 
-    print(entry)
+    print_entry(entry)
 
 
 # TODO: add checks if there are peaks with duplicate atom names and exit as error
@@ -201,6 +203,7 @@ def _build_series_data_loop(
 
     series_data_loop.add_tag(tags)
 
+    loop_builder = LoopBuilder(series_data_loop)
     for group_index, (atoms, values) in enumerate(atoms_and_values.items(), start=1):
 
         if not outputs:
@@ -210,6 +213,20 @@ def _build_series_data_loop(
         else:
             list_ids = [f"nefpls_relaxation_list_{output}" for output in outputs]
 
+        # the atom columns are the same for every row of the group, groups with fewer atoms are padded with None
+        atom_values = []
+        if add_atom_names:
+            for atom in atoms:
+                atom_values.extend(
+                    [
+                        atom.residue.chain_code,
+                        atom.residue.sequence_code,
+                        atom.residue.residue_name,
+                        atom.atom_name,
+                    ]
+                )
+            atom_values.extend([None] * (4 * len(additional_tags) - len(atom_values)))
+
         for list_id in list_ids:
             zipper = zip_longest(
                 values.spectra,
@@ -218,35 +235,22 @@ def _build_series_data_loop(
                 values.values,
                 fillvalue=UNUSED,
             )
-            for spectrum, peak_id, series_value, value in zipper:
-                data = {
-                    "nmr_spectrum_id": spectrum,
-                    "peak_id": peak_id,
-                    "variable_value": series_value,
-                    "variable_error": UNUSED,
-                    "value": value,
-                    "value_error": UNUSED,
-                    "relaxation_list_id": list_id,
-                    "data_id": group_index,
-                }
-
-                if add_atom_names:
-                    for i, atom in enumerate(atoms, start=1):
-                        data.update(
-                            {
-                                f"nefpls_chain_code_{i}": atom.residue.chain_code,
-                                f"nefpls_sequence_code_{i}": atom.residue.sequence_code,
-                                f"nefpls_residue_name_{i}": atom.residue.residue_name,
-                                f"nefpls_atom_name_{i}": atom.atom_name,
-                            }
-                        )
-                series_data_loop.add_data(
-                    [
-                        data,
-                    ]
-                )
+            loop_builder.add_value_rows(
+                [
+                    spectrum,
+                    peak_id,
+                    series_value,
+                    UNUSED,
+                    value,
+                    UNUSED,
+                    list_id,
+                    group_index,
+                    *atom_values,
+                ]
+                for spectrum, peak_id, series_value, value in zipper
+            )
 
-    return series_data_loop
+    return loop_builder.build()
 
 
 def _select_series_frames(
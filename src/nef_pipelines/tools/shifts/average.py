@@ -11,9 +11,11 @@ from tabulate import tabulate
 
 from nef_pipelines.lib.nef_lib import (
     UNUSED,
+    LoopBuilder,
     SelectionType,
     create_nef_save_frame,
     get_frame_ids,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
     select_frames,
 )
@@ -72,7 +74,7 @@ def average(
 
     entry = pipe(entry, frames, frame_name, force, update_policies=update_policies)
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
@@ -103,6 +105,7 @@ def pipe(
     )
     results_frame.add_loop(loop)
 
+    loop_builder = LoopBuilder(loop)
     for atom, stats in sorted(shifts.items()):
         stddev = stats.stddev() if len(stats) > 1 else UNUSED
 
@@ -110,17 +113,16 @@ def pipe(
         if not atom.residue.chain_code or not atom.residue.sequence_code:
             continue
 
-        data = [
-            {
-                "chain_code": atom.residue.chain_code,
-                "sequence_code": atom.residue.sequence_code,
-                "residue_name": atom.residue.residue_name,
-                "atom_name": atom.atom_name,
-                "value": stats.mean(),
-                "value_uncertainty": stddev,
-            }
-        ]
-        loop.add_data(data)
+        data = {
+            "chain_code": atom.residue.chain_code,
+            "sequence_code": atom.residue.sequence_code,
+            "residue_name": atom.residue.residue_name,
+            "atom_name": atom.atom_name,
+            "value": stats.mean(),
+            "value_uncertainty": stddev,
+        }
+        loop_builder.add_row(data)
+    loop_builder.build()
 
     if frame_name in get_frame_ids(entry) and not force:
         exit_error(
@@ -9,6 +9,7 @@ from pynmrstar import Entry, Saveframe
 
 from nef_pipelines.lib.nef_lib import (
     SelectionType,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
     select_frames,
 )
@@ -295,7 +296,7 @@ def correlation(
     else:
         _info("\nNo valid correlations calculated")
 
-    print(entry)
+    print_entry(entry)
 
 
 def _find_chemical_shift_frame(entry: Entry, frame_name: str) -> Optional[Saveframe]:
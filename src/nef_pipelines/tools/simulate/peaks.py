@@ -15,6 +15,7 @@ from nef_pipelines.lib.nef_frames_lib import (
 )
 from nef_pipelines.lib.nef_lib import (
     UNUSED,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
     select_frames_by_name,
 )
@@ -117,7 +118,7 @@ def peaks(
         entry, shift_frames, exact, spectra, name_template, spectrometer_frequency
     )
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
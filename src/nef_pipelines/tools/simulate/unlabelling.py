@@ -20,6 +20,7 @@ from nef_pipelines.lib.nef_lib import (
     UNUSED,
     SelectionType,
     create_nef_save_frame,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
     select_frames,
     select_frames_by_name,
@@ -690,7 +691,7 @@ def unlabelling(
         output_residue_typing=residue_types,
     )
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
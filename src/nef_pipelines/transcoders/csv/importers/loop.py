@@ -1,22 +1,29 @@
 from dataclasses import dataclass
 from enum import auto
 from pathlib import Path
-from typing import Any, List, Tuple
+from typing import Any, List, Optional, Tuple
 
 import typer
+from clevercsv.dialect import SimpleDialect
 from pynmrstar import Entry, Loop, Saveframe
 from strenum import KebabCaseStrEnum, LowercaseStrEnum
 
-from nef_pipelines.lib.nef_lib import read_or_create_entry_exit_error_on_bad_file
+from nef_pipelines.lib.nef_lib import (
+    print_entry,
+    read_or_create_entry_exit_error_on_bad_file,
+)
 from nef_pipelines.lib.structures import PipeOutput
 from nef_pipelines.lib.tabular_data_lib import (
+    DIALECT_HELP,
     ENCODING,
     HELP_FOR_FORMATS,
     CsvLikeFormats,
     CsvParseError,
     _apply_skip_and_comment,
     _parse_csv_rows_from_text,
-    parse_csv_text,
+    fit_rows_to_tags,
+    parse_dialect_or_exit,
+    read_csv_in_chunks,
 )
 from nef_pipelines.lib.util import STDIN, chunks, exit_error, warn
 from nef_pipelines.transcoders.csv import import_app
@@ -73,6 +80,7 @@ def loop(
     csv_format: CsvLikeFormats = typer.Option(
         CsvLikeFormats.AUTO, "-f", "--format", help=HELP_FOR_FORMATS
     ),
+    dialect: str = typer.Option(None, "--dialect", help=DIALECT_HELP),
     skip: int = typer.Option(
         0, "--skip", help="extra header rows to skip after the column header row"
     ),
@@ -88,6 +96,8 @@ def loop(
 
     csv_format = CsvLikeFormats(csv_format.upper())
 
+    dialect = parse_dialect_or_exit(dialect)
+
     entry = read_or_create_entry_exit_error_on_bad_file(input)
 
     # COMMENT policy requires --comment to be specified
@@ -99,7 +109,7 @@ def loop(
         exit_error(msg)
 
     framecode_loop_category_paths = _load_frames_loops_and_paths_or_exit_error(
-        file_args, csv_format, frame_policy, comment, skip
+        file_args, csv_format, frame_policy, comment, skip, dialect
     )
 
     # HEADER policy: skip is already applied when parsing framecode/loop_category,
@@ -119,7 +129,13 @@ def loop(
 
     try:
         result = pipe(
-            entry, frame_loop_paths, csv_format, data_skip, comment, header_skip
+            entry,
+            frame_loop_paths,
+            csv_format,
+            data_skip,
+            comment,
+            header_skip,
+            dialect,
         )
     except CsvParseError as e:
         exit_error(str(e))
@@ -127,7 +143,7 @@ def loop(
     for warning in result.warnings:
         warn(warning)
 
-    print(result.entry)
+    print_entry(result.entry)
 
 
 def pipe(
@@ -137,6 +153,7 @@ def pipe(
     skip: int = 0,
     comment: str = "",
     header_skip: int = 0,
+    dialect: Optional[SimpleDialect] = None,
 ) -> PipeOutput:
     """Add loops read from CSV files to existing saveframes in entry.
 
@@ -147,6 +164,7 @@ def pipe(
         skip: Number of extra header rows to skip after column headers
         comment: Prefix for comment lines to ignore
         header_skip: Number of rows to skip before reading column headers
+        dialect: Explicit dialect to read with, if given csv_format is ignored
 
     Returns:
         PipeOutput with modified entry and warnings about normalized headers
@@ -155,14 +173,14 @@ def pipe(
     all_warnings = []
 
     for frame_loop_path in frame_loop_paths:
-        # Read file once, parse as text
-        try:
-            text = frame_loop_path.path.read_text(encoding=ENCODING)
-        except (OSError, PermissionError, UnicodeDecodeError) as e:
-            exit_error(f"failed to read {frame_loop_path.path}: {e}")
-
-        tags, data_rows, warnings = parse_csv_text(
-            text, csv_format, skip, comment, header_skip, frame_loop_path.path
+        # the file is streamed so only a chunk of rows is held in memory at a time
+        tags, data_row_chunks, warnings = read_csv_in_chunks(
+            frame_loop_path.path,
+            csv_format,
+            skip,
+            comment,
+            header_skip,
+            dialect,
         )
         all_warnings.extend(warnings)
 
@@ -170,8 +188,8 @@ def pipe(
         nef_loop.set_category(frame_loop_path.loop_category)
         nef_loop.add_tag(tags)
 
-        row_dicts = [dict(zip(tags, row)) for row in data_rows]
-        nef_loop.add_data(row_dicts)
+        for data_rows in data_row_chunks:
+            nef_loop.data.extend(fit_rows_to_tags(data_rows, tags))
 
         frame_loop_path.frame.add_loop(nef_loop)
 
@@ -201,6 +219,7 @@ def _load_frames_loops_and_paths_or_exit_error(
     frame_policy: FrameNamePolicy,
     comment: str,
     skip: int,
+    dialect: Optional[SimpleDialect] = None,
 ) -> list[tuple[Any, Any, Path]]:
     if frame_policy == FrameNamePolicy.COMMAND_LINE:
         if len(file_args) % 3 != 0:
@@ -217,7 +236,7 @@ def _load_frames_loops_and_paths_or_exit_error(
         framecode_loop_category_paths = _parse_file_name_policy(file_args)
     elif frame_policy == FrameNamePolicy.HEADER:
         framecode_loop_category_paths = _parse_frame_and_loop_from_file_header(
-            file_args, csv_format, skip, comment
+            file_args, csv_format, skip, comment, dialect
         )
     elif frame_policy == FrameNamePolicy.COMMENT:
         framecode_loop_category_paths = _parse_frame_and_loop_from_comment(
@@ -246,7 +265,11 @@ def _parse_file_name_policy(file_args: List[str]) -> List[Tuple[str, str, Path]]
 
 
 def _parse_frame_and_loop_from_file_header(
-    file_args: List[str], csv_format: CsvLikeFormats, skip: int, comment: str = ""
+    file_args: List[str],
+    csv_format: CsvLikeFormats,
+    skip: int,
+    comment: str = "",
+    dialect: Optional[SimpleDialect] = None,
 ) -> List[Tuple[str, str, Path]]:
     """Parse HEADER policy: first line after comments and skip rows contains framecode,loop_category."""
     result = []
@@ -256,7 +279,7 @@ def _parse_frame_and_loop_from_file_header(
         filtered_text = _apply_skip_and_comment(raw_text, skip=skip, comment=comment)
 
         # Parse CSV rows from text (no file pointer needed)
-        rows = _parse_csv_rows_from_text(filtered_text, csv_format)
+        rows = _parse_csv_rows_from_text(filtered_text, csv_format, dialect)
         first_row = rows[0] if rows else None
 
         if first_row is None:
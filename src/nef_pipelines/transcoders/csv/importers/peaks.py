@@ -1,9 +1,10 @@
 import string
 from pathlib import Path
 from textwrap import dedent
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import typer
+from clevercsv.dialect import SimpleDialect
 from ordered_set import OrderedSet
 from pynmrstar import Entry
 
@@ -11,6 +12,7 @@ from nef_pipelines.lib.isotope_lib import ATOM_TO_ISOTOPE
 from nef_pipelines.lib.nef_lib import (
     UNUSED,
     add_frames_to_entry,
+    print_entry,
     read_or_create_entry_exit_error_on_bad_file,
 )
 from nef_pipelines.lib.peak_lib import peaks_to_frame
@@ -29,11 +31,12 @@ from nef_pipelines.lib.structures import (
     ShiftData,
 )
 from nef_pipelines.lib.tabular_data_lib import (
-    ENCODING,
+    DIALECT_HELP,
     HELP_FOR_FORMATS,
     CsvLikeFormats,
     CsvParseError,
-    _parse_csv_rows_from_text,
+    iter_csv_file_rows,
+    parse_dialect_or_exit,
 )
 from nef_pipelines.lib.util import (
     STDIN,
@@ -113,6 +116,7 @@ def peaks(
     csv_format: CsvLikeFormats = typer.Option(
         CsvLikeFormats.AUTO, "-f", "--format", help=HELP_FOR_FORMATS
     ),
+    dialect: str = typer.Option(None, "--dialect", help=DIALECT_HELP),
     csv_file_encoding: str = typer.Option(
         "utf-8-sig", "-e", "--encoding", help="encoding for the csv file"
     ),
@@ -136,6 +140,8 @@ def peaks(
 
     csv_format = csv_format.upper()
 
+    dialect = parse_dialect_or_exit(dialect)
+
     entry = read_or_create_entry_exit_error_on_bad_file(entry_input)
 
     try:
@@ -148,6 +154,7 @@ def peaks(
             csv_format,
             dimension_nuclei,
             spectrometer_frequency,
+            dialect=dialect,
         )
 
     except (CsvParseError, IncompatibleDimensionTypesException) as e:
@@ -156,7 +163,7 @@ def peaks(
     for warning in result.warnings:
         warn(warning)
 
-    print(result.entry)
+    print_entry(result.entry)
 
 
 def pipe(
@@ -168,6 +175,7 @@ def pipe(
     csv_format: CsvLikeFormats,
     input_dimensions: List[str],
     spectrometer_frequency,
+    dialect: Optional[SimpleDialect] = None,
 ) -> PipeOutput:
     """Import peak lists from CSV into NEF entry.
 
@@ -185,7 +193,7 @@ def pipe(
     encoding = {"encoding": csv_file_encoding}
 
     file_shifts, warnings = _parse_csv(
-        csv_file, encoding, chain_code, atoms, csv_file, csv_format, lookup
+        csv_file, encoding, chain_code, atoms, csv_file, csv_format, lookup, dialect
     )
 
     dimensions = _guess_dimensions_if_not_defined_or_throw(
@@ -375,6 +383,7 @@ def _parse_csv(
     file_name: str,
     csv_format: str,
     lookup: Dict,
+    dialect: Optional[SimpleDialect] = None,
 ):
     """Parse CSV file and return peaks with warnings for unknown residues.
 
@@ -385,9 +394,8 @@ def _parse_csv(
     unknown_residues = set()
     column_offsets = {}
 
-    # Read file and parse as text
-    text = csv_file.read_text(encoding=ENCODING)
-    rows = _parse_csv_rows_from_text(text, csv_format)
+    # Stream the rows from the file
+    rows = iter_csv_file_rows(csv_file, csv_format, dialect)
 
     for i, row in enumerate(rows):
         row = [elem.strip() for elem in row]
@@ -1,13 +1,15 @@
 from pathlib import Path
 from textwrap import dedent
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import typer
+from clevercsv.dialect import SimpleDialect
 from pynmrstar import Entry, Loop, Saveframe
 
 from nef_pipelines.lib.nef_lib import (
     UNUSED,
     add_frames_to_entry,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
 )
 from nef_pipelines.lib.sequence_lib import (
@@ -24,11 +26,12 @@ from nef_pipelines.lib.structures import (
 )
 from nef_pipelines.lib.tabular_data_lib import (
     COLUMN_SEPARATORS_MAY_HAVE_CHANGED,
-    ENCODING,
+    DIALECT_HELP,
     HELP_FOR_FORMATS,
     CsvLikeFormats,
     CsvParseError,
-    _parse_csv_rows_from_text,
+    iter_csv_file_rows,
+    parse_dialect_or_exit,
 )
 from nef_pipelines.lib.util import (
     STDIN,
@@ -99,6 +102,7 @@ def rdcs(
     csv_format: CsvLikeFormats = typer.Option(
         CsvLikeFormats.AUTO, "-f", "--format", help=HELP_FOR_FORMATS
     ),
+    dialect: str = typer.Option(None, "--dialect", help=DIALECT_HELP),
     csv_file_encoding: str = typer.Option(
         "utf-8-sig", "-e", "--encoding", help="encoding for the csv file"
     ),
@@ -122,6 +126,8 @@ def rdcs(
 
     csv_format = csv_format.upper()
 
+    dialect = parse_dialect_or_exit(dialect)
+
     entry = read_entry_from_file_or_stdin_or_exit_error(entry_input)
 
     try:
@@ -132,6 +138,7 @@ def rdcs(
             csv_file,
             csv_file_encoding,
             csv_format,
+            dialect=dialect,
         )
 
     except CsvParseError as e:
@@ -140,7 +147,7 @@ def rdcs(
     for warning in result.warnings:
         warn(warning)
 
-    print(result.entry)
+    print_entry(result.entry)
 
 
 def pipe(
@@ -150,6 +157,7 @@ def pipe(
     csv_file: Path,
     csv_file_encoding: str,
     csv_format: CsvLikeFormats,
+    dialect: Optional[SimpleDialect] = None,
 ) -> PipeOutput:
     """Import RDC restraints from CSV file into NEF entry.
 
@@ -160,6 +168,7 @@ def pipe(
         csv_file: Path to CSV file
         csv_file_encoding: Character encoding of the CSV file
         csv_format: CSV format (CSV, TSV, SSV, or AUTO)
+        dialect: Explicit dialect to read with, if given csv_format is ignored
 
     Returns:
         PipeOutput with modified entry and any warnings about unknown residues
@@ -170,7 +179,7 @@ def pipe(
 
     encoding = {"encoding": csv_file_encoding}
     file_rdcs, warnings = _parse_csv(
-        csv_file, encoding, chain_code, atoms, lookup, csv_file, csv_format
+        csv_file, encoding, chain_code, atoms, lookup, csv_file, csv_format, dialect
     )
 
     frame = _rdcs_to_frame(file_rdcs)
@@ -379,7 +388,14 @@ def _build_rdc_from_row(
 
 
 def _parse_csv(
-    csv_file, encoding, default_chain_code, atoms, lookup, file_name, csv_format
+    csv_file,
+    encoding,
+    default_chain_code,
+    atoms,
+    lookup,
+    file_name,
+    csv_format,
+    dialect=None,
 ):
     """Parse CSV file and extract RDC restraints.
 
@@ -391,9 +407,8 @@ def _parse_csv(
     weight = 1.0
     column_offsets = None
 
-    # Read file and parse as text
-    text = csv_file.read_text(encoding=ENCODING)
-    rows = _parse_csv_rows_from_text(text, csv_format)
+    # Stream the rows from the file
+    rows = iter_csv_file_rows(csv_file, csv_format, dialect)
 
     for i, row in enumerate(rows):
         if i == 0:
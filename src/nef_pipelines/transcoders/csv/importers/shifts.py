@@ -1,16 +1,23 @@
 from itertools import cycle
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import typer
+from clevercsv.dialect import SimpleDialect
 from pynmrstar import Entry, Loop
 
 from nef_pipelines.lib.nef_lib import (
     is_save_frame_name_in_entry,
     read_or_create_entry_exit_error_on_bad_file,
 )
-from nef_pipelines.lib.tabular_data_lib import HELP_FOR_FORMATS, CsvLikeFormats
-from nef_pipelines.lib.tabular_data_lib import read_csv as _read_csv
+from nef_pipelines.lib.tabular_data_lib import (
+    DIALECT_HELP,
+    HELP_FOR_FORMATS,
+    CsvLikeFormats,
+    fit_rows_to_tags,
+    parse_dialect_or_exit,
+    read_csv_in_chunks,
+)
 from nef_pipelines.lib.util import STDIN, chunks, exit_error, warn
 from nef_pipelines.tools.frames.create import pipe as frames_create_pipe
 from nef_pipelines.transcoders.csv import import_app
@@ -40,6 +47,7 @@ def shifts(
     csv_format: CsvLikeFormats = typer.Option(
         CsvLikeFormats.AUTO, "-f", "--format", help=HELP_FOR_FORMATS
     ),
+    dialect: str = typer.Option(None, "--dialect", help=DIALECT_HELP),
     skip: int = typer.Option(
         0, "--skip", help="extra header rows to skip after the column header row"
     ),
@@ -58,6 +66,8 @@ def shifts(
 
     csv_format = CsvLikeFormats(csv_format.upper())
 
+    dialect = parse_dialect_or_exit(dialect)
+
     _check_names_and_file_are_pairs_or_exit_errors(name_file)
 
     entry = read_or_create_entry_exit_error_on_bad_file(input)
@@ -67,7 +77,9 @@ def shifts(
     # Check which frames exist before import (to warn after)
     existing_frames = _check_existing_frames(entry, name_file_pairs)
 
-    result = pipe(entry, name_file_pairs, chain_codes, csv_format, skip, comment)
+    result = pipe(
+        entry, name_file_pairs, chain_codes, csv_format, skip, comment, dialect
+    )
 
     _warn_about_replaced_frames(existing_frames, quiet)
 
@@ -81,6 +93,7 @@ def pipe(
     csv_format: CsvLikeFormats,
     skip: int = 0,
     comment: str = "",
+    dialect: Optional[SimpleDialect] = None,
 ) -> Entry:
     """Import chemical shifts from CSV files into new shift list frames in entry."""
 
@@ -91,13 +104,15 @@ def pipe(
 
     for name, csv_file in name_file_pairs:
         default_chain_code = next(chain_code_iter)
-        tags, data_rows, _ = _read_csv(csv_file, csv_format, skip, comment)
+        tags, data_row_chunks, _ = read_csv_in_chunks(
+            csv_file, csv_format, skip, comment, dialect=dialect
+        )
 
         _validate_shift_tags_or_exit(tags, csv_file)
 
-        if "chain_code" not in tags:
+        add_chain_code = "chain_code" not in tags
+        if add_chain_code:
             tags = ["chain_code"] + tags
-            data_rows = [[default_chain_code] + row for row in data_rows]
 
         framecode = f"{FRAME_CATEGORY}_{name}"
         frame = entry.get_saveframe_by_name(framecode)
@@ -105,8 +120,13 @@ def pipe(
         nef_loop = Loop.from_scratch()
         nef_loop.set_category(LOOP_CATEGORY)
         nef_loop.add_tag(tags)
-        for row in data_rows:
-            nef_loop.add_data([dict(zip(tags, row))])
+
+        # rows are added a chunk at a time so the whole file is never held in memory
+        for data_rows in data_row_chunks:
+            if add_chain_code:
+                data_rows = [[default_chain_code] + row for row in data_rows]
+            nef_loop.data.extend(fit_rows_to_tags(data_rows, tags))
+
         frame.add_loop(nef_loop)
 
     return entry
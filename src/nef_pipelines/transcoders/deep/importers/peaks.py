@@ -12,6 +12,7 @@ from pynmrstar import Entry
 from nef_pipelines.lib.isotope_lib import CODE_TO_ISOTOPE, GAMMA_RATIOS
 from nef_pipelines.lib.nef_lib import (
     add_frames_to_entry,
+    print_entry,
     read_or_create_entry_exit_error_on_bad_file,
 )
 from nef_pipelines.lib.util import (
@@ -89,7 +90,7 @@ def peaks(
 
     entry = pipe(entry, file_names, chain_codes, spectrometer_frequencies)
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
@@ -10,6 +10,7 @@ from nef_pipelines.lib.nef_frames_lib import CCPN_MERIT, SPECTRUM_FRAME_CATEGORY
 from nef_pipelines.lib.nef_lib import (
     UNUSED,
     extract_column,
+    print_entry,
     read_or_create_entry_exit_error_on_bad_file,
     set_column,
     set_column_to_value,
@@ -358,7 +359,7 @@ def peaks(
             merit_function=merit_function,
         )
 
-    print(entry)
+    print_entry(entry)
 
 
 def is_iterable(target):
@@ -11,6 +11,7 @@ from pynmrstar import Entry
 
 from nef_pipelines.lib.nef_lib import (
     add_frames_to_entry,
+    print_entry,
     read_or_create_entry_exit_error_on_bad_file,
 )
 from nef_pipelines.lib.sequence_lib import (
@@ -141,7 +142,7 @@ def sequence(
         entry_name,
     )
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
@@ -7,6 +7,7 @@ from pynmrstar import Entry
 from tabulate import tabulate
 
 from nef_pipelines.lib.nef_lib import (
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
     select_frames_by_name,
 )
@@ -75,7 +76,7 @@ def fixed(
     entry = pipe(entry, shift_frame_selectors, target_chain, output_file, force)
 
     if entry:
-        print(entry)
+        print_entry(entry)
 
 
 def pipe(
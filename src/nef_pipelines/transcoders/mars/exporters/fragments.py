@@ -10,6 +10,7 @@ from tabulate import tabulate
 
 from nef_pipelines.lib.nef_lib import (
     loop_row_namespace_iter,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
 )
 from nef_pipelines.lib.structures import LineInfo
@@ -76,7 +77,7 @@ def fragments(
     entry = pipe(entry, Path(output_file), force)
 
     if entry:
-        print(entry)
+        print_entry(entry)
 
 
 def pipe(entry: Entry, output_file: Path, force: bool) -> Entry:
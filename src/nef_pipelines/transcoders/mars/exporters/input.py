@@ -5,7 +5,7 @@ from pathlib import Path
 import typer
 from pynmrstar import Entry
 
-from nef_pipelines.lib.nef_lib import read_entry_from_stdin_or_exit
+from nef_pipelines.lib.nef_lib import print_entry, read_entry_from_stdin_or_exit
 from nef_pipelines.lib.util import STDOUT, exit_if_file_has_bytes_and_no_force
 from nef_pipelines.transcoders.mars import export_app
 
@@ -78,7 +78,7 @@ def input_(
     entry = pipe(entry, deuterated, random_coil, output_file, force)
 
     if entry:
-        print(entry)
+        print_entry(entry)
 
 
 def pipe(
@@ -4,6 +4,7 @@ import typer
 
 from nef_pipelines.lib.nef_lib import (
     molecular_system_from_entry_or_exit,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
 )
 from nef_pipelines.lib.sequence_lib import chains_from_frames
@@ -55,7 +56,7 @@ def sequence(
     entry = fasta_pipe(entry, chain_code, Path(output_file), force)
 
     if entry:
-        print(entry)
+        print_entry(entry)
 
 
 def _get_single_chain_code_or_exit(chain_code_selector, molecular_system, input_file):
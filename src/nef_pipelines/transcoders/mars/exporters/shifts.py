@@ -11,6 +11,7 @@ from pynmrstar import Entry
 from tabulate import tabulate
 
 from nef_pipelines.lib.nef_lib import (
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
     select_frames_by_name,
 )
@@ -136,7 +137,7 @@ def shifts(
     entry = pipe(entry, shift_frame_selectors, target_chain, Path(output_file), force)
 
     if entry:
-        print(entry)
+        print_entry(entry)
 
 
 def _assigned_shifts_filter_non_numeric_sequence_codes(assigned_shifts):
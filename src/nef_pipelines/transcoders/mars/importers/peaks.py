@@ -10,6 +10,7 @@ from nef_pipelines.lib.isotope_lib import Isotope
 from nef_pipelines.lib.nef_lib import (
     UNUSED,
     add_frames_to_entry,
+    print_entry,
     read_or_create_entry_exit_error_on_bad_file,
 )
 from nef_pipelines.lib.peak_lib import peaks_to_frame
@@ -104,7 +105,7 @@ def peaks(
         sort_peaks=not dont_sort_peaks,
     )
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
@@ -2,7 +2,10 @@ from pathlib import Path
 
 import typer
 
-from nef_pipelines.lib.nef_lib import read_or_create_entry_exit_error_on_bad_file
+from nef_pipelines.lib.nef_lib import (
+    print_entry,
+    read_or_create_entry_exit_error_on_bad_file,
+)
 from nef_pipelines.lib.sequence_lib import MoleculeType
 from nef_pipelines.lib.util import STDIN
 from nef_pipelines.transcoders.fasta.importers.sequence import pipe
@@ -83,4 +86,4 @@ def sequence(
         file_name.root,
     )
 
-    print(entry)
+    print_entry(entry)
@@ -8,6 +8,7 @@ import typer
 from nef_pipelines.lib.nef_lib import (
     UNUSED,
     add_frames_to_entry,
+    print_entry,
     read_or_create_entry_exit_error_on_bad_file,
 )
 from nef_pipelines.lib.sequence_lib import (
@@ -161,7 +162,7 @@ def pipe(
 
     entry = add_frames_to_entry(entry, sparky_frames)
 
-    print(entry)
+    print_entry(entry)
 
 
 def _convert_residue_type_to_3_let_or_exit(residue_type, line_info):
@@ -12,6 +12,7 @@ from nef_pipelines.lib.nef_frames_lib import NEF_PIPELINES_NAMESPACE
 from nef_pipelines.lib.nef_lib import (
     SelectionType,
     loop_row_namespace_iter,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
     select_frames,
     select_frames_by_name,
@@ -75,7 +76,7 @@ def data(
     entry = pipe(entry, frame_selectors, exact, Path(output_file), force)
 
     if entry:
-        print(entry)
+        print_entry(entry)
 
 
 @dataclass
@@ -11,8 +11,14 @@ from pynmrstar import Entry
 
 from nef_pipelines.lib.nef_lib import (
     add_frames_to_entry,
+    print_entry,
     read_or_create_entry_exit_error_on_bad_file,
 )
+from nef_pipelines.lib.parallel_lib import (
+    JOBS_HELP,
+    exit_if_jobs_less_than_1,
+    run_per_file,
+)
 from nef_pipelines.lib.util import (
     NEWLINE,
     STDIN,
@@ -48,6 +54,7 @@ def peaks(
     entry_name: str = typer.Option(
         "nmrpipe", "-e", "--entry", help="entry name", metavar="<entry-name>"
     ),
+    jobs: int = typer.Option(1, "-j", "--jobs", help=JOBS_HELP),
     file_names: List[Path] = typer.Argument(
         ..., help="input peak files", metavar="<peak-file.xpk>"
     ),
@@ -64,18 +71,26 @@ def peaks(
 
     _exit_if_num_chains_and_files_dont_match(chain_codes, file_names)
 
+    exit_if_jobs_less_than_1(jobs)
+
     entry = read_or_create_entry_exit_error_on_bad_file(in_file, entry_name=entry_name)
 
-    entry = pipe(entry, file_names, chain_codes, filter_noise)
+    entry = pipe(entry, file_names, chain_codes, filter_noise, jobs=jobs)
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
-    entry: Entry, file_names: List[Path], chain_codes: List[str], filter_noise: bool
+    entry: Entry,
+    file_names: List[Path],
+    chain_codes: List[str],
+    filter_noise: bool,
+    jobs: int = 1,
 ) -> Entry:
 
-    peak_lists = _read_nmrpipe_peaks(file_names, chain_codes, filter_noise=filter_noise)
+    peak_lists = _read_nmrpipe_peaks(
+        file_names, chain_codes, filter_noise=filter_noise, jobs=jobs
+    )
 
     frame_name_template = "{file_name}"
 
@@ -148,17 +163,24 @@ def _create_entry_names_from_template_if_required(
     return _disambiguate_names(new_entry_names)
 
 
-def _read_nmrpipe_peaks(file_names, chain_codes, filter_noise):
-    results = []
-    for file_name, chain_code in zip(file_names, chain_codes):
-        with open(file_name) as file_h:
-            gdb_file = read_db_file_records(file_h, file_name=file_name)
+def _read_nmrpipe_peaks(file_names, chain_codes, filter_noise, jobs=1):
+    return run_per_file(
+        _read_nmrpipe_peak_file,
+        [
+            (file_name, chain_code, filter_noise)
+            for file_name, chain_code in zip(file_names, chain_codes)
+        ],
+        jobs,
+    )
+
 
-        _check_is_peak_file_or_exit(gdb_file)
+def _read_nmrpipe_peak_file(file_name, chain_code, filter_noise):
+    with open(file_name) as file_h:
+        gdb_file = read_db_file_records(file_h, file_name=file_name)
 
-        results.append(read_peak_file(gdb_file, chain_code, filter_noise=filter_noise))
+    _check_is_peak_file_or_exit(gdb_file)
 
-    return results
+    return read_peak_file(gdb_file, chain_code, filter_noise=filter_noise)
 
 
 def _check_is_peak_file_or_exit(gdb_file):
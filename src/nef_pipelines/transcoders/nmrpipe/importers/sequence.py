@@ -8,6 +8,7 @@ from pynmrstar import Entry
 
 from nef_pipelines.lib.nef_lib import (
     add_frames_to_entry,
+    print_entry,
     read_file_or_exit,
     read_or_create_entry_exit_error_on_bad_file,
 )
@@ -73,7 +74,7 @@ def sequence(
         entry, lines, chain_code, no_chain_start, no_chain_end, start, file_name
     )
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
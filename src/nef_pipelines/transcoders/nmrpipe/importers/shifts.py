@@ -6,6 +6,7 @@ import typer
 
 from nef_pipelines.lib.nef_lib import (
     add_frames_to_entry,
+    print_entry,
     read_file_or_exit,
     read_or_create_entry_exit_error_on_bad_file,
 )
@@ -52,7 +53,7 @@ def shifts(
 
     entry = pipe(entry, lines, chain_code, frame_name, file_name)
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(entry, lines, chain_code, frame_name, file_name):
@@ -6,6 +6,7 @@ from pynmrstar import Entry
 from requests.exceptions import HTTPError
 from tabulate import tabulate
 
+from nef_pipelines.lib.http_cache_lib import cached_get
 from nef_pipelines.lib.util import exit_error, info, is_int, warn
 from nef_pipelines.transcoders.nmrstar.importers.project_shortcuts import (
     SHORTCUT_URLS,
@@ -84,7 +85,7 @@ def _get_bmrb_entry_from_web_or_none(
             info(f"{i}. trying to from download {url}")
         try:
             try:
-                response = requests.get(url, timeout=timeout)
+                response = cached_get(url, timeout=timeout)
                 response.raise_for_status()
                 possible_entry = response.content
             except requests.exceptions.SSLError:
@@ -101,7 +102,7 @@ def _get_bmrb_entry_from_web_or_none(
                 except AttributeError:
                     # no pyopenssl support used / needed / available
                     pass
-                response = requests.get(url, verify=False, timeout=timeout)
+                response = cached_get(url, verify=False, timeout=timeout)
                 response.raise_for_status()
                 possible_entry = response.content
 
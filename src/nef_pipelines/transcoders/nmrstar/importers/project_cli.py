@@ -8,7 +8,13 @@ import typer
 from pynmrstar.exceptions import ParsingError
 from strenum import LowercaseStrEnum
 
+from nef_pipelines.lib.http_cache_lib import (
+    OFFLINE_HELP,
+    HttpCacheMode,
+    set_http_cache_mode,
+)
 from nef_pipelines.lib.nef_lib import (
+    print_entry,
     read_entry_from_file_or_raise,
     read_or_create_entry_exit_error_on_bad_file,
 )
@@ -144,6 +150,7 @@ def project(
     mirror: Mirror = typer.Option(None, help="select the mirror website to use"),
     verbose: bool = typer.Option(False, help="print verbose output"),
     timeout: int = typer.Option(10, help="timeout (seconds)  for http responses"),
+    offline: bool = typer.Option(False, "--offline", help=OFFLINE_HELP),
     file_paths: List[str] = typer.Argument(None, help=FILE_PATH_HELP),
 ):
     """- convert as much as possible from an NMR-STAR file to NEF [shifts & sequences] [alpha]"""
@@ -151,6 +158,8 @@ def project(
     if list_shortcuts:
         _get_project_module()._list_shortcuts_and_exit()
 
+    set_http_cache_mode(HttpCacheMode.OFFLINE if offline else None)
+
     file_paths = parse_comma_separated_options(file_paths)
     file_paths = [
         SHORTCUTS[file_path.upper()] if file_path.upper() in SHORTCUTS else file_path
@@ -177,7 +186,7 @@ def project(
         ]
     else:
         url_templates = [
-            MIRROR_URLS[Mirror.USA],
+            url_template,
         ]
 
     for file_path in file_paths:
@@ -237,7 +246,7 @@ def project(
             file_path,
         )
 
-        print(entry)
+        print_entry(entry)
 
 
 def _notify_failed_read_and_exit(file_path, e):
@@ -10,6 +10,7 @@ from pynmrstar import Entry
 from nef_pipelines.lib.nef_lib import (
     UNUSED,
     loop_row_namespace_iter,
+    print_entry,
     read_entry_from_file_or_exit_error,
     read_entry_from_file_or_stdin_or_exit_error,
 )
@@ -67,7 +68,7 @@ def rdcs(
         use_author,
     )
 
-    print(nef_entry)
+    print_entry(nef_entry)
 
 
 def pipe(
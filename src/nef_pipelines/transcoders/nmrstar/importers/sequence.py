@@ -9,6 +9,7 @@ from nef_pipelines.lib.nef_lib import (
     UNUSED,
     add_frames_to_entry,
     loop_row_namespace_iter,
+    print_entry,
     read_entry_from_file_or_exit_error,
     read_or_create_entry_exit_error_on_bad_file,
 )
@@ -110,7 +111,7 @@ def sequence(
         use_author,
     )
 
-    print(nef_entry)
+    print_entry(nef_entry)
 
 
 def pipe(
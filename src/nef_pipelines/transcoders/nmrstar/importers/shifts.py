@@ -1,6 +1,7 @@
 import sys
 from dataclasses import dataclass, replace
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from textwrap import dedent
 from typing import List, Union
@@ -14,6 +15,7 @@ from nef_pipelines.lib.nef_lib import (
     UNUSED,
     add_frames_to_entry,
     loop_row_namespace_iter,
+    print_entry,
     read_entry_from_file_or_exit_error,
     read_or_create_entry_exit_error_on_bad_file,
 )
@@ -117,7 +119,7 @@ def shifts(
         stereo_mode,
     )
 
-    print(nef_entry)
+    print_entry(nef_entry)
 
 
 def pipe(
@@ -234,42 +236,29 @@ def _get_chem_atom_set_atoms(chem_atom_set, chem_comp):
     return list(id_and_values_result.values())
 
 
-def _get_geminal_pairs(residue_names):
+@lru_cache(maxsize=None)
+def _load_data_table(file_name):
+    # the reference tables are read once, residues missing from them are added as they are derived from chem comps
+    path = Path(nef_pipelines_root()) / "nef_pipelines" / "data" / file_name
 
-    ambiguity_translations_path = (
-        Path(nef_pipelines_root())
-        / "nef_pipelines"
-        / "data"
-        / "ambiguity_translations.json"
-    )
+    with open(path, "r") as f:
+        return hjson.loads(f.read())
+
+
+def _get_geminal_pairs(residue_names):
 
-    with open(ambiguity_translations_path, "r") as f:
-        all_prochiral_pairs = hjson.loads(f.read())
+    all_prochiral_pairs = _load_data_table("ambiguity_translations.json")
 
-    # import nef_pipelines.lib.translation.io as converter_io
-    # converter_io.load_chem_comps()
-    # all_prochiral_pairs = {}
-    #
-    # # for residue_name in residue_names:
-    # residue_names = [chem_comp for chem_comp in converter_io.CHEM_COMPS]
     for residue_name in residue_names:
         if residue_name in all_prochiral_pairs:
             continue
 
-        # TODO:  this would be a lot neater if data was only loaded on first access
         import nef_pipelines.lib.translation.io as converter_io  # lazy
 
-        converter_io.load_chem_comps()
-
         # TODO: add the ability to add unknown chem comps
         _exit_if_unknown_chem_comp(residue_name)
 
         residue_linkings = {}
-        all_prochiral_pairs[residue_name] = residue_linkings
-
-        converter_io.load_chem_comps()
-
-        _exit_if_unknown_chem_comp(residue_name)
 
         chem_comp = converter_io.CHEM_COMPS[residue_name]
 
@@ -307,9 +296,7 @@ def _get_geminal_pairs(residue_names):
                     active_chem_atom_sets_by_linking[linking].append(atom_set_name)
 
         for linking, active_atom_set_keys in active_chem_atom_sets_by_linking.items():
-            new_and_old_names = all_prochiral_pairs[residue_name].setdefault(
-                linking, {}
-            )
+            new_and_old_names = residue_linkings.setdefault(linking, {})
             for atom_set_key in active_atom_set_keys:
                 chem_atom_set = atom_sets_by_key[atom_set_key]
                 if chem_atom_set.isEquivalent:
@@ -342,37 +329,24 @@ def _get_geminal_pairs(residue_names):
                         new_name = f"{name[:-1]}{replacements[i]}"
                     pair_values[name] = new_name
 
-        # print(residue_name, all_prochiral_pairs[residue_name])
-    # import json
-    # with open(ambiguity_translations_path, 'w') as fh:
-    #     fh.write(json.dumps(all_prochiral_pairs))
-    # print(f'wrote {ambiguity_translations_path}')
-    # sys.exit(0)
-    # print(all_prochiral_pairs.keys())
+        all_prochiral_pairs[residue_name] = residue_linkings
+
     return all_prochiral_pairs
 
 
 def _get_atom_sets_by_residue(residue_names):
 
-    equivalent_atoms_path = (
-        Path(nef_pipelines_root())
-        / "nef_pipelines"
-        / "data"
-        / "default_atom_sets_by_comp_and_linking.json"
+    equivalent_atoms_by_residue = _load_data_table(
+        "default_atom_sets_by_comp_and_linking.json"
     )
-    with open(equivalent_atoms_path, "r") as f:
-        equivalent_atoms_by_residue = hjson.loads(f.read())
 
     for residue_name in residue_names:
 
         if residue_name in equivalent_atoms_by_residue:
             continue
 
-        # TODO:  this would be a lot neater if data was only loaded on first access
         import nef_pipelines.lib.translation.io as converter_io  # lazy
 
-        converter_io.load_chem_comps()
-
         # TODO: add the ability to add unknown chem comps
         _exit_if_unknown_chem_comp(residue_name)
 
@@ -646,6 +620,8 @@ def _chemical_shifts_from_star_frame(nmrstar_entry, use_author, file_name):
 def _exit_if_unknown_chem_comp(residue_name):
     import nef_pipelines.lib.translation.io as converter_io  # lazy
 
+    converter_io.load_chem_comps()
+
     if not (residue_name) in converter_io.CHEM_COMPS:
         exit_error(
             f"the residue / molecule {residue_name} is not found in the chemical components dictionary"
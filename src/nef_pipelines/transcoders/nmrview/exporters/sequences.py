@@ -8,6 +8,7 @@ from nef_pipelines.lib.nef_lib import (
     is_save_frame_name_in_entry,
     molecular_system_from_entry,
     molecular_system_from_entry_or_exit,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
 )
 from nef_pipelines.lib.sequence_lib import (
@@ -118,7 +119,7 @@ def pipe(entry, output_to_stdout, file_name_template, chain_selectors):
 
     stdout_is_atty = stdout.isatty() if not in_pytest() else True
     if not output_to_stdout and not stdout_is_atty:
-        print(entry)
+        print_entry(entry)
 
 
 def _make_file_name_banners(chains_to_filenames):
@@ -27,8 +27,14 @@ from nef_pipelines.lib.constants import NEF_UNKNOWN
 from nef_pipelines.lib.isotope_lib import GAMMA_RATIOS
 from nef_pipelines.lib.nef_lib import (
     add_frames_to_entry,
+    print_entry,
     read_or_create_entry_exit_error_on_bad_file,
 )
+from nef_pipelines.lib.parallel_lib import (
+    JOBS_HELP,
+    exit_if_jobs_less_than_1,
+    run_per_file,
+)
 from nef_pipelines.lib.sequence_lib import (
     MoleculeType,
     get_chain_starts_and_ends,
@@ -199,6 +205,7 @@ def peaks(
     frame_name_source: FrameNameOption = typer.Option(
         FrameNameOption.SPECTRUM, help=FRAME_NAME_SOURCE_HELP
     ),
+    jobs: int = typer.Option(1, "-j", "--jobs", help=JOBS_HELP),
     file_names: List[Path] = typer.Argument(
         ..., help="input peak files", metavar="<peak-file.xpk>"
     ),
@@ -213,6 +220,8 @@ def peaks(
 
     chain_codes = parse_comma_separated_options(chain_codes)
 
+    exit_if_jobs_less_than_1(jobs)
+
     entry = read_or_create_entry_exit_error_on_bad_file(in_file, entry_name)
 
     sequence = sequence_from_entry(entry)
@@ -239,9 +248,10 @@ def peaks(
         residue_name_handling,
         residue_number_handling,
         frame_name_source,
+        jobs=jobs,
     )
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
@@ -254,24 +264,30 @@ def pipe(
     residue_name_handling: ResidueNameHandlingOption,
     residue_number_handling: ResidueNumberHandlingOption,
     frame_name_source: FrameNameOption,
+    jobs: int = 1,
 ) -> Entry:
 
     frames = []
 
-    frame_names_and_peak_lists = []
-    for file_name, chain_code in zip(file_names, chain_codes):
-        with open(file_name, "r") as lines:
-            peaks_list = _read_raw_peaks(
-                lines,
+    peak_lists = run_per_file(
+        _read_raw_peaks_file,
+        [
+            (
+                file_name,
                 chain_code,
                 sequence,
-                file_name,
                 molecule_type,
                 residue_name_type,
                 residue_name_handling,
                 residue_number_handling,
             )
+            for file_name, chain_code in zip(file_names, chain_codes)
+        ],
+        jobs,
+    )
 
+    frame_names_and_peak_lists = []
+    for file_name, peaks_list in zip(file_names, peak_lists):
         frame_name = _make_peak_list_frame_name(
             peaks_list, file_name, frame_name_source
         )
@@ -465,6 +481,28 @@ def _create_entry_names_from_template_if_required(
     return new_entry_names
 
 
+def _read_raw_peaks_file(
+    file_name,
+    chain_code,
+    sequence,
+    molecule_type,
+    residue_name_type,
+    residue_name_handling,
+    residue_number_handling,
+):
+    with open(file_name, "r") as lines:
+        return _read_raw_peaks(
+            lines,
+            chain_code,
+            sequence,
+            file_name,
+            molecule_type,
+            residue_name_type,
+            residue_name_handling,
+            residue_number_handling,
+        )
+
+
 def _read_raw_peaks(
     lines,
     chain_code,
@@ -10,6 +10,7 @@ from strenum import LowercaseStrEnum
 from nef_pipelines.lib.nef_frames_lib import NEF_PIPELINES_NAMESPACE
 from nef_pipelines.lib.nef_lib import (
     create_nef_save_frame,
+    print_entry,
     read_or_create_entry_exit_error_on_bad_file,
 )
 from nef_pipelines.lib.structures import (
@@ -111,7 +112,7 @@ def rdcs(
 
     entry = pipe(entry, pales_input_files, chain_codes, frame_name_template)
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(entry, pales_input_files, chain_codes, frame_name_template):
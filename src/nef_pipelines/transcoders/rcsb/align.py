@@ -5,7 +5,10 @@ from typing import Dict, List, Tuple
 import typer
 from pynmrstar import Entry
 
-from nef_pipelines.lib.nef_lib import read_entry_from_file_or_stdin_or_exit_error
+from nef_pipelines.lib.nef_lib import (
+    print_entry,
+    read_entry_from_file_or_stdin_or_exit_error,
+)
 from nef_pipelines.lib.sequence_lib import sequences_from_frames
 from nef_pipelines.lib.structures import SequenceResidue
 from nef_pipelines.lib.util import exit_error, info, warn
@@ -75,7 +78,7 @@ def align(
     if verbose:
         info(f"Aligned structure written to: {output_file}")
 
-    print(entry)
+    print_entry(entry)
 
 
 def _read_structure(pdb_file: Path) -> Structure:
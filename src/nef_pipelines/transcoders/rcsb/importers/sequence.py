@@ -1,9 +1,10 @@
 from argparse import Namespace
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
 
 import typer
 
+from nef_pipelines.lib.nef_lib import print_entry
 from nef_pipelines.lib.sequence_lib import sequence_to_nef_frame
 from nef_pipelines.lib.structures import SequenceResidue
 from nef_pipelines.lib.typer_utils import get_args
@@ -18,6 +19,7 @@ from nef_pipelines.transcoders.rcsb.rcsb_lib import (
     guess_cif_or_pdb,
     parse_cif,
     parse_pdb,
+    read_cif_chain_sequences,
 )
 
 app = typer.Typer()
@@ -86,7 +88,7 @@ def process_sequence(args: Namespace):
         args,
     )
 
-    print(entry)
+    print_entry(entry)
 
 
 def read_sequences(path: Path, target_chain_codes: List[str], use_segids: bool = False):
@@ -96,41 +98,25 @@ def read_sequences(path: Path, target_chain_codes: List[str], use_segids: bool =
     file_lines = list(lines)
     file_type = guess_cif_or_pdb(file_lines, str(path))
 
-    try:
-        if file_type is RCSBFileType.PDB:
-            model = parse_pdb(file_lines, source=str(path))[0]
-        elif file_type is RCSBFileType.CIF:
-            model = parse_cif(file_lines, source=str(path))[0]
-        else:
-            msg = f"""
-                Couldn't determine if the file {path} was a cif or pdb file...
-                are you sure the file has the right format?
-            """
-            exit_error(msg)
-    except Exception as e:
-        exit_error(f"failed to parse {path} because {e}")
+    # mmCIF files map their chains to sequences so no atoms have to be read [mmCIF files don't have segids]
+    chain_sequences = None
+    if file_type is RCSBFileType.CIF and not use_segids:
+        try:
+            chain_sequences = read_cif_chain_sequences(file_lines, source=str(path))
+        except Exception as e:
+            exit_error(f"failed to parse {path} because {e}")
+
+    if chain_sequences is None:
+        chain_sequences = _read_chain_sequences_from_first_model(
+            path, file_lines, file_type, use_segids
+        )
 
     sequences = []
 
-    if not use_segids:
-
-        for chain in model:
-            id = chain.chain_code
-            if not id or len(id) == 0:
-                use_segids = True
-
     all_chains = len(target_chain_codes) == 0
 
-    for chain in model:
-        sequence_start = (
-            chain.sequence.start_sequence_code
-            if chain.sequence.start_sequence_code
-            else 1
-        )
-        for sequence_code, residue_name in enumerate(
-            chain.sequence.residues, sequence_start
-        ):
-            chain_code = chain.segment_id if use_segids else chain.chain_code
+    for chain_code, sequence_start, residue_names in chain_sequences:
+        for sequence_code, residue_name in enumerate(residue_names, sequence_start):
             chain_code = chain_code.strip()
 
             if not all_chains and chain_code not in target_chain_codes:
@@ -153,3 +139,42 @@ def read_sequences(path: Path, target_chain_codes: List[str], use_segids: bool =
             sequences.append(residue)
 
     return sequences
+
+
+def _read_chain_sequences_from_first_model(
+    path: Path, file_lines: List[str], file_type: RCSBFileType, use_segids: bool
+) -> List[Tuple[str, int, List[str]]]:
+    # the chains of the first model matched to the file's sequences
+
+    try:
+        if file_type is RCSBFileType.PDB:
+            model = parse_pdb(file_lines, source=str(path))[0]
+        elif file_type is RCSBFileType.CIF:
+            model = parse_cif(file_lines, source=str(path), lazy=True)[0]
+        else:
+            msg = f"""
+                Couldn't determine if the file {path} was a cif or pdb file...
+                are you sure the file has the right format?
+            """
+            exit_error(msg)
+    except Exception as e:
+        exit_error(f"failed to parse {path} because {e}")
+
+    if not use_segids:
+
+        for chain in model:
+            id = chain.chain_code
+            if not id or len(id) == 0:
+                use_segids = True
+
+    chain_sequences = []
+    for chain in model:
+        sequence_start = (
+            chain.sequence.start_sequence_code
+            if chain.sequence.start_sequence_code
+            else 1
+        )
+        chain_code = chain.segment_id if use_segids else chain.chain_code
+        chain_sequences.append((chain_code, sequence_start, chain.sequence.residues))
+
+    return chain_sequences
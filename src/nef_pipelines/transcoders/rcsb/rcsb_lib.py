@@ -1,13 +1,15 @@
 import random
 import re
 import string
+from array import array
 from collections import Counter
 from dataclasses import dataclass, field
 from enum import Enum, IntEnum, auto
+from math import isnan, nan
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
-from pdbx import DataContainer
+from pdbx import DataCategory, DataContainer
 from pdbx.reader import PdbxReader
 from strenum import LowercaseStrEnum
 
@@ -33,6 +35,97 @@ class Structure: ...  # noqa: E701
 class Sequence: ...  # noqa: E701
 
 
+@dataclass
+class ModelArrays:
+    """
+    The atoms of a model held in columns. Atoms are stored in residue order and residues in chain order so the atoms
+    of a residue and the residues of a chain are contiguous and are found from the start index of each residue and
+    chain. Columns are arrays or lists [for strings, which are shared between atoms] so a model is compact and can be
+    pickled, coordinate_array gives a numpy view of the coordinates.
+    """
+
+    # per atom
+    atom_serials: array = field(default_factory=lambda: array("q"))
+    atom_names: List[str] = field(default_factory=list)
+    alternative_locations: List[Optional[str]] = field(default_factory=list)
+    elements: List[Optional[str]] = field(default_factory=list)
+    coordinates: array = field(default_factory=lambda: array("d"))  # x y z per atom
+    occupancies: array = field(default_factory=lambda: array("d"))
+    temp_facts: array = field(default_factory=lambda: array("d"))  # nan if missing
+    atom_residue_indices: array = field(default_factory=lambda: array("q"))
+
+    # per residue
+    residue_sequence_codes: array = field(default_factory=lambda: array("q"))
+    residue_names: List[str] = field(default_factory=list)
+    residue_chain_indices: array = field(default_factory=lambda: array("q"))
+    residue_atom_starts: array = field(default_factory=lambda: array("q"))
+
+    # per chain
+    chain_codes: List[Optional[str]] = field(default_factory=list)
+    segment_ids: List[Optional[str]] = field(default_factory=list)
+    chain_residue_starts: array = field(default_factory=lambda: array("q"))
+
+    def __len__(self):
+        return len(self.atom_serials)
+
+    def residue_atom_indices(self, residue_index: int) -> range:
+        return _index_range(self.residue_atom_starts, residue_index, len(self))
+
+    def chain_residue_indices(self, chain_index: int) -> range:
+        return _index_range(
+            self.chain_residue_starts,
+            chain_index,
+            len(self.residue_sequence_codes),
+        )
+
+    def chain_indices_by_key(self) -> Dict[str, int]:
+        """
+        the index of the chain for each chain key [the chain code or if there isn't one the segment id], if a chain
+        key is repeated the last chain with that key is used
+        """
+        return {
+            chain_code if chain_code else segment_id: index
+            for index, (chain_code, segment_id) in enumerate(
+                zip(self.chain_codes, self.segment_ids)
+            )
+        }
+
+    def coordinate_array(self):
+        """
+        the coordinates as a number of atoms x 3 numpy array, the array is a view of the coordinates not a copy
+
+        :return: the numpy array
+        """
+        import numpy as np  # optional dependency
+
+        return np.frombuffer(self.coordinates, dtype=np.float64).reshape(-1, 3)
+
+
+def _index_range(starts: array, index: int, end: int) -> range:
+    next_index = index + 1
+    return range(starts[index], starts[next_index] if next_index < len(starts) else end)
+
+
+class _BuiltFromArrays:
+    # the field named by _lazy_field is built from the model's arrays the first time it's used, after that it's a
+    # normal field which can be edited, edits are not copied back to the arrays
+    _lazy_field = None
+
+    def __post_init__(self):
+        if self.arrays is not None:
+            del self.__dict__[self._lazy_field]
+
+    def __getattr__(self, name):
+        if name == self._lazy_field and self.__dict__.get("arrays") is not None:
+            value = self._build_from_arrays()
+            setattr(self, name, value)
+            return value
+
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {name!r}"
+        )
+
+
 @dataclass
 class Atom:  # noqa: F811
     serial: int
@@ -53,37 +146,102 @@ class Atom:  # noqa: F811
 
 
 @dataclass
-class Residue:
+class Residue(_BuiltFromArrays):
     sequence_code: int
     residue_name: str
     atoms: List[Atom] = field(default_factory=list)
     chain: Optional[Chain] = None
 
+    arrays: Optional[ModelArrays] = field(default=None, repr=False, compare=False)
+    index: Optional[int] = field(default=None, repr=False, compare=False)
+
+    _lazy_field = "atoms"
+
     def __iter__(self):
         return self.atoms.__iter__()
 
+    def _build_from_arrays(self) -> List[Atom]:
+        arrays = self.arrays
+
+        atoms = []
+        for index in arrays.residue_atom_indices(self.index):
+            coordinate_index = index * 3
+            temp_fact = arrays.temp_facts[index]
+
+            atoms.append(
+                Atom(
+                    arrays.atom_serials[index],
+                    arrays.atom_names[index],
+                    *arrays.coordinates[coordinate_index : coordinate_index + 3],
+                    alternative_location=arrays.alternative_locations[index],
+                    element=arrays.elements[index],
+                    temp_fact=None if isnan(temp_fact) else temp_fact,
+                    occupancy=arrays.occupancies[index],
+                    residue=self,
+                )
+            )
+
+        return atoms
+
 
 @dataclass
-class Chain:
+class Chain(_BuiltFromArrays):
     residues: List[Residue] = field(default_factory=list)
     chain_code: Optional[str] = None
     segment_id: Optional[str] = None
     sequence: Optional[Sequence] = None
     model: Optional[Model] = None
 
+    arrays: Optional[ModelArrays] = field(default=None, repr=False, compare=False)
+    index: Optional[int] = field(default=None, repr=False, compare=False)
+
+    _lazy_field = "residues"
+
     def __iter__(self):
         return self.residues.__iter__()
 
+    def _build_from_arrays(self) -> List[Residue]:
+        arrays = self.arrays
+
+        return [
+            Residue(
+                arrays.residue_sequence_codes[index],
+                arrays.residue_names[index],
+                chain=self,
+                arrays=arrays,
+                index=index,
+            )
+            for index in arrays.chain_residue_indices(self.index)
+        ]
+
 
 @dataclass
-class Model:
+class Model(_BuiltFromArrays):
     serial: int
     chains: Dict[str, Chain] = field(default_factory=dict)
     structure: Optional[Structure] = None
 
+    arrays: Optional[ModelArrays] = field(default=None, repr=False, compare=False)
+
+    _lazy_field = "chains"
+
     def __iter__(self):
         return iter(self.chains.values())
 
+    def _build_from_arrays(self) -> Dict[str, Chain]:
+        arrays = self.arrays
+
+        return {
+            chain_key: Chain(
+                chain_code=arrays.chain_codes[index],
+                segment_id=arrays.segment_ids[index],
+                model=self,
+                arrays=arrays,
+                index=index,
+            )
+            for chain_key, index in arrays.chain_indices_by_key().items()
+        }
+
 
 class PdbSecondaryStructureType(IntEnum):
     HELIX_RIGHT_HANDED_ALPHA = auto()
@@ -178,12 +336,85 @@ class StructureParseException(Exception):
     pass
 
 
-current_structure: Optional[Structure] = None
-current_model: Optional[Model] = None
-current_chain: Optional[Chain] = None
-current_residue: Optional[Residue] = None
-current_indices: Dict[str, int] = {}
-current_lines: List[str]
+class _ModelBuilder:
+    """
+    Build the models of a structure into ModelArrays atom by atom. All the state of a parse is held here, rather than
+    in module globals, so parses are reentrant and can be run in threads or worker processes.
+    """
+
+    def __init__(self, structure: Structure):
+        self.structure = structure
+        self.model: Optional[Model] = None
+        self.chain_open = False
+        self._residue_open = False
+        self._strings = {}
+
+    def start_model(self, serial: int):
+        self.model = Model(serial, structure=self.structure, arrays=ModelArrays())
+        self.structure.models.append(self.model)
+        self.end_chain()
+
+    def end_model(self):
+        self.model = None
+        self.end_chain()
+
+    def start_chain(self, chain_code: Optional[str], segment_id: Optional[str]):
+        arrays = self.model.arrays
+
+        arrays.chain_residue_starts.append(len(arrays.residue_sequence_codes))
+        arrays.chain_codes.append(chain_code)
+        arrays.segment_ids.append(segment_id)
+
+        self.chain_open = True
+        self._residue_open = False
+
+    def end_chain(self):
+        self.chain_open = False
+        self._residue_open = False
+
+    @property
+    def chain_code(self) -> Optional[str]:
+        return self.model.arrays.chain_codes[-1]
+
+    @property
+    def segment_id(self) -> Optional[str]:
+        return self.model.arrays.segment_ids[-1]
+
+    def _shared(self, value: Optional[str]) -> Optional[str]:
+        # atom, residue and element names are repeated many times so one copy of each is kept
+        return self._strings.setdefault(value, value)
+
+    def add_atom(
+        self,
+        sequence_code: int,
+        residue_name: str,
+        serial: int,
+        atom_name: str,
+        alternative_location: Optional[str],
+        x: float,
+        y: float,
+        z: float,
+        element: Optional[str],
+        temp_fact: Optional[float],
+        occupancy: float,
+    ):
+        arrays = self.model.arrays
+
+        if not self._residue_open or arrays.residue_sequence_codes[-1] != sequence_code:
+            arrays.residue_atom_starts.append(len(arrays.atom_serials))
+            arrays.residue_sequence_codes.append(sequence_code)
+            arrays.residue_names.append(self._shared(residue_name))
+            arrays.residue_chain_indices.append(len(arrays.chain_codes) - 1)
+            self._residue_open = True
+
+        arrays.atom_serials.append(serial)
+        arrays.atom_names.append(self._shared(atom_name))
+        arrays.alternative_locations.append(self._shared(alternative_location))
+        arrays.elements.append(self._shared(element))
+        arrays.coordinates.extend((x, y, z))
+        arrays.occupancies.append(occupancy)
+        arrays.temp_facts.append(nan if temp_fact is None else temp_fact)
+        arrays.atom_residue_indices.append(len(arrays.residue_sequence_codes) - 1)
 
 
 def _pad_line_to_80(line):
@@ -288,122 +519,116 @@ def _exit_if_no_chain_code_and_no_segment_id(
     return chain_code, segment_id
 
 
-def _parse_atom(line, line_info, default_chain_code=None):
-    global current_residue, current_chain, current_model
-
-    serial = line[6:11]
-    name = line[12:16]
-    alternative_location = line[16]
-    residue_name = line[17:20]
-    chain_code = line[21]
-    sequence_code = line[22:26]
-    x = line[30:38]
-    y = line[38:46]
-    z = line[46:54]
-    segment_id = line[72:76]
-    element = line[76:78]
-    temp_fact = line[60:66]
-
-    serial = _convert_to_int_or_exit(serial, line_info, "serial")
-    sequence_code = _convert_to_int_or_exit(sequence_code, line_info, "sequence_code")
-
-    x = _convert_to_float_or_exit(x, line_info, "x")
-    y = _convert_to_float_or_exit(y, line_info, "y")
-    z = _convert_to_float_or_exit(z, line_info, "z")
-
-    segment_id = _as_string_or_none(segment_id)
-    chain_code = _as_string_or_none(chain_code)
+def _parse_atom(
+    line: str,
+    line_no: int,
+    source: str,
+    builder: _ModelBuilder,
+    default_chain_code: Optional[str] = None,
+):
+    # line infos are only created to report errors as they are expensive to create for every atom
+    def line_info():
+        return PDBLineInfo(source, line_no=line_no, line=line, record_type="ATOM")
 
-    element = _as_string_or_none(element)
+    occupancy = line[54:60].strip()
+    temp_fact = line[60:66].strip()
+    try:
+        serial = int(line[6:11])
+        sequence_code = int(line[22:26])
+        x = float(line[30:38])
+        y = float(line[38:46])
+        z = float(line[46:54])
+        occupancy = float(occupancy) if occupancy else 1.0
+        temp_fact = float(temp_fact) if temp_fact else None
+    except ValueError:
+        # convert again reporting the first field that can't be converted
+        error_line_info = line_info()
+        _convert_to_int_or_exit(line[6:11], error_line_info, "serial")
+        _convert_to_int_or_exit(line[22:26], error_line_info, "sequence_code")
+        for field_name, value in zip("xyz", (line[30:38], line[38:46], line[46:54])):
+            _convert_to_float_or_exit(value, error_line_info, field_name)
+        if occupancy:
+            _convert_to_float_or_exit(occupancy, error_line_info, "occupancy")
+        _convert_to_float_or_exit(temp_fact, error_line_info, "temperature factor")
+
+    segment_id = line[72:76].strip() or None
+    chain_code = line[21].strip() or None
+
+    element = line[76:78].strip() or None
+
+    name = line[12:16].strip()
+    residue_name = line[17:20].strip()
+    if string.whitespace in name or string.whitespace in residue_name:
+        _as_continuous_string_or_exit(name, line_info(), "name")
+        _as_continuous_string_or_exit(residue_name, line_info(), "residue name")
+
+    alternative_location = line[16].strip() or None
+
+    if builder.chain_open:
+        previous_chain_code = builder.chain_code
+        previous_segment_id = builder.segment_id
+
+        if previous_chain_code != chain_code or previous_segment_id != segment_id:
+            _exit_if_chain_code_and_segid_are_mismatched(
+                previous_chain_code,
+                previous_segment_id,
+                chain_code,
+                segment_id,
+                line_info(),
+            )
 
-    temp_fact = _as_string_or_none(temp_fact)
-    if temp_fact:
-        temp_fact = _convert_to_float_or_exit(
-            temp_fact, line_info, "temperature factor"
+    if not chain_code and not segment_id:
+        chain_code, segment_id = _exit_if_no_chain_code_and_no_segment_id(
+            chain_code, segment_id, line_info(), default_chain_code
         )
 
-    name = _as_continuous_string_or_exit(name, line_info, "name")
-
-    alternative_location = _as_string_or_none(alternative_location)
-
-    residue_name = _as_continuous_string_or_exit(
-        residue_name, line_info, "residue name"
-    )
-
-    current_atom = Atom(
-        serial=serial,
-        atom_name=name,
-        alternative_location=alternative_location,
-        x=x,
-        y=y,
-        z=z,
-        element=element,
-        temp_fact=temp_fact,
-    )
-
-    _exit_if_chain_code_and_segid_are_mismatched(
-        current_chain, chain_code, segment_id, line_info
-    )
-
-    chain_code, segment_id = _exit_if_no_chain_code_and_no_segment_id(
-        chain_code, segment_id, line_info, default_chain_code
-    )
-
-    if current_chain:
+    if builder.chain_open:
         new_chain = False
-        if (
-            current_chain.chain_code and chain_code
-        ) and current_chain.chain_code != chain_code:
+        if (previous_chain_code and chain_code) and previous_chain_code != chain_code:
             new_chain = True
 
-        if (
-            current_chain.segment_id
-            and segment_id
-            and current_chain.segment_id != segment_id
-        ):
+        if previous_segment_id and segment_id and previous_segment_id != segment_id:
             new_chain = True
 
         if new_chain:
-            current_chain = None
-
-    if not current_chain:
-        chain_segment_key = chain_code if chain_code else segment_id
-        current_chain = Chain(chain_code=chain_code, segment_id=segment_id)
-        current_model.chains[chain_segment_key] = current_chain
+            builder.end_chain()
 
-    if current_residue and current_residue.sequence_code != sequence_code:
-        current_residue = None
+    if not builder.chain_open:
+        builder.start_chain(chain_code, segment_id)
 
-    if not current_residue:
-        current_residue = Residue(
-            sequence_code=sequence_code, residue_name=residue_name, chain=current_chain
-        )
-        current_chain.residues.append(current_residue)
-
-    current_atom.residue = current_residue
-    current_residue.atoms.append(current_atom)
+    builder.add_atom(
+        sequence_code,
+        residue_name,
+        serial,
+        name,
+        alternative_location,
+        x,
+        y,
+        z,
+        element,
+        temp_fact,
+        occupancy,
+    )
 
 
 def _exit_if_chain_code_and_segid_are_mismatched(
-    target_chain, chain_code, segment_id, line_info
+    previous_chain_code, previous_segment_id, chain_code, segment_id, line_info
 ):
     mismatch = None
     non_mismatch = None
 
     if (
-        target_chain
-        and target_chain.chain_code == chain_code
+        previous_chain_code == chain_code
         and chain_code
-        and target_chain.segment_id != segment_id
+        and previous_segment_id != segment_id
     ):
         mismatch = "segment id"
         non_mismatch = " chain code"
 
     if (
-        target_chain
-        and target_chain.segment_id == segment_id
+        previous_segment_id == segment_id
         and segment_id
-        and target_chain.chain_code != chain_code
+        and previous_chain_code != chain_code
     ):
         mismatch = "chain code"
         non_mismatch = "segment id"
@@ -413,8 +638,8 @@ def _exit_if_chain_code_and_segid_are_mismatched(
             while reading a chain from the file {line_info.file_name} at line {line_info.line_no}
             the {mismatch} changed but the {non_mismatch} didn't
 
-            chain code previous: {target_chain.chain_code} current: |{chain_code}|
-            segment id previous: {target_chain.segment_id} current: |{segment_id}|
+            chain code previous: {previous_chain_code} current: |{chain_code}|
+            segment id previous: {previous_segment_id} current: |{segment_id}|
 
             the current line is
 
@@ -427,12 +652,11 @@ def _exit_if_chain_code_and_segid_are_mismatched(
         exit_error(msg)
 
 
-def _parse_sequence(line: str, _: PDBLineInfo):
-    global current_structure
+def _parse_sequence(line: str, _: PDBLineInfo, structure: Structure):
     chain_code = line[11]
     chain_code = _as_string_or_none(chain_code)
 
-    sequence = current_structure.sequences.setdefault(
+    sequence = structure.sequences.setdefault(
         chain_code,
         Sequence(id=None, start_sequence_code=1, source=SequenceSource.SEQRES),
     )
@@ -447,9 +671,7 @@ def _parse_sequence(line: str, _: PDBLineInfo):
         sequence.residues.append(target_residue)
 
 
-def _parse_helix(line: str, line_info: PDBLineInfo):
-    global current_structure
-
+def _parse_helix(line: str, line_info: PDBLineInfo, structure: Structure):
     chain_code = line[19]
     alternative_location = line[25]
     first_sequence_code = line[21:25]
@@ -475,14 +697,12 @@ def _parse_helix(line: str, line_info: PDBLineInfo):
         secondary_structure_type,
     )
 
-    current_structure.secondary_structure.setdefault(chain_code, []).append(
+    structure.secondary_structure.setdefault(chain_code, []).append(
         secondary_structure_element
     )
 
 
-def _parse_sheet(line, line_info):
-    global current_structure
-
+def _parse_sheet(line, line_info, structure: Structure):
     chain_code = line[21]
     first_sequence_code = line[22:26]
     alternative_location = line[26]
@@ -504,7 +724,7 @@ def _parse_sheet(line, line_info):
         PdbSecondaryStructureType.SHEET,
     )
 
-    current_structure.secondary_structure.setdefault(chain_code, []).append(
+    structure.secondary_structure.setdefault(chain_code, []).append(
         secondary_structure_element
     )
 
@@ -563,13 +783,17 @@ def _sequence_from_residues_if_no_seqres(structure):
         chain_min_residues = {}
         chain_sequence_valid = {}
         for model in structure.models:
-            for chain in model.chains.values():
-                for residue in chain.residues:
-                    chain_key = (chain.chain_code, chain.segment_id)
-                    chain_residues.setdefault(chain_key, {})
-                    chain_residues[chain_key].setdefault(
-                        residue.sequence_code, set()
-                    ).add(residue.residue_name)
+            arrays = model.arrays
+            for chain_index in arrays.chain_indices_by_key().values():
+                chain_key = (
+                    arrays.chain_codes[chain_index],
+                    arrays.segment_ids[chain_index],
+                )
+                residues = chain_residues.setdefault(chain_key, {})
+                for residue_index in arrays.chain_residue_indices(chain_index):
+                    residues.setdefault(
+                        arrays.residue_sequence_codes[residue_index], set()
+                    ).add(arrays.residue_names[residue_index])
 
         for chain_key in chain_residues:
             min_residue = min(chain_residues[chain_key].keys())
@@ -630,9 +854,8 @@ def parse_pdb(
         source: Source filename for error messages
         default_chain_code: Default chain code to use when both chain code and segment ID are missing
     """
-    global current_model, current_chain, current_residue, current_structure
-
-    current_structure = Structure(source)
+    structure = Structure(source)
+    builder = _ModelBuilder(structure)
 
     for line_no, line in enumerate(lines, start=1):
 
@@ -642,18 +865,18 @@ def parse_pdb(
 
         record_type = line[0:6].strip()
 
+        if record_type == "ATOM":
+            if not builder.model:
+                builder.start_model(1)
+            _parse_atom(line, line_no, source, builder, default_chain_code)
+            continue
+
         line_info = PDBLineInfo(
             source, line_no=line_no, line=line, record_type=record_type
         )
 
-        if record_type == "ATOM":
-            if not current_model:
-                current_model = Model(1)
-                current_structure.models.append(current_model)
-            _parse_atom(line, line_info, default_chain_code)
-
         if record_type == "TER":
-            if not current_chain:
+            if not builder.chain_open:
                 msg = f"""
                     at line {line_info.line_no} in {line_info.file_name}
                     there was a termination line when no chain was bein read
@@ -665,18 +888,17 @@ def parse_pdb(
 
                 exit_error(msg)
 
-            current_chain = None
-            current_residue = None
+            builder.end_chain()
 
-        if record_type == "MODEL":
+        elif record_type == "MODEL":
             model_number = line[10:14]
             model_number = _convert_to_int_or_exit(model_number, line_info, "MODEL")
 
-            if current_model:
+            if builder.model:
                 msg = f"""
                     at line {line_info.line_no} in the file {line_info.file_name}
                     a new model started when a model was already open
-                    the new model number was {model_number} the old model_numbers was {current_model.serial}
+                    the new model number was {model_number} the old model_numbers was {builder.model.serial}
 
                     the line was
 
@@ -687,50 +909,31 @@ def parse_pdb(
 
                 exit_error(msg)
 
-            current_model = Model(model_number)
-            current_structure.models.append(current_model)
+            builder.start_model(model_number)
 
-        if record_type == "ENDMDL":
-            current_model = None
-            current_chain = None
-            current_residue = None
+        elif record_type == "ENDMDL":
+            builder.end_model()
 
-        if record_type == "SEQRES":
-            _parse_sequence(line, line_info)
+        elif record_type == "SEQRES":
+            _parse_sequence(line, line_info, structure)
 
-        if record_type == "HELIX":
-            _parse_helix(line, line_info)
+        elif record_type == "HELIX":
+            _parse_helix(line, line_info, structure)
 
-        if record_type == "SHEET":
-            _parse_sheet(line, line_info)
+        elif record_type == "SHEET":
+            _parse_sheet(line, line_info, structure)
 
-    _sequence_from_residues_if_no_seqres(current_structure)
+    _sequence_from_residues_if_no_seqres(structure)
 
-    _fixup_sequences(current_structure)
-    _fixup_secondary_structure(current_structure)
+    _fixup_sequences(structure)
+    _fixup_secondary_structure(structure)
 
-    _match_sequences_and_set_offsets(current_structure)
+    _match_sequences_and_set_offsets(structure)
 
-    for secondary_structure_list in current_structure.secondary_structure.values():
+    for secondary_structure_list in structure.secondary_structure.values():
         secondary_structure_list.sort(key=lambda x: x.start_sequence_code)
 
-    result = current_structure
-    current_structure = None
-    current_model = None
-    current_chain = None
-    current_residue = None
-
-    return result
-
-
-def _find_last_row_indices(lines, targets):
-    result = {}
-    for i, line in enumerate(lines):
-        for target in targets:
-            if target in line:
-                result[target] = i
-
-    return result
+    return structure
 
 
 def _attibute_index_to_name(items, target_index):
@@ -832,128 +1035,318 @@ class ComputedLineInfo:
         self._search_terms = list(args)
 
 
-def _parse_cif_atoms(data: DataContainer, line_info: ComputedLineInfo) -> Structure:
-    global current_structure, current_model, current_chain, current_residue
+@dataclass(frozen=True)
+class _CifAtomSiteColumns:
+    record_type: int
+    atom_id: int
+    element: int
+    sequence_code: int
+    residue_name: int
+    chain_code: int
+    atom_name: int
+    alternative_location: int
+    model: int
+    occupancy: int
+    x: int
+    y: int
+    z: int
+    b_iso_or_equiv: int
+
+    sequence_code_name: str
+
+    @classmethod
+    def from_category(cls, atoms: DataCategory) -> "_CifAtomSiteColumns":
+        sequence_code = _get_attribute_index_favour_auth(atoms, "{source}_seq_id")
+
+        return cls(
+            record_type=atoms.get_attribute_index("group_PDB"),
+            atom_id=atoms.get_attribute_index("id"),
+            element=atoms.get_attribute_index("type_symbol"),
+            sequence_code=sequence_code,
+            residue_name=_get_attribute_index_favour_auth(atoms, "{source}_comp_id"),
+            chain_code=_get_attribute_index_favour_auth(atoms, "{source}_asym_id"),
+            atom_name=_get_attribute_index_favour_auth(atoms, "{source}_atom_id"),
+            alternative_location=atoms.get_attribute_index("pdbx_PDB_ins_code"),
+            model=atoms.get_attribute_index("pdbx_PDB_model_num"),
+            occupancy=atoms.get_attribute_index("occupancy"),
+            x=atoms.get_attribute_index("Cartn_x"),
+            y=atoms.get_attribute_index("Cartn_y"),
+            z=atoms.get_attribute_index("Cartn_z"),
+            b_iso_or_equiv=atoms.get_attribute_index("B_iso_or_equiv"),
+            sequence_code_name=_attibute_index_to_name(atoms, sequence_code),
+        )
 
-    atoms = data.get_object("atom_site")
-    line_info.set_container("atom_site")
 
-    record_type_index = atoms.get_attribute_index("group_PDB")
-    atom_id_index = atoms.get_attribute_index("id")
-    element_index = atoms.get_attribute_index("type_symbol")
+def _add_cif_atom(
+    builder: _ModelBuilder,
+    row: List[str],
+    columns: _CifAtomSiteColumns,
+    line_info: Callable[[], LineInfo],
+):
+    # line_info is only called to report errors
+    if row[columns.record_type] != "ATOM":
+        return
+
+    b_iso_or_equiv = _as_string_or_none(_cif_value(row[columns.b_iso_or_equiv]))
+    try:
+        atom_id = int(row[columns.atom_id])
+        sequence_code = int(row[columns.sequence_code])
+        model_number = int(row[columns.model])
+        occupancy = float(row[columns.occupancy])
+        x = float(row[columns.x])
+        y = float(row[columns.y])
+        z = float(row[columns.z])
+        b_iso_or_equiv = float(b_iso_or_equiv) if b_iso_or_equiv else b_iso_or_equiv
+    except ValueError:
+        # convert again reporting the first field that can't be converted
+        error_line_info = line_info()
+        _convert_to_int_or_exit(row[columns.atom_id], error_line_info, "atom_id")
+        _convert_to_int_or_exit(
+            row[columns.sequence_code],
+            error_line_info,
+            f"sequence atom_id [{columns.sequence_code_name}]",
+        )
+        _convert_to_int_or_exit(row[columns.model], error_line_info, "model")
+        _convert_to_float_or_exit(row[columns.occupancy], error_line_info, "occupancy")
+        for field_name in "xyz":
+            value = row[getattr(columns, field_name)]
+            _convert_to_float_or_exit(value, error_line_info, field_name)
+        _convert_to_float_or_exit(b_iso_or_equiv, error_line_info, "b value")
+
+    chain_code = _cif_value(row[columns.chain_code])
+
+    if not builder.model or model_number != builder.model.serial:
+        builder.start_model(model_number)
+
+    if builder.chain_open and builder.chain_code != chain_code:
+        builder.end_chain()
+
+    if not builder.chain_open:
+        builder.start_chain(chain_code, None)
+
+    builder.add_atom(
+        sequence_code,
+        _cif_value(row[columns.residue_name]),
+        atom_id,
+        _cif_value(row[columns.atom_name]),
+        _as_string_or_none(_cif_value(row[columns.alternative_location])),
+        x,
+        y,
+        z,
+        _as_string_or_none(_cif_value(row[columns.element])),
+        b_iso_or_equiv,
+        occupancy,
+    )
+
 
-    seq_code_index = _get_attribute_index_favour_auth(atoms, "{source}_seq_id")
-    residue_name_index = _get_attribute_index_favour_auth(atoms, "{source}_comp_id")
-    chain_code_index = _get_attribute_index_favour_auth(atoms, "{source}_asym_id")
-    atom_name_index = _get_attribute_index_favour_auth(atoms, "{source}_atom_id")
+def _parse_cif_atoms(
+    data: DataContainer, line_info: ComputedLineInfo, structure: Structure
+) -> Structure:
 
-    alternative_location_index = atoms.get_attribute_index("pdbx_PDB_ins_code")
+    atoms = data.get_object("atom_site")
+    line_info.set_container("atom_site")
 
-    model_index = atoms.get_attribute_index("pdbx_PDB_model_num")
-    occupancy_index = atoms.get_attribute_index("occupancy")
-    x_index = atoms.get_attribute_index("Cartn_x")
-    y_index = atoms.get_attribute_index("Cartn_y")
-    z_index = atoms.get_attribute_index("Cartn_z")
-    B_iso_or_equiv_index = atoms.get_attribute_index("B_iso_or_equiv")
+    columns = _CifAtomSiteColumns.from_category(atoms)
 
-    current_model = None
-    for i, row in enumerate(atoms, start=1):
+    def row_line_info():
         line_info.set_container_row(i)
         line_info.set_search_terms(*row)
+        return line_info
 
-        record_type = row[record_type_index]
+    builder = _ModelBuilder(structure)
+    for i, row in enumerate(atoms, start=1):
+        _add_cif_atom(builder, row, columns, row_line_info)
 
-        if record_type == "ATOM":
-            atom_id = row[atom_id_index]
-            element = row[element_index]
-            chain_code = row[chain_code_index]
-            atom_name = row[atom_name_index]
-            sequence_code = row[seq_code_index]
-            alternative_location = row[alternative_location_index]
-            residue_name = row[residue_name_index]
-            model_number = row[model_index]
-            occupancy = row[occupancy_index]
-            x = row[x_index]
-            y = row[y_index]
-            z = row[z_index]
-            b_iso_or_equiv = row[B_iso_or_equiv_index]
-
-            seq_code_attribute_name = _attibute_index_to_name(atoms, seq_code_index)
-
-            # use correct line info and correct name in conversion of sequence_id
-            atom_id = _convert_to_int_or_exit(atom_id, None, "atom_id")
-            element = _as_string_or_none(element)
-            sequence_code = _convert_to_int_or_exit(
-                sequence_code,
-                line_info,
-                f"sequence atom_id [{seq_code_attribute_name}]",
-            )
-            alternative_location = _as_string_or_none(alternative_location)
-            model_number = _convert_to_int_or_exit(model_number, line_info, "model")
-            occupancy = _convert_to_float_or_exit(occupancy, line_info, "occupancy")
-            x = _convert_to_float_or_exit(x, line_info, "x")
-            y = _convert_to_float_or_exit(y, line_info, "y")
-            z = _convert_to_float_or_exit(z, line_info, "z")
-
-            b_iso_or_equiv = _as_string_or_none(b_iso_or_equiv)
-            if b_iso_or_equiv:
-                b_iso_or_equiv = _convert_to_float_or_exit(
-                    b_iso_or_equiv, line_info, "b value"
-                )
+    return structure
 
-            if not current_model or model_number != current_model.serial:
-                current_model = Model(model_number, structure=current_structure)
-                current_structure.models.append(current_model)
-                current_chain = None
 
-            if current_chain and current_chain.chain_code != chain_code:
-                current_chain = None
-                current_residue = None
+_CIF_QUOTED_TOKEN = re.compile(r"""'(.*?)'(?=\s|$)|"(.*?)"(?=\s|$)|(\S+)""")
 
-            sequence = (
-                current_structure.sequences[sequence_code]
-                if sequence_code in current_structure.sequences
-                else None
-            )
+_CIF_NULL_VALUES = {"?": None, ".": ""}
 
-            if not current_chain:
-                current_chain = Chain(
-                    chain_code=chain_code, sequence=sequence, model=current_model
-                )
-                current_model.chains[chain_code] = current_chain
+_CIF_LOOP_ENDS = ("loop_", "_", "data_", "save_", "global_", "stop_")
 
-            if current_residue and current_residue.sequence_code != sequence_code:
-                current_residue = None
 
-            if not current_residue:
-                current_residue = Residue(
-                    sequence_code, residue_name, chain=current_chain
-                )
-                current_chain.residues.append(current_residue)
-
-            current_atom = Atom(
-                atom_id,
-                atom_name,
-                x,
-                y,
-                z,
-                alternative_location,
-                element,
-                b_iso_or_equiv,
-                occupancy,
-                current_residue,
-            )
+def _cif_tokens(line: str) -> List[str]:
+    if "'" in line or '"' in line:
+        return [
+            single or double or bare
+            for single, double, bare in _CIF_QUOTED_TOKEN.findall(line)
+        ]
 
-            current_residue.atoms.append(current_atom)
+    return line.split()
 
-    current_model = None
-    current_chain = None
-    current_residue = None
 
-    result = current_structure
-    current_structure = None
+def _cif_value(token: Optional[str]) -> Optional[str]:
+    # ? and . are unknown and missing values, which are read as None and "" as the mmCIF reader does
+    return _CIF_NULL_VALUES.get(token, token)
 
-    return result
+
+@dataclass
+class _CifAtomSite:
+    """
+    the atom_site loop of an mmCIF file, found by scanning its lines so the rows of each model can be read
+    independently without using the mmCIF reader
+
+    start and end are the indices of the loop_ line and the line after the last row, model_ranges gives the
+    serial and the indices of the first and after the last row of each model
+    """
+
+    start: int
+    end: int
+    columns: _CifAtomSiteColumns
+    model_ranges: List[Tuple[str, int, int]]
+
+
+def _find_cif_atom_site(lines: List[str], source: str) -> Optional[_CifAtomSite]:
+    """
+    find the atom_site loop in the lines of an mmCIF file and the rows of each of its models
+
+    :param lines: the lines of the file
+    :param source: the name of the file for error messages
+    :return: the atom_site loop or None if it isn't present or its rows can't be read one per line
+    """
+
+    prefix = "_atom_site."
+
+    in_text_field = False
+    header_start = None
+    for line_index, line in enumerate(lines):
+        if line.startswith(";"):
+            in_text_field = not in_text_field
+        elif not in_text_field and line.startswith(prefix):
+            header_start = line_index
+            break
+
+    if header_start is None or header_start == 0:
+        return None
+
+    if lines[header_start - 1].strip() != "loop_":
+        return None
+
+    attribute_names = []
+    line_index = header_start
+    while line_index < len(lines) and lines[line_index].startswith(prefix):
+        attribute_names.append(lines[line_index].strip()[len(prefix) :])
+        line_index += 1
+
+    columns = _CifAtomSiteColumns.from_category(
+        DataCategory("atom_site", attribute_names)
+    )
+    attribute_count = len(attribute_names)
+
+    model_ranges = []
+    previous_model_serial = None
+    for line_index in range(line_index, len(lines)):
+        line = lines[line_index]
+        stripped = line.lstrip()
+
+        if not stripped or stripped[0] == "#":
+            continue
+
+        if stripped.startswith(_CIF_LOOP_ENDS):
+            break
+
+        # text fields and rows split over lines are left to the mmCIF reader
+        row = _cif_tokens(line)
+        if stripped[0] == ";" or len(row) != attribute_count:
+            return None
+
+        # only ATOM records start new models
+        if row[columns.record_type] != "ATOM":
+            continue
+
+        model_serial = row[columns.model]
+        if model_serial == previous_model_serial:
+            model_ranges[-1][2] = line_index + 1
+        else:
+            line_info = PDBLineInfo(source, line_index + 1, line, record_type="ATOM")
+            serial = _convert_to_int_or_exit(model_serial, line_info, "model")
+            model_ranges.append([serial, line_index, line_index + 1])
+            previous_model_serial = model_serial
+    else:
+        line_index = len(lines)
+
+    model_ranges = [tuple(model_range) for model_range in model_ranges]
+
+    return _CifAtomSite(header_start - 1, line_index, columns, model_ranges)
+
+
+def _read_cif_model_arrays(
+    lines: List[str], first_line_no: int, columns: _CifAtomSiteColumns, source: str
+) -> ModelArrays:
+    """
+    read the atom_site rows of a single model [one row per line] into model arrays
+
+    :param lines: the lines of the rows of the model
+    :param first_line_no: the line number of the first of the lines in the file
+    :param columns: the indices of the atom_site attributes in the rows
+    :param source: the name of the file for error messages
+    :return: the arrays of the model
+    """
+
+    def line_info():
+        return PDBLineInfo(source, line_no=line_no, line=line, record_type="ATOM")
+
+    builder = _ModelBuilder(Structure(source))
+    for line_no, line in enumerate(lines, start=first_line_no):
+        stripped = line.lstrip()
+        if stripped and stripped[0] != "#":
+            _add_cif_atom(builder, _cif_tokens(line), columns, line_info)
+
+    return builder.model.arrays
+
+
+class _LazyCifModelArrays(ModelArrays):
+    """
+    model arrays that are read from the atom_site rows of their model the first time they are used
+    """
+
+    def __init__(
+        self,
+        lines: List[str],
+        first_line_no: int,
+        columns: _CifAtomSiteColumns,
+        source: str,
+    ):
+        self._rows = (lines, first_line_no, columns, source)
+
+    def __getattr__(self, name):
+        rows = self.__dict__.get("_rows")
+        if rows is None or name not in ModelArrays.__dataclass_fields__:
+            raise AttributeError(name)
+
+        self.__dict__.update(vars(_read_cif_model_arrays(*rows)))
+        self.__dict__.pop("_rows", None)
+
+        return self.__dict__[name]
+
+    def __getstate__(self):
+        self.atom_serials  # read the rows before pickling
+        return self.__dict__
+
+
+def _add_cif_models(
+    structure: Structure,
+    lines: List[str],
+    atom_site: _CifAtomSite,
+    lazy: bool,
+    jobs: int,
+):
+    model_rows = [
+        (lines[start:end], start + 1, atom_site.columns, structure.source)
+        for _, start, end in atom_site.model_ranges
+    ]
+
+    if lazy:
+        model_arrays = [_LazyCifModelArrays(*rows) for rows in model_rows]
+    else:
+        from nef_pipelines.lib.parallel_lib import run_per_file  # deferred
+
+        model_arrays = run_per_file(_read_cif_model_arrays, model_rows, jobs)
+
+    for (serial, _, _), arrays in zip(atom_site.model_ranges, model_arrays):
+        structure.models.append(Model(serial, structure=structure, arrays=arrays))
 
 
 def _get_attribute_index_favour_auth(atoms, attribute_template):
@@ -967,9 +1360,7 @@ def _get_attribute_index_favour_auth(atoms, attribute_template):
     return result
 
 
-def _parse_cif_helix(data, line_info):
-    global current_structure
-
+def _parse_cif_helix(data, line_info, structure: Structure):
     if helices := data.get_object("struct_conf"):
         line_info.set_container("struct_conf")
 
@@ -1015,17 +1406,15 @@ def _parse_cif_helix(data, line_info):
                 last_sequence_code,
                 alternative_location,
                 secondary_structure_type,
-                structure=current_structure,
+                structure=structure,
             )
 
-            current_structure.secondary_structure.setdefault(chain_code, []).append(
+            structure.secondary_structure.setdefault(chain_code, []).append(
                 secondary_structure_element
             )
 
 
-def _parse_cif_sheet(data, line_info):
-    global current_structure
-
+def _parse_cif_sheet(data, line_info, structure: Structure):
     if sheets := data.get_object("struct_sheet_range"):
         line_info.set_container("struct_sheet_range")
 
@@ -1064,36 +1453,43 @@ def _parse_cif_sheet(data, line_info):
                 PdbSecondaryStructureType.SHEET,
             )
 
-            current_structure.secondary_structure.setdefault(chain_code, []).append(
+            structure.secondary_structure.setdefault(chain_code, []).append(
                 secondary_structure_element
             )
 
 
-def parse_cif(lines: Iterable[str], source: str = "unknown") -> Structure:
-    global current_structure, current_indices
+def parse_cif(
+    lines: Iterable[str], source: str = "unknown", lazy: bool = False, jobs: int = 1
+) -> Structure:
+    """
+    Parse an mmCIF file into a Structure object.
 
-    current_lines = [line for line in lines]
+    The atom_site loop is read separately from the rest of the file, one model at a time, so the sequences and
+    secondary structure can be read without reading the atoms of every model.
 
-    current_indices = _find_last_row_indices(
-        current_lines,
-        [
-            "_atom_site",
-        ],
-    )
+    Args:
+        lines: Lines from the mmCIF file
+        source: Source filename for error messages
+        lazy: only read the atoms of a model when it is first used, errors in a model's atoms are then reported
+              when it is used rather than when the file is parsed
+        jobs: the number of processes to read models with if they are not read lazily
+    """
+    lines = [line for line in lines]
 
-    current_structure = Structure(source)
+    structure = Structure(source)
 
-    reader = PdbxReader(current_lines)
-    data = []
-    reader.read(data)
-    data = data[0]
+    data, atom_site = _read_cif_data_without_atom_site(lines, source)
+
+    line_info = ComputedLineInfo(lines, file_name=source)
 
-    line_info = ComputedLineInfo(current_lines, file_name=source)
+    _parse_cif_sequence(data, line_info, structure)
+    _parse_cif_helix(data, line_info, structure)
+    _parse_cif_sheet(data, line_info, structure)
 
-    _parse_cif_sequence(data, line_info)
-    _parse_cif_helix(data, line_info)
-    _parse_cif_sheet(data, line_info)
-    structure = _parse_cif_atoms(data, line_info)
+    if atom_site:
+        _add_cif_models(structure, lines, atom_site, lazy, jobs)
+    else:
+        _parse_cif_atoms(data, line_info, structure)
 
     _fixup_cif_sequences(structure)
 
@@ -1105,6 +1501,73 @@ def parse_cif(lines: Iterable[str], source: str = "unknown") -> Structure:
     return structure
 
 
+def _read_cif_data_without_atom_site(
+    lines: List[str], source: str
+) -> Tuple[DataContainer, Optional[_CifAtomSite]]:
+    # the atom site loop is read by model rather than by the mmCIF reader
+    atom_site = _find_cif_atom_site(lines, source)
+
+    cif_lines = (
+        lines
+        if atom_site is None
+        else lines[: atom_site.start] + lines[atom_site.end :]
+    )
+
+    reader = PdbxReader(cif_lines)
+    data = []
+    reader.read(data)
+
+    return data[0], atom_site
+
+
+def read_cif_chain_sequences(
+    lines: Iterable[str], source: str = "unknown"
+) -> Optional[List[Tuple[str, int, List[str]]]]:
+    """
+    Read the sequence of each polymer chain in an mmCIF file without reading its atoms.
+
+    Chains are mapped to the sequences of their entities by pdbx_poly_seq_scheme, so unlike parse_cif the atom_site
+    loop isn't read to match the chains of the first model to the sequences. Only chains with at least one observed
+    residue are reported, as they would be by parse_cif.
+
+    Args:
+        lines: Lines from the mmCIF file
+        source: Source filename for error messages
+
+    Returns:
+        the [author] chain code, first sequence code and residue names of each chain in the order of the file, or
+        None if the file has no pdbx_poly_seq_scheme or entity_poly_seq
+    """
+    lines = [line for line in lines]
+
+    data, _ = _read_cif_data_without_atom_site(lines, source)
+
+    scheme = data.get_object("pdbx_poly_seq_scheme")
+    if not scheme or not data.get_object("entity_poly_seq"):
+        return None
+
+    structure = Structure(source)
+    _parse_cif_sequence(data, ComputedLineInfo(lines, file_name=source), structure)
+
+    entity_id_index = scheme.get_attribute_index("entity_id")
+    chain_code_index = scheme.get_attribute_index("pdb_strand_id")
+    observed_residue_index = scheme.get_attribute_index("auth_mon_id")
+
+    chain_entity_ids = {}
+    observed_chain_codes = set()
+    for row in scheme.row_list:
+        chain_code = row[chain_code_index]
+        chain_entity_ids.setdefault(chain_code, row[entity_id_index])
+        if _cif_value(row[observed_residue_index]):
+            observed_chain_codes.add(chain_code)
+
+    return [
+        (chain_code, 1, list(structure.sequences[entity_id].residues))
+        for chain_code, entity_id in chain_entity_ids.items()
+        if chain_code in observed_chain_codes and entity_id in structure.sequences
+    ]
+
+
 def _fixup_cif_sequences(structure):
     sequence_id_map = {}
     for new_sequence_id, (original_sequence_id, sequence) in enumerate(
@@ -1123,9 +1586,10 @@ def _get_lenght_longest_residue_name(structure):
     for sequence in structure.sequences.values():
         residue_names.update(sequence.residues)
 
-    for model in structure.models:
-        for chain in model.chains.values():
-            residue_names.update([residue.residue_name for residue in chain])
+    # only the first model is matched to the sequences, so other models [which may not have been read yet] are
+    # not needed
+    for model in structure.models[:1]:
+        residue_names.update(model.arrays.residue_names)
 
     name_lengths = [len(residue_name) for residue_name in residue_names]
 
@@ -1202,9 +1666,7 @@ def _match_sequences_and_set_offsets(structure):
             chain.sequence = sequence
 
 
-def _parse_cif_sequence(data, line_info):
-    global current_structure, current_indices
-
+def _parse_cif_sequence(data, line_info, structure: Structure):
     sequence = data.get_object("entity_poly_seq")
     line_info.set_container("entity_poly_seq")
 
@@ -1217,17 +1679,17 @@ def _parse_cif_sequence(data, line_info):
 
         entity_id = row[entity_id_index]
         monomer_id = row[monomer_id_index]
-        current_structure.sequences.setdefault(
+        structure.sequences.setdefault(
             entity_id,
             Sequence(
                 entity_id,
                 None,
-                structure=current_structure,
+                structure=structure,
                 source=SequenceSource.SEQRES,
             ),
         )
 
-        current_structure.sequences[entity_id].residues.append(monomer_id)
+        structure.sequences[entity_id].residues.append(monomer_id)
 
 
 PDB_RECORD_IDS = set(
@@ -5,25 +5,35 @@ import os
 import re
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from pathlib import Path
 from textwrap import dedent, indent
-from typing import Optional
+from typing import List, Optional, Tuple
 from urllib.parse import urlsplit
 
-import requests
 import typer
 from bs4 import BeautifulSoup
 from bs4.element import Comment
 from pynmrstar import Entry
 from tabulate import tabulate
 
+from nef_pipelines.lib.http_cache_lib import (
+    OFFLINE_HELP,
+    HttpCacheMissException,
+    HttpCacheMode,
+    cached_get,
+    cached_request,
+    set_http_cache_mode,
+)
 from nef_pipelines.lib.nef_lib import (
     UNUSED,
     SelectionType,
+    print_entry,
     read_or_create_entry_exit_error_on_bad_file,
 )
+from nef_pipelines.lib.parallel_lib import exit_if_jobs_less_than_1
 from nef_pipelines.lib.sequence_lib import sequences_from_frames, translate_1_to_3
 from nef_pipelines.lib.shift_lib import shifts_to_nef_frame
 from nef_pipelines.lib.structures import AtomLabel, Residue, ShiftData, ShiftList
@@ -44,6 +54,11 @@ ALPHA_FOLD_URL_TEMPLATE = (
 
 SHIFTX2_RETRY_COUNT = 10
 DEFAULT_TIMEOUT = 2
+DEFAULT_JOBS = 4
+
+JOBS_HELP = """
+    the most predictions to request from the shiftx2 server at once when predicting shifts for more than one structure
+    """
 
 
 @dataclass
@@ -90,6 +105,10 @@ class PDBDownloadResult(NetworkResult, PdbAndUniprotIDs, PbdUniprotChainMapping)
     pdb_content: Optional[str] = field(default=None)
 
 
+class Shiftx2PredictionException(Exception):
+    """A shift prediction couldn't be made for a structure."""
+
+
 def tag_visible(element):
     if element.parent.name in [
         "style",
@@ -121,9 +140,10 @@ app = typer.Typer()
 # noinspection PyUnusedLocal
 @import_app.command(no_args_is_help=True)
 def shifts(
-    code_or_file_name: str = typer.Argument(
+    codes_or_file_names: List[str] = typer.Argument(
         None,
-        help="file name to read shift data from or alphafold / pdb code to fetch data for",
+        help="""files to read shift data from or alphafold / pdb codes to fetch data for, with more than one the
+                predictions are requested from the server in parallel and each is added as a separate shift list""",
     ),
     source_chain: str = typer.Option(
         None, help="chain in the source coordinate file to predict shift data for"
@@ -157,6 +177,8 @@ def shifts(
         "--in",
         help="input to read NEF data from [- is stdin]",
     ),
+    offline: bool = typer.Option(False, "--offline", help=OFFLINE_HELP),
+    jobs: int = typer.Option(DEFAULT_JOBS, "-j", "--jobs", help=JOBS_HELP),
 ):
     """- read a shiftx2 chemical shift prediction or calculate from a pdb file directly or using a pdb, uniprot or
     alphafold id using the web server [alpha]"""
@@ -170,18 +192,41 @@ def shifts(
     if retain_structure and not structure_path:
         structure_path = "retained_{code}"
 
+    if not codes_or_file_names:
+        exit_error("no pdb codes or file names to predict shifts for were given")
+
+    exit_if_jobs_less_than_1(jobs)
+
+    set_http_cache_mode(HttpCacheMode.OFFLINE if offline else None)
+
     entry = read_or_create_entry_exit_error_on_bad_file(in_file, "shiftx2")
 
-    entry = pipe(
-        entry,
-        code_or_file_name,
-        source_chain,
-        chain,
-        alphafold,
-        structure_path,
-        verbose,
-    )
-    print(entry)
+    if len(codes_or_file_names) == 1:
+        try:
+            entry = pipe(
+                entry,
+                codes_or_file_names[0],
+                source_chain,
+                chain,
+                alphafold,
+                structure_path,
+                verbose,
+            )
+        except (Shiftx2PredictionException, HttpCacheMissException) as e:
+            exit_error(str(e))
+    else:
+        entry = pipe_many(
+            entry,
+            codes_or_file_names,
+            source_chain,
+            chain,
+            alphafold,
+            structure_path,
+            verbose,
+            jobs,
+        )
+
+    print_entry(entry)
 
 
 def pipe(
@@ -194,13 +239,179 @@ def pipe(
     verbose: bool = False,
 ) -> Entry:
 
+    structure_path = _ignore_structure_path_if_not_downloaded(
+        code_or_filename, alphafold, structure_path
+    )
+
+    prediction = _predict_shifts(
+        code_or_filename, source_chain, chain, alphafold, verbose
+    )
+
+    return _add_prediction_to_entry(
+        entry, prediction, "shiftx2", source_chain, chain, structure_path, verbose
+    )
+
+
+def pipe_many(
+    entry: Entry,
+    codes_or_filenames: List[str],
+    source_chain: str,
+    chain: str,
+    alphafold: bool,
+    structure_path: Optional[Path] = None,
+    verbose: bool = False,
+    jobs: int = DEFAULT_JOBS,
+) -> Entry:
+    """
+    predict shifts for many structures requesting up to jobs predictions from the server at once, each prediction
+    is added as a shift list named shiftx2_<code or file name> in the order the structures were given. Structures
+    whose prediction fails are reported as warnings and skipped, if all of them fail this exits with an error
+    """
+
+    structure_paths = [
+        _ignore_structure_path_if_not_downloaded(
+            code_or_filename, alphafold, structure_path
+        )
+        for code_or_filename in codes_or_filenames
+    ]
+    frame_names = _unique_frame_names(codes_or_filenames)
+
+    failures = []
+    with ThreadPoolExecutor(max_workers=min(jobs, len(codes_or_filenames))) as executor:
+        futures = [
+            executor.submit(
+                _predict_shifts_or_failure,
+                code_or_filename,
+                source_chain,
+                chain,
+                alphafold,
+                verbose,
+            )
+            for code_or_filename in codes_or_filenames
+        ]
+
+        for code_or_filename, frame_name, item_structure_path, future in zip(
+            codes_or_filenames, frame_names, structure_paths, futures
+        ):
+            prediction, failure = future.result()
+            if failure:
+                failures.append(code_or_filename)
+                warn(
+                    f"couldn't get a shiftx2 prediction for {code_or_filename} because\n{dedent(failure)}"
+                )
+                continue
+
+            entry = _add_prediction_to_entry(
+                entry,
+                prediction,
+                frame_name,
+                source_chain,
+                chain,
+                item_structure_path,
+                verbose,
+            )
+
+    if len(failures) == len(codes_or_filenames):
+        exit_error(
+            f"couldn't get shiftx2 predictions for any of {', '.join(codes_or_filenames)}"
+        )
+    elif failures:
+        warn(
+            f"{len(failures)} of {len(codes_or_filenames)} shiftx2 predictions failed: {', '.join(failures)}"
+        )
+
+    return entry
+
+
+@dataclass
+class _Prediction:
+    code_or_filename: str
+    shifts: List[ShiftData]
+    pdb_file_info: Optional[PDBDownloadResult]
+    alphafold: bool
+
+
+def _predict_shifts_or_failure(
+    code_or_filename, source_chain, chain, alphafold, verbose
+) -> Tuple[Optional[_Prediction], Optional[str]]:
+    from requests.exceptions import RequestException  # deferred
+
+    try:
+        prediction = _predict_shifts(
+            code_or_filename, source_chain, chain, alphafold, verbose
+        )
+    except (Shiftx2PredictionException, HttpCacheMissException, RequestException) as e:
+        return None, str(e) or type(e).__name__
+
+    return prediction, None
+
+
+def _ignore_structure_path_if_not_downloaded(
+    code_or_filename, alphafold, structure_path
+):
+
+    # TODO: this is 'a glorious hack' it may need redoing to remove technical debt
+    if structure_path and not alphafold:
+        file_path = Path(code_or_filename)
+        if _is_structure_file(file_path):
+            msg = f"""
+                a request to retain the structure used is ignored when the input is a pdb file (by extension)
+                the input path was: {str(file_path)}
+            """
+            warn(msg)
+            structure_path = None
+        elif not file_path.exists():
+            msg = f"""
+                a request to retain the structure used is ignored when submitting a pdb code directly to the server
+                the pdb code was: {code_or_filename}
+            """
+            warn(msg)
+            structure_path = None
+
+    return structure_path
+
+
+def _is_structure_file(file_path):
+    return file_path.suffix in [".pdb"]  # , '.mmcif'] # TODO: we should support mmcifs?
+
+
+def _unique_frame_names(codes_or_filenames):
+    result = []
+    seen = set()
+    for code_or_filename in codes_or_filenames:
+        name = (
+            Path(code_or_filename).stem
+            if Path(code_or_filename).exists()
+            else code_or_filename
+        )
+        name = re.sub(r"[^A-Za-z0-9_.-]", "_", f"shiftx2_{name}")
+
+        unique_name = name
+        index = 2
+        while unique_name in seen:
+            unique_name = f"{name}_{index}"
+            index += 1
+        seen.add(unique_name)
+
+        result.append(unique_name)
+
+    return result
+
+
+def _predict_shifts(
+    code_or_filename: str,
+    source_chain: str,
+    chain: str,
+    alphafold: bool,
+    verbose: bool = False,
+) -> _Prediction:
+
     if not chain and source_chain:
         chain = source_chain
 
     file_path = Path(code_or_filename)
-    is_structure_file = file_path.suffix in [
-        ".pdb"
-    ]  # , '.mmcif'] # TODO: we should support mmcifs?
+    is_structure_file = _is_structure_file(file_path)
+    pdb_file_info = None
     if file_path.exists() and not is_structure_file:
         shifts = _read_shifts_from_file(file_path, chain)
     else:
@@ -213,16 +424,6 @@ def pipe(
             use_file = True
         elif is_structure_file:
 
-            # TODO: this is 'a glorious hack' it may need redoing to remove technical debt
-            if structure_path:
-                msg = f"""
-                    a request to retain the structure used is ignored when the input is a pdb file (by extension)
-                    the input path was: {str(file_path)}
-                """
-
-                warn(msg)
-                structure_path = None
-
             pdb_file_info = PDBDownloadResult(
                 pdb_uniprot_start=None,
                 pdb_uniprot_end=None,
@@ -240,15 +441,6 @@ def pipe(
             use_file = True
         else:
             use_file = False
-            if structure_path:
-                msg = f"""
-                    a request to retain the structure used is ignored when submitting a pdb code directly to the server
-                    the pdb code was: {code_or_filename}
-                """
-
-                warn(msg)
-                structure_path = None
-            pdb_file_info = None
 
         timeout = DEFAULT_TIMEOUT
         pdb_content = pdb_file_info.pdb_content if alphafold else None
@@ -260,7 +452,8 @@ def pipe(
                 use_file=use_file,
                 pdb_content=pdb_content,
             )
-            time.sleep(timeout)
+            if not request.from_cache:
+                time.sleep(timeout)
             if shifts:
                 break
             elif verbose:
@@ -275,14 +468,31 @@ def pipe(
                         f"timeout too short increase timeout from {old_timeout}s -> {timeout}"
                     )
 
-        _exit_if_too_many_attempted_connections(
+        _raise_if_too_many_attempted_connections(
             shifts, code_or_filename, SHIFTX2_RETRY_COUNT
         )
 
-    shift_list = ShiftList(shifts)
-    frame = shifts_to_nef_frame(shift_list, "shiftx2")
+    return _Prediction(code_or_filename, shifts, pdb_file_info, alphafold)
 
-    entry.add_saveframe(frame)
+
+def _add_prediction_to_entry(
+    entry: Entry,
+    prediction: _Prediction,
+    frame_name: str,
+    source_chain: str,
+    chain: str,
+    structure_path: Optional[Path],
+    verbose: bool,
+) -> Entry:
+
+    pdb_file_info = prediction.pdb_file_info
+    alphafold = prediction.alphafold
+
+    if alphafold:
+        _note_uniprot_mapping_if_verbose(pdb_file_info, verbose)
+
+    shift_list = ShiftList(prediction.shifts)
+    frame = shifts_to_nef_frame(shift_list, frame_name)
 
     if not chain and source_chain:
         chain = source_chain
@@ -325,7 +535,12 @@ def pipe(
 
             chain_bounds = {chain: chain_bounds}
 
-            entry = trim(entry, "shiftx2", SelectionType.NAME, chain_bounds)
+            # trim in an entry of its own so only the new frame is selected
+            frame_entry = Entry.from_scratch(frame_name)
+            frame_entry.add_saveframe(frame)
+            trim(frame_entry, frame.name, SelectionType.NAME, chain_bounds)
+
+    entry.add_saveframe(frame)
 
     _retain_structure_if_requested(structure_path, pdb_file_info, verbose)
 
@@ -385,12 +600,12 @@ def _increment_timeout(timeout):
     return timeout
 
 
-def _exit_if_too_many_attempted_connections(shifts, code_or_filename, RETRY_COUNT):
+def _raise_if_too_many_attempted_connections(shifts, code_or_filename, RETRY_COUNT):
     if not shifts:
         msg = f"""\
             couldn't get a shiftx2 prediction for {code_or_filename} after {RETRY_COUNT} retries
             """
-        exit_error(msg.strip())
+        raise Shiftx2PredictionException(msg.strip())
 
 
 class ShiftFormat(Enum):
@@ -438,7 +653,7 @@ def _parse_text_to_shifts(text, cli_chain_code, source):
                         the first line in the file was
                         {line}
                         """
-                exit_error(msg)
+                raise Shiftx2PredictionException(msg)
         lines.append(line)
 
     columns = {
@@ -600,21 +815,20 @@ def _get_shifts_from_server(
         )
         data["pdbid"] = pdb_file_or_code
 
-    if use_file:
-        request = requests.request("POST", CGI_URL, data=data, files=files)
-    else:
-        request = requests.request("POST", CGI_URL, data=data)
+    # only pages with a link to the predictions are cached so busy or error pages are retried
+    request = cached_request(
+        "POST", CGI_URL, data=data, files=files, cache_if=_has_predictions_link
+    )
 
     if fh and not isinstance(fh, io.BytesIO):
         fh.close()
 
-    soup = BeautifulSoup(request.text, features="html.parser")
     shifts = ""
-    putative_links = soup.find_all("a", href=True, string="download predictions")
+    putative_links = _find_predictions_links(request)
     if putative_links:
         link = putative_links[0]["href"]
         data_url = f"{ROOT_URL}/{link}"
-        data_r = requests.get(data_url)
+        data_r = cached_get(data_url)
         text = data_r.text
 
         shifts = _parse_text_to_shifts(text, cli_chain_code, CGI_URL)
@@ -622,6 +836,15 @@ def _get_shifts_from_server(
     return shifts, request
 
 
+def _find_predictions_links(request):
+    soup = BeautifulSoup(request.text, features="html.parser")
+    return soup.find_all("a", href=True, string="download predictions")
+
+
+def _has_predictions_link(request):
+    return request.ok and bool(_find_predictions_links(request))
+
+
 def _warn(msg):
     msg = dedent(msg)
     msg = f"WARNING: {msg}"
@@ -711,7 +934,7 @@ def _get_filename_from_url(url=None):
     return os.path.basename(urlpath)
 
 
-def _exit_if_alphafold_network_bad(alphafold_result):
+def _raise_if_alphafold_network_bad(alphafold_result):
     if not alphafold_result.network_ok:
         msg = f"""
            failed to get alphafold structure url using uniprot id {alphafold_result.uniprot_id} which was
@@ -720,10 +943,10 @@ def _exit_if_alphafold_network_bad(alphafold_result):
            could not be accessed is there a network problem?
         """
 
-        exit_error(msg)
+        raise Shiftx2PredictionException(msg)
 
 
-def _exit_if_pdb_download_bad(pdb_file_data: PDBDownloadResult):
+def _raise_if_pdb_download_bad(pdb_file_data: PDBDownloadResult):
 
     msg = None
     if not pdb_file_data.network_ok:
@@ -741,26 +964,24 @@ def _exit_if_pdb_download_bad(pdb_file_data: PDBDownloadResult):
             """
 
     if msg:
-        exit_error(msg)
+        raise Shiftx2PredictionException(msg)
 
 
 def _pdb_code_to_alphafold_pdb_file(code_or_filename, source_chain, verbose):
 
     mapping = _convert_pdb_code_to_uniprot_id(code_or_filename, source_chain)
 
-    _exit_if_pdb_to_uniprot_network_failure(mapping)
-    _exit_if_pdb_to_uniprot_mapping_fails(code_or_filename, mapping)
+    _raise_if_pdb_to_uniprot_network_failure(mapping)
+    _raise_if_pdb_to_uniprot_mapping_fails(code_or_filename, mapping)
 
     alphafold_result = _get_alphafold_pdb_url_from_uniprot_id(mapping)
 
-    _exit_if_alphafold_network_bad(alphafold_result)
-    _exit_if_alphafold_uniprot_to_pdb_url_fails(alphafold_result)
-
-    _note_uniprot_mapping_if_verbose(alphafold_result, verbose)
+    _raise_if_alphafold_network_bad(alphafold_result)
+    _raise_if_alphafold_uniprot_to_pdb_url_fails(alphafold_result)
 
     pdb_file_data = _download_pdb_file(alphafold_result)
 
-    _exit_if_pdb_download_bad(pdb_file_data)
+    _raise_if_pdb_download_bad(pdb_file_data)
 
     return pdb_file_data
 
@@ -783,7 +1004,7 @@ def _note_uniprot_mapping_if_verbose(mapping, verbose):
 
 def _download_pdb_file(alphafold_result: AlphafoldResult) -> PDBDownloadResult:
     """Download a PDB file from the AlphaFold URL and return its content in memory."""
-    response = requests.get(alphafold_result.pdb_url)
+    response = cached_get(alphafold_result.pdb_url)
 
     network_ok = response.status_code == NETWORK_200_OK
     data = response.text if network_ok else None
@@ -813,7 +1034,7 @@ def _get_alphafold_pdb_url_from_uniprot_id(
         uniprot_id=mapping.uniprot_id, alphafold_key=ALPHA_FOLD_KEY
     )
 
-    response = requests.get(alphafold_url)
+    response = cached_get(alphafold_url)
 
     network_ok = response.status_code == NETWORK_200_OK
 
@@ -844,21 +1065,21 @@ def _get_alphafold_pdb_url_from_uniprot_id(
     return alphafold_result
 
 
-def _exit_if_alphafold_uniprot_to_pdb_url_fails(alphafold_result):
+def _raise_if_alphafold_uniprot_to_pdb_url_fails(alphafold_result):
     if not alphafold_result.pdb_url:
         msg = f"""
            failed to get alphafold structure url using uniprot id {alphafold_result.uniprot_id} which was
            mapped from pdb code {alphafold_result.pdb_code}. Is thisfor a structure not in the embl database
            [eg a virus, or a bacterium like E.coli]?
            """
-        exit_error(msg)
+        raise Shiftx2PredictionException(msg)
 
 
 def _convert_pdb_code_to_uniprot_id(
     code_or_filename, source_chain
 ) -> PdbUniprotMapping:
 
-    response = requests.get(
+    response = cached_get(
         PDB_UNIPROT_MAPPING_URL_TEMPLATE.format(code_or_filename=code_or_filename)
     )
 
@@ -910,7 +1131,7 @@ def _convert_pdb_code_to_uniprot_id(
     return result
 
 
-def _exit_if_pdb_to_uniprot_network_failure(mapping: PdbUniprotMapping):
+def _raise_if_pdb_to_uniprot_network_failure(mapping: PdbUniprotMapping):
 
     if not mapping.network_ok:
         msg = f"""
@@ -919,10 +1140,10 @@ def _exit_if_pdb_to_uniprot_network_failure(mapping: PdbUniprotMapping):
 
         {PDB_UNIPROT_MAPPING_URL_TEMPLATE.format(code_or_filename=mapping.pdb_code)}
         """
-        exit_error(msg)
+        raise Shiftx2PredictionException(msg)
 
 
-def _exit_if_pdb_to_uniprot_mapping_fails(code, mapping: PdbUniprotMapping):
+def _raise_if_pdb_to_uniprot_mapping_fails(code, mapping: PdbUniprotMapping):
 
     if mapping.uniprot_id is None:
         mapping_table = []
@@ -959,4 +1180,4 @@ def _exit_if_pdb_to_uniprot_mapping_fails(code, mapping: PdbUniprotMapping):
             source_chain=mapping["chain_id"],
             mapping_table=mapping_table,
         )
-        exit_error(msg)
+        raise Shiftx2PredictionException(msg)
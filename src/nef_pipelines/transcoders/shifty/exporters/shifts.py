@@ -7,6 +7,7 @@ from pynmrstar import Entry, Saveframe
 from tabulate import tabulate
 
 from nef_pipelines.lib.nef_lib import (
+    print_entry,
     read_entry_from_stdin_or_exit,
     select_frames_by_name,
 )
@@ -104,7 +105,7 @@ def shifts(
     entry = pipe(entry, shift_frames, chain_code, infill, sequence_lookup, output_file)
 
     if not (sys.stdout.isatty() or output_file == STDOUT):
-        print(entry)
+        print_entry(entry)
 
 
 def pipe(
@@ -13,6 +13,7 @@ from tabulate import tabulate
 
 from nef_pipelines.lib.nef_lib import (
     UNUSED,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
     select_frames_by_name,
 )
@@ -173,7 +174,7 @@ def peaks(
 def _output_entry_if_required(entry, output_to_files):
 
     if (not sys.stdout.isatty()) and output_to_files:
-        print(entry)
+        print_entry(entry)
 
 
 def _write_output_tables(sparky_lines, output_to_files):
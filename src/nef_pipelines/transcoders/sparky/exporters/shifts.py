@@ -9,6 +9,7 @@ from tabulate import tabulate
 from nef_pipelines.lib.nef_lib import (
     UNUSED,
     SelectionType,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
     select_frames,
 )
@@ -104,7 +105,7 @@ def shifts(
     _write_output_files(shift_files, output_to_stdout, force)
 
     if not sys.stdout.isatty() and not output_to_stdout:
-        print(entry)
+        print_entry(entry)
 
 
 def pipe(
@@ -10,8 +10,14 @@ from nef_pipelines.lib.isotope_lib import ATOM_TO_ISOTOPE, convert_isotopes
 from nef_pipelines.lib.nef_lib import (
     UNUSED,
     add_frames_to_entry,
+    print_entry,
     read_or_create_entry_exit_error_on_bad_file,
 )
+from nef_pipelines.lib.parallel_lib import (
+    JOBS_HELP,
+    exit_if_jobs_less_than_1,
+    run_per_file,
+)
 from nef_pipelines.lib.peak_lib import peaks_to_frame
 from nef_pipelines.lib.sequence_lib import MoleculeTypes, sequence_from_entry
 from nef_pipelines.lib.structures import NewPeak
@@ -88,6 +94,7 @@ def peaks(
     spectrometer_frequency: float = typer.Option(
         600.123456789, help="spectrometer frequency in MHz"
     ),
+    jobs: int = typer.Option(1, "-j", "--jobs", help=JOBS_HELP),
 ):
     """convert sparky peaks file <SPARKY-PEAKS>.txt to NEF"""
 
@@ -102,6 +109,8 @@ def peaks(
     # make this a library function
     _exit_if_number_chain_codes_and_file_names_dont_match(chain_codes, file_names)
 
+    exit_if_jobs_less_than_1(jobs)
+
     entry = read_or_create_entry_exit_error_on_bad_file(input)
 
     sequence = sequence_from_entry(entry) if not no_validate else None
@@ -140,13 +149,14 @@ def peaks(
             input_dimensions=nuclei,
             spectrometer_frequency=spectrometer_frequency,
             molecule_type=molecule_type,
+            jobs=jobs,
         )
     except NoIsotopesOnAxisException as e:
         msg = f"{e}. You need to define the isotopes on these axes with the --nuclei option"
 
         exit_error(msg)
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
@@ -158,25 +168,23 @@ def pipe(
     input_dimensions,
     spectrometer_frequency,
     molecule_type=MoleculeTypes.PROTEIN,
+    jobs=1,
 ):
 
     sparky_frames = []
 
-    for file_name, lines in file_names_and_lines.items():
+    peaks_and_dimensions = run_per_file(
+        _parse_peaks_and_dimensions,
+        [
+            (file_name, lines, chain_code, sequence, input_dimensions, molecule_type)
+            for file_name, lines in file_names_and_lines.items()
+        ],
+        jobs,
+    )
 
-        sparky_peaks = parse_peaks(
-            lines,
-            file_name=file_name,
-            molecule_type=molecule_type,
-            chain_code=chain_code,
-            sequence=sequence,
-        )
-
-        sparky_peaks = [translate_new_peak(peak) for peak in sparky_peaks]
-
-        dimensions = _guess_dimensions_if_not_defined_or_throw(
-            sparky_peaks, input_dimensions, file_name
-        )
+    for file_name, (sparky_peaks, dimensions) in zip(
+        file_names_and_lines, peaks_and_dimensions
+    ):
 
         dimensions = [{"axis_code": dimension} for dimension in dimensions]
 
@@ -193,6 +201,26 @@ def pipe(
     return add_frames_to_entry(entry, sparky_frames)
 
 
+def _parse_peaks_and_dimensions(
+    file_name, lines, chain_code, sequence, input_dimensions, molecule_type
+):
+    sparky_peaks = parse_peaks(
+        lines,
+        file_name=file_name,
+        molecule_type=molecule_type,
+        chain_code=chain_code,
+        sequence=sequence,
+    )
+
+    sparky_peaks = [translate_new_peak(peak) for peak in sparky_peaks]
+
+    dimensions = _guess_dimensions_if_not_defined_or_throw(
+        sparky_peaks, input_dimensions, file_name
+    )
+
+    return sparky_peaks, dimensions
+
+
 def _guess_dimensions_if_not_defined_or_throw(
     peaks: List[NewPeak], input_dimensions: List[str], file_name
 ) -> List[str]:
@@ -6,6 +6,7 @@ import typer
 from nef_pipelines.lib.nef_lib import (
     UNUSED,
     add_frames_to_entry,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
 )
 from nef_pipelines.lib.sequence_lib import (
@@ -78,7 +79,7 @@ def shifts(
 
     entry = pipe(entry, chain_codes, frame_name, file_names)
 
-    print(entry)
+    print_entry(entry)
 
 
 def _exit_if_number_chain_codes_and_file_names_dont_match(chain_codes, file_names):
@@ -15,6 +15,7 @@ from strenum import StrEnum
 from nef_pipelines.lib.nef_lib import (
     UNUSED,
     add_frames_to_entry,
+    print_entry,
     read_file_or_exit,
     read_or_create_entry_exit_error_on_bad_file,
 )
@@ -106,7 +107,7 @@ def restraints(
 
     entry = pipe(entry, lines, file_name, chain_code, frame_name, class_to_merit)
 
-    print(entry)
+    print_entry(entry)
 
 
 def _parse_merits_and_merge(merits):
@@ -8,6 +8,7 @@ from nef_pipelines.lib.nef_frames_lib import NEF_PIPELINES_NAMESPACE
 from nef_pipelines.lib.nef_lib import (
     UNUSED,
     create_nef_save_frame,
+    print_entry,
     read_file_or_exit,
     read_or_create_entry_exit_error_on_bad_file,
 )
@@ -65,7 +66,7 @@ def secondary_structure(
 
     entry = pipe(entry, lines, chain_code, frame_name, file_name, include_predictions)
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
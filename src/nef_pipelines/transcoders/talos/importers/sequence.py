@@ -5,6 +5,7 @@ import typer
 from pynmrstar import Entry
 
 from nef_pipelines.lib.nef_lib import (
+    print_entry,
     read_file_or_exit,
     read_or_create_entry_exit_error_on_bad_file,
 )
@@ -52,7 +53,7 @@ def sequence(
 
     entry = pipe(entry, lines, chain_code, no_chain_start, no_chain_end, file_name)
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
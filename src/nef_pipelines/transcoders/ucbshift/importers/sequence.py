@@ -10,6 +10,7 @@ from strenum import LowercaseStrEnum
 
 from nef_pipelines.lib.nef_lib import (
     NEF_MOLECULAR_SYSTEM,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
 )
 from nef_pipelines.lib.sequence_lib import sequence_from_entry, sequence_to_nef_frame
@@ -93,7 +94,7 @@ def sequence(
         entry, chain_mode, chain_code, file_paths, no_chain_starts, no_chain_ends
     )
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(entry, chain_mode, chain_code, file_paths, no_chain_starts, no_chain_ends):
@@ -5,6 +5,7 @@ import typer
 
 from nef_pipelines.lib.nef_lib import (
     add_frames_to_entry,
+    print_entry,
     read_or_create_entry_exit_error_on_bad_file,
 )
 from nef_pipelines.lib.sequence_lib import get_chain_code_iter
@@ -62,7 +63,7 @@ def shifts(
 
     entry = pipe(entry, chain_codes, frame_name, file_names, prediction_type)
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(entry, chain_codes, frame_name_template, file_names, prediction_type):
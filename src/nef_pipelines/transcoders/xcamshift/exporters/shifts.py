@@ -8,6 +8,7 @@ from tabulate import tabulate
 
 from nef_pipelines.lib.nef_lib import (
     UNUSED,
+    print_entry,
     read_entry_from_stdin_or_exit,
     select_frames_by_name,
 )
@@ -54,7 +55,7 @@ def shifts(
     entry = pipe(entry, shift_frames, output_file)
 
     if not (sys.stdout.isatty() or output_file == STDOUT):
-        print(entry)
+        print_entry(entry)
 
 
 def pipe(entry: Entry, shift_frames: List[Saveframe], output_file: Path) -> Entry:
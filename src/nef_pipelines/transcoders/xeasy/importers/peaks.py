@@ -5,8 +5,14 @@ import typer
 
 from nef_pipelines.lib.nef_lib import (
     add_frames_to_entry,
+    print_entry,
     read_or_create_entry_exit_error_on_bad_file,
 )
+from nef_pipelines.lib.parallel_lib import (
+    JOBS_HELP,
+    exit_if_jobs_less_than_1,
+    run_per_file,
+)
 from nef_pipelines.lib.peak_lib import peaks_to_frame
 from nef_pipelines.lib.sequence_lib import (
     sequence_from_entry_or_exit,
@@ -59,9 +65,12 @@ def peaks(
     spectrometer_frequency: float = typer.Option(
         600.123456789, help="spectrometer frequency in MHz"
     ),
+    jobs: int = typer.Option(1, "-j", "--jobs", help=JOBS_HELP),
 ):
     """convert xeasy peaks file <XEASY-PEAKS>.peaks to NEF"""
 
+    exit_if_jobs_less_than_1(jobs)
+
     entry = read_or_create_entry_exit_error_on_bad_file(input)
 
     sequence = sequence_from_entry_or_exit(entry)
@@ -72,9 +81,10 @@ def peaks(
         file_names,
         sequence,
         spectrometer_frequency=spectrometer_frequency,
+        jobs=jobs,
     )
 
-    print(entry)
+    print_entry(entry)
 
 
 def pipe(
@@ -83,23 +93,20 @@ def pipe(
     file_names,
     sequence,
     spectrometer_frequency,
+    jobs=1,
 ):
 
     xeasy_frames = []
 
     residue_type_lookup = sequence_to_residue_name_lookup(sequence)
-    for file_name in file_names:
 
-        with file_name.open() as fh:
-            lines = fh.readlines()
-
-        spectrum_type, dimension_info, peaks = parse_peaks(
-            lines, file_name, residue_type_lookup
-        )
+    peaks_and_dimensions = run_per_file(
+        _read_peaks_file,
+        [(file_name, residue_type_lookup) for file_name in file_names],
+        jobs,
+    )
 
-        dimensions = _guess_dimensions_if_not_defined_or_throw(
-            peaks, dimension_info, file_name
-        )
+    for file_name, (peaks, dimensions) in zip(file_names, peaks_and_dimensions):
 
         dimensions = [{"axis_code": dimension.axis_code} for dimension in dimensions]
 
@@ -114,3 +121,18 @@ def pipe(
         xeasy_frames.append(frame)
 
     return add_frames_to_entry(entry, xeasy_frames)
+
+
+def _read_peaks_file(file_name, residue_type_lookup):
+    with Path(file_name).open() as fh:
+        lines = fh.readlines()
+
+    spectrum_type, dimension_info, peaks = parse_peaks(
+        lines, file_name, residue_type_lookup
+    )
+
+    dimensions = _guess_dimensions_if_not_defined_or_throw(
+        peaks, dimension_info, file_name
+    )
+
+    return peaks, dimensions
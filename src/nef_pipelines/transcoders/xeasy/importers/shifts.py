@@ -5,6 +5,7 @@ import typer
 
 from nef_pipelines.lib.nef_lib import (
     add_frames_to_entry,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
 )
 from nef_pipelines.lib.sequence_lib import (
@@ -66,4 +67,4 @@ def pipe(entry, sequence, entry_name, file_names):
 
     entry = add_frames_to_entry(entry, xeasy_frames)
 
-    print(entry)
+    print_entry(entry)
@@ -5,7 +5,7 @@ from typing import List
 
 import typer
 
-from nef_pipelines.lib.nef_lib import file_name_path_to_frame_name
+from nef_pipelines.lib.nef_lib import file_name_path_to_frame_name, print_entry
 from nef_pipelines.lib.sequence_lib import (
     ANY_CHAIN,
     get_sequence_or_exit,
@@ -80,4 +80,4 @@ def dihedrals(
         [nef_restraints], Namespace(pipe=None, entry_name="xplor_dihedral_restraints")
     )
 
-    print(entry)
+    print_entry(entry)
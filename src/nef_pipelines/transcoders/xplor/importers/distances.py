@@ -7,6 +7,7 @@ import typer
 from nef_pipelines.lib.nef_lib import (
     add_frames_to_entry,
     file_name_path_to_frame_name,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
 )
 from nef_pipelines.lib.sequence_lib import (
@@ -80,4 +81,4 @@ def distances(
 
     entry = add_frames_to_entry(entry, [nef_restraints])
 
-    print(entry)
+    print_entry(entry)
@@ -7,6 +7,7 @@ from pynmrstar import Entry
 
 from nef_pipelines.lib.nef_lib import (
     NEF_MOLECULAR_SYSTEM,
+    print_entry,
     read_entry_from_file_or_stdin_or_exit_error,
 )
 from nef_pipelines.lib.sequence_lib import sequence_from_entry, sequence_to_nef_frame
@@ -92,4 +93,4 @@ def sequence(
     entry.add_saveframe(sequence_frame)
 
     if not quiet:
-        print(entry)
+        print_entry(entry)
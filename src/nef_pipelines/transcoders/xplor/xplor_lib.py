@@ -1,8 +1,10 @@
+import re
 from collections import UserList
+from dataclasses import dataclass
 from functools import partial
 from pathlib import Path
 from textwrap import dedent
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Tuple, Union
 
 from pynmrstar import Loop, Saveframe
 from pyparsing import (
@@ -349,6 +351,10 @@ _distance_restraint = Group(
 
 _distance_restraints = OneOrMore(_distance_restraint)
 
+# used for single restraints the fast scanner can't read, ignore is only called once as each call adds a new copy of
+# the comment expression
+_commented_distance_restraint = _distance_restraint.copy().ignore(XPLOR_COMMENT)
+
 
 def _remove_xplor_comments(data_lines: List[str]) -> List[str]:
     result = []
@@ -726,6 +732,285 @@ def parse_dihedral_restraints(
     return restraints
 
 
+# a hand written scanner for the common forms of distance restraint, restraints are read one at a time
+#   assign (segid A and resid 1 and name HA) (resid 2 and name HB#) 3.0 1.2 0.5
+#   assign ((resid 1 and name HA) or (resid 1 and name HB)) (resid 2 and name HB#) 3.0 1.2 0.5
+# restraints the scanner can't read are read by the pyparsing grammar
+_SKIPPED_TEXT = re.compile(r"(?:\s+|!.*)*")
+_SCANNER_TOKEN = re.compile(r"[()]|[^\s()!]+")
+_SCANNER_REST_OF_LINE = re.compile(r".*")
+_SCANNER_RESIDUE_NUMBER = re.compile(r"-?[0-9]+")
+_SCANNER_ATOM_NAME = re.compile(r"[A-Za-z0-9*%#+'\"]+")
+_SCANNER_SEGID = re.compile(r"[A-Za-z0-9]{1,4}")
+_SCANNER_NUMBER = re.compile(r"[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?")
+
+
+class _NotScannable(Exception):
+    ...
+
+
+@dataclass
+class _ScannedSelection:
+    # or'd terms each of which is a list of (factor name, value) pairs, nested selections are bracketed terms
+    terms: List[List[Tuple[str, Union[str, int]]]]
+    nested: bool
+
+
+@dataclass
+class _ScannedDistanceRestraint:
+    selections: List[_ScannedSelection]
+    distance: float
+    distance_minus: float
+    distance_plus: float
+    extra_info: str
+
+
+@dataclass
+class _ParsedDistanceRestraint:
+    atoms: List[AtomLabel]
+    distance: float
+    distance_minus: float
+    distance_plus: float
+    extra_info: str
+
+
+def _is_keyword(word: str, literal: str, min_length: int = 4) -> bool:
+    # the same matches as _expand_literal
+    return len(word) >= min_length and literal.startswith(word.lower())
+
+
+class _DistanceRestraintScanner:
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+
+    def skip(self) -> int:
+        self.pos = _SKIPPED_TEXT.match(self.text, self.pos).end()
+        return self.pos
+
+    def peek(self) -> str:
+        self.skip()
+        match = _SCANNER_TOKEN.match(self.text, self.pos)
+        return match.group() if match else ""
+
+    def next(self) -> str:
+        token = self.peek()
+        if not token:
+            raise _NotScannable()
+        self.pos += len(token)
+        return token
+
+    def expect(self, expected: str):
+        if self.next() != expected:
+            raise _NotScannable()
+
+    def value(self, pattern: re.Pattern) -> str:
+        token = self.next()
+        if not pattern.fullmatch(token):
+            raise _NotScannable()
+        return token
+
+    def at_assign_or_end(self) -> bool:
+        token = self.peek()
+        return not token or _is_keyword(token, ASSIGN)
+
+    def factor(self) -> Tuple[str, Union[str, int]]:
+        keyword = self.next()
+
+        if _is_keyword(keyword, SEGMENT_IDENTIFIER_LITERAL):
+            result = SEGID, self.value(_SCANNER_SEGID)
+        elif _is_keyword(keyword, RESIDUE_LITERAL):
+            result = RESID, int(self.value(_SCANNER_RESIDUE_NUMBER))
+        elif keyword.lower() == ATOM_NAME_LITERAL:
+            result = ATOM, self.value(_SCANNER_ATOM_NAME)
+        else:
+            raise _NotScannable()
+
+        return result
+
+    def term(self) -> List[Tuple[str, Union[str, int]]]:
+        factors = [self.factor()]
+        while self.peek().lower() == AND.lower():
+            self.next()
+            factors.append(self.factor())
+        return factors
+
+    def selection(self) -> _ScannedSelection:
+        self.expect(LEFT_PARENTHESIS)
+
+        nested = self.peek() == LEFT_PARENTHESIS
+        if not nested:
+            terms = [self.term()]
+            self.expect(RIGHT_PARENTHESIS)
+        else:
+            terms = []
+            while True:
+                self.expect(LEFT_PARENTHESIS)
+                terms.append(self.term())
+                self.expect(RIGHT_PARENTHESIS)
+
+                token = self.next()
+                if token == RIGHT_PARENTHESIS:
+                    break
+                elif token.lower() != OR.lower():
+                    raise _NotScannable()
+
+        return _ScannedSelection(terms, nested)
+
+    def distance_restraint(self) -> _ScannedDistanceRestraint:
+        if not _is_keyword(self.next(), ASSIGN):
+            raise _NotScannable()
+
+        selections = [self.selection(), self.selection()]
+        distance, distance_minus, distance_plus = [
+            float(self.value(_SCANNER_NUMBER)) for _ in range(3)
+        ]
+
+        extra_info = _SCANNER_REST_OF_LINE.match(self.text, self.pos).group()
+        self.pos += len(extra_info)
+        extra_info = extra_info.strip()
+        if extra_info.startswith(XPLOR_COMMENT_TOKEN):
+            extra_info = ""
+
+        if not self.at_assign_or_end():
+            raise _NotScannable()
+
+        return _ScannedDistanceRestraint(
+            selections, distance, distance_minus, distance_plus, extra_info
+        )
+
+    def skip_to_next_assign(self) -> int:
+        self.next()
+        while not self.at_assign_or_end():
+            self.next()
+        return self.pos
+
+
+def _scan_distance_restraints(
+    text: str,
+) -> Iterator[Tuple[int, int, Union[_ScannedDistanceRestraint, None]]]:
+    """
+    find the distance restraints in a text one at a time
+
+    :param text: xplor distance restraints
+    :return: an iterator of the start and end of each restraint in the text and the restraint as read by the scanner
+             or None if the scanner can't read it
+    """
+    scanner = _DistanceRestraintScanner(text)
+
+    start = scanner.skip()
+    if start == len(text):
+        yield 0, len(text), None
+
+    while start < len(text):
+        try:
+            restraint = scanner.distance_restraint()
+            end = scanner.pos
+        except _NotScannable:
+            restraint = None
+            scanner.pos = start
+            end = scanner.skip_to_next_assign()
+
+        yield start, end, restraint
+
+        start = scanner.skip()
+
+
+def _scanned_atom_label(
+    selection: _ScannedSelection,
+    residue_types: Dict[Tuple[str, str], str],
+    default_chain_code: str,
+) -> Union[AtomLabel, None]:
+
+    # anything other than a single atom is left for _get_single_atom_selection to report, this includes nested
+    # selections as restraints only accept single atom selections at the top level
+    if selection.nested:
+        return None
+
+    values = {SEGID: [], RESID: [], ATOM: []}
+    for name, value in selection.terms[0]:
+        values[name].append(value)
+
+    if len(values[RESID]) != 1 or len(values[ATOM]) != 1 or len(values[SEGID]) > 1:
+        return None
+
+    sequence_code = values[RESID][0]
+    chain_code = values[SEGID][0] if values[SEGID] else default_chain_code
+
+    residue_type_key = chain_code, str(sequence_code)
+    if residue_type_key not in residue_types:
+        return None
+
+    residue = SequenceResidue(
+        chain_code, sequence_code, residue_types[residue_type_key]
+    )
+    return AtomLabel(residue, values[ATOM][0])
+
+
+def _parse_distance_restraint_or_exit_error(
+    restraint_text: str,
+    start: int,
+    end: int,
+    number: int,
+    residue_name_lookup: Dict[Tuple[str, str], str],
+    file_path_display_name: str,
+    chain_code: str,
+) -> _ParsedDistanceRestraint:
+
+    try:
+        restraint = _commented_distance_restraint.parse_string(
+            restraint_text[start:end], parse_all=True
+        )[0]
+    except ParseException as parse_exception:
+        # report the position in the file rather than in the restraint
+        parse_exception = ParseException(
+            restraint_text, start + parse_exception.loc, parse_exception.msg
+        )
+        msg = f"""\
+            failed to read distance restraints from the file {file_path_display_name} because:
+            {str(parse_exception)}
+        """
+        exit_error(msg)
+
+    atom_selections = []
+
+    for atom_index in range(1, 3):
+
+        xplor_atoms = restraint.get(f"atoms_{atom_index}")[0]
+
+        try:
+            nef_atoms = _get_single_atom_selection(
+                xplor_atoms, residue_name_lookup, chain_code
+            )
+
+        except XPLORParseException as e:
+            atom_number = end_with_ordinal(atom_index)
+            approximate_restraint = _get_approximate_restraint_strings(
+                restraint_text[start:end]
+            )[0]
+            approximate_restraint = approximate_restraint.split("\n")
+            msg = f"""\
+                got a multi atom selection for the {atom_number} atom in restraint number {number}
+                in {file_path_display_name}
+                distance restraints require single atom selections...
+                the restraint text is most probably:
+            """
+            msg = dedent(msg)
+            for elem in approximate_restraint:
+                msg += f"    {elem}\n"
+            exit_error(msg, e)
+
+        atom_selections.append(nef_atoms)
+
+    return _ParsedDistanceRestraint(
+        atom_selections,
+        restraint.get(DISTANCE),
+        restraint.get(DISTANCE_MINUS),
+        restraint.get(DISTANCE_PLUS),
+        restraint.get(EXTRA_INFO).strip(),
+    )
+
+
 def parse_distance_restraints(
     restraint_text: str,
     residue_name_lookup: Dict[Tuple[str, str], str],
@@ -734,7 +1019,8 @@ def parse_distance_restraints(
     use_chains: bool = False,
 ) -> List[DistanceRestraint]:
     """
-    parse xplor distance restraints into DistanceRestraint structures
+    parse xplor distance restraints into DistanceRestraint structures, restraints are read one at a time by a fast
+    scanner and any it can't read are read by the full pyparsing grammar
 
     :param restraint_text: the text of the restraints in xplor format
     :param residue_name_lookup: a lookup for residue names from a  chain_code, residue_code key
@@ -743,67 +1029,51 @@ def parse_distance_restraints(
     :param use_chains: use the passed in chain_code rather than any read segids
     :return:  a list of dihedral restraints
     """
-    try:
-        xplor_basic_restraints = _distance_restraints.ignore(
-            XPLOR_COMMENT
-        ).parse_string(restraint_text)
-    except ParseException as parse_exception:
-        msg = f"""\
-            failed to read distance restraints from the file {file_path_display_name} because:
-            {str(parse_exception)}
-        """
-        exit_error(msg)
 
     restraints = []
-    for i, restraint in enumerate(xplor_basic_restraints, start=1):
-
-        atom_selections = []
-
-        for atom_index in range(1, 3):
-
-            xplor_atoms = restraint.get(f"atoms_{atom_index}")[0]
-
-            try:
-                nef_atoms = _get_single_atom_selection(
-                    xplor_atoms, residue_name_lookup, chain_code
-                )
+    for i, (start, end, scanned) in enumerate(
+        _scan_distance_restraints(restraint_text), start=1
+    ):
 
-            except XPLORParseException as e:
-                atom_number = end_with_ordinal(atom_index)
-                approximate_restraints = _get_approximate_restraint_strings(
-                    restraint_text
+        restraint = None
+        if scanned is not None:
+            atom_selections = [
+                _scanned_atom_label(selection, residue_name_lookup, chain_code)
+                for selection in scanned.selections
+            ]
+            if None not in atom_selections:
+                restraint = _ParsedDistanceRestraint(
+                    atom_selections,
+                    scanned.distance,
+                    scanned.distance_minus,
+                    scanned.distance_plus,
+                    scanned.extra_info,
                 )
-                approximate_restraint = approximate_restraints[i - 1]
-                approximate_restraint = approximate_restraint.split("\n")
-                msg = f"""\
-                    got a multi atom selection for the {atom_number} atom in restraint number {i}
-                    in {file_path_display_name}
-                    dihedral restraints require single atom selections...
-                    the restraint text is most probably:
-                """
-                msg = dedent(msg)
-                for elem in approximate_restraint:
-                    msg += f"    {elem}\n"
-                exit_error(msg, e)
 
-            atom_selections.append(nef_atoms)
+        if restraint is None:
+            restraint = _parse_distance_restraint_or_exit_error(
+                restraint_text,
+                start,
+                end,
+                i,
+                residue_name_lookup,
+                file_path_display_name,
+                chain_code,
+            )
 
+        atom_selections = restraint.atoms
         if use_chains and chain_code != ANY_CHAIN:
             atom_selections = replace_chain_in_atom_labels(atom_selections, chain_code)
 
-        target_distance = restraint.get(DISTANCE)
-        distance_minus = restraint.get(DISTANCE_MINUS)
-        distance_plus = restraint.get(DISTANCE_PLUS)
-        comment = restraint.get(EXTRA_INFO).strip()
-        if comment == "":
-            comment = None
+        target_distance = restraint.distance
+        comment = restraint.extra_info if restraint.extra_info != "" else None
 
         atom_selections = [[atom_selection] for atom_selection in atom_selections]
         restraint = DistanceRestraint(
             *atom_selections,
             target_distance=target_distance,
-            distance_minus=target_distance - distance_minus,
-            distance_plus=target_distance + distance_plus,
+            distance_minus=target_distance - restraint.distance_minus,
+            distance_plus=target_distance + restraint.distance_plus,
             comment=comment,
         )
 